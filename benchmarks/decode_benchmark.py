@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark de decodificación de video por backend de captura.
+
+Mide los fps de decodificación de cada backend de ``capture_backends``
+sobre un clip local, sin throttling ni análisis, para elegir el
+decodificador más rápido en cada estación de tierra.
+
+Uso:
+    python benchmarks/decode_benchmark.py                       # Clip sintético
+    python benchmarks/decode_benchmark.py --clip vuelo.mp4      # Clip propio
+    python benchmarks/decode_benchmark.py --threads 1 2 4       # Variar threads
+"""
+
+import sys
+import os
+import argparse
+import tempfile
+import time
+from typing import Dict, Any, List
+
+import cv2
+import numpy as np
+
+# Configurar path para imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.processors.capture_backends import create_capture_backend
+
+
+def create_synthetic_clip(path: str, frames: int = 300,
+                          size: tuple = (1280, 720), fps: int = 30) -> str:
+    """
+    Genera un clip MP4 con movimiento para el benchmark.
+
+    Args:
+        path: Ruta del fichero de salida
+        frames: Número de frames del clip
+        size: Resolución (ancho, alto)
+        fps: Frames por segundo del clip
+
+    Returns:
+        Ruta del clip generado
+    """
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"mp4v"), fps, size)
+    rng = np.random.default_rng(0)
+    background = rng.integers(0, 255, (size[1], size[0], 3), dtype=np.uint8)
+    for index in range(frames):
+        frame = np.roll(background, index * 4, axis=1)
+        cv2.putText(frame, f"frame {index}", (40, 80),
+                    cv2.FONT_HERSHEY_SIMPLEX, 2, (255, 255, 255), 3)
+        writer.write(frame)
+    writer.release()
+    return path
+
+
+def benchmark_backend(name: str, clip: str, max_frames: int,
+                      options: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Decodifica el clip con un backend y mide su rendimiento.
+
+    Args:
+        name: Nombre del backend
+        clip: Ruta del clip
+        max_frames: Máximo de frames a decodificar
+        options: Opciones del backend
+
+    Returns:
+        Diccionario con frames decodificados, tiempo y fps
+    """
+    backend = create_capture_backend(name, **options)
+    cap = backend.open(clip)
+    if not cap.isOpened():
+        return {"backend": name, "options": options, "error": "no se pudo abrir"}
+
+    frames = 0
+    start = time.perf_counter()
+    while frames < max_frames:
+        ret, _ = cap.read()
+        if not ret:
+            break
+        frames += 1
+    elapsed = time.perf_counter() - start
+    cap.release()
+
+    return {
+        "backend": name,
+        "options": options,
+        "frames": frames,
+        "seconds": elapsed,
+        "fps": frames / elapsed if elapsed > 0 else 0.0
+    }
+
+
+def build_runs(threads: List[int]) -> List[tuple]:
+    """Construye las combinaciones de backend y opciones a medir."""
+    runs = [("opencv", {})]
+    for count in threads:
+        runs.append(("ffmpeg", {"decoder_threads": count}))
+        runs.append(("file", {"realtime": False, "decoder_threads": count}))
+    return runs
+
+
+def print_report(results: List[Dict[str, Any]]) -> None:
+    """Muestra la tabla de resultados ordenada por fps."""
+    print(f"\n{'BACKEND':<10}{'OPCIONES':<42}{'FRAMES':>8}{'FPS':>10}")
+    print("-" * 70)
+    for result in sorted(results, key=lambda r: r.get("fps", 0.0), reverse=True):
+        options = str(result["options"])
+        if "error" in result:
+            print(f"{result['backend']:<10}{options:<42}{result['error']:>18}")
+            continue
+        print(f"{result['backend']:<10}{options:<42}{result['frames']:>8}{result['fps']:>10.1f}")
+
+
+def main() -> None:
+    """Punto de entrada del benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark de decodificación por backend")
+    parser.add_argument("--clip", help="Clip local a decodificar (por defecto, uno sintético)")
+    parser.add_argument("--frames", type=int, default=300, help="Máximo de frames por ejecución")
+    parser.add_argument("--threads", type=int, nargs="+", default=[0, 1, 4],
+                        help="Threads de decodificador a probar (0 = automático)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        clip = args.clip or create_synthetic_clip(os.path.join(temp_dir, "clip.mp4"))
+        print(f"🎞️  Clip: {clip}")
+        results = [benchmark_backend(name, clip, args.frames, options)
+                   for name, options in build_runs(args.threads)]
+
+    print_report(results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark de inferencia YOLO por backend.
+
+Mide la latencia por imagen (lotes de una imagen) y el throughput en
+lotes de cada backend de ``yolo_backends`` sobre imágenes locales, para
+elegir el motor de inferencia en estaciones de tierra sin GPU. La
+primera ejecución de onnx/openvino incluye la exportación del modelo.
+
+Uso:
+    python benchmarks/yolo_benchmark.py                         # Imágenes sintéticas
+    python benchmarks/yolo_benchmark.py --images capturas/      # Carpeta de imágenes
+    python benchmarks/yolo_benchmark.py --backends pytorch onnx --batch-size 8
+"""
+
+import sys
+import os
+import glob
+import argparse
+import time
+from typing import Dict, Any, List
+
+import cv2
+import numpy as np
+
+# Configurar path para imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.yolo_backends import INFERENCE_BACKENDS, DEFAULT_CACHE_DIR
+from src.utils.yolo_model_manager import YoloModelManager
+
+IMAGE_PATTERNS = ("*.jpg", "*.jpeg", "*.png")
+
+
+def load_images(folder: str, limit: int) -> List[np.ndarray]:
+    """
+    Carga las imágenes de una carpeta en RGB, como las recibe el modelo.
+
+    Args:
+        folder: Carpeta con imágenes
+        limit: Máximo de imágenes a cargar
+
+    Returns:
+        Lista de imágenes RGB
+    """
+    paths = sorted(p for pattern in IMAGE_PATTERNS
+                   for p in glob.glob(os.path.join(folder, pattern)))[:limit]
+    images = [cv2.imread(path) for path in paths]
+    return [cv2.cvtColor(image, cv2.COLOR_BGR2RGB) for image in images if image is not None]
+
+
+def create_synthetic_images(count: int, size: tuple = (1280, 720)) -> List[np.ndarray]:
+    """
+    Genera imágenes RGB con formas para el benchmark.
+
+    Args:
+        count: Número de imágenes
+        size: Resolución (ancho, alto)
+
+    Returns:
+        Lista de imágenes RGB
+    """
+    rng = np.random.default_rng(0)
+    images = []
+    for _ in range(count):
+        image = rng.integers(0, 255, (size[1], size[0], 3), dtype=np.uint8)
+        for _ in range(5):
+            x, y = int(rng.integers(0, size[0] - 200)), int(rng.integers(0, size[1] - 200))
+            color = tuple(int(c) for c in rng.integers(0, 255, 3))
+            cv2.rectangle(image, (x, y), (x + 150, y + 150), color, -1)
+        images.append(image)
+    return images
+
+
+def benchmark_backend(name: str, images: List[np.ndarray], batch_size: int,
+                      warmup: int, cache_dir: str) -> Dict[str, Any]:
+    """
+    Carga el modelo con un backend y mide latencia y throughput.
+
+    Args:
+        name: Nombre del backend
+        images: Imágenes RGB de prueba
+        batch_size: Imágenes por llamada en la medida de throughput
+        warmup: Predicciones de calentamiento antes de medir
+        cache_dir: Directorio de los modelos exportados
+
+    Returns:
+        Diccionario con tiempo de carga, latencias y throughput
+    """
+    manager = YoloModelManager(backend=name, cache_dir=cache_dir)
+    start = time.perf_counter()
+    if not manager.initialize_model():
+        return {"backend": name, "error": "no se pudo cargar"}
+    load_seconds = time.perf_counter() - start
+    if manager.active_backend != name:
+        return {"backend": name, "error": f"no disponible (usa {manager.active_backend})"}
+
+    for image in images[:warmup]:
+        manager.predict(image)
+
+    latencies = []
+    for image in images:
+        start = time.perf_counter()
+        manager.predict(image)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    for index in range(0, len(images), batch_size):
+        manager.predict(images[index:index + batch_size])
+    batch_seconds = time.perf_counter() - start
+
+    return {
+        "backend": name,
+        "load_seconds": load_seconds,
+        "latency_ms_mean": float(np.mean(latencies)),
+        "latency_ms_p95": float(np.percentile(latencies, 95)),
+        "throughput": len(images) / batch_seconds if batch_seconds > 0 else 0.0
+    }
+
+
+def print_report(results: List[Dict[str, Any]], batch_size: int) -> None:
+    """Muestra la tabla de resultados ordenada por latencia media."""
+    print(f"\n{'BACKEND':<10}{'CARGA (s)':>11}{'MEDIA (ms)':>12}{'P95 (ms)':>11}"
+          f"{f'IMG/S (lote {batch_size})':>20}")
+    print("-" * 64)
+    for result in sorted(results, key=lambda r: r.get("latency_ms_mean", float("inf"))):
+        if "error" in result:
+            print(f"{result['backend']:<10}{result['error']:>54}")
+            continue
+        print(f"{result['backend']:<10}{result['load_seconds']:>11.1f}"
+              f"{result['latency_ms_mean']:>12.1f}{result['latency_ms_p95']:>11.1f}"
+              f"{result['throughput']:>20.1f}")
+
+
+def main() -> None:
+    """Punto de entrada del benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark de inferencia YOLO por backend")
+    parser.add_argument("--images", help="Carpeta de imágenes (por defecto, sintéticas)")
+    parser.add_argument("--count", type=int, default=32, help="Máximo de imágenes a medir")
+    parser.add_argument("--backends", nargs="+", default=list(INFERENCE_BACKENDS),
+                        choices=list(INFERENCE_BACKENDS), help="Backends a comparar")
+    parser.add_argument("--batch-size", type=int, default=8, help="Tamaño de lote del throughput")
+    parser.add_argument("--warmup", type=int, default=3, help="Predicciones de calentamiento")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="Caché de modelos exportados")
+    args = parser.parse_args()
+
+    images = load_images(args.images, args.count) if args.images else create_synthetic_images(args.count)
+    if not images:
+        parser.error(f"No hay imágenes en {args.images}")
+    print(f"🖼️  Imágenes: {len(images)} ({args.images or 'sintéticas'})")
+
+    results = [benchmark_backend(name, images, args.batch_size, args.warmup, args.cache_dir)
+               for name in args.backends]
+    print_report(results, args.batch_size)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,21 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Análisis batch de un vídeo grabado.
+Responsabilidad única: Lanzar BatchVideoAnalyzer desde la línea de comandos.
+
+Uso:
+    python src/analyze_video.py vuelo.mp4
+    python src/analyze_video.py vuelo.mp4 --interval 0.5 --workers 4 --output results/vuelo.jsonl
+"""
+
+import os
+import sys
+
+# Agregar la ruta del proyecto al PYTHONPATH
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.processors.batch_video_analyzer import main
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -288,7 +288,8 @@ def _extract_yolo_params(form_data) -> Dict[str, Any]:
     return {
         'confidence_threshold': float(form_data.get('yolo_confidence', 0.5)),
         'nms_threshold': float(form_data.get('nms_threshold', 0.4)),
-        'model_version': form_data.get('yolo_model', 'yolo11n')
+        'model_version': form_data.get('yolo_model', 'yolo11n'),
+        'columnar': form_data.get('columnar', 'false').lower() == 'true'
     }
 
 def _get_encoded_image_for_chat(image_file) -> tuple:
@@ -6,7 +6,7 @@ Responsabilidad única: Manejar las APIs HTTP relacionadas con drones.
 """
 
 import logging
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, Response, stream_with_context
 from typing import Dict, Any
 
 logger = logging.getLogger(__name__)
@@ -110,6 +110,102 @@ def stop_stream():
         logger.error(f"Error al detener stream: {str(e)}")
         return jsonify({'success': False, 'error': str(e)})
 
+@drone_blueprint.route('/streams', methods=['GET'])
+def list_fleet_streams():
+    """Lista los streams activos de la flota."""
+    try:
+        if not drone_service:
+            return jsonify({'success': False, 'error': 'Servicio no inicializado'})
+            
+        result = drone_service.list_fleet_streams()
+        return jsonify(result)
+        
+    except Exception as e:
+        logger.error(f"Error al listar streams: {str(e)}")
+        return jsonify({'success': False, 'error': str(e)})
+
+@drone_blueprint.route('/streams/start', methods=['POST'])
+def start_fleet_stream():
+    """Inicia el stream de un dron de la flota."""
+    try:
+        if not drone_service:
+            return jsonify({'success': False, 'error': 'Servicio no inicializado'})
+            
+        data = request.json or {}
+        stream_id = data.get('stream_id')
+        stream_url = data.get('stream_url')
+        
+        if not stream_id or not stream_url:
+            return jsonify({'success': False, 'error': 'stream_id y stream_url son requeridos'})
+            
+        result = drone_service.start_fleet_stream(stream_id, stream_url)
+        return jsonify(result)
+        
+    except Exception as e:
+        logger.error(f"Error al iniciar stream de flota: {str(e)}")
+        return jsonify({'success': False, 'error': str(e)})
+
+@drone_blueprint.route('/streams/stop', methods=['POST'])
+def stop_fleet_stream():
+    """Detiene el stream de un dron de la flota."""
+    try:
+        if not drone_service:
+            return jsonify({'success': False, 'error': 'Servicio no inicializado'})
+            
+        data = request.json or {}
+        stream_id = data.get('stream_id')
+        
+        if not stream_id:
+            return jsonify({'success': False, 'error': 'stream_id no especificado'})
+            
+        result = drone_service.stop_fleet_stream(stream_id)
+        return jsonify(result)
+        
+    except Exception as e:
+        logger.error(f"Error al detener stream de flota: {str(e)}")
+        return jsonify({'success': False, 'error': str(e)})
+
+@drone_blueprint.route('/video/feed')
+def video_feed():
+    """Vista previa en vivo MJPEG del stream principal o de un dron de la flota."""
+    try:
+        if not drone_service:
+            return jsonify({'success': False, 'error': 'Servicio no inicializado'})
+            
+        result = drone_service.get_video_feed(request.args.get('stream_id'))
+        if not result.get('success'):
+            return jsonify(result)
+        
+        # Cada espectador recibe siempre el frame más reciente (sin cola)
+        response = Response(stream_with_context(result['frames']), mimetype=result['mimetype'])
+        response.headers['Cache-Control'] = 'no-cache, no-store'
+        response.headers['X-Accel-Buffering'] = 'no'
+        return response
+        
+    except Exception as e:
+        logger.error(f"Error en vista previa de video: {str(e)}")
+        return jsonify({'success': False, 'error': str(e)})
+
+@drone_blueprint.route('/video/history')
+def video_history():
+    """Historial de análisis del stream en un rango de tiempo."""
+    try:
+        if not drone_service:
+            return jsonify({'success': False, 'error': 'Servicio no inicializado'})
+            
+        result = drone_service.get_video_history(
+            stream_id=request.args.get('stream_id'),
+            start=request.args.get('start', type=float),
+            end=request.args.get('end', type=float),
+            limit=request.args.get('limit', type=int),
+            include_thumbnails=request.args.get('thumbnails', 'false').lower() == 'true'
+        )
+        return jsonify(result)
+        
+    except Exception as e:
+        logger.error(f"Error al obtener historial de video: {str(e)}")
+        return jsonify({'success': False, 'error': str(e)})
+
 @drone_blueprint.route('/telemetry')
 def get_telemetry():
     """Obtiene datos de telemetría del dron."""
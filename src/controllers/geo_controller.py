@@ -6,8 +6,8 @@ Responsabilidad única: Manejar las APIs HTTP de análisis geográfico.
 """
 
 import logging
-from flask import Blueprint, request, jsonify
-from typing import Dict, Any
+from flask import Blueprint, request, jsonify, Response
+from typing import Dict, Any, Optional
 
 logger = logging.getLogger(__name__)
 
@@ -39,18 +39,56 @@ def add_reference():
 
 @geo_blueprint.route('/changes/detect', methods=['POST'])
 def detect_changes():
-    """Detecta cambios entre imagen actual y referencia."""
+    """Lanza en segundo plano la detección de cambios entre el frame actual y su referencia."""
     try:
         if not geo_service:
             return jsonify({'success': False, 'error': 'Servicio no inicializado'})
             
-        result = geo_service.detect_changes()
-        return jsonify(result)
+        data = request.get_json(silent=True) or {}
+        result = geo_service.start_change_detection(_extract_coordinates(data))
+        # 202: el trabajo se consulta en /changes/jobs/<job_id>; 429: demasiados pendientes
+        if result.get('busy'):
+            return jsonify(result), 429
+        return jsonify(result), 202 if result.get('success') else 200
             
     except Exception as e:
         logger.error(f"Error en detección de cambios: {str(e)}")
         return jsonify({'success': False, 'error': str(e)})
 
+@geo_blueprint.route('/changes/jobs/<job_id>', methods=['GET'])
+def get_change_detection_job(job_id: str):
+    """Consulta el estado y el resultado de un trabajo de detección de cambios."""
+    try:
+        if not geo_service:
+            return jsonify({'success': False, 'error': 'Servicio no inicializado'})
+            
+        result = geo_service.get_change_detection_job(job_id)
+        return jsonify(result)
+            
+    except Exception as e:
+        logger.error(f"Error al consultar detección de cambios: {str(e)}")
+        return jsonify({'success': False, 'error': str(e)})
+
+@geo_blueprint.route('/changes/<detection_id>/image', methods=['GET'])
+def get_change_image(detection_id: str):
+    """Imagen JPEG con los cambios marcados, renderizada al pedirla."""
+    try:
+        if not geo_service:
+            return jsonify({'success': False, 'error': 'Servicio no inicializado'})
+            
+        image = geo_service.get_change_visualization(detection_id)
+        if image is None:
+            return jsonify({'success': False, 'error': f'Visualización no disponible: {detection_id}'}), 404
+        
+        response = Response(image, mimetype='image/jpeg')
+        # Una detección no cambia: el navegador puede reutilizar la imagen
+        response.headers['Cache-Control'] = 'private, max-age=3600'
+        return response
+            
+    except Exception as e:
+        logger.error(f"Error al obtener imagen de cambios: {str(e)}")
+        return jsonify({'success': False, 'error': str(e)})
+
 @geo_blueprint.route('/target/create', methods=['POST'])
 def create_target():
     """Crea un nuevo objetivo para triangulación."""
@@ -122,6 +160,12 @@ def get_targets_status():
         logger.error(f"Error al obtener estado de objetivos: {str(e)}")
         return jsonify({'success': False, 'error': str(e)})
 
+def _extract_coordinates(data: Dict[str, Any]) -> Optional[Dict[str, float]]:
+    """Extrae las coordenadas opcionales de la captura."""
+    if data.get('latitude') is None or data.get('longitude') is None:
+        return None
+    return {'latitude': float(data['latitude']), 'longitude': float(data['longitude'])}
+
 def _extract_observation_params(data: Dict[str, Any]) -> Dict[str, Any]:
     """Extrae y valida parámetros de observación."""
     return {
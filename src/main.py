@@ -19,7 +19,9 @@ from src.models.geo_analyzer import GeoAnalyzer
 from src.models.yolo_detector import YoloObjectDetector
 from src.models.mission_planner import LLMMissionPlanner
 from src.models.geo_manager import GeolocationManager
-from src.utils.config import setup_logging
+from src.utils.config import (setup_logging, get_video_capture_config, get_video_detection_config,
+                              get_yolo_config)
+from src.utils.helpers import get_references_directory
 from src.services import DroneService, MissionService, AnalysisService, GeoService
 from src.services.chat_service import ChatService
 from src.controllers import (
@@ -105,7 +107,15 @@ class DroneGeoApp:
         
         # Inicializar modelos principales
         analyzer = GeoAnalyzer()
-        yolo_detector = YoloObjectDetector()
+        yolo_config = get_yolo_config()
+        yolo_detector = YoloObjectDetector(batch_size=yolo_config["batch_size"],
+                                           decode_workers=yolo_config["decode_workers"],
+                                           backend=yolo_config["backend"],
+                                           model_cache_dir=yolo_config["model_cache_dir"],
+                                           detection_cache_size=yolo_config["detection_cache_size"],
+                                           cache_floor_confidence=yolo_config["cache_floor_confidence"],
+                                           annotation_quality=yolo_config["annotation_quality"],
+                                           annotation_max_width=yolo_config["annotation_max_width"])
         mission_planner = LLMMissionPlanner()
         geo_manager = GeolocationManager()
         
@@ -113,13 +123,14 @@ class DroneGeoApp:
         chat_service = ChatService()
         
         # Inicializar controladores de hardware
-        hardware_components = self._initialize_hardware_components()
+        hardware_components = self._initialize_hardware_components(yolo_detector)
         
         # Crear servicios
         self.services = {
             'drone': DroneService(
                 hardware_components['drone_controller'],
-                hardware_components['video_processor']
+                hardware_components['video_processor'],
+                hardware_components['stream_manager']
             ),
             'mission': MissionService(
                 mission_planner,
@@ -129,7 +140,10 @@ class DroneGeoApp:
             'geo': GeoService(
                 geo_manager,
                 hardware_components['geo_triangulation'],
-                hardware_components['geo_correlator']
+                hardware_components['geo_correlator'],
+                change_detector=hardware_components['change_detector'],
+                video_processor=hardware_components['video_processor'],
+                drone_controller=hardware_components['drone_controller']
             ),
             'chat': chat_service
         }
@@ -157,24 +171,38 @@ class DroneGeoApp:
             print("🔧 Asegúrate de que todos los drivers y dependencias estén instalados")
             sys.exit(1)
     
-    def _initialize_hardware_components(self) -> dict:
+    def _initialize_hardware_components(self, yolo_detector: YoloObjectDetector) -> dict:
         """Inicializa componentes de hardware reales."""
-        return self._initialize_real_components()
+        return self._initialize_real_components(yolo_detector)
     
-    def _initialize_real_components(self) -> dict:
+    def _initialize_real_components(self, yolo_detector: YoloObjectDetector) -> dict:
         """Inicializa componentes reales."""
         from src.drones.dji_controller import DJIDroneController
         from src.processors.video_processor import VideoProcessor
         from src.processors.change_detector import ChangeDetector
+        from src.processors.stream_manager import VideoStreamManager
+        from src.processors.capture_backends import create_capture_backend
         from src.geo.geo_triangulation import GeoTriangulation
         from src.geo.geo_correlator import GeoCorrelator
         
         analyzer = GeoAnalyzer()  # Necesario para VideoProcessor
+        capture_config = get_video_capture_config()
+        capture_backend = create_capture_backend(
+            capture_config["backend"], **capture_config["options"]
+        )
+        detection_config = get_video_detection_config()
+        object_detector = yolo_detector if detection_config["enabled"] else None
         
         components = {
             'drone_controller': DJIDroneController(),
-            'video_processor': VideoProcessor(analyzer),
-            'change_detector': ChangeDetector(),
+            'video_processor': VideoProcessor(
+                analyzer, capture_backend=capture_backend,
+                object_detector=object_detector,
+                detection_batch_size=detection_config["batch_size"],
+                detection_interval=detection_config["interval"]
+            ),
+            'stream_manager': VideoStreamManager(analyzer, capture_backend=capture_backend),
+            'change_detector': ChangeDetector(reference_directory=get_references_directory()),
             'geo_triangulation': GeoTriangulation(),
             'geo_correlator': GeoCorrelator()
         }
@@ -5,16 +5,26 @@ Módulo para detección de objetos usando YOLO 11.
 Responsabilidad única: Coordinación de la detección de objetos.
 """
 
+import os
 import logging
-from typing import Dict, List, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Optional, Iterator, Tuple
+
+import numpy as np
 
 from src.utils.image_processor import ImageProcessor
 from src.utils.yolo_model_manager import YoloModelManager
+from src.utils.yolo_backends import DEFAULT_CACHE_DIR
+from src.utils.yolo_detection_cache import YoloDetectionCache, RawDetections
 from src.utils.yolo_result_formatter import YoloResultFormatter
 from src.utils.image_annotator import ImageAnnotator
 
 logger = logging.getLogger(__name__)
 
+# Sin supresión en la pasada que alimenta la caché: el NMS se aplica al refiltrar
+RAW_NMS_THRESHOLD = 1.0
+RAW_MAX_DETECTIONS = 1000
+
 
 class YoloObjectDetector:
     """
@@ -23,22 +33,39 @@ class YoloObjectDetector:
     """
     
     def __init__(self, confidence_threshold: float = 0.5, 
-                 nms_threshold: float = 0.4):
+                 nms_threshold: float = 0.4, batch_size: int = 8,
+                 decode_workers: Optional[int] = None, backend: str = "pytorch",
+                 model_cache_dir: str = DEFAULT_CACHE_DIR, detection_cache_size: int = 64,
+                 cache_floor_confidence: float = 0.25, annotation_quality: int = 95,
+                 annotation_max_width: Optional[int] = None):
         """
         Inicializa el detector YOLO.
         
         Args:
             confidence_threshold: Umbral de confianza por defecto
             nms_threshold: Umbral NMS por defecto
+            batch_size: Imágenes por llamada al modelo en ``detect_objects_batch``
+            decode_workers: Threads de decodificación de lotes (por defecto, uno por CPU)
+            backend: Motor de inferencia (pytorch, onnx u openvino)
+            model_cache_dir: Directorio de los modelos exportados
+            detection_cache_size: Imágenes cuyas detecciones se cachean (0 = sin caché)
+            cache_floor_confidence: Confianza mínima de las cajas cacheadas
+            annotation_quality: Calidad JPEG de las imágenes anotadas
+            annotation_max_width: Ancho máximo de las imágenes anotadas (None = original)
         """
         self.confidence_threshold = confidence_threshold
         self.nms_threshold = nms_threshold
+        self.batch_size = max(1, batch_size)
+        self.decode_workers = decode_workers or os.cpu_count() or 1
+        self.cache_floor_confidence = cache_floor_confidence
+        self.detection_cache = YoloDetectionCache(detection_cache_size)
         
         # Inicializar componentes
         self.image_processor = ImageProcessor()
-        self.model_manager = YoloModelManager()
+        self.model_manager = YoloModelManager(backend, model_cache_dir)
         self.result_formatter = YoloResultFormatter()
-        self.image_annotator = ImageAnnotator(self.image_processor)
+        self.image_annotator = ImageAnnotator(self.image_processor, annotation_quality,
+                                              annotation_max_width)
         
         # Inicializar modelo
         self._initialize_components()
@@ -53,14 +80,21 @@ class YoloObjectDetector:
     
     def detect_objects(self, image_data: bytes, 
                       confidence_threshold: Optional[float] = None,
-                      nms_threshold: Optional[float] = None) -> Dict[str, Any]:
+                      nms_threshold: Optional[float] = None,
+                      columnar: bool = False, annotate: bool = False) -> Dict[str, Any]:
         """
         Detecta objetos en una imagen.
         
+        Las salidas del modelo se cachean por el contenido de la imagen: una
+        misma imagen pedida de nuevo (con los mismos u otros umbrales) se
+        responde refiltrando las cajas guardadas sin ejecutar el modelo.
+        
         Args:
             image_data: Datos de la imagen en bytes
             confidence_threshold: Umbral de confianza (opcional)
             nms_threshold: Umbral NMS (opcional)
+            columnar: Devolver las detecciones como diccionario de columnas
+            annotate: Incluir la imagen anotada en base64
             
         Returns:
             Diccionario con resultados de detección
@@ -77,21 +111,29 @@ class YoloObjectDetector:
         nms_threshold = nms_threshold or self.nms_threshold
         
         try:
-            # Procesar imagen
-            image = self._process_input_image(image_data)
-            if image is None:
-                return self.result_formatter.format_error_response(
-                    "Error procesando imagen"
-                )
+            key = self.detection_cache.key_for(image_data)
+            raw = self.detection_cache.get(key, conf_threshold)
             
-            # Ejecutar detección
-            results = self._run_detection(image, conf_threshold, nms_threshold)
+            # Procesar imagen (con las cajas en caché solo hace falta para anotar)
+            image = None
+            if raw is None or annotate:
+                image = self._process_input_image(image_data)
+                if image is None:
+                    return self.result_formatter.format_error_response(
+                        "Error procesando imagen"
+                    )
+            
+            # Ejecutar detección si la imagen no está en caché
+            if raw is None:
+                raw = self._run_raw_detection(image, conf_threshold)
+                self.detection_cache.put(key, raw)
+            boxes = raw.filter(conf_threshold, nms_threshold)
             
             # Procesar resultados
-            detections = self._process_detections(results[0], image.shape)
+            detections = self._format_boxes(boxes, raw.image_shape, columnar)
             
-            # Anotar imagen
-            annotated_image = self._annotate_image(image, results[0])
+            # Anotar imagen solo si se pide
+            annotated_image = self._annotate_image(image, detections) if annotate else None
             
             return self.result_formatter.format_response(
                 success=True,
@@ -105,6 +147,175 @@ class YoloObjectDetector:
             logger.error(f"Error en detección YOLO: {str(e)}")
             return self.result_formatter.format_error_response(str(e))
     
+    def detect_frame(self, frame, confidence_threshold: Optional[float] = None,
+                     nms_threshold: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Detecta objetos en un frame BGR ya decodificado, sin anotarlo.
+        
+        Evita la codificación JPEG intermedia y la imagen anotada, por lo que
+        es la opción adecuada para procesar vídeo frame a frame.
+        
+        Args:
+            frame: Frame BGR como array numpy
+            confidence_threshold: Umbral de confianza (opcional)
+            nms_threshold: Umbral NMS (opcional)
+            
+        Returns:
+            Diccionario con resultados de detección (sin imagen anotada)
+        """
+        if not self.model_manager.is_model_ready():
+            return self.result_formatter.format_error_response(
+                "YOLO 11 no está disponible", 
+                self.model_manager.is_initialized
+            )
+        
+        conf_threshold = confidence_threshold or self.confidence_threshold
+        nms_threshold = nms_threshold or self.nms_threshold
+        
+        try:
+            image = self.image_processor.bgr_to_rgb(frame)
+            results = self._run_detection(image, conf_threshold, nms_threshold)
+            detections = self._process_detections(results[0], image.shape)
+            return self.result_formatter.format_response(
+                success=True,
+                detections=detections,
+                annotated_image=None,
+                conf_threshold=conf_threshold,
+                nms_threshold=nms_threshold
+            )
+        except Exception as e:
+            logger.error(f"Error en detección YOLO de frame: {str(e)}")
+            return self.result_formatter.format_error_response(str(e))
+    
+    def detect_frames(self, frames: List[Any], confidence_threshold: Optional[float] = None,
+                      nms_threshold: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Detecta objetos en varios frames BGR con una sola llamada al modelo.
+        
+        Args:
+            frames: Lista de frames BGR como arrays numpy
+            confidence_threshold: Umbral de confianza (opcional)
+            nms_threshold: Umbral NMS (opcional)
+            
+        Returns:
+            Lista de resultados de detección, uno por frame y en el mismo orden
+        """
+        if not self.model_manager.is_model_ready():
+            error = self.result_formatter.format_error_response(
+                "YOLO 11 no está disponible", 
+                self.model_manager.is_initialized
+            )
+            return [dict(error) for _ in frames]
+        
+        conf_threshold = confidence_threshold or self.confidence_threshold
+        nms_threshold = nms_threshold or self.nms_threshold
+        
+        try:
+            images = [self.image_processor.bgr_to_rgb(frame) for frame in frames]
+            results = self._run_detection(images, conf_threshold, nms_threshold)
+            return [
+                self.result_formatter.format_response(
+                    success=True,
+                    detections=self._process_detections(result, image.shape),
+                    annotated_image=None,
+                    conf_threshold=conf_threshold,
+                    nms_threshold=nms_threshold
+                )
+                for image, result in zip(images, results)
+            ]
+        except Exception as e:
+            logger.error(f"Error en detección YOLO por lotes: {str(e)}")
+            return [self.result_formatter.format_error_response(str(e)) for _ in frames]
+    
+    def detect_objects_batch(self, images_data: List[bytes],
+                             confidence_threshold: Optional[float] = None,
+                             nms_threshold: Optional[float] = None,
+                             batch_size: Optional[int] = None,
+                             annotate: bool = False) -> List[Dict[str, Any]]:
+        """
+        Detecta objetos en muchas imágenes codificadas (carpeta de fotos, ráfaga).
+        
+        Las imágenes se decodifican en paralelo y se pasan al modelo en lotes
+        de ``batch_size``; mientras el modelo procesa un lote ya se está
+        decodificando el siguiente, de modo que solo hay dos lotes
+        decodificados en memoria a la vez.
+        
+        Args:
+            images_data: Lista de imágenes en bytes
+            confidence_threshold: Umbral de confianza (opcional)
+            nms_threshold: Umbral NMS (opcional)
+            batch_size: Imágenes por llamada al modelo (por defecto, el del detector)
+            annotate: Incluir la imagen anotada de cada resultado
+            
+        Returns:
+            Lista de resultados de detección, uno por imagen y en el mismo orden
+        """
+        if not self.model_manager.is_model_ready():
+            error = self.result_formatter.format_error_response(
+                "YOLO 11 no está disponible", 
+                self.model_manager.is_initialized
+            )
+            return [dict(error) for _ in images_data]
+        
+        conf_threshold = confidence_threshold or self.confidence_threshold
+        nms_threshold = nms_threshold or self.nms_threshold
+        size = max(1, batch_size or self.batch_size)
+        responses: List[Optional[Dict[str, Any]]] = [None] * len(images_data)
+        
+        workers = min(self.decode_workers, max(1, len(images_data)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for indices, images in self._decode_batches(images_data, size, executor):
+                valid = [(i, image) for i, image in zip(indices, images) if image is not None]
+                for i, image in zip(indices, images):
+                    if image is None:
+                        responses[i] = self.result_formatter.format_error_response(
+                            "Error procesando imagen"
+                        )
+                if valid:
+                    self._detect_decoded_batch(valid, responses, conf_threshold,
+                                               nms_threshold, annotate)
+        
+        logger.info(f"Detección YOLO por lotes completada: {len(images_data)} imágenes "
+                    f"en lotes de {size}")
+        return responses
+    
+    def _decode_batches(self, images_data: List[bytes], batch_size: int,
+                        executor: ThreadPoolExecutor) -> Iterator[Tuple[List[int], List[Any]]]:
+        """Decodifica las imágenes por lotes, adelantando la decodificación del siguiente."""
+        chunks = [list(range(start, min(start + batch_size, len(images_data))))
+                  for start in range(0, len(images_data), batch_size)]
+        submit = lambda chunk: [executor.submit(self._process_input_image, images_data[i])
+                                for i in chunk]
+        
+        pending = submit(chunks[0]) if chunks else []
+        for position, chunk in enumerate(chunks):
+            current = pending
+            if position + 1 < len(chunks):
+                pending = submit(chunks[position + 1])
+            yield chunk, [future.result() for future in current]
+    
+    def _detect_decoded_batch(self, batch: List[Tuple[int, Any]],
+                              responses: List[Optional[Dict[str, Any]]],
+                              conf_threshold: float, nms_threshold: float,
+                              annotate: bool) -> None:
+        """Ejecuta el modelo sobre un lote decodificado y escribe sus respuestas."""
+        try:
+            images = [image for _, image in batch]
+            results = self._run_detection(images, conf_threshold, nms_threshold)
+            for (index, image), result in zip(batch, results):
+                detections = self._process_detections(result, image.shape)
+                responses[index] = self.result_formatter.format_response(
+                    success=True,
+                    detections=detections,
+                    annotated_image=self._annotate_image(image, detections) if annotate else None,
+                    conf_threshold=conf_threshold,
+                    nms_threshold=nms_threshold
+                )
+        except Exception as e:
+            logger.error(f"Error en detección YOLO por lotes: {str(e)}")
+            for index, _ in batch:
+                responses[index] = self.result_formatter.format_error_response(str(e))
+    
     def _process_input_image(self, image_data: bytes):
         """
         Procesa la imagen de entrada.
@@ -133,6 +344,43 @@ class YoloObjectDetector:
             image, conf_threshold, nms_threshold
         )
     
+    def _run_raw_detection(self, image, conf_threshold: float) -> RawDetections:
+        """
+        Ejecuta el modelo sin NMS y con la confianza mínima de la caché.
+        
+        Args:
+            image: Imagen procesada
+            conf_threshold: Umbral de confianza de la petición
+            
+        Returns:
+            Cajas antes de NMS, válidas para umbrales desde la confianza usada
+        """
+        floor = min(conf_threshold, self.cache_floor_confidence)
+        results = self.model_manager.predict(image, floor, RAW_NMS_THRESHOLD,
+                                             max_det=RAW_MAX_DETECTIONS)
+        raw = RawDetections.from_results(results[0], image.shape, floor)
+        if len(raw) >= RAW_MAX_DETECTIONS:
+            # Lista truncada: solo es completa por encima de la menor confianza guardada
+            raw.min_confidence = float(np.nextafter(raw.conf.min(), np.inf))
+        return raw
+    
+    def _format_boxes(self, boxes, image_shape, columnar: bool = False):
+        """
+        Formatea cajas YOLO (``Boxes`` de ultralytics o ``RawDetections``).
+        
+        Args:
+            boxes: Cajas con arrays ``xyxy``, ``conf`` y ``cls``
+            image_shape: Forma de la imagen
+            columnar: Devolver un diccionario de columnas
+            
+        Returns:
+            Lista de detecciones formateadas (o diccionario de columnas)
+        """
+        return self.result_formatter.format_detections(
+            boxes.xyxy, boxes.conf, boxes.cls,
+            self.model_manager.get_class_names(), image_shape, columnar
+        )
+    
     def _process_detections(self, results, image_shape) -> List[Dict[str, Any]]:
         """
         Procesa los resultados de detección.
@@ -144,32 +392,22 @@ class YoloObjectDetector:
         Returns:
             Lista de detecciones formateadas
         """
-        detections = []
-        
-        if results.boxes is not None:
-            boxes = results.boxes.cpu().numpy()
-            class_names = self.model_manager.get_class_names()
-            
-            for i, box in enumerate(boxes):
-                detection = self.result_formatter.format_detection(
-                    box, class_names, i, image_shape
-                )
-                detections.append(detection)
-        
-        return detections
+        if results.boxes is None:
+            return []
+        return self._format_boxes(results.boxes.cpu().numpy(), image_shape)
     
-    def _annotate_image(self, image, yolo_results) -> str:
+    def _annotate_image(self, image, detections) -> str:
         """
-        Anota la imagen con las detecciones.
+        Anota la imagen con las detecciones ya formateadas.
         
         Args:
-            image: Imagen original
-            yolo_results: Resultados de YOLO
+            image: Imagen original en RGB
+            detections: Detecciones formateadas (filas o columnas)
             
         Returns:
             Imagen anotada en base64
         """
-        return self.image_annotator.annotate_yolo_results(image, yolo_results)
+        return self.image_annotator.annotate_detections(image, detections)
     
     def get_available_classes(self) -> List[str]:
         """
@@ -187,12 +425,14 @@ class YoloObjectDetector:
         Returns:
             Información del modelo
         """
-        return self.result_formatter.format_model_info(
+        info = self.result_formatter.format_model_info(
             self.model_manager.is_initialized,
             self.model_manager.get_class_names(),
             self.confidence_threshold,
             self.nms_threshold
         )
+        info['detection_cache'] = self.detection_cache.get_stats()
+        return info
     
     def is_initialized(self) -> bool:
         """
@@ -5,12 +5,50 @@ Este módulo proporciona funcionalidades de:
 - Detección de cambios entre imágenes de la misma zona geográfica
 - Procesamiento de video en tiempo real desde drones
 - Análisis visual continuo con threading optimizado
+- Buffer circular de frames crudos con codificación bajo demanda
+- Gestión concurrente de los streams de una flota de drones
+- Filtro de cambio de escena para evitar análisis redundantes
+- Control adaptativo de la tasa de muestreo según la carga
+- Backends de captura configurables (OpenCV, FFmpeg, ficheros grabados)
+- Análisis batch de vídeos grabados repartido en procesos
+- Vista previa MJPEG en vivo compartida entre espectadores
+- Detección YOLO continua por lotes sobre el stream de video
+- Historial acotado de análisis consultable por rango de tiempo
+- Detección de cambios por teselas y de grueso a fino para ortofotos grandes
+- Almacén persistente de referencias mapeadas en memoria
+- Índice espacial para localizar referencias por coordenadas GPS
+- Alineación de capturas con su referencia antes de diferenciar
+- Visualización de cambios generada solo bajo demanda
+- Seguimiento incremental de cambios con un fondo por ubicación
+- Caché de imágenes preprocesadas indexada por contenido
 """
 
 from .change_detector import ChangeDetector
 from .video_processor import VideoProcessor
+from .frame_buffer import FrameRingBuffer
+from .stream_manager import VideoStreamManager
+from .scene_change_gate import SceneChangeGate
+from .rate_controller import AdaptiveRateController
+from .capture_backends import CaptureBackend, create_capture_backend
+from .batch_video_analyzer import BatchVideoAnalyzer
+from .mjpeg_streamer import MjpegStreamer
+from .frame_detection_stage import FrameDetectionStage
+from .analysis_history import AnalysisHistory
+from .tiled_differencer import TiledDifferencer
+from .reference_store import ReferenceImageStore
+from .reference_index import ReferenceSpatialIndex
+from .image_aligner import ImageAligner
+from .change_visualization import ChangeVisualization
+from .background_model import BackgroundModel
+from .preprocessing_cache import PreprocessingCache
 
-__all__ = ['ChangeDetector', 'VideoProcessor']
+__all__ = ['ChangeDetector', 'VideoProcessor', 'FrameRingBuffer', 'VideoStreamManager',
+           'SceneChangeGate', 'AdaptiveRateController',
+           'CaptureBackend', 'create_capture_backend', 'BatchVideoAnalyzer',
+           'MjpegStreamer', 'FrameDetectionStage', 'AnalysisHistory',
+           'TiledDifferencer', 'ReferenceImageStore', 'ReferenceSpatialIndex',
+           'ImageAligner', 'ChangeVisualization', 'BackgroundModel',
+           'PreprocessingCache']
 
 # Versión del módulo
 __version__ = '1.0.0'
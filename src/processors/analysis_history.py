@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Historial acotado de los análisis del stream de video.
+Responsabilidad única: Conservar análisis recientes indexados por tiempo dentro de un presupuesto de memoria.
+"""
+
+import json
+import base64
+import bisect
+import threading
+import logging
+from dataclasses import dataclass
+from typing import Dict, Any, Optional, List
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class AnalysisRecord:
+    """Análisis almacenado con su miniatura y su coste estimado en memoria."""
+    timestamp: float
+    results: Dict[str, Any]
+    frame_sequence: Optional[int] = None
+    frame_timestamp: Optional[float] = None
+    thumbnail: Optional[bytes] = None
+    size_bytes: int = 0
+
+    def to_dict(self, include_thumbnail: bool = False) -> Dict[str, Any]:
+        """
+        Convierte el registro a un diccionario serializable.
+
+        Args:
+            include_thumbnail: Incluir la miniatura JPEG en base64
+
+        Returns:
+            Diccionario con el análisis y sus metadatos
+        """
+        record = {
+            "timestamp": self.timestamp,
+            "frame_sequence": self.frame_sequence,
+            "frame_timestamp": self.frame_timestamp,
+            "results": self.results,
+            "has_thumbnail": self.thumbnail is not None
+        }
+        if include_thumbnail and self.thumbnail is not None:
+            record["thumbnail"] = base64.b64encode(self.thumbnail).decode("utf-8")
+        return record
+
+
+class AnalysisHistory:
+    """
+    Historial de análisis ordenado por marca de tiempo.
+
+    En lugar del JPEG completo de cada frame se guarda una miniatura
+    pequeña, y los registros más antiguos se expulsan en cuanto se supera
+    el número máximo de entradas o el presupuesto de memoria. Las
+    consultas por rango usan búsqueda binaria sobre las marcas de tiempo.
+    """
+
+    def __init__(self, max_entries: int = 500, memory_budget: int = 16 * 1024 * 1024,
+                 thumbnail_width: int = 160, thumbnail_quality: int = 70):
+        """
+        Inicializa el historial.
+
+        Args:
+            max_entries: Número máximo de análisis conservados
+            memory_budget: Bytes máximos estimados entre resultados y miniaturas
+            thumbnail_width: Ancho en píxeles de las miniaturas (0 = sin miniaturas)
+            thumbnail_quality: Calidad JPEG de las miniaturas
+        """
+        if max_entries < 1 or memory_budget <= 0:
+            raise ValueError("El historial necesita al menos una entrada y un presupuesto positivo")
+
+        self.max_entries = max_entries
+        self.memory_budget = memory_budget
+        self.thumbnail_width = thumbnail_width
+        self.thumbnail_quality = thumbnail_quality
+        self._records: List[AnalysisRecord] = []
+        self._timestamps: List[float] = []
+        self._memory_used = 0
+        self.records_evicted = 0
+        self._lock = threading.Lock()
+
+    def add(self, timestamp: float, results: Dict[str, Any],
+            frame: Optional[np.ndarray] = None, frame_sequence: Optional[int] = None,
+            frame_timestamp: Optional[float] = None) -> AnalysisRecord:
+        """
+        Añade un análisis al historial.
+
+        Args:
+            timestamp: Instante del análisis
+            results: Resultados del analizador
+            frame: Frame BGR analizado, del que se guarda solo una miniatura
+            frame_sequence: Secuencia del frame en el buffer circular
+            frame_timestamp: Instante de captura del frame
+
+        Returns:
+            Registro almacenado
+        """
+        thumbnail = self._make_thumbnail(frame) if frame is not None else None
+        record = AnalysisRecord(timestamp, results, frame_sequence, frame_timestamp, thumbnail)
+        record.size_bytes = self._estimate_size(record)
+
+        with self._lock:
+            # Los análisis llegan casi siempre en orden: bisect solo reordena los rezagados
+            index = bisect.bisect_right(self._timestamps, timestamp)
+            self._timestamps.insert(index, timestamp)
+            self._records.insert(index, record)
+            self._memory_used += record.size_bytes
+            self._evict()
+        return record
+
+    def _make_thumbnail(self, frame: np.ndarray) -> Optional[bytes]:
+        """Reduce el frame al ancho de miniatura y lo codifica en JPEG."""
+        if self.thumbnail_width <= 0:
+            return None
+        height, width = frame.shape[:2]
+        if width > self.thumbnail_width:
+            thumb_height = max(1, int(height * self.thumbnail_width / width))
+            frame = cv2.resize(frame, (self.thumbnail_width, thumb_height),
+                               interpolation=cv2.INTER_AREA)
+        ok, buffer = cv2.imencode(".jpg", frame,
+                                  [int(cv2.IMWRITE_JPEG_QUALITY), self.thumbnail_quality])
+        return buffer.tobytes() if ok else None
+
+    @staticmethod
+    def _estimate_size(record: AnalysisRecord) -> int:
+        """Estima los bytes que ocupa un registro (resultados serializados + miniatura)."""
+        try:
+            results_size = len(json.dumps(record.results, default=str))
+        except (TypeError, ValueError):
+            results_size = len(str(record.results))
+        return results_size + (len(record.thumbnail) if record.thumbnail else 0)
+
+    def _evict(self) -> None:
+        """Expulsa los registros más antiguos fuera de límites (requiere el lock)."""
+        while self._records and (len(self._records) > self.max_entries
+                                 or self._memory_used > self.memory_budget):
+            evicted = self._records.pop(0)
+            self._timestamps.pop(0)
+            self._memory_used -= evicted.size_bytes
+            self.records_evicted += 1
+
+    def get_range(self, start: Optional[float] = None, end: Optional[float] = None,
+                  limit: Optional[int] = None) -> List[AnalysisRecord]:
+        """
+        Obtiene los análisis con marca de tiempo en ``[start, end]``.
+
+        Args:
+            start: Instante inicial (None = desde el más antiguo)
+            end: Instante final (None = hasta el más reciente)
+            limit: Máximo de registros, quedándose con los más recientes
+
+        Returns:
+            Registros del rango en orden cronológico
+        """
+        with self._lock:
+            low = 0 if start is None else bisect.bisect_left(self._timestamps, start)
+            high = len(self._timestamps) if end is None else bisect.bisect_right(self._timestamps, end)
+            records = self._records[low:high]
+        if limit is not None and limit >= 0:
+            records = records[-limit:] if limit else []
+        return records
+
+    def get_nearest(self, timestamp: float) -> Optional[AnalysisRecord]:
+        """
+        Obtiene el análisis más cercano a un instante.
+
+        Args:
+            timestamp: Instante buscado
+
+        Returns:
+            Registro más cercano o None si el historial está vacío
+        """
+        with self._lock:
+            if not self._records:
+                return None
+            index = bisect.bisect_left(self._timestamps, timestamp)
+            candidates = [i for i in (index - 1, index) if 0 <= i < len(self._records)]
+            best = min(candidates, key=lambda i: abs(self._timestamps[i] - timestamp))
+            return self._records[best]
+
+    def latest(self) -> Optional[AnalysisRecord]:
+        """Obtiene el análisis más reciente."""
+        with self._lock:
+            return self._records[-1] if self._records else None
+
+    def clear(self) -> None:
+        """Vacía el historial."""
+        with self._lock:
+            self._records.clear()
+            self._timestamps.clear()
+            self._memory_used = 0
+
+    def __len__(self) -> int:
+        """Número de análisis conservados."""
+        with self._lock:
+            return len(self._records)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Obtiene las estadísticas del historial.
+
+        Returns:
+            Diccionario con entradas, memoria usada y expulsiones
+        """
+        with self._lock:
+            return {
+                "entries": len(self._records),
+                "max_entries": self.max_entries,
+                "memory_used": self._memory_used,
+                "memory_budget": self.memory_budget,
+                "records_evicted": self.records_evicted,
+                "oldest_timestamp": self._timestamps[0] if self._timestamps else None,
+                "newest_timestamp": self._timestamps[-1] if self._timestamps else None
+            }
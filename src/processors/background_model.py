@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Modelo de fondo incremental por ubicación para seguir cambios entre capturas.
+Responsabilidad única: Mantener una media móvil de cada ubicación y la persistencia de sus regiones de cambio.
+"""
+
+import threading
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, Any, Optional, List, Tuple
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+Box = Tuple[int, int, int, int]
+
+
+@dataclass
+class RegionTrack:
+    """Región de cambio seguida entre capturas consecutivas."""
+    track_id: int
+    box: Box
+    first_capture: int
+    hits: int = 1
+
+
+@dataclass
+class LocationBackground:
+    """Estado incremental de una ubicación: media móvil y regiones seguidas."""
+    mean: np.ndarray
+    captures: int = 0
+    tracks: List[RegionTrack] = field(default_factory=list)
+    next_track_id: int = 1
+
+
+class BackgroundModel:
+    """
+    Media móvil exponencial de las capturas de cada ubicación.
+
+    El fondo se inicializa con la referencia suavizada y cada captura lo
+    actualiza con ``cv2.accumulateWeighted`` (O(píxeles), sin guardar
+    frames anteriores). Las regiones de cambio de una captura se emparejan
+    por IoU con las de la anterior, de modo que cada una lleva el número
+    de capturas consecutivas en las que ha persistido. Solo se mantienen
+    en memoria las ``max_locations`` ubicaciones usadas más recientemente.
+    """
+
+    def __init__(self, alpha: float = 0.05, match_iou: float = 0.3,
+                 min_persistence: int = 3, max_locations: int = 64):
+        """
+        Inicializa el modelo de fondo.
+
+        Args:
+            alpha: Peso de cada captura nueva en la media móvil
+            match_iou: IoU mínimo para considerar que dos regiones son la misma
+            min_persistence: Capturas consecutivas para marcar una región como persistente
+            max_locations: Ubicaciones cuyo fondo se mantiene en memoria
+        """
+        if not 0.0 < alpha <= 1.0:
+            raise ValueError("alpha debe estar en (0, 1]")
+
+        self.alpha = alpha
+        self.match_iou = match_iou
+        self.min_persistence = min_persistence
+        self.max_locations = max_locations
+        self._locations: "OrderedDict[str, LocationBackground]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_background(self, location_id: str, reference_blur: np.ndarray) -> np.ndarray:
+        """
+        Obtiene el fondo actual de una ubicación.
+
+        Args:
+            location_id: ID de la ubicación
+            reference_blur: Referencia suavizada con la que inicializar el fondo
+
+        Returns:
+            Fondo en grises (uint8) con la forma de la referencia
+        """
+        with self._lock:
+            state = self._get_state(location_id, reference_blur)
+            return cv2.convertScaleAbs(state.mean)
+
+    def update(self, location_id: str, current_blur: np.ndarray, boxes: np.ndarray,
+               valid_mask: Optional[np.ndarray] = None) -> List[Dict[str, Any]]:
+        """
+        Incorpora una captura al fondo y sigue sus regiones de cambio.
+
+        Args:
+            location_id: ID de la ubicación (inicializada con ``get_background``)
+            current_blur: Captura suavizada en el encuadre de la referencia
+            boxes: Rectángulos (x, y, ancho, alto) de las regiones de cambio
+            valid_mask: Píxeles cubiertos por la captura (None = todos)
+
+        Returns:
+            Seguimiento de cada región en el orden de ``boxes``
+        """
+        with self._lock:
+            state = self._locations.get(location_id)
+            if state is None:
+                return []
+            cv2.accumulateWeighted(current_blur, state.mean, self.alpha, mask=valid_mask)
+            state.captures += 1
+            return self._track_regions(state, np.asarray(boxes, dtype=np.float64).reshape(-1, 4))
+
+    def _get_state(self, location_id: str, reference_blur: np.ndarray) -> LocationBackground:
+        """Obtiene (o crea a partir de la referencia) el estado de una ubicación (requiere el lock)."""
+        state = self._locations.get(location_id)
+        if state is None or state.mean.shape != reference_blur.shape[:2]:
+            state = LocationBackground(mean=np.asarray(reference_blur, dtype=np.float32).copy())
+            self._locations[location_id] = state
+            while len(self._locations) > self.max_locations:
+                self._locations.popitem(last=False)
+        self._locations.move_to_end(location_id)
+        return state
+
+    def _track_regions(self, state: LocationBackground, boxes: np.ndarray) -> List[Dict[str, Any]]:
+        """Empareja las regiones con las de la captura anterior (requiere el lock)."""
+        previous = state.tracks
+        overlaps = self._iou_matrix(boxes, np.array([t.box for t in previous], dtype=np.float64))
+
+        tracks: List[RegionTrack] = []
+        taken = set()
+        for i, box in enumerate(boxes):
+            match = None
+            if overlaps.shape[1]:
+                # Emparejamiento voraz: la región anterior libre con mayor solape
+                for j in np.argsort(-overlaps[i]):
+                    if overlaps[i, j] < self.match_iou:
+                        break
+                    if j not in taken:
+                        match = previous[j]
+                        taken.add(j)
+                        break
+
+            box_tuple = tuple(int(v) for v in box)
+            if match is None:
+                tracks.append(RegionTrack(state.next_track_id, box_tuple, state.captures))
+                state.next_track_id += 1
+            else:
+                tracks.append(RegionTrack(match.track_id, box_tuple, match.first_capture,
+                                          match.hits + 1))
+
+        # Las regiones que no reaparecen dejan de seguirse
+        state.tracks = tracks
+        return [
+            {"track_id": track.track_id, "persistence": track.hits,
+             "first_capture": track.first_capture,
+             "persistent": track.hits >= self.min_persistence}
+            for track in tracks
+        ]
+
+    @staticmethod
+    def _iou_matrix(boxes: np.ndarray, others: np.ndarray) -> np.ndarray:
+        """IoU entre dos conjuntos de rectángulos (x, y, ancho, alto)."""
+        if len(boxes) == 0 or len(others) == 0:
+            return np.zeros((len(boxes), len(others)))
+        x0 = np.maximum(boxes[:, None, 0], others[None, :, 0])
+        y0 = np.maximum(boxes[:, None, 1], others[None, :, 1])
+        x1 = np.minimum(boxes[:, None, 0] + boxes[:, None, 2], others[None, :, 0] + others[None, :, 2])
+        y1 = np.minimum(boxes[:, None, 1] + boxes[:, None, 3], others[None, :, 1] + others[None, :, 3])
+        intersection = np.clip(x1 - x0, 0, None) * np.clip(y1 - y0, 0, None)
+        areas = boxes[:, 2] * boxes[:, 3]
+        other_areas = others[:, 2] * others[:, 3]
+        union = areas[:, None] + other_areas[None, :] - intersection
+        return np.where(union > 0, intersection / np.maximum(union, 1e-9), 0.0)
+
+    def reset(self, location_id: str) -> bool:
+        """
+        Descarta el fondo de una ubicación.
+
+        Args:
+            location_id: ID de la ubicación
+
+        Returns:
+            True si tenía fondo
+        """
+        with self._lock:
+            return self._locations.pop(location_id, None) is not None
+
+    def get_captures(self, location_id: str) -> int:
+        """Número de capturas incorporadas al fondo de una ubicación."""
+        with self._lock:
+            state = self._locations.get(location_id)
+            return state.captures if state else 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Obtiene las estadísticas del modelo.
+
+        Returns:
+            Diccionario con ubicaciones, regiones seguidas y parámetros
+        """
+        with self._lock:
+            return {
+                "locations": len(self._locations),
+                "max_locations": self.max_locations,
+                "tracked_regions": sum(len(s.tracks) for s in self._locations.values()),
+                "alpha": self.alpha
+            }
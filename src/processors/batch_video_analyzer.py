@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Análisis offline de vídeos grabados a máxima velocidad.
+Responsabilidad única: Repartir la decodificación y detección de un fichero entre procesos.
+"""
+
+import os
+import json
+import argparse
+import math
+import time
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Any, Optional, List, Callable
+
+import cv2
+import numpy as np
+
+from src.utils.helpers import get_results_directory
+from src.utils.config import setup_logging
+
+logger = logging.getLogger(__name__)
+
+FrameAnalyzer = Callable[[np.ndarray], Dict[str, Any]]
+
+# Analizador de frames de cada proceso worker (se crea una vez por proceso)
+_worker_analyzer: Optional[FrameAnalyzer] = None
+
+
+def create_yolo_frame_analyzer() -> FrameAnalyzer:
+    """
+    Crea el analizador de frames por defecto basado en YOLO.
+
+    Returns:
+        Función que recibe un frame BGR y devuelve sus detecciones
+    """
+    from src.models.yolo_detector import YoloObjectDetector
+    detector = YoloObjectDetector()
+    return detector.detect_frame
+
+
+def _init_worker(analyzer_factory: Callable[[], FrameAnalyzer]) -> None:
+    """Inicializa el analizador de frames del proceso worker."""
+    global _worker_analyzer
+    _worker_analyzer = analyzer_factory()
+
+
+@dataclass
+class VideoSegment:
+    """
+    Tramo de un vídeo asignado a un proceso worker.
+    Los frames se indexan desde 0 y ``end_frame`` es exclusivo (None = hasta el final).
+    """
+    video_path: str
+    start_frame: int
+    end_frame: Optional[int]
+    fps: float
+    sample_interval: float
+
+
+def analyze_segment(segment: VideoSegment) -> List[Dict[str, Any]]:
+    """
+    Decodifica un tramo del vídeo y analiza los frames muestreados.
+
+    El muestreo usa la marca de tiempo del vídeo (índice / fps), nunca el
+    reloj de pared, de modo que la rejilla de muestreo es la misma sea cual
+    sea el reparto en tramos. Los frames no muestreados solo se avanzan con
+    ``grab`` para no pagar su conversión de color.
+
+    Args:
+        segment: Tramo a procesar
+
+    Returns:
+        Lista de registros por frame muestreado, en orden
+    """
+    cap = cv2.VideoCapture(segment.video_path)
+    if not cap.isOpened():
+        raise IOError(f"No se pudo abrir el vídeo: {segment.video_path}")
+
+    try:
+        if segment.start_frame > 0:
+            cap.set(cv2.CAP_PROP_POS_FRAMES, segment.start_frame)
+        return _read_segment_frames(cap, segment)
+    finally:
+        cap.release()
+
+
+def _read_segment_frames(cap: cv2.VideoCapture, segment: VideoSegment) -> List[Dict[str, Any]]:
+    """Recorre los frames del tramo y analiza los que tocan según el muestreo."""
+    records = []
+    frame_index = segment.start_frame
+    next_sample = _first_sample_time(segment)
+
+    while segment.end_frame is None or frame_index < segment.end_frame:
+        video_time = frame_index / segment.fps
+        if video_time + 1e-9 < next_sample:
+            if not cap.grab():
+                break
+        else:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            records.append(_analyze_frame(segment, frame, frame_index, video_time))
+            next_sample = _next_sample_time(video_time, segment.sample_interval)
+        frame_index += 1
+    return records
+
+
+def _first_sample_time(segment: VideoSegment) -> float:
+    """
+    Primer instante de la rejilla de muestreo que corresponde al tramo.
+
+    Un instante de la rejilla pertenece al primer frame cuya marca de tiempo
+    lo alcanza, así que el tramo empieza por el primer instante posterior
+    al último frame del tramo anterior.
+    """
+    if segment.start_frame == 0:
+        return 0.0
+    previous_time = (segment.start_frame - 1) / segment.fps
+    return _next_sample_time(previous_time, segment.sample_interval)
+
+
+def _next_sample_time(video_time: float, sample_interval: float) -> float:
+    """Primer instante de la rejilla estrictamente posterior a ``video_time``."""
+    return (math.floor((video_time + 1e-9) / sample_interval) + 1) * sample_interval
+
+
+def _analyze_frame(segment: VideoSegment, frame: np.ndarray,
+                   frame_index: int, video_time: float) -> Dict[str, Any]:
+    """Analiza un frame y construye su registro de resultados."""
+    return {
+        "video": os.path.basename(segment.video_path),
+        "frame_index": frame_index,
+        "video_timestamp": round(video_time, 3),
+        "results": _worker_analyzer(frame)
+    }
+
+
+class BatchVideoAnalyzer:
+    """
+    Analizador de vídeos grabados en modo batch.
+
+    A diferencia de ``VideoProcessor`` no hay throttling por reloj de pared:
+    el fichero se divide en tramos que procesan en paralelo varios
+    procesos (cada uno con su propio decodificador y detector) y los
+    resultados se escriben en JSONL, en orden, a medida que terminan los
+    tramos.
+    """
+
+    def __init__(self, sample_interval: float = 1.0, max_workers: Optional[int] = None,
+                 segment_duration: float = 60.0,
+                 analyzer_factory: Callable[[], FrameAnalyzer] = create_yolo_frame_analyzer):
+        """
+        Inicializa el analizador batch.
+
+        Args:
+            sample_interval: Segundos de vídeo entre frames analizados
+            max_workers: Procesos worker (por defecto, uno por CPU)
+            segment_duration: Segundos de vídeo por tramo de trabajo
+            analyzer_factory: Función serializable que crea el analizador de frames
+        """
+        if sample_interval <= 0 or segment_duration <= 0:
+            raise ValueError("El intervalo de muestreo y la duración de tramo deben ser positivos")
+
+        self.sample_interval = sample_interval
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.segment_duration = segment_duration
+        self.analyzer_factory = analyzer_factory
+
+    def analyze_file(self, video_path: str, output_path: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Analiza un fichero de vídeo completo.
+
+        Args:
+            video_path: Ruta del vídeo grabado
+            output_path: Ruta del JSONL de salida (por defecto, en results/)
+
+        Returns:
+            Resumen con frames analizados, tiempos y ruta de salida
+        """
+        fps, frame_count = self._read_video_info(video_path)
+        output_path = output_path or self._default_output_path(video_path)
+        segments = self._build_segments(video_path, fps, frame_count)
+        logger.info(f"Análisis batch de {video_path}: {len(segments)} tramos, "
+                    f"{self.max_workers} procesos")
+
+        start = time.perf_counter()
+        written, errors = self._run_segments(segments, output_path)
+        elapsed = time.perf_counter() - start
+
+        duration = frame_count / fps if frame_count > 0 else None
+        return {
+            "video": video_path,
+            "output_path": output_path,
+            "frames_analyzed": written,
+            "segments": len(segments),
+            "segment_errors": errors,
+            "video_duration": duration,
+            "processing_time": round(elapsed, 3),
+            "speedup": round(duration / elapsed, 2) if duration and elapsed > 0 else None
+        }
+
+    def _read_video_info(self, video_path: str) -> tuple:
+        """Obtiene fps y número de frames del vídeo."""
+        cap = cv2.VideoCapture(video_path)
+        if not cap.isOpened():
+            raise IOError(f"No se pudo abrir el vídeo: {video_path}")
+        fps = cap.get(cv2.CAP_PROP_FPS) or 0.0
+        frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT) or 0)
+        cap.release()
+
+        if fps <= 0:
+            logger.warning(f"FPS desconocidos en {video_path}, se asumen 30")
+            fps = 30.0
+        return fps, frame_count
+
+    def _build_segments(self, video_path: str, fps: float, frame_count: int) -> List[VideoSegment]:
+        """Divide el vídeo en tramos de duración fija."""
+        if frame_count <= 0:
+            # Sin número de frames fiable no se puede repartir: un único tramo
+            return [VideoSegment(video_path, 0, None, fps, self.sample_interval)]
+
+        frames_per_segment = max(1, int(round(self.segment_duration * fps)))
+        return [
+            VideoSegment(video_path, start, min(start + frames_per_segment, frame_count),
+                         fps, self.sample_interval)
+            for start in range(0, frame_count, frames_per_segment)
+        ]
+
+    def _run_segments(self, segments: List[VideoSegment], output_path: str) -> tuple:
+        """Procesa los tramos en el pool y escribe sus resultados en orden."""
+        written, errors = 0, 0
+        with ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_worker,
+                                 initargs=(self.analyzer_factory,)) as executor, \
+                open(output_path, "w", encoding="utf-8") as output:
+            futures = [executor.submit(analyze_segment, segment) for segment in segments]
+            for segment, future in zip(segments, futures):
+                try:
+                    records = future.result()
+                except Exception as e:
+                    errors += 1
+                    logger.error(f"Error en tramo desde frame {segment.start_frame}: {str(e)}")
+                    continue
+                written += self._write_records(output, records)
+        return written, errors
+
+    @staticmethod
+    def _write_records(output, records: List[Dict[str, Any]]) -> int:
+        """Escribe registros en JSONL y los vuelca a disco."""
+        for record in records:
+            output.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+        output.flush()
+        return len(records)
+
+    @staticmethod
+    def _default_output_path(video_path: str) -> str:
+        """Ruta JSONL por defecto en el directorio de resultados."""
+        stem = os.path.splitext(os.path.basename(video_path))[0]
+        return os.path.join(get_results_directory(), f"{stem}_analysis.jsonl")
+
+
+def main(argv: Optional[List[str]] = None,
+         analyzer_factory: Callable[[], FrameAnalyzer] = create_yolo_frame_analyzer) -> int:
+    """
+    Punto de entrada de línea de comandos (``src/analyze_video.py``):
+    analiza un vídeo grabado con YOLO.
+
+    Args:
+        argv: Argumentos (por defecto, los de ``sys.argv``)
+        analyzer_factory: Función serializable que crea el analizador de frames
+
+    Returns:
+        Código de salida (0 si todos los tramos se analizaron)
+    """
+    parser = argparse.ArgumentParser(description="Análisis batch de un vídeo grabado con YOLO")
+    parser.add_argument("video", help="Ruta del vídeo grabado")
+    parser.add_argument("--output", help="JSONL de salida (por defecto, en results/)")
+    parser.add_argument("--interval", type=float, default=1.0,
+                        help="Segundos de vídeo entre frames analizados")
+    parser.add_argument("--workers", type=int, help="Procesos worker (por defecto, uno por CPU)")
+    parser.add_argument("--segment-duration", type=float, default=60.0,
+                        help="Segundos de vídeo por tramo de trabajo")
+    args = parser.parse_args(argv)
+
+    setup_logging()
+    try:
+        analyzer = BatchVideoAnalyzer(sample_interval=args.interval, max_workers=args.workers,
+                                      segment_duration=args.segment_duration,
+                                      analyzer_factory=analyzer_factory)
+        summary = analyzer.analyze_file(args.video, args.output)
+    except (IOError, ValueError) as e:
+        logger.error(f"Error en el análisis batch: {str(e)}")
+        return 1
+
+    print(json.dumps(summary, ensure_ascii=False, indent=2))
+    return 1 if summary["segment_errors"] else 0
@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Backends de captura de video configurables.
+Responsabilidad única: Abrir fuentes de video con los ajustes de decodificación adecuados.
+"""
+
+import os
+import cv2
+import threading
+import time
+import logging
+from typing import Dict, Any, Optional, List, Tuple, Type
+
+logger = logging.getLogger(__name__)
+
+# OpenCV lee las opciones de FFmpeg de una variable de entorno global del proceso
+_FFMPEG_OPTIONS_ENV = "OPENCV_FFMPEG_CAPTURE_OPTIONS"
+_ffmpeg_options_lock = threading.Lock()
+
+
+class CaptureBackend:
+    """
+    Interfaz común de los backends de captura.
+
+    ``open`` devuelve un objeto compatible con ``cv2.VideoCapture``
+    (``isOpened``, ``read``, ``release``); el procesador de video
+    comprueba si se abrió correctamente.
+    """
+
+    name = "base"
+
+    def open(self, source: str) -> Any:
+        """
+        Abre una fuente de video.
+
+        Args:
+            source: URL del stream o ruta del fichero
+
+        Returns:
+            Objeto de captura compatible con ``cv2.VideoCapture``
+        """
+        raise NotImplementedError
+
+    def describe(self) -> Dict[str, Any]:
+        """Obtiene la configuración del backend para estadísticas y logs."""
+        return {"backend": self.name}
+
+
+class OpenCVCaptureBackend(CaptureBackend):
+    """Captura con la configuración por defecto de OpenCV."""
+
+    name = "opencv"
+
+    def open(self, source: str) -> cv2.VideoCapture:
+        """Abre la fuente con ``cv2.VideoCapture`` sin ajustes adicionales."""
+        return cv2.VideoCapture(source)
+
+
+class FFmpegCaptureBackend(CaptureBackend):
+    """
+    Captura con FFmpeg ajustado para baja latencia.
+
+    Permite fijar el número de threads del decodificador, los flags de
+    baja latencia y, si el equipo la tiene, la aceleración por hardware.
+    El buffering se controla con los flags de FFmpeg (``fflags;nobuffer``,
+    ``flags;low_delay``): ``CAP_PROP_BUFFERSIZE`` no tiene efecto en
+    ``CAP_FFMPEG``, así que no se ofrece como ajuste.
+    """
+
+    name = "ffmpeg"
+
+    def __init__(self, decoder_threads: int = 0, low_latency: bool = True, hw_acceleration: bool = False,
+                 rtsp_transport: str = "tcp"):
+        """
+        Inicializa el backend FFmpeg.
+
+        Args:
+            decoder_threads: Threads del decodificador (0 = automático)
+            low_latency: Desactivar el buffering de entrada de FFmpeg
+            hw_acceleration: Solicitar decodificación por hardware si existe
+            rtsp_transport: Transporte para fuentes RTSP (tcp o udp)
+        """
+        self.decoder_threads = decoder_threads
+        self.low_latency = low_latency
+        self.hw_acceleration = hw_acceleration
+        self.rtsp_transport = rtsp_transport
+
+    def open(self, source: str) -> cv2.VideoCapture:
+        """Abre la fuente con FFmpeg aplicando las opciones configuradas."""
+        with _ffmpeg_options_lock:
+            previous = os.environ.get(_FFMPEG_OPTIONS_ENV)
+            os.environ[_FFMPEG_OPTIONS_ENV] = self.build_ffmpeg_options(source)
+            try:
+                cap = cv2.VideoCapture(source, cv2.CAP_FFMPEG, self.build_open_params())
+            finally:
+                self._restore_options(previous)
+        return cap
+
+    def build_ffmpeg_options(self, source: str) -> str:
+        """
+        Construye las opciones de FFmpeg en el formato de OpenCV.
+
+        Args:
+            source: Fuente que se va a abrir
+
+        Returns:
+            Cadena ``clave;valor|clave;valor``
+        """
+        options: List[Tuple[str, str]] = []
+        if self.low_latency:
+            options += [("fflags", "nobuffer"), ("flags", "low_delay")]
+        if str(source).startswith("rtsp://"):
+            options.append(("rtsp_transport", self.rtsp_transport))
+        return "|".join(f"{key};{value}" for key, value in options)
+
+    def build_open_params(self) -> List[int]:
+        """Construye los parámetros de apertura de ``cv2.VideoCapture``."""
+        params = []
+        if self.decoder_threads > 0:
+            params += [cv2.CAP_PROP_N_THREADS, self.decoder_threads]
+        if self.hw_acceleration:
+            params += [cv2.CAP_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_ANY]
+        return params
+
+    @staticmethod
+    def _restore_options(previous: Optional[str]) -> None:
+        """Restaura la variable de entorno de opciones de FFmpeg."""
+        if previous is None:
+            os.environ.pop(_FFMPEG_OPTIONS_ENV, None)
+        else:
+            os.environ[_FFMPEG_OPTIONS_ENV] = previous
+
+    def describe(self) -> Dict[str, Any]:
+        """Obtiene la configuración del backend FFmpeg."""
+        return {
+            "backend": self.name,
+            "decoder_threads": self.decoder_threads,
+            "low_latency": self.low_latency,
+            "hw_acceleration": self.hw_acceleration
+        }
+
+
+class FileReplayCapture:
+    """
+    Captura de un fichero grabado que se reproduce como un stream.
+
+    Con ``realtime`` entrega los frames al ritmo del fichero y con
+    ``loop`` vuelve al principio al llegar al final.
+    """
+
+    def __init__(self, cap: cv2.VideoCapture, realtime: bool = True, loop: bool = False):
+        """
+        Inicializa la reproducción.
+
+        Args:
+            cap: Captura abierta sobre el fichero
+            realtime: Respetar los fps del fichero
+            loop: Reiniciar la reproducción al terminar
+        """
+        self._cap = cap
+        self.realtime = realtime
+        self.loop = loop
+        fps = cap.get(cv2.CAP_PROP_FPS) if cap.isOpened() else 0
+        self._frame_period = 1.0 / fps if fps and fps > 0 else 0.0
+        self._next_frame_time = 0.0
+
+    def isOpened(self) -> bool:
+        """Indica si el fichero está abierto."""
+        return self._cap.isOpened()
+
+    def read(self) -> Tuple[bool, Any]:
+        """Lee el siguiente frame, esperando a su instante si es en tiempo real."""
+        self._wait_for_next_frame()
+        ret, frame = self._cap.read()
+        if not ret and self.loop:
+            self._cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ret, frame = self._cap.read()
+        return ret, frame
+
+    def _wait_for_next_frame(self) -> None:
+        """Duerme hasta el instante del siguiente frame del fichero."""
+        if not self.realtime or self._frame_period <= 0:
+            return
+        now = time.monotonic()
+        if self._next_frame_time > now:
+            time.sleep(self._next_frame_time - now)
+        self._next_frame_time = max(self._next_frame_time, now) + self._frame_period
+
+    def get(self, prop_id: int) -> float:
+        """Obtiene una propiedad de la captura subyacente."""
+        return self._cap.get(prop_id)
+
+    def set(self, prop_id: int, value: float) -> bool:
+        """Modifica una propiedad de la captura subyacente."""
+        return self._cap.set(prop_id, value)
+
+    def release(self) -> None:
+        """Libera el fichero."""
+        self._cap.release()
+
+
+class FileReplayBackend(CaptureBackend):
+    """Backend para reproducir MP4 grabados como si fueran un stream."""
+
+    name = "file"
+
+    def __init__(self, realtime: bool = True, loop: bool = False, decoder_threads: int = 0):
+        """
+        Inicializa el backend de reproducción de ficheros.
+
+        Args:
+            realtime: Entregar los frames al ritmo original del fichero
+            loop: Reiniciar la reproducción al terminar
+            decoder_threads: Threads del decodificador (0 = automático)
+        """
+        self.realtime = realtime
+        self.loop = loop
+        self.decoder_threads = decoder_threads
+
+    def open(self, source: str) -> FileReplayCapture:
+        """Abre un fichero de video local para su reproducción."""
+        if not os.path.isfile(source):
+            logger.error(f"Fichero de video no encontrado: {source}")
+        params = [cv2.CAP_PROP_N_THREADS, self.decoder_threads] if self.decoder_threads > 0 else []
+        cap = cv2.VideoCapture(source, cv2.CAP_ANY, params)
+        return FileReplayCapture(cap, realtime=self.realtime, loop=self.loop)
+
+    def describe(self) -> Dict[str, Any]:
+        """Obtiene la configuración del backend de ficheros."""
+        return {
+            "backend": self.name,
+            "realtime": self.realtime,
+            "loop": self.loop,
+            "decoder_threads": self.decoder_threads
+        }
+
+
+CAPTURE_BACKENDS: Dict[str, Type[CaptureBackend]] = {
+    OpenCVCaptureBackend.name: OpenCVCaptureBackend,
+    FFmpegCaptureBackend.name: FFmpegCaptureBackend,
+    FileReplayBackend.name: FileReplayBackend
+}
+
+
+def create_capture_backend(name: str = "opencv", **options) -> CaptureBackend:
+    """
+    Crea un backend de captura por nombre.
+
+    Args:
+        name: Nombre del backend (opencv, ffmpeg o file)
+        **options: Opciones propias del backend
+
+    Returns:
+        Instancia del backend
+
+    Raises:
+        ValueError: Si el backend no existe
+    """
+    backend_class = CAPTURE_BACKENDS.get(name.lower())
+    if backend_class is None:
+        raise ValueError(f"Backend de captura desconocido: {name}")
+    return backend_class(**options)
@@ -4,25 +4,83 @@
 Detector de cambios entre imágenes de la misma zona geográfica.
 """
 
+import os
+import math
+import base64
 import cv2
+import time
+import uuid
+import threading
 import numpy as np
 import logging
-from typing import Dict, Any, List, Tuple, Optional
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Tuple, Optional, Union
+
+from src.processors.tiled_differencer import TiledDifferencer
+from src.processors.reference_store import ReferenceImageStore
+from src.processors.reference_index import ReferenceSpatialIndex, METERS_PER_DEGREE
+from src.processors.image_aligner import ImageAligner
+from src.processors.change_visualization import ChangeVisualization
+from src.processors.background_model import BackgroundModel
+from src.processors.preprocessing_cache import PreprocessingCache, PreprocessedImage
 
 logger = logging.getLogger(__name__)
 
 class ChangeDetector:
     """Detector de cambios entre imágenes de la misma zona geográfica."""
     
-    def __init__(self, sensitivity: float = 0.2):
+    def __init__(self, sensitivity: float = 0.2, tiling_min_pixels: Optional[int] = 12_000_000,
+                 tile_size: int = 1024, max_workers: Optional[int] = None,
+                 reference_directory: Optional[str] = None, reference_cache_size: int = 32,
+                 match_radius_m: float = 50.0, alignment: bool = True,
+                 visualization_cache_size: int = 8, camera_fov_deg: float = 84.0,
+                 background_alpha: float = 0.05,
+                 preprocessing_cache_bytes: int = 256 * 1024 * 1024,
+                 visualization_cache_bytes: int = 64 * 1024 * 1024,
+                 visualization_max_width: Optional[int] = 1920):
         """
         Inicializa el detector de cambios.
         
         Args:
             sensitivity: Sensibilidad de detección (0.0-1.0)
+            tiling_min_pixels: Píxeles a partir de los que se usa el modo por teselas
+                (None = siempre a resolución completa)
+            tile_size: Lado de las teselas del modo por teselas
+            max_workers: Threads para procesar teselas (por defecto, uno por CPU)
+            reference_directory: Directorio donde persistir las referencias (None = solo memoria)
+            reference_cache_size: Referencias abiertas que se mantienen en memoria
+            match_radius_m: Distancia máxima para asociar una captura a una referencia
+            alignment: Alinear cada captura con su referencia antes de diferenciar
+            visualization_cache_size: Visualizaciones recientes que se pueden renderizar por ID
+            camera_fov_deg: Campo de visión horizontal de la cámara, para georreferenciar regiones
+            background_alpha: Peso de cada captura en el fondo del modo incremental
+            preprocessing_cache_bytes: Memoria de la caché de imágenes decodificadas (0 = sin caché)
+            visualization_cache_bytes: Memoria máxima de las visualizaciones pendientes
+                (siempre se conserva la más reciente)
+            visualization_max_width: Ancho al que se reducen las capturas pendientes de
+                renderizar (None = resolución completa)
         """
         self.sensitivity = sensitivity
-        self.reference_images = {}  # Diccionario de imágenes de referencia por coordenadas
+        # Referencias por ubicación, mapeadas desde disco si hay directorio
+        self.reference_images = ReferenceImageStore(reference_directory, reference_cache_size)
+        self.match_radius_m = match_radius_m
+        self.reference_index = ReferenceSpatialIndex()
+        self._index_stored_references()
+        self.tiling_min_pixels = tiling_min_pixels
+        self.tiled_differencer = TiledDifferencer(tile_size=tile_size, max_workers=max_workers)
+        self.aligner = ImageAligner() if alignment else None
+        self.camera_fov_deg = camera_fov_deg
+        # Fondo incremental por ubicación para ``track_changes``
+        self.background_model = BackgroundModel(alpha=background_alpha)
+        # Imágenes decodificadas por hash de contenido: una captura contra varias referencias
+        self.preprocessing_cache = PreprocessingCache(preprocessing_cache_bytes)
+        # Manejadores de las últimas detecciones, renderizables por ID
+        self.visualization_cache_size = visualization_cache_size
+        self.visualization_cache_bytes = visualization_cache_bytes
+        self.visualization_max_width = visualization_max_width
+        self._visualizations: "OrderedDict[str, ChangeVisualization]" = OrderedDict()
+        self._visualizations_lock = threading.Lock()
         logger.info(f"Detector de cambios inicializado (sensibilidad: {sensitivity})")
     
     def add_reference_image(self, image_data: bytes, coordinates: Dict[str, float], 
@@ -56,22 +114,59 @@ class ChangeDetector:
             logger.error(f"Error al añadir imagen de referencia: {str(e)}")
             return ""
     
+    def _index_stored_references(self) -> None:
+        """Indexa por coordenadas las referencias recuperadas del disco."""
+        for location_id in self.reference_images:
+            fields = self.reference_images.get_fields(location_id) or {}
+            coordinates = fields.get("coordinates")
+            if coordinates:
+                self.reference_index.insert(
+                    location_id, coordinates["latitude"], coordinates["longitude"]
+                )
+    
+    def find_references(self, coordinates: Dict[str, float], radius_m: Optional[float] = None,
+                        max_results: Optional[int] = 1) -> List[Dict[str, Any]]:
+        """
+        Busca las referencias más cercanas a unas coordenadas.
+        
+        Args:
+            coordinates: Coordenadas de la captura (latitud, longitud)
+            radius_m: Distancia máxima en metros (por defecto, ``match_radius_m``)
+            max_results: Número máximo de referencias (None = todas las del radio)
+            
+        Returns:
+            Lista de referencias con su ID y distancia, de la más cercana a la más lejana
+        """
+        radius = self.match_radius_m if radius_m is None else radius_m
+        matches = self.reference_index.nearest(
+            coordinates["latitude"], coordinates["longitude"], radius, max_results
+        )
+        return [{"location_id": location_id, "distance_m": round(distance, 2)}
+                for location_id, distance in matches]
+    
     def _generate_location_id(self, coordinates: Dict[str, float]) -> str:
         """Genera un ID único para la ubicación."""
         return f"{coordinates['latitude']:.5f}_{coordinates['longitude']:.5f}"
     
+    def _preprocess_image(self, image_data: bytes) -> PreprocessedImage:
+        """
+        Decodifica una imagen y la pasa a grises, reutilizando la caché por contenido.
+        
+        Raises:
+            ValueError: Si los bytes no son una imagen válida
+        """
+        preprocessed = self.preprocessing_cache.get(image_data)
+        if preprocessed is None:
+            raise ValueError("No se pudo decodificar la imagen")
+        return preprocessed
+    
     def _process_reference_image(self, image_data: bytes) -> Optional[Dict[str, np.ndarray]]:
         """Procesa la imagen de referencia."""
         try:
-            # Decodificar imagen
-            nparr = np.frombuffer(image_data, np.uint8)
-            image = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
-            
-            # Convertir a escala de grises y aplicar blur para reducir ruido
-            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-            blur = cv2.GaussianBlur(gray, (21, 21), 0)
-            
-            return {"original": image, "processed": blur}
+            # Escala de grises y blur para reducir ruido (de la caché si ya se vio)
+            preprocessed = self._preprocess_image(image_data)
+            return {"original": preprocessed.original, "gray": preprocessed.gray,
+                    "processed": preprocessed.blur()}
         except Exception as e:
             logger.error(f"Error al procesar imagen de referencia: {str(e)}")
             return None
@@ -79,81 +174,372 @@ class ChangeDetector:
     def _store_reference_image(self, location_id: str, processed_image: Dict[str, np.ndarray], 
                              coordinates: Dict[str, float], metadata: Dict[str, Any]) -> None:
         """Almacena la imagen de referencia procesada."""
-        self.reference_images[location_id] = {
+        reference = {
             "image": processed_image["processed"],
             "original": processed_image["original"],
             "metadata": metadata,
             "coordinates": coordinates
         }
+        # Características de alineación calculadas una vez por referencia
+        if self.aligner is not None:
+            gray = processed_image.get("gray")
+            if gray is None:
+                gray = cv2.cvtColor(processed_image["original"], cv2.COLOR_BGR2GRAY)
+            features = self.aligner.extract_features(gray)
+            if features is not None:
+                reference.update(features)
+        
+        self.reference_images[location_id] = reference
+        self.reference_index.insert(location_id, coordinates["latitude"], coordinates["longitude"])
+        # Una referencia nueva invalida el fondo acumulado de la anterior
+        self.background_model.reset(location_id)
     
-    def detect_changes(self, image_data: bytes, location_id: str) -> Dict[str, Any]:
+    def detect_changes(self, image_data: bytes, location_id: Optional[str] = None,
+                       coordinates: Optional[Dict[str, float]] = None,
+                       include_visualization: bool = False) -> Dict[str, Any]:
         """
         Detecta cambios entre la imagen actual y la de referencia.
         
+        La imagen con los cambios marcados no se genera por defecto: el
+        resultado lleva un manejador ``visualization`` y un ``detection_id``
+        con los que renderizarla después (``render_visualization``).
+        
         Args:
             image_data: Datos de la imagen actual en bytes
             location_id: ID de la ubicación de referencia
+            coordinates: Coordenadas de la captura para buscar la referencia
+                más cercana cuando no se indica ``location_id``
+            include_visualization: Codificar ya la imagen en ``changes_image``
             
         Returns:
             Diccionario con los resultados de la detección
         """
         try:
-            # Validar referencia
-            if not self._validate_reference(location_id):
-                return {"error": "Ubicación de referencia no encontrada"}
+            # Resolver la referencia por coordenadas (telemetría sin redondear)
+            location = coordinates if location_id is None and coordinates is not None else location_id
+            location_id, reference_distance, error = self._resolve_location(location)
+            if error:
+                return {"error": error}
+            
+            reference = self.reference_images[location_id]
+            result = self._compare_with_reference(
+                image_data, location_id, reference, reference_distance, include_visualization
+            )
+            if "visualization" in result:
+                result["detection_id"] = self._remember_visualization(result["visualization"])
+            return result
+            
+        except Exception as e:
+            logger.error(f"Error en detección de cambios: {str(e)}")
+            return {"error": str(e)}
+    
+    def track_changes(self, image_data: bytes, location_id: Optional[str] = None,
+                      coordinates: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+        """
+        Detecta cambios de forma incremental frente al fondo de la ubicación.
+        
+        En lugar de la referencia estática, la captura se compara con una
+        media móvil de las capturas anteriores (inicializada con la
+        referencia) que esta misma captura actualiza después. Cada región
+        indica en cuántas capturas consecutivas ha persistido.
+        
+        Args:
+            image_data: Datos de la imagen actual en bytes
+            location_id: ID de la ubicación de referencia
+            coordinates: Coordenadas de la captura para buscar la referencia
+                más cercana cuando no se indica ``location_id``
+            
+        Returns:
+            Diccionario con los resultados de la detección y la persistencia
+        """
+        try:
+            location = coordinates if location_id is None and coordinates is not None else location_id
+            location_id, reference_distance, error = self._resolve_location(location)
+            if error:
+                return {"error": error}
+            
+            reference = self.reference_images[location_id]
+            current_image_data = self._process_current_image(image_data)
+            if current_image_data is None:
+                return {"error": "Error al procesar imagen actual", "location_id": location_id}
+            current_image_data = self._align_to_reference(location_id, reference, current_image_data)
+            
+            # Diferenciar contra el fondo acumulado y no contra la referencia
+            blur = self._current_blur(current_image_data)
+            background = self.background_model.get_background(location_id, reference["image"])
+            difference_data = self._difference_full_resolution(background, blur)
+            self._mask_unaligned_border(difference_data, current_image_data.get("valid_mask"))
+            
+            region_data = self._analyze_regions(difference_data, current_image_data["original"])
+            metrics = self._calculate_change_metrics(difference_data, region_data)
+            tracks = self.background_model.update(location_id, blur, region_data["boxes"],
+                                                  current_image_data.get("valid_mask"))
+            
+            visualization = self._create_changes_visualization(
+                current_image_data["original"], region_data["boxes"]
+            )
+            result = self._build_detection_result(location_id, metrics, None, region_data, reference)
+            for region, track in zip(result["regions"], tracks):
+                region.update(track)
+            result.update({
+                "persistent_regions": sum(1 for track in tracks if track["persistent"]),
+                "captures": self.background_model.get_captures(location_id),
+                "visualization": visualization,
+                "detection_id": self._remember_visualization(visualization)
+            })
+            if reference_distance is not None:
+                result["reference_distance_m"] = reference_distance
+            if "alignment" in current_image_data:
+                result["alignment"] = current_image_data["alignment"]
+            return result
+            
+        except Exception as e:
+            logger.error(f"Error en seguimiento de cambios: {str(e)}")
+            return {"error": str(e)}
+    
+    def detect_changes_batch(self, captures: List[Tuple[bytes, Union[str, Dict[str, float]]]],
+                             include_visualization: bool = False,
+                             max_workers: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Compara muchas capturas contra sus referencias en una sola llamada.
+        
+        Las capturas se agrupan por referencia para abrir cada una una sola
+        vez; la decodificación y la comparación de cada captura se reparten
+        en un pool de threads (OpenCV libera el GIL).
+        
+        Args:
+            captures: Lista de pares (imagen en bytes, location_id o coordenadas)
+            include_visualization: Incluir la imagen con los cambios marcados
+                (JPEG en base64) en cada fila
+            max_workers: Threads del pool (por defecto, uno por CPU)
             
+        Returns:
+            Diccionario con una fila compacta por captura (en el orden de
+            entrada) y un resumen del lote
+        """
+        started = time.perf_counter()
+        rows: List[Optional[Dict[str, Any]]] = [None] * len(captures)
+        groups = self._group_captures_by_reference(captures, rows)
+        
+        with ThreadPoolExecutor(max_workers=max_workers or os.cpu_count() or 1) as executor:
+            futures = []
+            for location_id, members in groups.items():
+                reference = self.reference_images[location_id]
+                for index, distance in members:
+                    futures.append((index, executor.submit(
+                        self._compare_with_reference, captures[index][0], location_id,
+                        reference, distance, include_visualization
+                    )))
+            for index, future in futures:
+                rows[index] = self._summarize_result(index, future.result())
+        
+        return {
+            "results": rows,
+            "summary": self._summarize_batch(rows, len(groups), time.perf_counter() - started)
+        }
+    
+    def _group_captures_by_reference(self, captures: List[Tuple[bytes, Any]],
+                                     rows: List[Optional[Dict[str, Any]]]
+                                     ) -> Dict[str, List[Tuple[int, Optional[float]]]]:
+        """Agrupa las capturas por referencia y anota en ``rows`` las que no tienen."""
+        groups: Dict[str, List[Tuple[int, Optional[float]]]] = {}
+        for index, (_, location) in enumerate(captures):
+            location_id, distance, error = self._resolve_location(location)
+            if error:
+                rows[index] = self._summarize_result(index, {"error": error, "location_id": location_id})
+                continue
+            groups.setdefault(location_id, []).append((index, distance))
+        return groups
+    
+    def _resolve_location(self, location: Union[str, Dict[str, float], None]
+                          ) -> Tuple[Optional[str], Optional[float], Optional[str]]:
+        """
+        Resuelve un ID de ubicación o unas coordenadas a una referencia existente.
+        
+        Returns:
+            Tupla (location_id, distancia a la referencia o None, error o None)
+        """
+        distance = None
+        if isinstance(location, dict):
+            matches = self.find_references(location)
+            if not matches:
+                return None, None, "No hay referencias dentro del radio de búsqueda"
+            location, distance = matches[0]["location_id"], matches[0]["distance_m"]
+        
+        # Validar referencia
+        if not self._validate_reference(location):
+            return location, None, "Ubicación de referencia no encontrada"
+        return location, distance, None
+    
+    def _compare_with_reference(self, image_data: bytes, location_id: str,
+                                reference: Dict[str, Any], reference_distance: Optional[float],
+                                include_visualization: bool) -> Dict[str, Any]:
+        """Ejecuta la comparación completa de una captura con una referencia ya abierta."""
+        try:
             # Procesar imagen actual
             current_image_data = self._process_current_image(image_data)
             if current_image_data is None:
-                return {"error": "Error al procesar imagen actual"}
+                return {"error": "Error al procesar imagen actual", "location_id": location_id}
+            
+            # Alinear con la referencia para que la deriva del dron no cuente como cambio
+            current_image_data = self._align_to_reference(location_id, reference, current_image_data)
             
             # Detectar diferencias
-            difference_data = self._calculate_differences(location_id, current_image_data)
+            difference_data = self._calculate_differences(location_id, reference, current_image_data)
             
-            # Analizar contornos
-            contour_data = self._analyze_contours(difference_data, current_image_data["original"])
+            # Analizar regiones de cambio
+            region_data = self._analyze_regions(difference_data, current_image_data["original"])
             
             # Calcular métricas
-            metrics = self._calculate_change_metrics(difference_data, contour_data)
+            metrics = self._calculate_change_metrics(difference_data, region_data)
             
-            # Crear imagen con cambios marcados
-            changes_image_bytes = self._create_changes_visualization(
-                current_image_data["original"], contour_data["significant_contours"]
+            # Imagen con cambios marcados: solo se dibuja y codifica si se pide
+            visualization = self._create_changes_visualization(
+                current_image_data["original"], region_data["boxes"]
             )
+            changes_image_bytes = visualization.encode() if include_visualization else None
             
             # Construir resultado
-            return self._build_detection_result(location_id, metrics, changes_image_bytes, contour_data)
+            result = self._build_detection_result(location_id, metrics, changes_image_bytes,
+                                                  region_data, reference)
+            result["visualization"] = visualization
+            if reference_distance is not None:
+                result["reference_distance_m"] = reference_distance
+            if "alignment" in current_image_data:
+                result["alignment"] = current_image_data["alignment"]
+            return result
             
         except Exception as e:
             logger.error(f"Error en detección de cambios: {str(e)}")
-            return {"error": str(e)}
+            return {"error": str(e), "location_id": location_id}
+    
+    @staticmethod
+    def _summarize_result(index: int, result: Dict[str, Any]) -> Dict[str, Any]:
+        """Reduce un resultado de detección a una fila de la tabla del lote."""
+        # Tipos nativos (y la imagen en base64) para que la tabla sea serializable a JSON
+        has_changes = result.get("has_changes")
+        row = {
+            "index": index,
+            "location_id": result.get("location_id"),
+            "has_changes": None if has_changes is None else bool(has_changes),
+            "change_percentage": (round(float(result["change_percentage"]), 2)
+                                  if "change_percentage" in result else None),
+            "significant_areas": result.get("significant_areas"),
+            "aligned": result.get("alignment", {}).get("aligned"),
+            "error": result.get("error")
+        }
+        if result.get("changes_image") is not None:
+            row["changes_image"] = base64.b64encode(result["changes_image"]).decode("ascii")
+        return row
+    
+    @staticmethod
+    def _summarize_batch(rows: List[Dict[str, Any]], references_used: int,
+                         elapsed: float) -> Dict[str, Any]:
+        """Calcula el resumen agregado de un lote."""
+        return {
+            "total_captures": len(rows),
+            "with_changes": sum(1 for row in rows if row["has_changes"]),
+            "errors": sum(1 for row in rows if row["error"]),
+            "references_used": references_used,
+            "processing_time": round(elapsed, 3)
+        }
     
     def _validate_reference(self, location_id: str) -> bool:
         """Valida que existe la imagen de referencia."""
         return location_id in self.reference_images
     
-    def _process_current_image(self, image_data: bytes) -> Optional[Dict[str, np.ndarray]]:
+    def _process_current_image(self, image_data: bytes) -> Optional[Dict[str, Any]]:
         """Procesa la imagen actual para comparación."""
         try:
-            # Decodificar imagen actual
-            nparr = np.frombuffer(image_data, np.uint8)
-            current_image = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
-            
-            # Convertir a escala de grises y aplicar blur
-            gray = cv2.cvtColor(current_image, cv2.COLOR_BGR2GRAY)
-            blur = cv2.GaussianBlur(gray, (21, 21), 0)
-            
-            return {"original": current_image, "processed": blur}
+            # El blur se aplica tras la alineación; la entrada de caché lo
+            # conserva mientras la captura no haya que deformarla
+            preprocessed = self._preprocess_image(image_data)
+            return {"original": preprocessed.original, "gray": preprocessed.gray,
+                    "preprocessed": preprocessed}
         except Exception as e:
             logger.error(f"Error al procesar imagen actual: {str(e)}")
             return None
     
-    def _calculate_differences(self, location_id: str, current_image_data: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    @staticmethod
+    def _current_blur(current_image_data: Dict[str, Any]) -> np.ndarray:
+        """Captura suavizada, de la caché si la captura no se ha deformado."""
+        preprocessed = current_image_data.get("preprocessed")
+        if preprocessed is not None:
+            return preprocessed.blur()
+        return cv2.GaussianBlur(current_image_data["gray"], (21, 21), 0)
+    
+    def _current_coarse(self, current_image_data: Dict[str, Any]) -> Optional[np.ndarray]:
+        """Nivel grueso de la captura para el modo por teselas, si se puede cachear."""
+        preprocessed = current_image_data.get("preprocessed")
+        if preprocessed is None:
+            return None
+        return preprocessed.derive(
+            "coarse", lambda: self.tiled_differencer.build_coarse(preprocessed.gray)
+        )
+    
+    def _align_to_reference(self, location_id: str, reference: Dict[str, Any],
+                            current_image_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Deforma la captura al encuadre de la referencia si se puede estimar la homografía."""
+        if self.aligner is None:
+            return current_image_data
+        
+        aligned = self.aligner.align(
+            self._get_reference_features(location_id, reference), reference["image"].shape,
+            current_image_data["original"], current_image_data["gray"]
+        )
+        # Los derivados en caché solo valen si la captura no se ha deformado
+        unwarped = aligned["gray"] is current_image_data["gray"]
+        return {
+            "original": aligned["original"],
+            "gray": aligned["gray"],
+            "valid_mask": aligned["valid_mask"],
+            "preprocessed": current_image_data.get("preprocessed") if unwarped else None,
+            "alignment": {"aligned": aligned["aligned"], "inliers": aligned["inliers"]}
+        }
+    
+    def _get_reference_features(self, location_id: str,
+                                reference: Dict[str, Any]) -> Optional[Dict[str, np.ndarray]]:
+        """Obtiene las características ORB de la referencia, calculándolas si faltan."""
+        if reference.get("descriptors") is not None:
+            return {"keypoints": reference["keypoints"], "descriptors": reference["descriptors"]}
+        
+        # Referencias anteriores a la alineación: calcular y guardar una vez
+        gray = cv2.cvtColor(reference["original"], cv2.COLOR_BGR2GRAY)
+        features = self.aligner.extract_features(gray)
+        if features is not None:
+            for name, array in features.items():
+                self.reference_images.set_array(location_id, name, array)
+        return features
+    
+    def _use_tiling(self, shape: Tuple[int, ...]) -> bool:
+        """Indica si una imagen es lo bastante grande para el modo por teselas."""
+        if self.tiling_min_pixels is None:
+            return False
+        return shape[0] * shape[1] >= self.tiling_min_pixels
+    
+    def _calculate_differences(self, location_id: str, reference: Dict[str, Any],
+                               current_image_data: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
         """Calcula las diferencias entre imágenes."""
-        reference = self.reference_images[location_id]
+        # Ortofotos grandes: comparación gruesa y diferenciado fino solo donde cambió
+        if self._use_tiling(current_image_data["gray"].shape):
+            difference_data = self.tiled_differencer.compute(
+                reference["image"], current_image_data["gray"],
+                self._get_reference_coarse(location_id, reference),
+                self._current_coarse(current_image_data)
+            )
+        else:
+            blur = self._current_blur(current_image_data)
+            difference_data = self._difference_full_resolution(reference["image"], blur)
         
+        self._mask_unaligned_border(difference_data, current_image_data.get("valid_mask"))
+        return difference_data
+    
+    @staticmethod
+    def _difference_full_resolution(reference_blur: np.ndarray,
+                                    current_blur: np.ndarray) -> Dict[str, np.ndarray]:
+        """Diferencia dos imágenes suavizadas a resolución completa."""
         # Calcular diferencia absoluta entre imágenes
-        frame_delta = cv2.absdiff(reference["image"], current_image_data["processed"])
+        frame_delta = cv2.absdiff(reference_blur, current_blur)
         
         # Aplicar umbral para destacar diferencias
         thresh = cv2.threshold(frame_delta, 25, 255, cv2.THRESH_BINARY)[1]
@@ -163,31 +549,72 @@ class ChangeDetector:
         
         return {"delta": frame_delta, "threshold": thresh, "dilated": dilated}
     
-    def _analyze_contours(self, difference_data: Dict[str, np.ndarray], 
+    def _mask_unaligned_border(self, difference_data: Dict[str, np.ndarray],
+                               valid_mask: Optional[np.ndarray]) -> None:
+        """Anula las diferencias fuera de la zona cubierta por la captura alineada."""
+        if valid_mask is None:
+            return
+        # Erosionar el radio del blur: el borde deformado contamina a sus vecinos
+        valid = cv2.erode(valid_mask, np.ones((21, 21), np.uint8)) > 0
+        for name in ("delta", "threshold", "dilated"):
+            difference_data[name][~valid] = 0
+    
+    def _get_reference_coarse(self, location_id: str, reference: Dict[str, Any]) -> np.ndarray:
+        """Obtiene (y guarda con la referencia) el nivel grueso de su pirámide."""
+        if reference.get("coarse") is None:
+            gray = cv2.cvtColor(reference["original"], cv2.COLOR_BGR2GRAY)
+            coarse = self.tiled_differencer.build_coarse(gray)
+            self.reference_images.set_array(location_id, "coarse", coarse)
+            return coarse
+        return reference["coarse"]
+    
+    def _analyze_regions(self, difference_data: Dict[str, np.ndarray],
                          current_image: np.ndarray) -> Dict[str, Any]:
-        """Analiza los contornos de las áreas de cambio."""
-        # Encontrar contornos de las áreas de cambio
-        contours, _ = cv2.findContours(
-            difference_data["dilated"].copy(), cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE
+        """
+        Obtiene las regiones de cambio con sus estadísticas en una sola pasada.
+        
+        ``connectedComponentsWithStats`` da el área, el rectángulo y el
+        centroide de todas las regiones a la vez; el filtrado por tamaño es
+        vectorial y la intensidad solo se mide en las regiones significativas.
+        """
+        count, labels, stats, centroids = cv2.connectedComponentsWithStats(
+            difference_data["dilated"], connectivity=8
         )
         
-        # Filtrar contornos por tamaño
+        # Filtrar regiones por tamaño (la etiqueta 0 es el fondo)
         min_area = current_image.shape[0] * current_image.shape[1] * 0.005  # 0.5% del área total
-        significant_contours = [c for c in contours if cv2.contourArea(c) > min_area]
+        areas = stats[1:, cv2.CC_STAT_AREA]
+        significant = np.flatnonzero(areas > min_area) + 1
+        boxes = stats[significant, :4]
         
         return {
-            "all_contours": contours,
-            "significant_contours": significant_contours,
-            "min_area": min_area
+            "total_regions": count - 1,
+            "labels": significant,
+            "areas": stats[significant, cv2.CC_STAT_AREA],
+            "boxes": boxes,
+            "centroids": centroids[significant],
+            "intensity": self._region_intensity(difference_data["delta"], labels, significant, boxes),
+            "min_area": min_area,
+            "shape": labels.shape
         }
     
+    @staticmethod
+    def _region_intensity(delta: np.ndarray, labels: np.ndarray, significant: np.ndarray,
+                          boxes: np.ndarray) -> np.ndarray:
+        """Diferencia media de cada región significativa, medida dentro de su rectángulo."""
+        intensity = np.zeros(len(significant), dtype=np.float64)
+        for i, (label, (x, y, w, h)) in enumerate(zip(significant, boxes)):
+            mask = (labels[y:y + h, x:x + w] == label).astype(np.uint8)
+            intensity[i] = cv2.mean(delta[y:y + h, x:x + w], mask=mask)[0]
+        return intensity
+    
     def _calculate_change_metrics(self, difference_data: Dict[str, np.ndarray], 
-                                contour_data: Dict[str, Any]) -> Dict[str, float]:
+                                region_data: Dict[str, Any]) -> Dict[str, float]:
         """Calcula las métricas de cambio."""
         thresh = difference_data["threshold"]
         
         # Calcular porcentaje de cambio
-        change_pixels = np.sum(thresh > 0)
+        change_pixels = cv2.countNonZero(thresh)
         total_pixels = thresh.shape[0] * thresh.shape[1]
         change_percentage = (change_pixels / total_pixels) * 100
         
@@ -197,26 +624,117 @@ class ChangeDetector:
         return {
             "change_percentage": change_percentage,
             "has_significant_changes": has_significant_changes,
-            "significant_areas": len(contour_data["significant_contours"])
+            "significant_areas": len(region_data["areas"])
         }
     
-    def _create_changes_visualization(self, current_image: np.ndarray, 
-                                    significant_contours: List) -> bytes:
-        """Crea una visualización de los cambios detectados."""
-        # Crear imagen con cambios marcados
-        changes_image = current_image.copy()
-        for contour in significant_contours:
-            (x, y, w, h) = cv2.boundingRect(contour)
-            cv2.rectangle(changes_image, (x, y), (x + w, y + h), (0, 255, 0), 2)
-        
-        # Codificar imagen resultante
-        _, buffer = cv2.imencode('.jpg', changes_image)
-        return buffer.tobytes()
+    def _describe_regions(self, region_data: Dict[str, Any],
+                          reference: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Convierte las estadísticas de las regiones en una lista serializable."""
+        coordinates = self._georeference_points(region_data["centroids"], region_data["shape"],
+                                                reference)
+        return [
+            {
+                "bbox": [int(v) for v in box],
+                "area_px": int(area),
+                "centroid": [round(float(cx), 1), round(float(cy), 1)],
+                "intensity": round(float(intensity), 2),
+                "coordinates": coordinates[i] if coordinates else None
+            }
+            for i, (box, area, (cx, cy), intensity) in enumerate(zip(
+                region_data["boxes"], region_data["areas"],
+                region_data["centroids"], region_data["intensity"]
+            ))
+        ]
+    
+    def _georeference_points(self, points: np.ndarray, shape: Tuple[int, ...],
+                             reference: Dict[str, Any]) -> Optional[List[Dict[str, float]]]:
+        """
+        Proyecta píxeles del encuadre de la referencia a coordenadas GPS.
+        
+        Supone cámara cenital centrada en las coordenadas de la referencia.
+        La resolución en el suelo sale de ``gsd_m`` en los metadatos o, si
+        no está, de ``altitude`` y el campo de visión; ``yaw`` (grados desde
+        el norte) orienta la imagen.
+        
+        Returns:
+            Coordenadas de cada punto o None si faltan datos para proyectar
+        """
+        coordinates = reference.get("coordinates")
+        metadata = reference.get("metadata") or {}
+        height, width = shape[:2]
+        gsd = metadata.get("gsd_m")
+        if gsd is None and metadata.get("altitude") is not None:
+            gsd = 2 * metadata["altitude"] * math.tan(math.radians(self.camera_fov_deg) / 2) / width
+        if not coordinates or gsd is None or len(points) == 0:
+            return None
+        
+        # Desplazamientos en metros respecto al centro (x al este, y al norte)
+        offset_x = (points[:, 0] - width / 2) * gsd
+        offset_y = (height / 2 - points[:, 1]) * gsd
+        yaw = math.radians(metadata.get("yaw", 0.0))
+        east = offset_x * math.cos(yaw) + offset_y * math.sin(yaw)
+        north = offset_y * math.cos(yaw) - offset_x * math.sin(yaw)
+        
+        latitude = coordinates["latitude"]
+        latitudes = latitude + north / METERS_PER_DEGREE
+        longitudes = coordinates["longitude"] + east / (
+            METERS_PER_DEGREE * max(math.cos(math.radians(latitude)), 1e-6)
+        )
+        return [{"latitude": round(float(lat), 7), "longitude": round(float(lon), 7)}
+                for lat, lon in zip(latitudes, longitudes)]
+    
+    def _create_changes_visualization(self, current_image: np.ndarray,
+                                    boxes: np.ndarray) -> ChangeVisualization:
+        """Crea el manejador (sin copiar ni codificar) de la visualización de cambios."""
+        return ChangeVisualization(current_image, [tuple(int(v) for v in box) for box in boxes])
+    
+    def _remember_visualization(self, visualization: ChangeVisualization) -> str:
+        """
+        Guarda un manejador en el LRU de visualizaciones y devuelve su ID.
+        
+        La captura se reduce a ``visualization_max_width`` y el LRU se limita
+        tanto en número de entradas como en bytes retenidos.
+        """
+        if self.visualization_max_width:
+            visualization.downscale(self.visualization_max_width)
+        detection_id = f"change_{uuid.uuid4().hex[:12]}"
+        with self._visualizations_lock:
+            self._visualizations[detection_id] = visualization
+            # Los manejadores ya codificados ocupan menos: se mide en cada inserción
+            bytes_used = sum(entry.nbytes for entry in self._visualizations.values())
+            while len(self._visualizations) > 1 and (
+                    len(self._visualizations) > self.visualization_cache_size
+                    or bytes_used > self.visualization_cache_bytes):
+                _, evicted = self._visualizations.popitem(last=False)
+                bytes_used -= evicted.nbytes
+        return detection_id
+    
+    def render_visualization(self, detection_id: str) -> Optional[bytes]:
+        """
+        Obtiene la imagen con los cambios de una detección reciente.
+        
+        La primera petición dibuja y codifica la imagen; las siguientes
+        devuelven los bytes en caché.
+        
+        Args:
+            detection_id: ID devuelto por ``detect_changes``
+            
+        Returns:
+            Bytes JPEG de la visualización o None si ya no está disponible
+        """
+        with self._visualizations_lock:
+            visualization = self._visualizations.get(detection_id)
+            if visualization is None:
+                return None
+            self._visualizations.move_to_end(detection_id)
+        return visualization.encode()
     
     def _build_detection_result(self, location_id: str, metrics: Dict[str, float], 
-                              changes_image_bytes: bytes, contour_data: Dict[str, Any]) -> Dict[str, Any]:
+                              changes_image_bytes: Optional[bytes], region_data: Dict[str, Any],
+                              reference: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Construye el resultado final de la detección."""
-        reference = self.reference_images[location_id]
+        if reference is None:
+            reference = self.reference_images[location_id]
         
         result = {
             "location_id": location_id,
@@ -224,12 +742,29 @@ class ChangeDetector:
             "change_percentage": metrics["change_percentage"],
             "significant_areas": metrics["significant_areas"],
             "changes_image": changes_image_bytes,
+            "regions": self._describe_regions(region_data, reference),
+            "total_regions": region_data["total_regions"],
             "timestamp": reference["metadata"].get("timestamp", 0)
         }
         
         logger.info(f"Detección de cambios completada: {metrics['change_percentage']:.2f}% de cambio")
         return result
     
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Obtiene las estadísticas del detector y sus cachés.
+        
+        Returns:
+            Diccionario con las estadísticas de referencias, índice, caché de
+            preprocesado y modelo de fondo
+        """
+        return {
+            "references": self.reference_images.get_stats(),
+            "spatial_index": self.reference_index.get_stats(),
+            "preprocessing_cache": self.preprocessing_cache.get_stats(),
+            "background_model": self.background_model.get_stats()
+        }
+    
     def get_reference_image(self, location_id: str) -> Optional[bytes]:
         """
         Obtiene la imagen de referencia para una ubicación.
@@ -261,5 +796,7 @@ class ChangeDetector:
             return False
         
         del self.reference_images[location_id]
+        self.reference_index.remove(location_id)
+        self.background_model.reset(location_id)
         logger.info(f"Imagen de referencia eliminada: {location_id}")
         return True 
\ No newline at end of file
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Visualización diferida de los cambios detectados.
+Responsabilidad única: Dibujar y codificar la imagen con los cambios marcados solo cuando se pide.
+"""
+
+import threading
+import logging
+from typing import List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+Box = Tuple[int, int, int, int]
+
+BOX_COLOR = (0, 255, 0)
+BOX_THICKNESS = 2
+
+
+class ChangeVisualization:
+    """
+    Manejador de la imagen con los cambios de una detección.
+
+    Guarda una referencia a la captura (sin copiarla) y los rectángulos de
+    las áreas significativas. La copia, el dibujo y la codificación JPEG
+    solo ocurren la primera vez que se llama a ``encode``; los bytes
+    quedan en caché y la captura se libera, de modo que una comprobación
+    de umbral que nunca pide la imagen no paga ese coste. Mientras espera
+    a ser pedida, ``downscale`` puede sustituir la captura por una copia
+    reducida para no retener la resolución completa.
+    """
+
+    def __init__(self, image: np.ndarray, boxes: List[Box], jpeg_quality: int = 95):
+        """
+        Inicializa el manejador.
+
+        Args:
+            image: Captura BGR (alineada con la referencia si procede)
+            boxes: Rectángulos (x, y, ancho, alto) de las áreas significativas
+            jpeg_quality: Calidad JPEG de la imagen codificada
+        """
+        self._image: Optional[np.ndarray] = image
+        self.boxes = boxes
+        self.jpeg_quality = jpeg_quality
+        self._encoded: Optional[bytes] = None
+        self._lock = threading.Lock()
+
+    @property
+    def rendered(self) -> bool:
+        """Indica si la imagen ya se ha codificado."""
+        return self._encoded is not None
+
+    @property
+    def nbytes(self) -> int:
+        """Memoria retenida: los bytes JPEG si ya se codificó o la captura si no."""
+        with self._lock:
+            if self._encoded is not None:
+                return len(self._encoded)
+            return self._image.nbytes if self._image is not None else 0
+
+    def downscale(self, max_width: int) -> None:
+        """
+        Reduce la captura retenida (y sus rectángulos) a un ancho máximo.
+
+        No hace nada si la imagen ya se codificó o ya es más estrecha.
+
+        Args:
+            max_width: Ancho máximo en píxeles de la imagen a renderizar
+        """
+        with self._lock:
+            image = self._image
+        if image is None or image.shape[1] <= max_width:
+            return
+
+        scale = max_width / image.shape[1]
+        size = (max_width, max(1, round(image.shape[0] * scale)))
+        reduced = cv2.resize(image, size, interpolation=cv2.INTER_AREA)
+        boxes = [tuple(int(round(v * scale)) for v in box) for box in self.boxes]
+
+        with self._lock:
+            if self._image is image:
+                self._image = reduced
+                self.boxes = boxes
+
+    def render(self) -> np.ndarray:
+        """
+        Dibuja los cambios sobre una copia de la captura.
+
+        Returns:
+            Imagen BGR con los rectángulos de cambio
+        """
+        with self._lock:
+            image = self._image
+        if image is None:
+            # Ya codificada: la captura se liberó, se recupera de los bytes
+            return cv2.imdecode(np.frombuffer(self._encoded, np.uint8), cv2.IMREAD_COLOR)
+
+        changes_image = image.copy()
+        for x, y, w, h in self.boxes:
+            cv2.rectangle(changes_image, (x, y), (x + w, y + h), BOX_COLOR, BOX_THICKNESS)
+        return changes_image
+
+    def encode(self) -> bytes:
+        """
+        Obtiene la imagen con los cambios en JPEG, codificándola la primera vez.
+
+        Returns:
+            Bytes JPEG de la visualización
+        """
+        with self._lock:
+            if self._encoded is not None:
+                return self._encoded
+
+        changes_image = self.render()
+        _, buffer = cv2.imencode(".jpg", changes_image,
+                                 [int(cv2.IMWRITE_JPEG_QUALITY), self.jpeg_quality])
+
+        with self._lock:
+            if self._encoded is None:
+                self._encoded = buffer.tobytes()
+                self._image = None
+            return self._encoded
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Buffer circular de frames crudos para el procesamiento de video.
+Responsabilidad única: Almacenar frames sin codificar y codificarlos bajo demanda.
+"""
+
+import cv2
+import numpy as np
+import threading
+import time
+import base64
+import logging
+from typing import Dict, Any, Optional, List
+
+logger = logging.getLogger(__name__)
+
+
+class FrameRingBuffer:
+    """
+    Buffer circular de capacidad fija con frames ``np.ndarray`` crudos.
+
+    Los slots se reservan una única vez (con la forma del primer frame) y
+    se reutilizan en cada escritura. Cada frame recibe un número de
+    secuencia creciente; la codificación JPEG/base64 solo se realiza
+    cuando un consumidor la pide y se cachea por secuencia.
+    """
+
+    def __init__(self, capacity: int = 8, jpeg_quality: int = 90):
+        """
+        Inicializa el buffer circular.
+
+        Args:
+            capacity: Número de frames que se conservan
+            jpeg_quality: Calidad JPEG usada al codificar bajo demanda
+        """
+        if capacity < 1:
+            raise ValueError("La capacidad del buffer debe ser al menos 1")
+
+        self.capacity = capacity
+        self.jpeg_quality = jpeg_quality
+        self._slots: Optional[np.ndarray] = None
+        self._sequences = [-1] * capacity
+        self._timestamps = [0.0] * capacity
+        self._encoded: List[Dict[str, Any]] = [{} for _ in range(capacity)]
+        self._next_sequence = 0
+        self._lock = threading.Lock()
+
+    def push(self, frame: np.ndarray, timestamp: Optional[float] = None) -> int:
+        """
+        Copia un frame en el siguiente slot libre del buffer.
+
+        Args:
+            frame: Frame BGR capturado
+            timestamp: Marca de tiempo del frame (por defecto, ahora)
+
+        Returns:
+            Número de secuencia asignado al frame
+        """
+        with self._lock:
+            self._ensure_slots(frame)
+            sequence = self._next_sequence
+            index = sequence % self.capacity
+
+            # Invalidar el slot antes de sobrescribirlo
+            self._sequences[index] = -1
+            np.copyto(self._slots[index], frame)
+            self._timestamps[index] = timestamp if timestamp is not None else time.time()
+            self._encoded[index] = {}
+            self._sequences[index] = sequence
+            self._next_sequence += 1
+            return sequence
+
+    def _ensure_slots(self, frame: np.ndarray) -> None:
+        """Reserva los slots si no existen o si cambió la forma del frame."""
+        if (self._slots is not None and self._slots.shape[1:] == frame.shape
+                and self._slots.dtype == frame.dtype):
+            return
+
+        if self._slots is not None:
+            logger.info(f"Resolución de stream cambiada a {frame.shape}, reasignando buffer")
+
+        self._slots = np.empty((self.capacity,) + frame.shape, dtype=frame.dtype)
+        self._sequences = [-1] * self.capacity
+        self._encoded = [{} for _ in range(self.capacity)]
+
+    def latest_sequence(self) -> Optional[int]:
+        """
+        Obtiene la secuencia del frame más reciente.
+
+        Returns:
+            Número de secuencia o None si el buffer está vacío
+        """
+        with self._lock:
+            if self._next_sequence == 0:
+                return None
+            return self._next_sequence - 1
+
+    def contains(self, sequence: int) -> bool:
+        """Indica si el frame con esa secuencia sigue en el buffer."""
+        with self._lock:
+            return self._sequences[sequence % self.capacity] == sequence
+
+    def get_frame(self, sequence: int, copy: bool = True) -> Optional[np.ndarray]:
+        """
+        Obtiene el frame crudo de una secuencia.
+
+        Args:
+            sequence: Número de secuencia del frame
+            copy: Si es False devuelve una vista del slot (puede sobrescribirse)
+
+        Returns:
+            Frame BGR o None si ya fue sobrescrito
+        """
+        view = self._get_slot_view(sequence)
+        if view is None or not copy:
+            return view
+
+        frame = view.copy()
+        return frame if self.contains(sequence) else None
+
+    def get_timestamp(self, sequence: int) -> Optional[float]:
+        """Obtiene la marca de tiempo de un frame del buffer."""
+        with self._lock:
+            index = sequence % self.capacity
+            if self._sequences[index] != sequence:
+                return None
+            return self._timestamps[index]
+
+    def get_shape(self) -> Optional[tuple]:
+        """Obtiene la forma de los frames almacenados."""
+        return None if self._slots is None else self._slots.shape[1:]
+
+    def get_jpeg(self, sequence: int) -> Optional[bytes]:
+        """
+        Obtiene el frame codificado en JPEG, codificándolo solo una vez.
+
+        Args:
+            sequence: Número de secuencia del frame
+
+        Returns:
+            Bytes JPEG o None si el frame ya no está disponible
+        """
+        cached = self._get_cached(sequence, "jpeg")
+        if cached is not None:
+            return cached
+
+        view = self._get_slot_view(sequence)
+        if view is None:
+            return None
+
+        params = [int(cv2.IMWRITE_JPEG_QUALITY), self.jpeg_quality]
+        success, buffer = cv2.imencode('.jpg', view, params)
+        if not success:
+            logger.error(f"No se pudo codificar el frame {sequence}")
+            return None
+
+        # Si el slot se sobrescribió durante la codificación, descartar
+        return self._store_cached(sequence, "jpeg", buffer.tobytes())
+
+    def get_base64(self, sequence: int) -> Optional[str]:
+        """
+        Obtiene el frame codificado en JPEG y base64.
+
+        Args:
+            sequence: Número de secuencia del frame
+
+        Returns:
+            Cadena base64 o None si el frame ya no está disponible
+        """
+        cached = self._get_cached(sequence, "base64")
+        if cached is not None:
+            return cached
+
+        jpeg_bytes = self.get_jpeg(sequence)
+        if jpeg_bytes is None:
+            return None
+
+        encoded = base64.b64encode(jpeg_bytes).decode('utf-8')
+        return self._store_cached(sequence, "base64", encoded)
+
+    def _get_slot_view(self, sequence: int) -> Optional[np.ndarray]:
+        """Devuelve la vista del slot si aún contiene la secuencia pedida."""
+        with self._lock:
+            index = sequence % self.capacity
+            if sequence < 0 or self._sequences[index] != sequence:
+                return None
+            return self._slots[index]
+
+    def _get_cached(self, sequence: int, key: str) -> Any:
+        """Obtiene una codificación cacheada para la secuencia."""
+        with self._lock:
+            index = sequence % self.capacity
+            if self._sequences[index] != sequence:
+                return None
+            return self._encoded[index].get(key)
+
+    def _store_cached(self, sequence: int, key: str, value: Any) -> Any:
+        """Cachea una codificación si el slot sigue siendo válido."""
+        with self._lock:
+            index = sequence % self.capacity
+            if self._sequences[index] != sequence:
+                return None
+            self._encoded[index][key] = value
+            return value
+
+    def __len__(self) -> int:
+        """Número de frames válidos almacenados."""
+        with self._lock:
+            return sum(1 for sequence in self._sequences if sequence >= 0)
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Etapa de detección de objetos continua sobre el stream de video.
+Responsabilidad única: Detectar objetos en lotes de frames recientes del buffer circular.
+"""
+
+import threading
+import time
+import logging
+from typing import Dict, Any, Optional, List, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from src.models.yolo_detector import YoloObjectDetector
+    from src.processors.video_processor import VideoProcessor
+
+logger = logging.getLogger(__name__)
+
+
+class FrameDetectionStage:
+    """
+    Etapa opcional de YOLO dentro del pipeline de ``VideoProcessor``.
+
+    Un thread propio espera frames nuevos, toma como máximo los
+    ``batch_size`` más recientes del buffer circular y los pasa al modelo
+    en una sola llamada. Si el modelo no da abasto, los frames más
+    antiguos que el lote simplemente se saltan (y se cuentan), de modo que
+    la detección nunca acumula retraso respecto al stream.
+    """
+
+    def __init__(self, processor: "VideoProcessor", detector: "YoloObjectDetector",
+                 batch_size: int = 4, interval: float = 1.0):
+        """
+        Inicializa la etapa de detección.
+
+        Args:
+            processor: Procesador de video del que se leen los frames
+            detector: Detector YOLO compartido
+            batch_size: Frames máximos por llamada al modelo
+            interval: Segundos mínimos entre lotes
+        """
+        if batch_size < 1:
+            raise ValueError("El tamaño de lote debe ser al menos 1")
+
+        self.processor = processor
+        self.detector = detector
+        self.batch_size = batch_size
+        self.interval = interval
+        self.last_detections: Optional[Dict[str, Any]] = None
+        self.batches_run = 0
+        self.frames_detected = 0
+        self.frames_skipped = 0
+        self.last_batch_latency: Optional[float] = None
+        self._last_sequence: Optional[int] = None
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Arranca el thread de detección."""
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, args=(self._stop_event,), daemon=True
+        )
+        self._thread.start()
+        logger.info(f"Etapa de detección iniciada (lotes de {self.batch_size})")
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Detiene el thread de detección.
+
+        Args:
+            timeout: Tiempo máximo de espera (None espera al lote en curso)
+        """
+        self._stop_event.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+            if self._thread.is_alive():
+                logger.warning("El thread de detección sigue terminando el lote en curso")
+        self._thread = None
+
+    def _run(self, stop_event: threading.Event) -> None:
+        """Bucle de detección: espera frames nuevos y procesa un lote por intervalo."""
+        while not stop_event.is_set():
+            started = time.monotonic()
+            sequence = self.processor.wait_for_frame(self._last_sequence, timeout=1.0)
+            if sequence is None:
+                # Sin frames nuevos o procesador parándose: no girar en vacío
+                stop_event.wait(0.05)
+                continue
+
+            try:
+                self.run_batch()
+            except Exception as e:
+                logger.error(f"Error en etapa de detección: {str(e)}")
+
+            remaining = self.interval - (time.monotonic() - started)
+            if remaining > 0:
+                stop_event.wait(remaining)
+
+    def run_batch(self) -> bool:
+        """
+        Detecta objetos en el lote de frames más recientes no procesados.
+
+        Returns:
+            True si había frames y se ejecutó el modelo
+        """
+        batch, frames = self._collect_batch()
+        if not frames:
+            return False
+
+        started = time.perf_counter()
+        results = self.detector.detect_frames(frames)
+        self.last_batch_latency = time.perf_counter() - started
+
+        self._publish(batch, results)
+        return True
+
+    def _collect_batch(self) -> Tuple[List[Tuple[int, float]], List[Any]]:
+        """
+        Copia los frames más recientes aún no procesados y cuenta los saltados.
+
+        Returns:
+            Tupla (lista de (secuencia, marca de tiempo), lista de frames)
+        """
+        frame_buffer = self.processor.frame_buffer
+        latest = frame_buffer.latest_sequence()
+        if latest is None or (self._last_sequence is not None and latest <= self._last_sequence):
+            return [], []
+
+        first_pending = 0 if self._last_sequence is None else self._last_sequence + 1
+        first = max(first_pending, latest - self.batch_size + 1)
+        self.frames_skipped += first - first_pending
+
+        batch, frames = [], []
+        for sequence in range(first, latest + 1):
+            timestamp = frame_buffer.get_timestamp(sequence)
+            frame = frame_buffer.get_frame(sequence)
+            if frame is None:
+                self.frames_skipped += 1
+                continue
+            batch.append((sequence, timestamp))
+            frames.append(frame)
+
+        self._last_sequence = latest
+        return batch, frames
+
+    def _publish(self, batch: List[Tuple[int, float]], results: List[Dict[str, Any]]) -> None:
+        """Publica las detecciones del lote como últimas detecciones."""
+        self.last_detections = {
+            "timestamp": time.time(),
+            "frames": [
+                {
+                    "frame_sequence": sequence,
+                    "frame_timestamp": frame_timestamp,
+                    "detections": result.get("detections", []),
+                    "total_objects": result.get("total_objects", 0),
+                    "error": result.get("error")
+                }
+                for (sequence, frame_timestamp), result in zip(batch, results)
+            ]
+        }
+        self.batches_run += 1
+        self.frames_detected += len(batch)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Obtiene las estadísticas de la etapa de detección.
+
+        Returns:
+            Diccionario con lotes ejecutados, frames detectados y saltados
+        """
+        return {
+            "batch_size": self.batch_size,
+            "interval": self.interval,
+            "batches_run": self.batches_run,
+            "frames_detected": self.frames_detected,
+            "frames_skipped": self.frames_skipped,
+            "last_batch_latency": (
+                None if self.last_batch_latency is None
+                else round(self.last_batch_latency, 4)
+            )
+        }
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Registro (alineación) de capturas contra imágenes de referencia.
+Responsabilidad única: Estimar y aplicar la homografía que lleva una captura al encuadre de su referencia.
+"""
+
+import logging
+from typing import Dict, Any, Optional, Tuple
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class ImageAligner:
+    """
+    Alineador basado en características ORB.
+
+    Los puntos y descriptores se extraen sobre una versión reducida de la
+    imagen (``working_width``) y se devuelven en coordenadas de resolución
+    completa, de modo que los de cada referencia se calculan una sola vez
+    al añadirla y se guardan junto a ella. Por comparación solo se
+    extraen las características de la captura, se emparejan con distancia
+    de Hamming y se estima la homografía con RANSAC.
+    """
+
+    def __init__(self, max_features: int = 1000, working_width: int = 1024,
+                 min_matches: int = 12, ratio: float = 0.75,
+                 ransac_threshold: float = 4.0, identity_tolerance: float = 0.5):
+        """
+        Inicializa el alineador.
+
+        Args:
+            max_features: Máximo de puntos ORB por imagen
+            working_width: Ancho de la imagen reducida donde se buscan los puntos
+            min_matches: Inliers mínimos para aceptar una homografía
+            ratio: Umbral del test de ratio de Lowe al emparejar
+            ransac_threshold: Error de reproyección máximo de RANSAC en píxeles
+            identity_tolerance: Desplazamiento de esquinas por debajo del que no se deforma
+        """
+        self.max_features = max_features
+        self.working_width = working_width
+        self.min_matches = min_matches
+        self.ratio = ratio
+        self.ransac_threshold = ransac_threshold
+        self.identity_tolerance = identity_tolerance
+        self._matcher = cv2.BFMatcher(cv2.NORM_HAMMING)
+
+    def extract_features(self, gray: np.ndarray) -> Optional[Dict[str, np.ndarray]]:
+        """
+        Extrae puntos ORB y descriptores de una imagen en grises.
+
+        Args:
+            gray: Imagen en grises a resolución completa
+
+        Returns:
+            Diccionario con ``keypoints`` (N×2, píxeles a resolución completa)
+            y ``descriptors`` (N×32), o None si no hay suficientes puntos
+        """
+        scale = min(1.0, self.working_width / gray.shape[1])
+        small = gray if scale == 1.0 else cv2.resize(
+            gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA
+        )
+
+        orb = cv2.ORB_create(nfeatures=self.max_features)
+        keypoints, descriptors = orb.detectAndCompute(small, None)
+        if descriptors is None or len(keypoints) < self.min_matches:
+            return None
+
+        points = np.array([kp.pt for kp in keypoints], dtype=np.float32) / scale
+        return {"keypoints": points, "descriptors": descriptors}
+
+    def estimate_homography(self, reference_features: Dict[str, np.ndarray],
+                            current_features: Dict[str, np.ndarray]
+                            ) -> Tuple[Optional[np.ndarray], int]:
+        """
+        Estima la homografía que lleva la captura al encuadre de la referencia.
+
+        Args:
+            reference_features: Características de la referencia
+            current_features: Características de la captura
+
+        Returns:
+            Tupla (homografía 3×3 o None, número de inliers)
+        """
+        pairs = self._matcher.knnMatch(current_features["descriptors"],
+                                       reference_features["descriptors"], k=2)
+        good = [m[0] for m in pairs
+                if len(m) == 2 and m[0].distance < self.ratio * m[1].distance]
+        if len(good) < self.min_matches:
+            return None, len(good)
+
+        source = current_features["keypoints"][[m.queryIdx for m in good]]
+        target = reference_features["keypoints"][[m.trainIdx for m in good]]
+        homography, mask = cv2.findHomography(source, target, cv2.RANSAC, self.ransac_threshold)
+        inliers = int(mask.sum()) if mask is not None else 0
+        if homography is None or inliers < self.min_matches or not self._is_plausible(homography):
+            return None, inliers
+        return homography, inliers
+
+    def align(self, reference_features: Optional[Dict[str, np.ndarray]],
+              reference_shape: Tuple[int, ...], current_image: np.ndarray,
+              current_gray: np.ndarray) -> Dict[str, Any]:
+        """
+        Alinea una captura con su referencia.
+
+        Args:
+            reference_features: Características precalculadas de la referencia
+            reference_shape: Forma de la referencia (alto, ancho)
+            current_image: Captura BGR
+            current_gray: Captura en grises
+
+        Returns:
+            Diccionario con ``original``, ``gray``, ``valid_mask`` (None si
+            toda la imagen es válida) y el estado de la alineación
+        """
+        result = {"original": current_image, "gray": current_gray, "valid_mask": None,
+                  "aligned": False, "inliers": 0}
+        current_features = self.extract_features(current_gray) if reference_features else None
+        if current_features is None:
+            return result
+
+        homography, inliers = self.estimate_homography(reference_features, current_features)
+        result["inliers"] = inliers
+        if homography is None:
+            logger.debug("Alineación descartada: emparejamientos insuficientes")
+            return result
+
+        height, width = reference_shape[:2]
+        if current_gray.shape[:2] == (height, width) and self._is_identity(homography, width, height):
+            result["aligned"] = True
+            return result
+
+        size = (width, height)
+        result.update({
+            "original": cv2.warpPerspective(current_image, homography, size, flags=cv2.INTER_LINEAR),
+            "gray": cv2.warpPerspective(current_gray, homography, size, flags=cv2.INTER_LINEAR),
+            "valid_mask": cv2.warpPerspective(
+                np.full(current_gray.shape[:2], 255, dtype=np.uint8), homography, size,
+                flags=cv2.INTER_NEAREST
+            ),
+            "aligned": True
+        })
+        return result
+
+    def _is_identity(self, homography: np.ndarray, width: int, height: int) -> bool:
+        """Indica si la homografía apenas mueve las esquinas de la imagen."""
+        corners = np.float32([[0, 0], [width, 0], [width, height], [0, height]]).reshape(-1, 1, 2)
+        moved = cv2.perspectiveTransform(corners, homography)
+        return float(np.abs(moved - corners).max()) < self.identity_tolerance
+
+    @staticmethod
+    def _is_plausible(homography: np.ndarray) -> bool:
+        """Descarta homografías degeneradas (escalas o perspectivas absurdas)."""
+        determinant = np.linalg.det(homography[:2, :2])
+        return 0.2 < determinant < 5.0 and np.abs(homography[2, :2]).max() < 0.01
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Difusión en vivo de un procesador de video como MJPEG.
+Responsabilidad única: Servir los frames del procesador a varios espectadores HTTP.
+"""
+
+import threading
+import time
+import logging
+from typing import Dict, Any, Iterator, Optional
+
+from src.processors.video_processor import VideoProcessor
+
+logger = logging.getLogger(__name__)
+
+
+class MjpegStreamer:
+    """
+    Emisor ``multipart/x-mixed-replace`` alimentado por un ``VideoProcessor``.
+
+    Todos los espectadores leen del mismo buffer circular, cuya caché JPEG
+    por secuencia garantiza una única codificación por frame sea cual sea
+    el número de espectadores. Cada espectador salta siempre al frame más
+    reciente: un cliente lento no acumula cola, simplemente recibe menos
+    frames (se cuentan como descartados).
+    """
+
+    BOUNDARY = "frame"
+    MIMETYPE = f"multipart/x-mixed-replace; boundary={BOUNDARY}"
+
+    def __init__(self, processor: VideoProcessor, max_fps: float = 15.0,
+                 idle_timeout: float = 10.0):
+        """
+        Inicializa el emisor MJPEG.
+
+        Args:
+            processor: Procesador de video del que se leen los frames
+            max_fps: Máximo de frames por segundo enviados a cada espectador
+            idle_timeout: Segundos sin frames nuevos tras los que se cierra el stream
+        """
+        self.processor = processor
+        self.max_fps = max_fps
+        self.idle_timeout = idle_timeout
+        self._lock = threading.Lock()
+        self.viewers = 0
+        self.frames_sent = 0
+        self.frames_skipped = 0
+
+    def stream(self) -> Iterator[bytes]:
+        """
+        Genera las partes MJPEG para un espectador.
+
+        El generador termina cuando el procesador se detiene, cuando no
+        llegan frames en ``idle_timeout`` o cuando el cliente se desconecta
+        (el servidor cierra el generador).
+
+        Yields:
+            Partes multipart con un frame JPEG cada una
+        """
+        self._update_viewers(1)
+        try:
+            yield from self._stream_frames()
+        finally:
+            self._update_viewers(-1)
+
+    def _stream_frames(self) -> Iterator[bytes]:
+        """Bucle de envío de frames para un espectador."""
+        last_sequence: Optional[int] = None
+        min_period = 1.0 / self.max_fps if self.max_fps > 0 else 0.0
+
+        while self.processor.processing:
+            sequence = self.processor.wait_for_frame(last_sequence, self.idle_timeout)
+            if sequence is None:
+                break
+
+            jpeg = self.processor.frame_buffer.get_jpeg(sequence)
+            if jpeg is None:
+                continue
+
+            self._count_frame(last_sequence, sequence)
+            last_sequence = sequence
+            sent_at = time.monotonic()
+            yield self.format_part(jpeg)
+
+            # Limitar los fps por espectador
+            remaining = min_period - (time.monotonic() - sent_at)
+            if remaining > 0:
+                time.sleep(remaining)
+
+    @classmethod
+    def format_part(cls, jpeg: bytes) -> bytes:
+        """
+        Construye una parte multipart para un frame JPEG.
+
+        Args:
+            jpeg: Frame codificado en JPEG
+
+        Returns:
+            Bytes de la parte con cabeceras y delimitador
+        """
+        header = (f"--{cls.BOUNDARY}\r\nContent-Type: image/jpeg\r\n"
+                  f"Content-Length: {len(jpeg)}\r\n\r\n").encode("ascii")
+        return header + jpeg + b"\r\n"
+
+    def _count_frame(self, last_sequence: Optional[int], sequence: int) -> None:
+        """Actualiza los contadores de frames enviados y saltados."""
+        with self._lock:
+            self.frames_sent += 1
+            if last_sequence is not None:
+                self.frames_skipped += max(0, sequence - last_sequence - 1)
+
+    def _update_viewers(self, delta: int) -> None:
+        """Registra la conexión o desconexión de un espectador."""
+        with self._lock:
+            self.viewers += delta
+            viewers = self.viewers
+        logger.info(f"Espectadores MJPEG activos: {viewers}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Obtiene las estadísticas de difusión.
+
+        Returns:
+            Diccionario con espectadores, frames enviados y saltados
+        """
+        with self._lock:
+            return {
+                "viewers": self.viewers,
+                "frames_sent": self.frames_sent,
+                "frames_skipped": self.frames_skipped,
+                "max_fps": self.max_fps
+            }
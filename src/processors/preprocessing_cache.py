@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Caché de imágenes preprocesadas indexada por el contenido de sus bytes.
+Responsabilidad única: Decodificar y preprocesar cada imagen una sola vez mientras quepa en memoria.
+"""
+
+import hashlib
+import threading
+import logging
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Callable
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+BLUR_KERNEL = 21
+
+
+class PreprocessedImage:
+    """
+    Imagen decodificada con sus derivados calculados bajo demanda.
+
+    Guarda la imagen BGR y su versión en grises; el suavizado y los
+    niveles de pirámide se calculan la primera vez que se piden y se
+    conservan junto a ella. Los arrays se comparten entre quienes usan
+    la entrada y no deben modificarse.
+    """
+
+    def __init__(self, key: bytes, original: np.ndarray, gray: np.ndarray,
+                 on_resize: Optional[Callable[["PreprocessedImage"], None]] = None):
+        """
+        Inicializa la entrada.
+
+        Args:
+            key: Hash del contenido de la imagen
+            original: Imagen BGR decodificada
+            gray: Imagen en escala de grises
+            on_resize: Aviso a la caché cuando se añade un derivado
+        """
+        self.key = key
+        self.original = original
+        self.gray = gray
+        self._derived: Dict[str, np.ndarray] = {}
+        self._on_resize = on_resize
+        self._lock = threading.Lock()
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes ocupados por la imagen y sus derivados."""
+        with self._lock:
+            derived = sum(array.nbytes for array in self._derived.values())
+        return self.original.nbytes + self.gray.nbytes + derived
+
+    def derive(self, name: str, compute: Callable[[], np.ndarray]) -> np.ndarray:
+        """
+        Obtiene un derivado, calculándolo la primera vez.
+
+        Args:
+            name: Nombre del derivado (por ejemplo ``blur`` o ``coarse``)
+            compute: Función que lo calcula a partir de la entrada
+
+        Returns:
+            Array derivado
+        """
+        with self._lock:
+            value = self._derived.get(name)
+        if value is not None:
+            return value
+
+        value = compute()
+        with self._lock:
+            value = self._derived.setdefault(name, value)
+        if self._on_resize is not None:
+            self._on_resize(self)
+        return value
+
+    def blur(self) -> np.ndarray:
+        """Imagen en grises suavizada con el kernel de la detección de cambios."""
+        return self.derive("blur", lambda: cv2.GaussianBlur(self.gray, (BLUR_KERNEL, BLUR_KERNEL), 0))
+
+
+class PreprocessingCache:
+    """
+    LRU de imágenes preprocesadas indexado por el hash de sus bytes.
+
+    Una misma captura comparada con varias referencias (o reenviada) se
+    decodifica, se pasa a grises y se suaviza una sola vez. El hash
+    (BLAKE2b) recorre los bytes comprimidos, mucho más baratos que
+    decodificarlos. Las entradas se expulsan por tamaño en bytes, de la
+    menos a la más reciente.
+    """
+
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024):
+        """
+        Inicializa la caché.
+
+        Args:
+            max_bytes: Memoria máxima de las entradas (0 = sin caché)
+        """
+        if max_bytes < 0:
+            raise ValueError("El tamaño máximo de la caché no puede ser negativo")
+
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[bytes, PreprocessedImage]" = OrderedDict()
+        self._sizes: Dict[bytes, int] = {}
+        self._bytes_used = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, image_data: bytes) -> Optional[PreprocessedImage]:
+        """
+        Obtiene una imagen preprocesada, decodificándola si no está en caché.
+
+        Args:
+            image_data: Bytes de la imagen comprimida
+
+        Returns:
+            Entrada con la imagen decodificada o None si no se puede decodificar
+        """
+        key = hashlib.blake2b(image_data, digest_size=16).digest()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            self.misses += 1
+
+        image = cv2.imdecode(np.frombuffer(image_data, np.uint8), cv2.IMREAD_COLOR)
+        if image is None:
+            return None
+        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+
+        entry = PreprocessedImage(key, image, gray, on_resize=self._account)
+        with self._lock:
+            # Otro thread pudo decodificar la misma imagen a la vez
+            existing = self._entries.get(key)
+            if existing is not None:
+                return existing
+            if self.max_bytes:
+                self._entries[key] = entry
+                self._sizes[key] = 0
+        self._account(entry)
+        return entry
+
+    def _account(self, entry: PreprocessedImage) -> None:
+        """Actualiza el tamaño de una entrada y expulsa las más antiguas si hace falta."""
+        size = entry.nbytes
+        with self._lock:
+            if entry.key not in self._sizes:
+                return
+            self._bytes_used += size - self._sizes[entry.key]
+            self._sizes[entry.key] = size
+            while self._entries and self._bytes_used > self.max_bytes:
+                key, _ = self._entries.popitem(last=False)
+                self._bytes_used -= self._sizes.pop(key)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Vacía la caché."""
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self._bytes_used = 0
+
+    def __len__(self) -> int:
+        """Número de imágenes en caché."""
+        with self._lock:
+            return len(self._entries)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Obtiene las estadísticas de la caché.
+
+        Returns:
+            Diccionario con entradas, memoria usada, aciertos y fallos
+        """
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes_used": self._bytes_used,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 3) if total else 0.0,
+                "evictions": self.evictions
+            }
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Control adaptativo de la tasa de muestreo del procesamiento de video.
+Responsabilidad única: Ajustar los intervalos de captura y análisis según la carga medida.
+"""
+
+import threading
+import time
+import logging
+from collections import deque
+from typing import Dict, Any, Optional, List
+
+logger = logging.getLogger(__name__)
+
+
+class AdaptiveRateController:
+    """
+    Controlador de tasa multiplicativo para ``VideoProcessor``.
+
+    Mide los fps de la fuente, el coste de almacenar y codificar cada frame,
+    la latencia extremo a extremo de cada análisis (captura → resultado) y
+    la ocupación del worker de análisis. Tras cada análisis decide si hay
+    que reducir la tasa (multiplicar los intervalos por ``BACKOFF_FACTOR``)
+    o recuperarla (multiplicarlos por ``RECOVERY_FACTOR``) para mantener la
+    latencia objetivo. Ambos ajustes son multiplicativos: la recuperación
+    es más lenta que el retroceso, pero no es un incremento aditivo (AIMD).
+
+    El controlador no guarda intervalos absolutos sino factores de escala
+    sobre los intervalos configurados en el procesador, de modo que el
+    intervalo de análisis nunca baja del configurado y el de muestreo de
+    frames se mueve entre ``min_frame_scale`` y ``max_frame_scale``.
+    """
+
+    BACKOFF_FACTOR = 1.5
+    RECOVERY_FACTOR = 0.8
+
+    def __init__(self, target_latency: float = 8.0, tolerance: float = 0.2,
+                 min_frame_scale: float = 0.5, max_frame_scale: float = 5.0,
+                 max_analysis_scale: float = 4.0, smoothing: float = 0.3,
+                 history_size: int = 50, enabled: bool = True):
+        """
+        Inicializa el controlador de tasa.
+
+        Args:
+            target_latency: Latencia extremo a extremo objetivo en segundos
+            tolerance: Margen relativo alrededor del objetivo sin cambios
+            min_frame_scale: Factor mínimo sobre el intervalo de frames
+            max_frame_scale: Factor máximo sobre el intervalo de frames
+            max_analysis_scale: Factor máximo sobre el intervalo de análisis
+            smoothing: Peso de la última muestra en las medias móviles
+            history_size: Número de decisiones conservadas
+            enabled: Si es False solo se miden métricas, sin ajustar tasas
+        """
+        self.target_latency = target_latency
+        self.tolerance = tolerance
+        self.min_frame_scale = min_frame_scale
+        self.max_frame_scale = max_frame_scale
+        self.max_analysis_scale = max_analysis_scale
+        self.smoothing = smoothing
+        self.enabled = enabled
+        self.frame_scale = 1.0
+        self.analysis_scale = 1.0
+        self._metrics: Dict[str, Optional[float]] = {
+            "frame_cost": None, "encode_time": None,
+            "analysis_latency": None, "analysis_duration": None
+        }
+        self._read_times = deque(maxlen=30)
+        self._decisions = deque(maxlen=history_size)
+        self._lock = threading.Lock()
+
+    def record_frame_read(self, timestamp: float) -> None:
+        """Registra la lectura de un frame de la fuente (para sus fps)."""
+        self._read_times.append(timestamp)
+
+    def record_frame_cost(self, duration: float) -> None:
+        """Registra el tiempo de almacenar y publicar un frame."""
+        self._update_metric("frame_cost", duration)
+
+    def record_encode(self, duration: float) -> None:
+        """Registra el tiempo de codificación JPEG/base64 de un frame."""
+        self._update_metric("encode_time", duration)
+
+    def record_analysis(self, latency: float, duration: float) -> None:
+        """
+        Registra un análisis completado.
+
+        Args:
+            latency: Segundos desde la captura del frame hasta el resultado
+            duration: Segundos que tardó la llamada al analizador
+        """
+        self._update_metric("analysis_latency", latency)
+        self._update_metric("analysis_duration", duration)
+
+    def _update_metric(self, name: str, value: float) -> None:
+        """Actualiza la media móvil exponencial de una métrica."""
+        with self._lock:
+            previous = self._metrics[name]
+            self._metrics[name] = value if previous is None else (
+                self.smoothing * value + (1 - self.smoothing) * previous
+            )
+
+    def adjust(self, frame_interval: float,
+               analysis_interval: float) -> Optional[Dict[str, Any]]:
+        """
+        Decide un cambio de tasa a partir de las métricas actuales.
+
+        Args:
+            frame_interval: Intervalo de frames configurado en el procesador
+            analysis_interval: Intervalo de análisis configurado en el procesador
+
+        Returns:
+            Decisión tomada o None si la tasa se mantiene
+        """
+        if not self.enabled:
+            return None
+
+        with self._lock:
+            pressure = self._pressure_reasons(frame_interval, analysis_interval)
+            if pressure:
+                return self._apply(pressure, self.BACKOFF_FACTOR,
+                                   frame_interval, analysis_interval)
+            if self._has_headroom(analysis_interval):
+                return self._apply(["headroom"], self.RECOVERY_FACTOR,
+                                   frame_interval, analysis_interval)
+        return None
+
+    def _pressure_reasons(self, frame_interval: float, analysis_interval: float) -> List[str]:
+        """Lista los motivos para reducir la tasa (requiere el lock adquirido)."""
+        reasons = []
+        latency = self._metrics["analysis_latency"]
+        if latency is not None and latency > self.target_latency * (1 + self.tolerance):
+            reasons.append("latency")
+        if self._occupancy(analysis_interval) > 0.8:
+            reasons.append("analysis_occupancy")
+        frame_cost = (self._metrics["frame_cost"] or 0.0) + (self._metrics["encode_time"] or 0.0)
+        if frame_cost > 0.5 * frame_interval * self.frame_scale:
+            reasons.append("frame_cost")
+        return reasons
+
+    def _has_headroom(self, analysis_interval: float) -> bool:
+        """Indica si hay margen para aumentar la tasa (requiere el lock adquirido)."""
+        latency = self._metrics["analysis_latency"]
+        if latency is None or latency > self.target_latency * (1 - self.tolerance):
+            return False
+        if self._occupancy(analysis_interval) > 0.5:
+            return False
+        return self.frame_scale > self.min_frame_scale or self.analysis_scale > 1.0
+
+    def _occupancy(self, analysis_interval: float) -> float:
+        """Fracción del intervalo de análisis que el worker pasa ocupado."""
+        duration = self._metrics["analysis_duration"]
+        if duration is None:
+            return 0.0
+        return duration / (analysis_interval * self.analysis_scale)
+
+    def _apply(self, reasons: List[str], factor: float, frame_interval: float,
+               analysis_interval: float) -> Optional[Dict[str, Any]]:
+        """Aplica un factor a las escalas y registra la decisión."""
+        frame_scale = min(max(self.frame_scale * factor, self.min_frame_scale),
+                          self.max_frame_scale)
+        analysis_scale = min(max(self.analysis_scale * factor, 1.0),
+                             self.max_analysis_scale)
+        if (frame_scale, analysis_scale) == (self.frame_scale, self.analysis_scale):
+            return None
+
+        self.frame_scale, self.analysis_scale = frame_scale, analysis_scale
+        decision = {
+            "timestamp": time.time(),
+            "action": "decrease_rate" if factor > 1 else "increase_rate",
+            "reasons": reasons,
+            "frame_interval": round(frame_interval * frame_scale, 3),
+            "analysis_interval": round(analysis_interval * analysis_scale, 3),
+            "analysis_latency": self._metrics["analysis_latency"]
+        }
+        self._decisions.append(decision)
+        logger.info(f"Tasa de video ajustada ({decision['action']}): {', '.join(reasons)}")
+        return decision
+
+    def get_source_fps(self) -> float:
+        """Calcula los fps de lectura de la fuente en la ventana reciente."""
+        read_times = list(self._read_times)
+        if len(read_times) < 2:
+            return 0.0
+        elapsed = read_times[-1] - read_times[0]
+        return (len(read_times) - 1) / elapsed if elapsed > 0 else 0.0
+
+    def get_decisions(self) -> List[Dict[str, Any]]:
+        """Obtiene el historial reciente de decisiones de tasa."""
+        with self._lock:
+            return list(self._decisions)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Obtiene las métricas y el estado del controlador.
+
+        Returns:
+            Diccionario con escalas, medias móviles y última decisión
+        """
+        with self._lock:
+            metrics = {name: None if value is None else round(value, 4)
+                       for name, value in self._metrics.items()}
+            last_decision = self._decisions[-1] if self._decisions else None
+            stats = {
+                "enabled": self.enabled,
+                "target_latency": self.target_latency,
+                "frame_scale": round(self.frame_scale, 3),
+                "analysis_scale": round(self.analysis_scale, 3),
+                "decisions": len(self._decisions),
+                "last_decision": last_decision
+            }
+        stats.update(metrics)
+        stats["source_fps"] = round(self.get_source_fps(), 2)
+        return stats
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Índice espacial de las imágenes de referencia.
+Responsabilidad única: Encontrar las referencias más cercanas a unas coordenadas GPS.
+"""
+
+import math
+import threading
+import logging
+from typing import Dict, Any, Optional, List, Tuple, Set
+
+from src.models.mission_utils import calculate_distance
+
+logger = logging.getLogger(__name__)
+
+METERS_PER_DEGREE = 111320.0
+
+Cell = Tuple[int, int]
+
+
+class ReferenceSpatialIndex:
+    """
+    Rejilla de celdas de latitud/longitud con las referencias de cada celda.
+
+    Una búsqueda por radio solo visita las celdas que cubren el rectángulo
+    del radio y calcula la distancia haversine de las referencias que
+    contienen, de modo que el coste depende de la densidad local y no del
+    número total de referencias de la patrulla.
+    """
+
+    def __init__(self, cell_size_m: float = 250.0):
+        """
+        Inicializa el índice espacial.
+
+        Args:
+            cell_size_m: Lado aproximado de cada celda en metros
+        """
+        if cell_size_m <= 0:
+            raise ValueError("El tamaño de celda debe ser positivo")
+
+        self.cell_size_m = cell_size_m
+        self._cell_degrees = cell_size_m / METERS_PER_DEGREE
+        self._cells: Dict[Cell, Set[str]] = {}
+        self._positions: Dict[str, Tuple[float, float]] = {}
+        self._lock = threading.Lock()
+
+    def insert(self, location_id: str, latitude: float, longitude: float) -> None:
+        """
+        Añade o mueve una referencia en el índice.
+
+        Args:
+            location_id: ID de la referencia
+            latitude: Latitud en grados
+            longitude: Longitud en grados
+        """
+        with self._lock:
+            self._discard(location_id)
+            self._positions[location_id] = (latitude, longitude)
+            self._cells.setdefault(self._cell_of(latitude, longitude), set()).add(location_id)
+
+    def remove(self, location_id: str) -> bool:
+        """
+        Elimina una referencia del índice.
+
+        Args:
+            location_id: ID de la referencia
+
+        Returns:
+            True si estaba indexada
+        """
+        with self._lock:
+            return self._discard(location_id)
+
+    def nearest(self, latitude: float, longitude: float, radius_m: float,
+                max_results: Optional[int] = 1) -> List[Tuple[str, float]]:
+        """
+        Busca las referencias más cercanas dentro de un radio.
+
+        Args:
+            latitude: Latitud de la captura
+            longitude: Longitud de la captura
+            radius_m: Distancia máxima en metros
+            max_results: Número máximo de resultados (None = todos)
+
+        Returns:
+            Lista de (location_id, distancia en metros) ordenada por distancia
+        """
+        with self._lock:
+            candidates = [
+                (location_id, self._positions[location_id])
+                for cell in self._cells_in_radius(latitude, longitude, radius_m)
+                for location_id in self._cells[cell]
+            ]
+
+        matches = []
+        for location_id, position in candidates:
+            distance = calculate_distance((latitude, longitude), position)
+            if distance <= radius_m:
+                matches.append((location_id, distance))
+        matches.sort(key=lambda match: match[1])
+        return matches if max_results is None else matches[:max_results]
+
+    def __len__(self) -> int:
+        """Número de referencias indexadas."""
+        with self._lock:
+            return len(self._positions)
+
+    def _discard(self, location_id: str) -> bool:
+        """Quita una referencia de su celda (requiere el lock)."""
+        position = self._positions.pop(location_id, None)
+        if position is None:
+            return False
+        cell = self._cell_of(*position)
+        members = self._cells.get(cell)
+        if members is not None:
+            members.discard(location_id)
+            if not members:
+                del self._cells[cell]
+        return True
+
+    def _cell_of(self, latitude: float, longitude: float) -> Cell:
+        """Celda de la rejilla que contiene unas coordenadas."""
+        return (math.floor(latitude / self._cell_degrees),
+                math.floor(longitude / self._cell_degrees))
+
+    def _cells_in_radius(self, latitude: float, longitude: float, radius_m: float) -> List[Cell]:
+        """Celdas ocupadas dentro del rectángulo envolvente de un radio (requiere el lock)."""
+        lat_span = radius_m / METERS_PER_DEGREE
+        # Los grados de longitud se estrechan con la latitud
+        cos_lat = max(math.cos(math.radians(latitude)), 1e-6)
+        lon_span = min(radius_m / (METERS_PER_DEGREE * cos_lat), 180.0)
+
+        min_cell = self._cell_of(latitude - lat_span, longitude - lon_span)
+        max_cell = self._cell_of(latitude + lat_span, longitude + lon_span)
+        rows = range(min_cell[0], max_cell[0] + 1)
+        columns = range(min_cell[1], max_cell[1] + 1)
+
+        # Radios enormes: recorrer las celdas ocupadas es más barato que el rectángulo
+        if len(rows) * len(columns) > len(self._cells):
+            return [cell for cell in self._cells if cell[0] in rows and cell[1] in columns]
+        return [(i, j) for i in rows for j in columns if (i, j) in self._cells]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Obtiene las estadísticas del índice.
+
+        Returns:
+            Diccionario con referencias, celdas ocupadas y tamaño de celda
+        """
+        with self._lock:
+            return {
+                "references": len(self._positions),
+                "occupied_cells": len(self._cells),
+                "cell_size_m": self.cell_size_m
+            }
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Almacén persistente de imágenes de referencia para la detección de cambios.
+Responsabilidad única: Guardar referencias preprocesadas en disco y servirlas mapeadas en memoria.
+"""
+
+import os
+import re
+import json
+import threading
+import logging
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from typing import Dict, Any, Optional, Iterator
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILENAME = "index.json"
+
+
+class ReferenceImageStore(MutableMapping):
+    """
+    Diccionario de referencias por ubicación respaldado en disco.
+
+    Cada array de una referencia (imagen suavizada, original, nivel grueso)
+    se guarda como ``.npy`` y se abre con ``np.load(mmap_mode="r")``, de
+    modo que solo las páginas que se leen ocupan memoria. Los datos
+    ligeros (coordenadas, metadatos) viven en un índice JSON por
+    ubicación que se recarga al arrancar. Las referencias abiertas
+    recientemente se mantienen en un LRU de ``cache_size`` entradas.
+
+    Sin ``directory`` se comporta como un diccionario en memoria.
+    """
+
+    def __init__(self, directory: Optional[str] = None, cache_size: int = 32):
+        """
+        Inicializa el almacén de referencias.
+
+        Args:
+            directory: Directorio de persistencia (None = solo en memoria)
+            cache_size: Referencias abiertas que se mantienen en el LRU
+        """
+        if cache_size < 1:
+            raise ValueError("El tamaño de la caché debe ser al menos 1")
+
+        self.directory = directory
+        self.cache_size = cache_size
+        self._index: Dict[str, Dict[str, Any]] = {}
+        self._memory: Dict[str, Dict[str, Any]] = {}
+        self._cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.RLock()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+            self._index = self._load_index()
+            logger.info(f"Almacén de referencias cargado: {len(self._index)} ubicaciones")
+
+    @property
+    def persistent(self) -> bool:
+        """Indica si las referencias se guardan en disco."""
+        return self.directory is not None
+
+    def __getitem__(self, location_id: str) -> Dict[str, Any]:
+        """Obtiene una referencia, abriendo sus arrays mapeados si no está en el LRU."""
+        with self._lock:
+            if not self.persistent:
+                return self._memory[location_id]
+
+            entry = self._cache.get(location_id)
+            if entry is not None:
+                self._cache.move_to_end(location_id)
+                self.cache_hits += 1
+                return entry
+
+            record = self._index[location_id]
+            self.cache_misses += 1
+            entry = dict(record["fields"])
+            for name, filename in record["arrays"].items():
+                entry[name] = np.load(os.path.join(self.directory, filename), mmap_mode="r")
+            self._remember(location_id, entry)
+            return entry
+
+    def __setitem__(self, location_id: str, reference: Dict[str, Any]) -> None:
+        """Guarda una referencia completa (arrays en ``.npy``, resto en el índice)."""
+        with self._lock:
+            if not self.persistent:
+                self._memory[location_id] = dict(reference)
+                return
+
+            self._delete_files(location_id)
+            arrays, fields = {}, {}
+            for name, value in reference.items():
+                if isinstance(value, np.ndarray):
+                    arrays[name] = self._save_array(location_id, name, value)
+                else:
+                    fields[name] = value
+            self._index[location_id] = {"fields": fields, "arrays": arrays}
+            self._cache.pop(location_id, None)
+            self._save_index()
+
+    def set_array(self, location_id: str, name: str, array: np.ndarray) -> None:
+        """
+        Añade o reemplaza un único array de una referencia existente.
+
+        Args:
+            location_id: ID de la ubicación
+            name: Nombre del array (por ejemplo ``coarse``)
+            array: Datos a guardar
+
+        Raises:
+            KeyError: Si la ubicación no existe
+        """
+        with self._lock:
+            if not self.persistent:
+                self._memory[location_id][name] = array
+                return
+
+            record = self._index[location_id]
+            record["arrays"][name] = self._save_array(location_id, name, array)
+            self._save_index()
+            entry = self._cache.get(location_id)
+            if entry is not None:
+                entry[name] = np.load(os.path.join(self.directory, record["arrays"][name]),
+                                      mmap_mode="r")
+
+    def __delitem__(self, location_id: str) -> None:
+        """Elimina una referencia y sus ficheros."""
+        with self._lock:
+            if not self.persistent:
+                del self._memory[location_id]
+                return
+
+            if location_id not in self._index:
+                raise KeyError(location_id)
+            self._delete_files(location_id)
+            del self._index[location_id]
+            self._cache.pop(location_id, None)
+            self._save_index()
+
+    def __iter__(self) -> Iterator[str]:
+        """Itera sobre los IDs de ubicación."""
+        with self._lock:
+            keys = list(self._index if self.persistent else self._memory)
+        return iter(keys)
+
+    def __len__(self) -> int:
+        """Número de referencias almacenadas."""
+        with self._lock:
+            return len(self._index if self.persistent else self._memory)
+
+    def __contains__(self, location_id: object) -> bool:
+        """Comprueba si existe una referencia sin abrir sus arrays."""
+        with self._lock:
+            return location_id in (self._index if self.persistent else self._memory)
+
+    def get_fields(self, location_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Obtiene los datos ligeros de una referencia sin abrir sus arrays.
+
+        Args:
+            location_id: ID de la ubicación
+
+        Returns:
+            Diccionario con coordenadas, metadatos, etc. o None si no existe
+        """
+        with self._lock:
+            if not self.persistent:
+                reference = self._memory.get(location_id)
+                if reference is None:
+                    return None
+                return {k: v for k, v in reference.items() if not isinstance(v, np.ndarray)}
+            record = self._index.get(location_id)
+            return dict(record["fields"]) if record else None
+
+    def _remember(self, location_id: str, entry: Dict[str, Any]) -> None:
+        """Añade una referencia abierta al LRU (requiere el lock)."""
+        self._cache[location_id] = entry
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def _save_array(self, location_id: str, name: str, array: np.ndarray) -> str:
+        """Guarda un array como ``.npy`` y devuelve su nombre de fichero."""
+        filename = f"{self._safe_name(location_id)}_{name}.npy"
+        np.save(os.path.join(self.directory, filename), np.ascontiguousarray(array))
+        return filename
+
+    def _delete_files(self, location_id: str) -> None:
+        """Borra los ficheros de arrays de una referencia (requiere el lock)."""
+        record = self._index.get(location_id)
+        if record is None:
+            return
+        self._cache.pop(location_id, None)
+        for filename in record["arrays"].values():
+            try:
+                os.remove(os.path.join(self.directory, filename))
+            except FileNotFoundError:
+                pass
+
+    @staticmethod
+    def _safe_name(location_id: str) -> str:
+        """Convierte un ID de ubicación en un nombre de fichero seguro."""
+        return re.sub(r"[^A-Za-z0-9_.-]", "_", location_id)
+
+    def _load_index(self) -> Dict[str, Dict[str, Any]]:
+        """Carga el índice de referencias del disco."""
+        path = os.path.join(self.directory, INDEX_FILENAME)
+        if not os.path.exists(path):
+            return {}
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.error(f"Índice de referencias ilegible, se empieza vacío: {str(e)}")
+            return {}
+
+    def _save_index(self) -> None:
+        """Escribe el índice de forma atómica (requiere el lock)."""
+        path = os.path.join(self.directory, INDEX_FILENAME)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(self._index, f, ensure_ascii=False, default=str)
+        os.replace(temp_path, path)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Obtiene las estadísticas del almacén.
+
+        Returns:
+            Diccionario con referencias, entradas en caché y aciertos
+        """
+        with self._lock:
+            return {
+                "references": len(self),
+                "persistent": self.persistent,
+                "cached": len(self._cache),
+                "cache_size": self.cache_size,
+                "cache_hits": self.cache_hits,
+                "cache_misses": self.cache_misses
+            }
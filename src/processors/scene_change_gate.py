@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Filtro previo de cambio de escena para el análisis de video.
+Responsabilidad única: Decidir si un frame difiere lo bastante del último analizado.
+"""
+
+import cv2
+import numpy as np
+import threading
+import logging
+from dataclasses import dataclass
+from typing import Dict, Any, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SceneSignature:
+    """
+    Firma compacta de un frame.
+    Combina un hash perceptual de diferencias (dHash) y una miniatura en grises.
+    """
+    hash_bits: np.ndarray
+    thumbnail: np.ndarray
+
+
+class SceneChangeGate:
+    """
+    Compuerta barata previa a la llamada al modelo de visión.
+
+    Cada frame se reduce a una miniatura en grises de pocos píxeles de la
+    que se obtienen un dHash de 64 bits y la diferencia media absoluta con
+    la miniatura del último frame analizado. Si ninguna de las dos métricas
+    supera su umbral, la escena se considera la misma y se puede reutilizar
+    el resultado anterior, como mucho durante ``max_reuse_age`` segundos.
+    """
+
+    HASH_SIZE = 8
+
+    def __init__(self, hash_threshold: int = 6, difference_threshold: float = 8.0,
+                 max_reuse_age: float = 60.0, thumbnail_size: int = 32):
+        """
+        Inicializa la compuerta de cambio de escena.
+
+        Args:
+            hash_threshold: Bits distintos del dHash a partir de los que hay cambio
+            difference_threshold: Diferencia media de grises (0-255) que indica cambio
+            max_reuse_age: Segundos máximos que se reutiliza un mismo análisis
+            thumbnail_size: Lado de la miniatura usada para comparar
+        """
+        self.hash_threshold = hash_threshold
+        self.difference_threshold = difference_threshold
+        self.max_reuse_age = max_reuse_age
+        self.thumbnail_size = thumbnail_size
+        self._reference: Optional[SceneSignature] = None
+        self._reference_time = 0.0
+        self._lock = threading.Lock()
+        self.frames_evaluated = 0
+        self.scene_changes = 0
+        self.unchanged_frames = 0
+        self.last_hash_distance: Optional[int] = None
+        self.last_mean_difference: Optional[float] = None
+
+    def compute_signature(self, frame: np.ndarray) -> SceneSignature:
+        """
+        Calcula la firma de un frame BGR o en escala de grises.
+
+        Args:
+            frame: Frame crudo
+
+        Returns:
+            Firma con el dHash y la miniatura del frame
+        """
+        size = (self.thumbnail_size, self.thumbnail_size)
+        # Reducir primero: la conversión a grises se hace sobre pocos píxeles
+        small = cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+        if small.ndim == 3:
+            small = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+
+        hash_image = cv2.resize(
+            small, (self.HASH_SIZE + 1, self.HASH_SIZE), interpolation=cv2.INTER_AREA
+        )
+        hash_bits = (hash_image[:, 1:] > hash_image[:, :-1]).ravel()
+        return SceneSignature(hash_bits=hash_bits, thumbnail=small)
+
+    def evaluate(self, frame: np.ndarray, current_time: float) -> Tuple[bool, SceneSignature]:
+        """
+        Determina si un frame requiere un análisis nuevo.
+
+        Args:
+            frame: Frame crudo candidato
+            current_time: Instante actual
+
+        Returns:
+            Tupla (requiere_análisis, firma_del_frame)
+        """
+        signature = self.compute_signature(frame)
+        with self._lock:
+            self.frames_evaluated += 1
+            changed = self._is_scene_changed(signature, current_time)
+            if changed:
+                self.scene_changes += 1
+            else:
+                self.unchanged_frames += 1
+        return changed, signature
+
+    def _is_scene_changed(self, signature: SceneSignature, current_time: float) -> bool:
+        """Compara la firma con la referencia (requiere el lock adquirido)."""
+        if self._reference is None:
+            return True
+        if current_time - self._reference_time > self.max_reuse_age:
+            return True
+
+        self.last_hash_distance = int(
+            np.count_nonzero(signature.hash_bits != self._reference.hash_bits)
+        )
+        self.last_mean_difference = float(
+            np.mean(cv2.absdiff(signature.thumbnail, self._reference.thumbnail))
+        )
+        return (self.last_hash_distance > self.hash_threshold
+                or self.last_mean_difference > self.difference_threshold)
+
+    def record_analysis(self, signature: SceneSignature, current_time: float) -> None:
+        """
+        Registra la firma del último frame analizado como nueva referencia.
+
+        Args:
+            signature: Firma del frame analizado
+            current_time: Instante del análisis
+        """
+        with self._lock:
+            self._reference = signature
+            self._reference_time = current_time
+
+    def reset(self) -> None:
+        """Olvida la referencia para forzar el análisis del próximo frame."""
+        with self._lock:
+            self._reference = None
+            self._reference_time = 0.0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Obtiene las estadísticas de la compuerta.
+
+        Returns:
+            Diccionario con frames evaluados, cambios detectados y frames sin cambio
+        """
+        with self._lock:
+            return {
+                "frames_evaluated": self.frames_evaluated,
+                "scene_changes": self.scene_changes,
+                "unchanged_frames": self.unchanged_frames,
+                "last_hash_distance": self.last_hash_distance,
+                "last_mean_difference": (
+                    None if self.last_mean_difference is None
+                    else round(self.last_mean_difference, 2)
+                )
+            }
@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Gestor de múltiples streams de video concurrentes.
+Responsabilidad única: Orquestar la captura de N drones y repartir el análisis.
+"""
+
+import threading
+import time
+import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, Future
+from dataclasses import dataclass, field
+from typing import Dict, Any, Optional, List, Tuple, Set
+
+from src.models.geo_analyzer import GeoAnalyzer
+from src.processors.video_processor import VideoProcessor, STOP_TIMEOUT
+from src.processors.capture_backends import CaptureBackend
+from src.processors.mjpeg_streamer import MjpegStreamer
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ManagedStream:
+    """
+    Estado de un stream gestionado.
+    Agrupa el procesador de captura y los contadores de planificación.
+    """
+    stream_id: str
+    stream_url: str
+    processor: VideoProcessor
+    preview: MjpegStreamer
+    started_at: float = field(default_factory=time.time)
+    last_analysis_time: float = 0.0
+    waiting_for_worker: bool = False
+    analyses_deferred: int = 0
+    analysis_errors: int = 0
+
+
+class VideoStreamManager:
+    """
+    Gestor de streams de video de una flota de drones.
+
+    Cada stream tiene su propio bucle de captura (``VideoProcessor``) y
+    todos comparten un pool acotado de workers de análisis. La planificación
+    es round-robin con como máximo un análisis en curso por stream, de modo
+    que un stream con mucho tráfico no acapara los workers.
+    """
+
+    def __init__(self, analyzer: GeoAnalyzer, max_workers: int = 4,
+                 analysis_interval: float = 5, max_streams: int = 16,
+                 capture_backend: Optional[CaptureBackend] = None):
+        """
+        Inicializa el gestor de streams.
+
+        Args:
+            analyzer: Analizador geográfico compartido por todos los streams
+            max_workers: Tamaño del pool de análisis compartido
+            analysis_interval: Intervalo mínimo entre análisis de un stream
+            max_streams: Número máximo de streams simultáneos
+            capture_backend: Backend de captura compartido por todos los streams
+        """
+        self.analyzer = analyzer
+        self.max_workers = max_workers
+        self.analysis_interval = analysis_interval
+        self.max_streams = max_streams
+        self.capture_backend = capture_backend
+        self._streams: Dict[str, ManagedStream] = {}
+        # Streams reservados cuya captura se está arrancando fuera del lock
+        self._starting: Set[str] = set()
+        self._schedule_order = deque()
+        self._in_flight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._scheduler_thread: Optional[threading.Thread] = None
+        self._running = False
+        logger.info(f"Gestor de streams inicializado ({max_workers} workers)")
+
+    def start_stream(self, stream_id: str, stream_url: str) -> bool:
+        """
+        Inicia la captura de un nuevo stream.
+
+        Args:
+            stream_id: Identificador del stream (por ejemplo, el ID del dron)
+            stream_url: URL del stream de video
+
+        Returns:
+            True si el stream se inició correctamente
+        """
+        # Reservar el hueco antes de arrancar la captura (que se hace sin el lock)
+        with self._lock:
+            if stream_id in self._streams or stream_id in self._starting:
+                logger.warning(f"El stream {stream_id} ya está activo")
+                return False
+            if len(self._streams) + len(self._starting) >= self.max_streams:
+                logger.error(f"Límite de streams alcanzado ({self.max_streams})")
+                return False
+            self._starting.add(stream_id)
+
+        try:
+            processor = self._create_processor()
+            started = processor.start_capture(stream_url)
+        except Exception:
+            with self._lock:
+                self._starting.discard(stream_id)
+            raise
+
+        with self._lock:
+            self._starting.discard(stream_id)
+            if not started:
+                return False
+            self._streams[stream_id] = ManagedStream(
+                stream_id, stream_url, processor, MjpegStreamer(processor)
+            )
+            self._schedule_order.append(stream_id)
+        self._ensure_scheduler()
+
+        logger.info(f"Stream {stream_id} iniciado: {stream_url}")
+        return True
+
+    def _create_processor(self) -> VideoProcessor:
+        """Crea un procesador de captura que despierta al planificador."""
+        processor = VideoProcessor(self.analyzer, self.analysis_interval,
+                                   capture_backend=self.capture_backend)
+        processor.frame_listener = lambda _sequence: self._wakeup.set()
+        return processor
+
+    def stop_stream(self, stream_id: str, timeout: float = STOP_TIMEOUT) -> bool:
+        """
+        Detiene un stream activo.
+
+        Args:
+            stream_id: Identificador del stream
+            timeout: Tiempo máximo de espera por thread de captura y análisis
+
+        Returns:
+            True si el stream existía y se detuvo
+        """
+        with self._lock:
+            stream = self._streams.pop(stream_id, None)
+            if stream is None:
+                return False
+            self._schedule_order.remove(stream_id)
+
+        stream.processor.stop_processing(timeout)
+        logger.info(f"Stream {stream_id} detenido")
+        return True
+
+    def list_streams(self) -> List[Dict[str, Any]]:
+        """
+        Lista los streams activos con sus estadísticas.
+
+        Returns:
+            Lista de diccionarios con el estado de cada stream
+        """
+        with self._lock:
+            stream_ids = list(self._streams.keys())
+        stats = [self.get_stream_stats(stream_id) for stream_id in stream_ids]
+        return [entry for entry in stats if entry is not None]
+
+    def get_stream_stats(self, stream_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Obtiene las estadísticas de un stream.
+
+        Args:
+            stream_id: Identificador del stream
+
+        Returns:
+            Diccionario con fps, profundidad de cola y contadores, o None
+        """
+        with self._lock:
+            stream = self._streams.get(stream_id)
+            if stream is None:
+                return None
+            analysis_in_flight = stream_id in self._in_flight
+
+        stats = stream.processor.get_stream_stats()
+        stats.update({
+            "stream_id": stream_id,
+            "uptime": round(time.time() - stream.started_at, 1),
+            "analysis_in_flight": analysis_in_flight,
+            "analyses_deferred": stream.analyses_deferred,
+            "analysis_errors": stream.analysis_errors,
+            "preview": stream.preview.get_stats()
+        })
+        return stats
+
+    def get_last_analysis(self, stream_id: str) -> Optional[Dict[str, Any]]:
+        """Obtiene el último análisis de un stream."""
+        with self._lock:
+            stream = self._streams.get(stream_id)
+        return stream.processor.get_last_analysis() if stream else None
+
+    def get_last_detections(self, stream_id: str) -> Optional[Dict[str, Any]]:
+        """Obtiene las últimas detecciones YOLO de un stream."""
+        with self._lock:
+            stream = self._streams.get(stream_id)
+        return stream.processor.get_last_detections() if stream else None
+
+    def get_analysis_history(self, stream_id: str, start: Optional[float] = None,
+                             end: Optional[float] = None, limit: Optional[int] = None,
+                             include_thumbnails: bool = False) -> Optional[List[Dict[str, Any]]]:
+        """Obtiene el historial de análisis de un stream en un rango de tiempo."""
+        with self._lock:
+            stream = self._streams.get(stream_id)
+        if stream is None:
+            return None
+        return stream.processor.get_analysis_history(start, end, limit, include_thumbnails)
+
+    def get_last_frame(self, stream_id: str) -> Optional[bytes]:
+        """Obtiene el último frame JPEG de un stream."""
+        with self._lock:
+            stream = self._streams.get(stream_id)
+        return stream.processor.get_last_frame() if stream else None
+
+    def get_preview(self, stream_id: str) -> Optional[MjpegStreamer]:
+        """Obtiene el emisor MJPEG compartido de un stream."""
+        with self._lock:
+            stream = self._streams.get(stream_id)
+        return stream.preview if stream else None
+
+    def shutdown(self, timeout: float = STOP_TIMEOUT) -> None:
+        """
+        Detiene todos los streams, el planificador y el pool de workers.
+
+        No espera a los análisis en curso: los pendientes se cancelan y los
+        que ya se están ejecutando terminan en segundo plano.
+
+        Args:
+            timeout: Tiempo máximo de espera por cada thread que se detiene
+        """
+        with self._lock:
+            stream_ids = list(self._streams.keys())
+            in_flight = len(self._in_flight)
+        for stream_id in stream_ids:
+            self.stop_stream(stream_id, timeout)
+
+        self._running = False
+        self._wakeup.set()
+        if self._scheduler_thread:
+            self._scheduler_thread.join(timeout)
+            if self._scheduler_thread.is_alive():
+                logger.warning("El planificador de streams sigue finalizando")
+        if self._executor:
+            if in_flight:
+                logger.warning(f"{in_flight} análisis en curso terminarán en segundo plano")
+            self._executor.shutdown(wait=False, cancel_futures=True)
+        self._scheduler_thread = None
+        self._executor = None
+        logger.info("Gestor de streams detenido")
+
+    def _ensure_scheduler(self) -> None:
+        """Arranca el pool y el planificador la primera vez que hacen falta."""
+        with self._lock:
+            if self._running:
+                return
+            self._running = True
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="stream-analysis"
+            )
+            self._scheduler_thread = threading.Thread(
+                target=self._run_scheduler, daemon=True
+            )
+            self._scheduler_thread.start()
+
+    def _run_scheduler(self) -> None:
+        """Bucle del planificador: reparte análisis cuando hay frames o vence un intervalo."""
+        while self._running:
+            self._wakeup.clear()
+            timeout = self._schedule_ready_streams(time.time())
+            self._wakeup.wait(timeout)
+
+    def _schedule_ready_streams(self, now: float) -> float:
+        """
+        Envía al pool los streams listos en orden round-robin.
+
+        El stream atendido pasa al final de la cola, por lo que cuando el
+        pool está saturado el siguiente hueco libre es para el stream que
+        lleva más tiempo sin ser atendido.
+
+        Args:
+            now: Instante actual
+
+        Returns:
+            Segundos hasta el próximo vencimiento de intervalo
+        """
+        next_due = self.analysis_interval
+        submitted: List[Tuple[str, Future]] = []
+        with self._lock:
+            for stream_id in list(self._schedule_order):
+                wait = self._try_schedule(self._streams[stream_id], now, submitted)
+                next_due = min(next_due, wait)
+
+        # Fuera del lock: si el análisis ya terminó, el callback se ejecuta
+        # en este mismo thread y necesita tomar el lock
+        for stream_id, future in submitted:
+            future.add_done_callback(
+                lambda done, stream_id=stream_id: self._on_analysis_done(stream_id, done)
+            )
+        return max(next_due, 0.01)
+
+    def _try_schedule(self, stream: ManagedStream, now: float,
+                      submitted: List[Tuple[str, Future]]) -> float:
+        """
+        Intenta planificar un stream (requiere el lock).
+
+        Args:
+            stream: Stream a planificar
+            now: Instante actual
+            submitted: Lista donde se añade (stream_id, future) si se envía al pool
+
+        Returns:
+            Espera hasta que el stream esté listo
+        """
+        # Cada procesador adapta su propio intervalo a la carga medida
+        interval = stream.processor.get_analysis_interval()
+        remaining = stream.last_analysis_time + interval - now
+        if remaining > 0:
+            return remaining
+        if stream.stream_id in self._in_flight:
+            return interval
+        if not stream.processor.has_pending_frame():
+            return interval
+        if len(self._in_flight) >= self.max_workers:
+            self._mark_deferred(stream)
+            return interval
+
+        stream.last_analysis_time = now
+        stream.waiting_for_worker = False
+        self._schedule_order.remove(stream.stream_id)
+        self._schedule_order.append(stream.stream_id)
+        future = self._executor.submit(stream.processor.analyze_latest_frame)
+        self._in_flight[stream.stream_id] = future
+        submitted.append((stream.stream_id, future))
+        return interval
+
+    def _mark_deferred(self, stream: ManagedStream) -> None:
+        """Cuenta una sola vez cada análisis retrasado por falta de workers."""
+        if not stream.waiting_for_worker:
+            stream.waiting_for_worker = True
+            stream.analyses_deferred += 1
+
+    def _on_analysis_done(self, stream_id: str, future: Future) -> None:
+        """Libera el hueco del stream y despierta al planificador."""
+        with self._lock:
+            self._in_flight.pop(stream_id, None)
+            stream = self._streams.get(stream_id)
+            if stream is not None and future.exception() is not None:
+                stream.analysis_errors += 1
+                logger.error(f"Error analizando stream {stream_id}: {future.exception()}")
+        self._wakeup.set()
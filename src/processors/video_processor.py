@@ -8,36 +8,78 @@ import cv2
 import numpy as np
 import threading
 import time
-import queue
 import logging
-import base64
-from typing import Dict, Any, Optional, List, Tuple
+from collections import deque
+from typing import Dict, Any, Optional, List, Tuple, Callable
 
 from src.models.geo_analyzer import GeoAnalyzer
+from src.processors.frame_buffer import FrameRingBuffer
+from src.processors.scene_change_gate import SceneChangeGate, SceneSignature
+from src.processors.rate_controller import AdaptiveRateController
+from src.processors.capture_backends import CaptureBackend, OpenCVCaptureBackend
+from src.processors.frame_detection_stage import FrameDetectionStage
+from src.processors.analysis_history import AnalysisHistory
 
 logger = logging.getLogger(__name__)
 
+# Espera máxima por thread al detener el procesamiento
+STOP_TIMEOUT = 2.0
+
 class VideoProcessor:
     """Procesador de video en tiempo real desde drones."""
     
-    def __init__(self, analyzer: GeoAnalyzer, analysis_interval: int = 5):
+    def __init__(self, analyzer: GeoAnalyzer, analysis_interval: int = 5,
+                 frame_buffer_size: int = 8, scene_change_gating: bool = True,
+                 frame_interval: float = 0.2, adaptive_rate: bool = True,
+                 capture_backend: Optional[CaptureBackend] = None,
+                 object_detector=None, detection_batch_size: int = 4,
+                 detection_interval: float = 1.0, history_size: int = 500,
+                 history_memory_budget: int = 16 * 1024 * 1024):
         """
         Inicializa el procesador de video.
         
         Args:
             analyzer: Instancia del analizador geográfico
             analysis_interval: Intervalo entre análisis en segundos
+            frame_buffer_size: Número de frames crudos retenidos en memoria
+            scene_change_gating: Reutilizar el último análisis si la escena no cambió
+            frame_interval: Intervalo base entre frames almacenados en segundos
+            adaptive_rate: Ajustar los intervalos según la latencia y la carga medidas
+            capture_backend: Backend de captura (por defecto, OpenCV sin ajustes)
+            object_detector: Detector YOLO para la etapa de detección continua (opcional)
+            detection_batch_size: Frames por llamada al detector
+            detection_interval: Segundos mínimos entre lotes de detección
+            history_size: Número máximo de análisis conservados en el historial
+            history_memory_budget: Bytes máximos del historial de análisis
         """
         self.analyzer = analyzer
         self.analysis_interval = analysis_interval
+        self.frame_interval = frame_interval
+        self.rate_controller = AdaptiveRateController(enabled=adaptive_rate)
+        self.capture_backend = capture_backend or OpenCVCaptureBackend()
+        self.detection_stage = None
+        if object_detector is not None:
+            self.detection_stage = FrameDetectionStage(
+                self, object_detector, detection_batch_size, detection_interval
+            )
         self.stream_url = None
         self.processing = False
-        self.last_frame = None
+        self.frame_buffer = FrameRingBuffer(capacity=frame_buffer_size)
         self.last_analysis = None
-        self.frame_queue = queue.Queue(maxsize=10)
-        self.analysis_queue = queue.Queue(maxsize=5)
+        self.scene_gate = SceneChangeGate() if scene_change_gating else None
+        self.analysis_history = AnalysisHistory(max_entries=history_size,
+                                                memory_budget=history_memory_budget)
         self.capture_thread = None
         self.analysis_thread = None
+        self.frame_listener: Optional[Callable[[int], None]] = None
+        self._frame_condition = threading.Condition()
+        self._pending_sequence: Optional[int] = None
+        self._stop_event = threading.Event()
+        self.frames_captured = 0
+        self.frames_dropped = 0
+        self.analyses_completed = 0
+        self.analyses_reused = 0
+        self._frame_times = deque(maxlen=30)
         logger.info("Procesador de video inicializado")
     
     def start_processing(self, stream_url: str) -> bool:
@@ -50,60 +92,140 @@ class VideoProcessor:
         Returns:
             True si se inició correctamente, False en caso contrario
         """
+        if not self.start_capture(stream_url):
+            return False
+        
         try:
-            self.stream_url = stream_url
-            self.processing = True
-            
-            # Iniciar threads de procesamiento
-            self._start_capture_thread()
             self._start_analysis_thread()
-            
             logger.info(f"Procesamiento de video iniciado para: {stream_url}")
             return True
         except Exception as e:
             logger.error(f"Error al iniciar procesamiento de video: {str(e)}")
             return False
     
+    def start_capture(self, stream_url: str) -> bool:
+        """
+        Inicia solo la captura de frames, sin thread de análisis propio.
+        
+        Se usa cuando el análisis lo programa un gestor externo
+        (por ejemplo, ``VideoStreamManager``) mediante ``analyze_latest_frame``.
+        
+        Args:
+            stream_url: URL del stream de video
+            
+        Returns:
+            True si se inició correctamente, False en caso contrario
+        """
+        try:
+            self.stream_url = stream_url
+            self.processing = True
+            # Cada arranque usa su propia señal para no reanimar threads antiguos
+            self._stop_event = threading.Event()
+            if self.scene_gate is not None:
+                self.scene_gate.reset()
+            self._start_capture_thread()
+            if self.detection_stage is not None:
+                self.detection_stage.start()
+            return True
+        except Exception as e:
+            logger.error(f"Error al iniciar captura de video: {str(e)}")
+            self.processing = False
+            return False
+    
     def _start_capture_thread(self) -> None:
         """Inicia el thread de captura de frames."""
-        self.capture_thread = threading.Thread(target=self._capture_frames)
+        self.capture_thread = threading.Thread(
+            target=self._capture_frames, args=(self._stop_event,)
+        )
         self.capture_thread.daemon = True
         self.capture_thread.start()
     
     def _start_analysis_thread(self) -> None:
         """Inicia el thread de análisis de frames."""
-        self.analysis_thread = threading.Thread(target=self._analyze_frames)
+        self.analysis_thread = threading.Thread(
+            target=self._analyze_frames, args=(self._stop_event,)
+        )
         self.analysis_thread.daemon = True
         self.analysis_thread.start()
     
-    def stop_processing(self) -> bool:
+    def stop_processing(self, timeout: float = STOP_TIMEOUT) -> bool:
         """
         Detiene el procesamiento del stream de video.
         
+        Los threads reciben una señal de parada y despiertan de inmediato
+        de cualquier espera; ``timeout`` solo limita cuánto se espera a que
+        terminen un análisis o una lectura ya en curso. Los threads que
+        sigan vivos al vencer el plazo terminan solos al acabar esa
+        operación, porque esperan a la señal de parada de su ejecución.
+        
+        Args:
+            timeout: Tiempo máximo de espera por thread
+            
         Returns:
             True si se detuvo correctamente
         """
         self.processing = False
-        self._stop_threads()
+        self._signal_stop()
+        self._stop_threads(timeout)
+        if self.detection_stage is not None:
+            self.detection_stage.stop(timeout)
         
         logger.info("Procesamiento de video detenido")
         return True
     
-    def _stop_threads(self) -> None:
-        """Detiene los threads de procesamiento."""
-        if self.capture_thread:
-            self.capture_thread.join(timeout=2.0)
-        if self.analysis_thread:
-            self.analysis_thread.join(timeout=2.0)
+    def _signal_stop(self) -> None:
+        """Activa la señal de parada y despierta al thread de análisis."""
+        self._stop_event.set()
+        with self._frame_condition:
+            self._frame_condition.notify_all()
+    
+    def _stop_threads(self, timeout: float) -> None:
+        """Espera a que los threads de procesamiento terminen."""
+        for thread in (self.capture_thread, self.analysis_thread):
+            if thread is None or thread is threading.current_thread():
+                continue
+            thread.join(timeout)
+            if thread.is_alive():
+                logger.warning(f"El thread {thread.name} sigue finalizando una operación en curso")
     
     def get_last_frame(self) -> Optional[bytes]:
         """
         Obtiene el último frame capturado.
         
+        La codificación JPEG se realiza solo en este momento y se comparte
+        entre todos los consumidores del mismo frame.
+        
         Returns:
             Último frame en formato JPEG o None
         """
-        return self.last_frame
+        sequence = self.frame_buffer.latest_sequence()
+        if sequence is None:
+            return None
+        return self.frame_buffer.get_jpeg(sequence)
+    
+    def wait_for_frame(self, after_sequence: Optional[int],
+                       timeout: float) -> Optional[int]:
+        """
+        Bloquea hasta que haya un frame más reciente que ``after_sequence``.
+        
+        Args:
+            after_sequence: Última secuencia ya consumida (None = cualquiera)
+            timeout: Tiempo máximo de espera en segundos
+            
+        Returns:
+            Secuencia del frame más reciente o None si vence el tiempo o se para
+        """
+        deadline = time.monotonic() + timeout
+        with self._frame_condition:
+            while True:
+                latest = self.frame_buffer.latest_sequence()
+                if latest is not None and (after_sequence is None or latest > after_sequence):
+                    return latest
+                
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or self._stop_event.is_set():
+                    return None
+                self._frame_condition.wait(remaining)
     
     def get_last_analysis(self) -> Optional[Dict[str, Any]]:
         """
@@ -114,7 +236,96 @@ class VideoProcessor:
         """
         return self.last_analysis
     
-    def _capture_frames(self):
+    def get_last_detections(self) -> Optional[Dict[str, Any]]:
+        """
+        Obtiene las detecciones del último lote de la etapa YOLO.
+        
+        Returns:
+            Diccionario con las detecciones por frame o None
+        """
+        if self.detection_stage is None:
+            return None
+        return self.detection_stage.last_detections
+    
+    def get_analysis_history(self, start: Optional[float] = None, end: Optional[float] = None,
+                             limit: Optional[int] = None,
+                             include_thumbnails: bool = False) -> List[Dict[str, Any]]:
+        """
+        Obtiene los análisis recientes dentro de un rango de tiempo.
+        
+        Args:
+            start: Instante inicial (None = desde el más antiguo)
+            end: Instante final (None = hasta el más reciente)
+            limit: Máximo de análisis, quedándose con los más recientes
+            include_thumbnails: Incluir las miniaturas JPEG en base64
+            
+        Returns:
+            Lista de análisis en orden cronológico
+        """
+        records = self.analysis_history.get_range(start, end, limit)
+        return [record.to_dict(include_thumbnails) for record in records]
+    
+    def has_pending_frame(self) -> bool:
+        """Indica si hay un frame capturado aún no analizado."""
+        with self._frame_condition:
+            return self._pending_sequence is not None
+    
+    def analyze_latest_frame(self) -> bool:
+        """
+        Analiza de forma síncrona el frame más reciente, si lo hay.
+        
+        Returns:
+            True si había un frame pendiente y se analizó
+        """
+        sequence = self._take_latest_frame()
+        if sequence is None:
+            return False
+        
+        self._perform_frame_analysis(sequence, time.time(), self._stop_event)
+        return True
+    
+    def get_stream_stats(self) -> Dict[str, Any]:
+        """
+        Obtiene estadísticas de captura y análisis del stream.
+        
+        Returns:
+            Diccionario con fps de captura, profundidad de cola y contadores
+        """
+        return {
+            "stream_url": self.stream_url,
+            "processing": self.processing,
+            "capture_fps": round(self._calculate_capture_fps(), 2),
+            "frame_interval": round(self.get_frame_interval(), 3),
+            "analysis_interval": round(self.get_analysis_interval(), 3),
+            "queue_depth": 1 if self.has_pending_frame() else 0,
+            "frames_captured": self.frames_captured,
+            "frames_dropped": self.frames_dropped,
+            "analyses_completed": self.analyses_completed,
+            "analyses_reused": self.analyses_reused,
+            "scene_gate": self.scene_gate.get_stats() if self.scene_gate else None,
+            "rate_control": self.rate_controller.get_stats(),
+            "capture_backend": self.capture_backend.describe(),
+            "detection": self.detection_stage.get_stats() if self.detection_stage else None,
+            "history": self.analysis_history.get_stats()
+        }
+    
+    def get_frame_interval(self) -> float:
+        """Obtiene el intervalo efectivo entre frames almacenados."""
+        return self.frame_interval * self.rate_controller.frame_scale
+    
+    def get_analysis_interval(self) -> float:
+        """Obtiene el intervalo efectivo entre análisis."""
+        return self.analysis_interval * self.rate_controller.analysis_scale
+    
+    def _calculate_capture_fps(self) -> float:
+        """Calcula los fps de frames almacenados en la ventana reciente."""
+        if len(self._frame_times) < 2:
+            return 0.0
+        
+        elapsed = self._frame_times[-1] - self._frame_times[0]
+        return (len(self._frame_times) - 1) / elapsed if elapsed > 0 else 0.0
+    
+    def _capture_frames(self, stop_event: threading.Event):
         """Thread para capturar frames del stream de video."""
         try:
             # Inicializar captura de video
@@ -123,7 +334,7 @@ class VideoProcessor:
                 return
             
             # Bucle principal de captura
-            self._run_capture_loop(cap)
+            self._run_capture_loop(cap, stop_event)
             
             # Liberar recursos
             cap.release()
@@ -131,109 +342,214 @@ class VideoProcessor:
             logger.error(f"Error en thread de captura: {str(e)}")
     
     def _initialize_video_capture(self) -> Optional[cv2.VideoCapture]:
-        """Inicializa la captura de video."""
-        cap = cv2.VideoCapture(self.stream_url)
+        """Inicializa la captura de video con el backend configurado."""
+        cap = self.capture_backend.open(self.stream_url)
         if not cap.isOpened():
             logger.error(f"No se pudo abrir el stream: {self.stream_url}")
             return None
         return cap
     
-    def _run_capture_loop(self, cap: cv2.VideoCapture) -> None:
+    def _run_capture_loop(self, cap: cv2.VideoCapture,
+                          stop_event: threading.Event) -> None:
         """Ejecuta el bucle principal de captura de frames."""
         last_frame_time = 0
         
-        while self.processing:
+        while not stop_event.is_set():
             ret, frame = cap.read()
             if not ret:
-                self._handle_capture_error()
+                self._handle_capture_error(stop_event)
                 continue
             
-            # Procesar frame con throttling
+            # Procesar frame con throttling adaptativo
             current_time = time.time()
+            self.rate_controller.record_frame_read(current_time)
             if self._should_process_frame(current_time, last_frame_time):
                 self._process_captured_frame(frame)
                 last_frame_time = current_time
     
-    def _handle_capture_error(self) -> None:
+    def _handle_capture_error(self, stop_event: threading.Event) -> None:
         """Maneja errores en la captura de frames."""
         logger.warning("Error al leer frame, reintentando...")
-        time.sleep(0.5)
+        # Espera interrumpible por la señal de parada de esta ejecución
+        stop_event.wait(0.5)
     
     def _should_process_frame(self, current_time: float, last_frame_time: float) -> bool:
         """Determina si debe procesar el frame basado en throttling."""
-        return current_time - last_frame_time > 0.2  # Procesar solo cada 200ms
+        return current_time - last_frame_time > self.get_frame_interval()
                 
     def _process_captured_frame(self, frame: np.ndarray) -> None:
-        """Procesa un frame capturado."""
-        # Convertir frame a JPEG
-        _, buffer = cv2.imencode('.jpg', frame)
-        jpeg_bytes = buffer.tobytes()
+        """Procesa un frame capturado sin codificarlo."""
+        started = time.perf_counter()
+        
+        # Guardar frame crudo en el buffer circular
+        sequence = self.frame_buffer.push(frame)
+        self.frames_captured += 1
+        self._frame_times.append(time.time())
         
-        # Actualizar último frame
-        self.last_frame = jpeg_bytes
+        # Publicar en el hueco "último frame gana" y despertar al análisis
+        with self._frame_condition:
+            if self._pending_sequence is not None:
+                self.frames_dropped += 1
+            self._pending_sequence = sequence
+            self._frame_condition.notify_all()
+        self.rate_controller.record_frame_cost(time.perf_counter() - started)
         
-        # Añadir a la cola para análisis si hay espacio
-        if not self.frame_queue.full():
-            self.frame_queue.put(jpeg_bytes)
+        # Notificar a un posible planificador externo
+        if self.frame_listener is not None:
+            self.frame_listener(sequence)
     
-    def _analyze_frames(self):
-        """Thread para analizar frames periódicamente."""
+    def _analyze_frames(self, stop_event: threading.Event):
+        """Thread para analizar frames en cuanto hay uno nuevo y vence el intervalo."""
         last_analysis_time = 0
         
-        while self.processing:
-            current_time = time.time()
+        while not stop_event.is_set():
+            sequence = self._wait_for_analysis_frame(last_analysis_time, stop_event)
+            if sequence is None:
+                break
             
-            # Analizar solo en el intervalo especificado
-            if self._should_analyze_frame(current_time, last_analysis_time):
-                self._perform_frame_analysis(current_time)
-                last_analysis_time = current_time
+            current_time = time.time()
+            self._perform_frame_analysis(sequence, current_time, stop_event)
+            last_analysis_time = current_time
+    
+    def _wait_for_analysis_frame(self, last_analysis_time: float,
+                                 stop_event: threading.Event) -> Optional[int]:
+        """
+        Bloquea hasta que venza el intervalo y haya un frame nuevo.
+        
+        Args:
+            last_analysis_time: Instante del último análisis
+            stop_event: Señal de parada del thread
             
-            time.sleep(0.1)  # Evitar uso excesivo de CPU
+        Returns:
+            Secuencia del frame a analizar o None si se pidió parar
+        """
+        with self._frame_condition:
+            while not stop_event.is_set():
+                current_time = time.time()
+                if (self._should_analyze_frame(current_time, last_analysis_time)
+                        and self._pending_sequence is not None):
+                    return self._consume_pending_frame()
+                
+                remaining = last_analysis_time + self.get_analysis_interval() - current_time
+                
+                # Sin frame: esperar notificación; con frame: esperar al intervalo
+                self._frame_condition.wait(remaining if remaining > 0 else None)
+        return None
     
     def _should_analyze_frame(self, current_time: float, last_analysis_time: float) -> bool:
         """Determina si debe analizar el frame basado en el intervalo."""
-        return current_time - last_analysis_time > self.analysis_interval
+        return current_time - last_analysis_time > self.get_analysis_interval()
     
-    def _perform_frame_analysis(self, current_time: float) -> None:
-        """Realiza el análisis de un frame."""
+    def _perform_frame_analysis(self, sequence: int, current_time: float,
+                                stop_event: threading.Event) -> None:
+        """
+        Realiza el análisis de un frame.
+        
+        Args:
+            sequence: Secuencia del frame en el buffer
+            current_time: Instante del análisis
+            stop_event: Señal de parada de la ejecución que analiza
+        """
         try:
-            # Obtener frame más reciente
-            frame = self._get_latest_frame()
-            if frame is None:
-                time.sleep(0.5)
+            # Filtro barato: si la escena no cambió, reutilizar el resultado
+            changed, signature = self._evaluate_scene_change(sequence, current_time)
+            if not changed:
+                self._reuse_last_analysis(sequence)
                 return
             
-            # Preparar datos para análisis
-            analysis_data = self._prepare_analysis_data(frame, current_time)
+            # Preparar datos para análisis (codificación bajo demanda)
+            frame_time = self.frame_buffer.get_timestamp(sequence)
+            analysis_data = self._prepare_analysis_data(sequence, current_time)
+            if analysis_data is None:
+                return
             
             # Ejecutar análisis
             results = self._execute_image_analysis(analysis_data)
+            self._update_scene_reference(signature, results, current_time)
+            self._update_rate_control(frame_time, current_time)
             
             # Procesar resultados
-            self._process_analysis_results(results, current_time, frame)
+            self._process_analysis_results(results, current_time, sequence)
             
         except Exception as e:
             logger.error(f"Error en análisis de frame: {str(e)}")
-            time.sleep(1.0)  # Esperar un poco antes de reintentar
+            stop_event.wait(1.0)  # Esperar un poco antes de reintentar
     
-    def _get_latest_frame(self) -> Optional[bytes]:
-        """Obtiene el frame más reciente de la cola."""
-        frame = None
-        while not self.frame_queue.empty():
-            frame = self.frame_queue.get()
-        return frame
+    def _evaluate_scene_change(self, sequence: int, current_time: float
+                               ) -> Tuple[bool, Optional[SceneSignature]]:
+        """
+        Compara el frame crudo con el último analizado.
+        
+        Args:
+            sequence: Secuencia del frame candidato
+            current_time: Instante actual
+            
+        Returns:
+            Tupla (requiere_análisis, firma del frame o None)
+        """
+        if self.scene_gate is None:
+            return True, None
+        
+        # Vista sin copia: la firma solo lee una miniatura del slot
+        frame = self.frame_buffer.get_frame(sequence, copy=False)
+        if frame is None:
+            return True, None
+        return self.scene_gate.evaluate(frame, current_time)
+    
+    def _update_scene_reference(self, signature: Optional[SceneSignature],
+                                results: Dict[str, Any], current_time: float) -> None:
+        """Fija el frame analizado como referencia, salvo si el análisis falló."""
+        if self.scene_gate is None:
+            return
+        if signature is None or "error" in results:
+            # Sin referencia válida el siguiente frame se analiza siempre
+            self.scene_gate.reset()
+            return
+        self.scene_gate.record_analysis(signature, current_time)
     
-    def _prepare_analysis_data(self, frame: bytes, current_time: float) -> Dict[str, Any]:
+    def _update_rate_control(self, frame_time: Optional[float],
+                             analysis_start: float) -> None:
+        """Registra la latencia del análisis y deja que el controlador ajuste la tasa."""
+        now = time.time()
+        latency = now - (frame_time if frame_time is not None else analysis_start)
+        self.rate_controller.record_analysis(latency, now - analysis_start)
+        self.rate_controller.adjust(self.frame_interval, self.analysis_interval)
+    
+    def _reuse_last_analysis(self, sequence: int) -> None:
+        """Mantiene el último análisis para un frame sin cambios de escena."""
+        self.analyses_reused += 1
+        logger.debug(f"Escena sin cambios en frame {sequence}, reutilizando último análisis")
+    
+    def _take_latest_frame(self) -> Optional[int]:
+        """Retira y devuelve la secuencia del frame pendiente más reciente."""
+        with self._frame_condition:
+            return self._consume_pending_frame()
+    
+    def _consume_pending_frame(self) -> Optional[int]:
+        """Vacía el hueco de frame pendiente (requiere la condición adquirida)."""
+        sequence = self._pending_sequence
+        self._pending_sequence = None
+        return sequence
+    
+    def _prepare_analysis_data(self, sequence: int,
+                               current_time: float) -> Optional[Dict[str, Any]]:
         """Prepara los datos para el análisis de imagen."""
-        # Convertir frame a base64 para el análisis
-        base64_image = base64.b64encode(frame).decode('utf-8')
+        # Codificar el frame a JPEG/base64 solo ahora que hay un consumidor
+        started = time.perf_counter()
+        base64_image = self.frame_buffer.get_base64(sequence)
+        if base64_image is None:
+            logger.warning(f"Frame {sequence} sobrescrito antes del análisis")
+            return None
+        self.rate_controller.record_encode(time.perf_counter() - started)
         
         # Crear metadatos
+        height, width = self.frame_buffer.get_shape()[:2]
         metadata = {
             "source": "drone_stream",
             "timestamp": current_time,
             "format": "JPEG",
-            "dimensions": (640, 480)  # Tamaño aproximado
+            "dimensions": (width, height),
+            "frame_sequence": sequence
         }
         
         return {"base64_image": base64_image, "metadata": metadata}
@@ -247,17 +563,19 @@ class VideoProcessor:
         )
     
     def _process_analysis_results(self, results: Dict[str, Any], 
-                                current_time: float, frame: bytes) -> None:
+                                current_time: float, sequence: Optional[int] = None) -> None:
         """Procesa los resultados del análisis."""
         # Actualizar último análisis
         self.last_analysis = results
+        self.analyses_completed += 1
         
-        # Añadir a la cola de análisis si hay espacio
-        if not self.analysis_queue.full():
-            self.analysis_queue.put({
-                "timestamp": current_time,
-                "results": results,
-                "frame": frame
-            })
+        # Guardar en el historial con una miniatura, no con el JPEG completo
+        frame = None
+        frame_time = None
+        if sequence is not None:
+            frame = self.frame_buffer.get_frame(sequence, copy=False)
+            frame_time = self.frame_buffer.get_timestamp(sequence)
+        self.analysis_history.add(current_time, results, frame=frame,
+                                  frame_sequence=sequence, frame_timestamp=frame_time)
         
         logger.info("Análisis de frame completado")
\ No newline at end of file
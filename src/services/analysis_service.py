@@ -124,7 +124,9 @@ class AnalysisService:
             results = self.yolo_detector.detect_objects(
                 image_bytes,
                 confidence_threshold=confidence_threshold,
-                nms_threshold=nms_threshold
+                nms_threshold=nms_threshold,
+                columnar=config_params.get('columnar', False),
+                annotate=True
             )
             
             # Añadir metadatos de la imagen
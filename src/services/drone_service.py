@@ -7,9 +7,12 @@ Responsabilidad única: Gestionar operaciones y simulaciones de drones.
 
 import logging
 import time
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from datetime import datetime
 
+from src.processors.mjpeg_streamer import MjpegStreamer
+from src.processors.video_processor import STOP_TIMEOUT
+
 logger = logging.getLogger(__name__)
 
 class DroneService:
@@ -18,16 +21,19 @@ class DroneService:
     Maneja tanto drones reales como simulaciones.
     """
     
-    def __init__(self, drone_controller, video_processor):
+    def __init__(self, drone_controller, video_processor, stream_manager=None):
         """
         Inicializa el servicio de drones.
         
         Args:
             drone_controller: Controlador de dron (real o mock)
             video_processor: Procesador de video
+            stream_manager: Gestor de streams de la flota (opcional)
         """
         self.drone_controller = drone_controller
         self.video_processor = video_processor
+        self.stream_manager = stream_manager
+        self.video_preview = MjpegStreamer(video_processor)
         logger.info("Servicio de drones inicializado")
     
     def connect(self) -> Dict[str, Any]:
@@ -101,7 +107,8 @@ class DroneService:
     def stop_video_stream(self) -> Dict[str, Any]:
         """Detiene la transmisión de video."""
         try:
-            self.video_processor.stop_processing()
+            # Se ejecuta en el thread de la petición: espera acotada
+            self.video_processor.stop_processing(timeout=STOP_TIMEOUT)
             success = self.drone_controller.stop_video_stream()
             
             return {'success': success}
@@ -110,6 +117,112 @@ class DroneService:
             logger.error(f"Error deteniendo stream: {str(e)}")
             return {'success': False, 'error': str(e)}
     
+    def start_fleet_stream(self, stream_id: str, stream_url: str) -> Dict[str, Any]:
+        """Inicia el procesamiento del stream de un dron de la flota."""
+        try:
+            if not self.stream_manager:
+                return {'success': False, 'error': 'Gestor de streams no disponible'}
+            
+            success = self.stream_manager.start_stream(stream_id, stream_url)
+            return {'success': success, 'stream_id': stream_id}
+            
+        except Exception as e:
+            logger.error(f"Error iniciando stream de flota: {str(e)}")
+            return {'success': False, 'error': str(e)}
+    
+    def stop_fleet_stream(self, stream_id: str) -> Dict[str, Any]:
+        """Detiene el procesamiento del stream de un dron de la flota."""
+        try:
+            if not self.stream_manager:
+                return {'success': False, 'error': 'Gestor de streams no disponible'}
+            
+            success = self.stream_manager.stop_stream(stream_id, timeout=STOP_TIMEOUT)
+            return {'success': success, 'stream_id': stream_id}
+            
+        except Exception as e:
+            logger.error(f"Error deteniendo stream de flota: {str(e)}")
+            return {'success': False, 'error': str(e)}
+    
+    def list_fleet_streams(self) -> Dict[str, Any]:
+        """Lista los streams activos de la flota con sus estadísticas."""
+        try:
+            if not self.stream_manager:
+                return {'success': False, 'error': 'Gestor de streams no disponible'}
+            
+            streams = self.stream_manager.list_streams()
+            return {'success': True, 'streams': streams, 'total_streams': len(streams)}
+            
+        except Exception as e:
+            logger.error(f"Error listando streams de flota: {str(e)}")
+            return {'success': False, 'error': str(e)}
+    
+    def get_video_feed(self, stream_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Obtiene el generador MJPEG para la vista previa en vivo.
+        
+        Args:
+            stream_id: Stream de la flota (None = stream principal)
+            
+        Returns:
+            Diccionario con el generador de frames y su mimetype, o el error
+        """
+        try:
+            preview = self._get_preview(stream_id)
+            if preview is None:
+                return {'success': False, 'error': f'Stream no encontrado: {stream_id}'}
+            if not preview.processor.processing:
+                return {'success': False, 'error': 'El stream de video no está activo'}
+            
+            return {'success': True, 'frames': preview.stream(), 'mimetype': preview.MIMETYPE}
+            
+        except Exception as e:
+            logger.error(f"Error obteniendo vista previa de video: {str(e)}")
+            return {'success': False, 'error': str(e)}
+    
+    def get_video_history(self, stream_id: Optional[str] = None, start: Optional[float] = None,
+                          end: Optional[float] = None, limit: Optional[int] = None,
+                          include_thumbnails: bool = False) -> Dict[str, Any]:
+        """
+        Obtiene los análisis recientes del stream para revisarlos hacia atrás.
+        
+        Args:
+            stream_id: Stream de la flota (None = stream principal)
+            start: Instante inicial del rango
+            end: Instante final del rango
+            limit: Máximo de análisis devueltos (los más recientes)
+            include_thumbnails: Incluir miniaturas JPEG en base64
+            
+        Returns:
+            Diccionario con los análisis del rango o el error
+        """
+        try:
+            if stream_id is None:
+                history = self.video_processor.get_analysis_history(
+                    start, end, limit, include_thumbnails
+                )
+            elif not self.stream_manager:
+                return {'success': False, 'error': 'Gestor de streams no disponible'}
+            else:
+                history = self.stream_manager.get_analysis_history(
+                    stream_id, start, end, limit, include_thumbnails
+                )
+            
+            if history is None:
+                return {'success': False, 'error': f'Stream no encontrado: {stream_id}'}
+            return {'success': True, 'analyses': history, 'total_analyses': len(history)}
+            
+        except Exception as e:
+            logger.error(f"Error obteniendo historial de video: {str(e)}")
+            return {'success': False, 'error': str(e)}
+    
+    def _get_preview(self, stream_id: Optional[str]) -> Optional[MjpegStreamer]:
+        """Selecciona el emisor MJPEG del stream principal o de la flota."""
+        if stream_id is None:
+            return self.video_preview
+        if not self.stream_manager:
+            return None
+        return self.stream_manager.get_preview(stream_id)
+    
     def get_telemetry(self) -> Dict[str, Any]:
         """Obtiene datos de telemetría del dron."""
         try:
@@ -5,19 +5,28 @@ Servicio de geolocalización para lógica de negocio.
 Responsabilidad única: Gestionar triangulación y análisis geográfico.
 """
 
+import time
+import uuid
+import threading
 import logging
-from typing import Dict, Any
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+NO_TELEMETRY_ERROR = 'No hay telemetría GPS del dron: no se puede situar la captura'
+
 class GeoService:
     """
     Servicio que encapsula la lógica de negocio para geolocalización.
     Maneja triangulación, detección de cambios y análisis geográfico.
     """
     
-    def __init__(self, geo_manager, geo_triangulation, geo_correlator):
+    def __init__(self, geo_manager, geo_triangulation, geo_correlator,
+                 change_detector=None, video_processor=None, drone_controller=None,
+                 max_jobs: int = 50, max_pending_jobs: int = 4):
         """
         Inicializa el servicio de geolocalización.
         
@@ -25,48 +34,208 @@ class GeoService:
             geo_manager: Gestor de geolocalización
             geo_triangulation: Módulo de triangulación
             geo_correlator: Módulo de correlación geográfica
+            change_detector: Detector de cambios entre capturas y referencias
+            video_processor: Procesador de video del que se toma el último frame
+            drone_controller: Controlador del dron para la telemetría
+            max_jobs: Trabajos de detección de cambios cuyo estado se conserva (límite duro)
+            max_pending_jobs: Trabajos en cola o en ejecución admitidos a la vez
         """
         self.geo_manager = geo_manager
         self.geo_triangulation = geo_triangulation
         self.geo_correlator = geo_correlator
+        self.change_detector = change_detector
+        self.video_processor = video_processor
+        self.drone_controller = drone_controller
         self.is_mock_triangulation = self._is_mock_module(geo_triangulation)
         self.is_mock_correlator = self._is_mock_module(geo_correlator)
         
+        # Trabajos de detección de cambios en segundo plano
+        self.max_jobs = max_jobs
+        self.max_pending_jobs = max_pending_jobs
+        self._jobs: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._jobs_lock = threading.Lock()
+        self._detection_executor: Optional[ThreadPoolExecutor] = None
+        
         logger.info("Servicio de geolocalización inicializado")
     
     def add_reference_image(self) -> Dict[str, Any]:
         """Añade una imagen de referencia para detección de cambios."""
         try:
-            # Simular telemetría del dron
-            drone_telemetry = self._get_mock_telemetry()
+            drone_telemetry = self._get_drone_telemetry()
+            if drone_telemetry is None:
+                if self._has_change_pipeline():
+                    # Un frame real con una posición inventada sería una referencia falsa
+                    return {'success': False, 'error': NO_TELEMETRY_ERROR}
+                # Sin frames reales la referencia del gestor es simulada
+                drone_telemetry = self._get_mock_telemetry()
             
             ref_id = self.geo_manager.add_reference_image(drone_telemetry)
-            return {'success': True, 'reference_id': ref_id}
+            result = {'success': True, 'reference_id': ref_id}
+            
+            # Guardar el frame actual como referencia del detector de cambios
+            location_id = self._add_change_reference(drone_telemetry)
+            if location_id:
+                result['location_id'] = location_id
+            return result
             
         except Exception as e:
             logger.error(f"Error añadiendo referencia: {str(e)}")
             return {'success': False, 'error': str(e)}
     
-    def detect_changes(self) -> Dict[str, Any]:
-        """Detecta cambios entre imagen actual y referencia."""
-        try:
-            # Verificar si tenemos imagen de referencia
-            if not self.geo_manager.current_reference_image:
-                return {
-                    'success': False, 
-                    'error': 'No hay imagen de referencia establecida'
-                }
+    def detect_changes(self, coordinates: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+        """
+        Detecta cambios entre el último frame del dron y la referencia más cercana.
+        
+        Args:
+            coordinates: Coordenadas de la captura (por defecto, las de la telemetría)
             
-            # Usar correlador real si está disponible
-            if not self.is_mock_correlator:
-                return self._detect_changes_real()
-            else:
+        Returns:
+            Diccionario con el resultado de la detección
+        """
+        try:
+            # Sin detector de cambios solo queda la simulación
+            if self.change_detector is None:
+                if not self.geo_manager.current_reference_image:
+                    return {
+                        'success': False, 
+                        'error': 'No hay imagen de referencia establecida'
+                    }
                 return self._detect_changes_mock()
+            
+            capture = self._snapshot_capture(coordinates)
+            if not capture['success']:
+                return capture
+            return self._detect_changes_real(capture['frame'], capture['coordinates'])
                 
         except Exception as e:
             logger.error(f"Error detectando cambios: {str(e)}")
             return {'success': False, 'error': str(e)}
     
+    def start_change_detection(self, coordinates: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+        """
+        Lanza la detección de cambios en segundo plano.
+        
+        El frame y la posición se toman al recibir la petición, no cuando
+        el worker llega al trabajo, para comparar el instante pedido.
+        
+        Args:
+            coordinates: Coordenadas de la captura (por defecto, las de la telemetría)
+            
+        Returns:
+            Diccionario con el ID del trabajo para consultar su estado, o
+            ``busy`` si ya hay demasiados trabajos sin terminar
+        """
+        try:
+            capture = None
+            if self.change_detector is not None:
+                capture = self._snapshot_capture(coordinates)
+                if not capture['success']:
+                    return capture
+            
+            job_id = f"changes_{uuid.uuid4().hex[:8]}"
+            with self._jobs_lock:
+                self._evict_finished_jobs()
+                unfinished = sum(1 for job in self._jobs.values()
+                                 if job['status'] in ('pending', 'running'))
+                if unfinished >= self.max_pending_jobs or len(self._jobs) >= self.max_jobs:
+                    logger.warning("Detección de cambios rechazada: demasiados trabajos pendientes")
+                    return {
+                        'success': False,
+                        'busy': True,
+                        'error': 'Demasiadas detecciones de cambios pendientes, inténtalo más tarde'
+                    }
+                self._jobs[job_id] = {
+                    'job_id': job_id,
+                    'status': 'pending',
+                    'created_at': time.time(),
+                    'result': None
+                }
+            
+            self._get_detection_executor().submit(self._run_change_detection_job, job_id, capture)
+            return {'success': True, 'job_id': job_id, 'status': 'pending'}
+            
+        except Exception as e:
+            logger.error(f"Error lanzando detección de cambios: {str(e)}")
+            return {'success': False, 'error': str(e)}
+    
+    def get_change_detection_job(self, job_id: str) -> Dict[str, Any]:
+        """
+        Obtiene el estado de un trabajo de detección de cambios.
+        
+        Args:
+            job_id: ID devuelto por ``start_change_detection``
+            
+        Returns:
+            Diccionario con el estado del trabajo y su resultado si ha terminado
+        """
+        with self._jobs_lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return {'success': False, 'error': f'Trabajo no encontrado: {job_id}'}
+            return {'success': True, **job}
+    
+    def get_change_visualization(self, detection_id: str) -> Optional[bytes]:
+        """
+        Obtiene la imagen con los cambios marcados de una detección reciente.
+        
+        Args:
+            detection_id: ID de la detección incluido en su resultado
+            
+        Returns:
+            Bytes JPEG o None si no está disponible
+        """
+        if self.change_detector is None:
+            return None
+        return self.change_detector.render_visualization(detection_id)
+    
+    def _get_detection_executor(self) -> ThreadPoolExecutor:
+        """Crea bajo demanda el worker de detección de cambios."""
+        with self._jobs_lock:
+            if self._detection_executor is None:
+                # Un solo worker: las detecciones se encolan sin competir por CPU
+                self._detection_executor = ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix="change-detection"
+                )
+            return self._detection_executor
+    
+    def _run_change_detection_job(self, job_id: str, capture: Optional[Dict[str, Any]]) -> None:
+        """
+        Ejecuta un trabajo de detección de cambios en el worker.
+        
+        Args:
+            job_id: ID del trabajo
+            capture: Frame y coordenadas tomados al lanzar el trabajo (None = simulación)
+        """
+        self._update_job(job_id, status='running', started_at=time.time())
+        if capture is None:
+            result = self.detect_changes()
+        else:
+            try:
+                result = self._detect_changes_real(capture['frame'], capture['coordinates'])
+            except Exception as e:
+                logger.error(f"Error en trabajo de detección de cambios {job_id}: {str(e)}")
+                result = {'success': False, 'error': str(e)}
+        self._update_job(
+            job_id,
+            status='completed' if result.get('success') else 'failed',
+            finished_at=time.time(),
+            result=result
+        )
+    
+    def _update_job(self, job_id: str, **fields) -> None:
+        """Actualiza el estado de un trabajo si sigue registrado."""
+        with self._jobs_lock:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                job.update(fields)
+    
+    def _evict_finished_jobs(self) -> None:
+        """Olvida los trabajos terminados más antiguos para dejar hueco a uno nuevo (requiere el lock)."""
+        excess = len(self._jobs) - self.max_jobs + 1
+        for job_id in [j for j, job in self._jobs.items()
+                       if job['status'] in ('completed', 'failed')][:max(0, excess)]:
+            del self._jobs[job_id]
+    
     def create_target(self) -> Dict[str, Any]:
         """Crea un nuevo objetivo para triangulación."""
         try:
@@ -185,35 +354,83 @@ class GeoService:
             logger.error(f"Error obteniendo estado: {str(e)}")
             return {'success': False, 'error': str(e)}
     
-    def _detect_changes_real(self) -> Dict[str, Any]:
-        """Detecta cambios usando el correlador real."""
-        # Simular imagen actual
-        mock_image_data = b"mock_image_data"
-        drone_telemetry = self._get_mock_telemetry()
-        
-        # Usar el correlador real
-        correlation_result = self.geo_correlator.correlate_drone_image(
-            mock_image_data, 
-            drone_telemetry,
-            confidence_threshold=0.6
-        )
+    def _has_change_pipeline(self) -> bool:
+        """Indica si hay detector de cambios y frames reales del dron."""
+        return self.change_detector is not None and self.video_processor is not None
+    
+    def _snapshot_capture(self, coordinates: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+        """
+        Toma el último frame y la posición de la captura en el mismo instante.
         
-        if 'error' in correlation_result:
-            return {'success': False, 'error': correlation_result['error']}
+        Args:
+            coordinates: Coordenadas de la captura (por defecto, las de la telemetría)
+            
+        Returns:
+            Diccionario con ``frame`` y ``coordinates``, o con el error
+        """
+        frame = self.video_processor.get_last_frame() if self.video_processor else None
+        if frame is None:
+            return {'success': False, 'error': 'No hay frames de video disponibles'}
         
-        # Determinar cambios basándose en la correlación
-        confidence = correlation_result.get('confidence', 0)
-        has_changes = confidence < 0.8
-        change_percentage = (1 - confidence) * 100
+        if coordinates is None:
+            drone_telemetry = self._get_drone_telemetry()
+            if drone_telemetry is None:
+                return {'success': False, 'error': NO_TELEMETRY_ERROR}
+            coordinates = drone_telemetry['gps']
         
         return {
             'success': True,
-            'has_changes': has_changes,
-            'change_percentage': round(change_percentage, 2),
-            'correlation_confidence': confidence,
-            'analysis_details': correlation_result
+            'frame': frame,
+            'coordinates': {'latitude': coordinates['latitude'],
+                            'longitude': coordinates['longitude']}
         }
     
+    def _detect_changes_real(self, frame: bytes, coordinates: Dict[str, float]) -> Dict[str, Any]:
+        """Detecta cambios de un frame frente a la referencia más cercana a sus coordenadas."""
+        result = self.change_detector.detect_changes(frame, coordinates=coordinates)
+        if 'error' in result:
+            return {'success': False, 'error': result['error']}
+        
+        return self._format_change_result(result)
+    
+    @staticmethod
+    def _format_change_result(result: Dict[str, Any]) -> Dict[str, Any]:
+        """Convierte el resultado del detector en una respuesta serializable."""
+        response = {
+            'success': True,
+            'location_id': result['location_id'],
+            'has_changes': bool(result['has_changes']),
+            'change_percentage': round(float(result['change_percentage']), 2),
+            'significant_areas': result['significant_areas'],
+            'regions': result.get('regions', []),
+            'detection_id': result.get('detection_id'),
+            'reference_timestamp': result.get('timestamp')
+        }
+        for key in ('reference_distance_m', 'alignment'):
+            if key in result:
+                response[key] = result[key]
+        return response
+    
+    def _add_change_reference(self, drone_telemetry: Dict[str, Any]) -> Optional[str]:
+        """Registra el último frame como referencia del detector de cambios."""
+        if self.change_detector is None or self.video_processor is None:
+            return None
+        frame = self.video_processor.get_last_frame()
+        if frame is None:
+            return None
+        
+        metadata = {'timestamp': drone_telemetry.get('timestamp', time.time())}
+        if drone_telemetry.get('altitude') is not None:
+            metadata['altitude'] = drone_telemetry['altitude']
+        yaw = drone_telemetry.get('orientation', {}).get('yaw')
+        if yaw is not None:
+            metadata['yaw'] = yaw
+        
+        location_id = self.change_detector.add_reference_image(
+            frame, drone_telemetry['gps'], metadata
+        )
+        return location_id or None
+    
     def _detect_changes_mock(self) -> Dict[str, Any]:
         """Detecta cambios usando simulación."""
         logger.warning("Usando simulación para detección de cambios")
@@ -296,6 +513,15 @@ class GeoService:
             confidence=0.85
         )
     
+    def _get_drone_telemetry(self) -> Optional[Dict[str, Any]]:
+        """Obtiene la telemetría real del dron (None si no hay posición GPS)."""
+        if self.drone_controller is not None:
+            telemetry = self.drone_controller.get_telemetry()
+            gps = telemetry.get('gps') if telemetry else None
+            if gps and gps.get('latitude') is not None:
+                return telemetry
+        return None
+    
     def _get_mock_telemetry(self) -> Dict[str, Any]:
         """Obtiene telemetría simulada."""
         return {
@@ -58,6 +58,58 @@ def get_docker_model_config():
         "timeout": 120,  # Modelos locales pueden tomar más tiempo
     }
 
+def get_video_capture_config():
+    """
+    Obtiene la configuración del backend de captura de video.
+    Permite elegir el decodificador más rápido en cada estación de tierra.
+    """
+    backend = os.environ.get("VIDEO_CAPTURE_BACKEND", "opencv").lower()
+    decoder_threads = int(os.environ.get("VIDEO_DECODER_THREADS", "0"))
+    
+    if backend == "ffmpeg":
+        options = {
+            "decoder_threads": decoder_threads,
+            "low_latency": os.environ.get("VIDEO_LOW_LATENCY", "true").lower() == "true",
+            "hw_acceleration": os.environ.get("VIDEO_HW_ACCELERATION", "false").lower() == "true",
+        }
+    elif backend == "file":
+        options = {
+            "realtime": True,
+            "loop": os.environ.get("VIDEO_REPLAY_LOOP", "false").lower() == "true",
+            "decoder_threads": decoder_threads,
+        }
+    else:
+        options = {}
+    
+    return {"backend": backend, "options": options}
+
+def get_video_detection_config():
+    """
+    Obtiene la configuración de la etapa YOLO del procesador de video.
+    Desactivada por defecto para no cargar el modelo en estaciones sin GPU.
+    """
+    return {
+        "enabled": os.environ.get("VIDEO_OBJECT_DETECTION", "false").lower() == "true",
+        "batch_size": int(os.environ.get("VIDEO_DETECTION_BATCH_SIZE", "4")),
+        "interval": float(os.environ.get("VIDEO_DETECTION_INTERVAL", "1.0")),
+    }
+
+def get_yolo_config():
+    """
+    Obtiene la configuración del detector YOLO: motor de inferencia y lotes de imágenes.
+    Con YOLO_DECODE_WORKERS=0 se usa un thread de decodificación por CPU.
+    """
+    return {
+        "backend": os.environ.get("YOLO_BACKEND", "pytorch").lower(),
+        "model_cache_dir": os.environ.get("YOLO_MODEL_CACHE_DIR", os.path.join("cache", "models")),
+        "batch_size": int(os.environ.get("YOLO_BATCH_SIZE", "8")),
+        "decode_workers": int(os.environ.get("YOLO_DECODE_WORKERS", "0")) or None,
+        "detection_cache_size": int(os.environ.get("YOLO_DETECTION_CACHE_SIZE", "64")),
+        "cache_floor_confidence": float(os.environ.get("YOLO_CACHE_FLOOR_CONFIDENCE", "0.25")),
+        "annotation_quality": int(os.environ.get("YOLO_ANNOTATION_QUALITY", "95")),
+        "annotation_max_width": int(os.environ.get("YOLO_ANNOTATION_MAX_WIDTH", "0")) or None,
+    }
+
 def get_llm_config():
     """
     Obtiene la configuración del LLM según la variable de entorno LLM_PROVIDER.
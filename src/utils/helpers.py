@@ -62,6 +62,18 @@ def get_missions_directory() -> str:
         os.makedirs(missions_dir)
     return missions_dir
 
+def get_references_directory() -> str:
+    """
+    Obtiene el directorio de imágenes de referencia, creándolo si no existe.
+    
+    Returns:
+        Ruta absoluta del directorio de referencias
+    """
+    references_dir = os.path.join(get_project_root(), "references")
+    if not os.path.exists(references_dir):
+        os.makedirs(references_dir)
+    return references_dir
+
 def encode_image_to_base64(image_path: str) -> Optional[Tuple[str, str]]:
     """
     Convierte una imagen a formato base64 compatible con OpenAI API.
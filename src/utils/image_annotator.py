@@ -5,9 +5,10 @@ Módulo para anotación de imágenes con detecciones.
 Responsabilidad única: Anotación visual de resultados de detección.
 """
 
+import cv2
 import numpy as np
 import logging
-from typing import Dict, List, Any, Tuple
+from typing import Dict, List, Any, Tuple, Union, Optional, Iterator
 from src.utils.image_processor import ImageProcessor
 
 logger = logging.getLogger(__name__)
@@ -25,144 +26,80 @@ class ImageAnnotator:
     DEFAULT_FONT_SCALE = 0.6
     TEXT_COLOR = (0, 0, 0)  # Negro
     
-    def __init__(self, image_processor: ImageProcessor):
+    def __init__(self, image_processor: ImageProcessor, jpeg_quality: int = 95,
+                 max_width: Optional[int] = None):
         """
         Inicializa el anotador.
         
         Args:
             image_processor: Instancia del procesador de imágenes
+            jpeg_quality: Calidad JPEG de las imágenes anotadas
+            max_width: Ancho máximo de las imágenes anotadas (None = tamaño original)
         """
         self.image_processor = image_processor
+        self.jpeg_quality = jpeg_quality
+        self.max_width = max_width
     
     def annotate_detections(self, image: np.ndarray, 
-                           detections: List[Dict[str, Any]]) -> str:
+                           detections: Union[List[Dict[str, Any]], Dict[str, Any]]) -> str:
         """
-        Anota una imagen con las detecciones.
+        Anota una imagen con las detecciones ya formateadas.
+        
+        La conversión RGB→BGR (o el redimensionado a ``max_width``) produce
+        la única copia de la imagen; se dibuja sobre ella y se codifica sin
+        más conversiones.
         
         Args:
-            image: Imagen original
-            detections: Lista de detecciones
+            image: Imagen original en RGB
+            detections: Lista de detecciones o diccionario de columnas
             
         Returns:
             Imagen anotada codificada en base64
         """
         try:
-            # Crear copia para anotar
-            annotated_image = image.copy()
+            annotated_image, scale = self._prepare_bgr_buffer(image)
             
             # Anotar cada detección
-            for detection in detections:
-                annotated_image = self._annotate_single_detection(
-                    annotated_image, detection
+            for x1, y1, x2, y2, class_name, confidence in self._iter_boxes(detections):
+                coords = tuple(int(v * scale) for v in (x1, y1, x2, y2))
+                annotated_image = self._draw_box_and_label(
+                    annotated_image, coords,
+                    {'class_name': class_name, 'confidence': confidence}
                 )
             
-            return self.image_processor.array_to_base64(annotated_image)
+            return self.image_processor.bgr_array_to_base64(annotated_image, self.jpeg_quality)
             
         except Exception as e:
             logger.error(f"Error anotando imagen: {str(e)}")
             return self.image_processor.array_to_base64(image)
     
-    def _annotate_single_detection(self, image: np.ndarray, 
-                                  detection: Dict[str, Any]) -> np.ndarray:
+    def _prepare_bgr_buffer(self, image: np.ndarray) -> Tuple[np.ndarray, float]:
         """
-        Anota una sola detección en la imagen.
+        Crea el buffer BGR de salida, reducido a ``max_width`` si hace falta.
         
         Args:
-            image: Imagen a anotar
-            detection: Datos de la detección
+            image: Imagen original en RGB
             
         Returns:
-            Imagen con la detección anotada
+            Tupla (imagen BGR nueva, escala aplicada a las coordenadas)
         """
-        # Extraer datos de la detección
-        bbox = detection['bbox']
-        class_name = detection['class_name']
-        confidence = detection['confidence']
-        
-        # Dibujar bounding box
-        image = self.image_processor.draw_bounding_box(
-            image, bbox['x1'], bbox['y1'], bbox['x2'], bbox['y2'],
-            self.DEFAULT_COLOR, self.DEFAULT_THICKNESS
-        )
+        width = image.shape[1]
+        if not self.max_width or width <= self.max_width:
+            return cv2.cvtColor(image, cv2.COLOR_RGB2BGR), 1.0
         
-        # Crear y dibujar etiqueta
-        label = f"{class_name}: {confidence:.2f}"
-        image = self.image_processor.draw_label(
-            image, label, bbox['x1'], bbox['y1'],
-            self.DEFAULT_FONT_SCALE, self.DEFAULT_THICKNESS,
-            self.TEXT_COLOR, self.DEFAULT_COLOR
-        )
-        
-        return image
+        scale = self.max_width / width
+        resized = cv2.resize(image, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        return cv2.cvtColor(resized, cv2.COLOR_RGB2BGR, dst=resized), scale
     
-    def annotate_yolo_results(self, image: np.ndarray, 
-                             yolo_results) -> str:
-        """
-        Anota imagen directamente con resultados de YOLO.
-        
-        Args:
-            image: Imagen original
-            yolo_results: Resultados directos de YOLO
-            
-        Returns:
-            Imagen anotada codificada en base64
-        """
-        try:
-            # Crear copia para anotar
-            annotated_image = image.copy()
-            
-            if yolo_results.boxes is not None:
-                boxes = yolo_results.boxes.cpu().numpy()
-                class_names = yolo_results.names
-                
-                for box in boxes:
-                    # Extraer datos
-                    coords = self._extract_box_coordinates(box)
-                    class_info = self._extract_class_info(box, class_names)
-                    
-                    # Anotar
-                    annotated_image = self._draw_box_and_label(
-                        annotated_image, coords, class_info
-                    )
-            
-            return self.image_processor.array_to_base64(annotated_image)
-            
-        except Exception as e:
-            logger.error(f"Error anotando resultados YOLO: {str(e)}")
-            return self.image_processor.array_to_base64(image)
-    
-    def _extract_box_coordinates(self, box) -> Tuple[int, int, int, int]:
-        """
-        Extrae coordenadas del bounding box.
-        
-        Args:
-            box: Datos del bounding box de YOLO
-            
-        Returns:
-            Tupla con coordenadas (x1, y1, x2, y2)
-        """
-        x1, y1, x2, y2 = box.xyxy[0]
-        return int(x1), int(y1), int(x2), int(y2)
-    
-    def _extract_class_info(self, box, class_names: Dict[int, str]) -> Dict[str, Any]:
-        """
-        Extrae información de clase y confianza.
-        
-        Args:
-            box: Datos del bounding box de YOLO
-            class_names: Diccionario de nombres de clases
-            
-        Returns:
-            Diccionario con información de clase
-        """
-        class_id = int(box.cls[0])
-        confidence = float(box.conf[0])
-        class_name = class_names.get(class_id, f"class_{class_id}")
-        
-        return {
-            'class_name': class_name,
-            'confidence': confidence
-        }
+    @staticmethod
+    def _iter_boxes(detections: Union[List[Dict[str, Any]], Dict[str, Any]]) -> Iterator[tuple]:
+        """Recorre las detecciones (filas o columnas) como (x1, y1, x2, y2, clase, confianza)."""
+        if isinstance(detections, dict):
+            bbox = detections['bbox']
+            return zip(bbox['x1'], bbox['y1'], bbox['x2'], bbox['y2'],
+                       detections['class_name'], detections['confidence'])
+        return ((d['bbox']['x1'], d['bbox']['y1'], d['bbox']['x2'], d['bbox']['y2'],
+                 d['class_name'], d['confidence']) for d in detections)
     
     def _draw_box_and_label(self, image: np.ndarray, 
                            coords: Tuple[int, int, int, int],
@@ -46,6 +46,19 @@ class ImageProcessor:
             logger.error(f"Error procesando imagen: {str(e)}")
             return None
     
+    @staticmethod
+    def bgr_to_rgb(frame: np.ndarray) -> np.ndarray:
+        """
+        Convierte un frame BGR de OpenCV a RGB para YOLO.
+        
+        Args:
+            frame: Frame BGR como array numpy
+            
+        Returns:
+            Array numpy en RGB
+        """
+        return cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    
     @staticmethod
     def array_to_base64(image: np.ndarray) -> str:
         """
@@ -61,8 +74,27 @@ class ImageProcessor:
             # Convertir RGB a BGR para OpenCV
             image_bgr = cv2.cvtColor(image, cv2.COLOR_RGB2BGR)
             
+        except Exception as e:
+            logger.error(f"Error convirtiendo imagen a base64: {str(e)}")
+            return ""
+        
+        return ImageProcessor.bgr_array_to_base64(image_bgr)
+    
+    @staticmethod
+    def bgr_array_to_base64(image: np.ndarray, jpeg_quality: int = 95) -> str:
+        """
+        Codifica en JPEG y base64 una imagen que ya está en BGR.
+        
+        Args:
+            image: Imagen BGR en formato numpy
+            jpeg_quality: Calidad JPEG (0-100)
+            
+        Returns:
+            Imagen codificada en base64
+        """
+        try:
             # Codificar imagen
-            _, buffer = cv2.imencode('.jpg', image_bgr)
+            _, buffer = cv2.imencode('.jpg', image, [int(cv2.IMWRITE_JPEG_QUALITY), jpeg_quality])
             image_bytes = buffer.tobytes()
             
             # Convertir a base64
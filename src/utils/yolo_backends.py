@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Backends de inferencia del modelo YOLO.
+Responsabilidad única: Exportar el modelo al formato de cada motor de inferencia y cachear el resultado.
+"""
+
+import os
+import shutil
+import hashlib
+import logging
+import importlib.util
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = os.path.join("cache", "models")
+
+
+def weights_fingerprint(weights_path: str) -> str:
+    """
+    Obtiene la huella del contenido de los pesos.
+
+    Args:
+        weights_path: Ruta de los pesos PyTorch
+
+    Returns:
+        Hash corto (hexadecimal) del fichero de pesos
+    """
+    digest = hashlib.blake2b(digest_size=6)
+    with open(weights_path, "rb") as weights:
+        for chunk in iter(lambda: weights.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+@dataclass(frozen=True)
+class InferenceBackend:
+    """
+    Motor de inferencia del modelo YOLO.
+
+    Los backends distintos de PyTorch se sirven con ultralytics a partir
+    del modelo exportado (``YOLO(ruta_exportada)``), de modo que las
+    predicciones devuelven los mismos objetos de resultados que el
+    modelo original y el resto del detector no cambia.
+    """
+    name: str
+    export_format: Optional[str]
+    artifact_suffix: str
+    runtime_module: str
+
+    def is_available(self) -> bool:
+        """Indica si el motor de inferencia está instalado."""
+        return importlib.util.find_spec(self.runtime_module) is not None
+
+    def artifact_path(self, weights_path: str, cache_dir: str, imgsz: int = 640) -> str:
+        """
+        Obtiene la ruta del modelo exportado en la caché.
+
+        El nombre incluye el tamaño de entrada y la huella de los pesos, de
+        modo que cambiar cualquiera de los dos produce una exportación nueva
+        en lugar de reutilizar una incompatible.
+
+        Args:
+            weights_path: Ruta de los pesos PyTorch
+            cache_dir: Directorio de la caché de modelos exportados
+            imgsz: Tamaño de entrada del modelo exportado
+
+        Returns:
+            Ruta del fichero (o directorio) exportado
+        """
+        stem = os.path.splitext(os.path.basename(weights_path))[0]
+        fingerprint = weights_fingerprint(weights_path)
+        return os.path.join(cache_dir, f"{stem}_{imgsz}_{fingerprint}{self.artifact_suffix}")
+
+
+INFERENCE_BACKENDS: Dict[str, InferenceBackend] = {
+    "pytorch": InferenceBackend("pytorch", None, ".pt", "torch"),
+    "onnx": InferenceBackend("onnx", "onnx", ".onnx", "onnxruntime"),
+    "openvino": InferenceBackend("openvino", "openvino", "_openvino_model", "openvino"),
+}
+
+
+def get_inference_backend(name: str = "pytorch") -> InferenceBackend:
+    """
+    Obtiene un backend de inferencia por nombre.
+
+    Args:
+        name: Nombre del backend (pytorch, onnx u openvino)
+
+    Returns:
+        Backend de inferencia
+
+    Raises:
+        ValueError: Si el backend no existe
+    """
+    backend = INFERENCE_BACKENDS.get(name.lower())
+    if backend is None:
+        raise ValueError(f"Backend de inferencia desconocido: {name}")
+    return backend
+
+
+def export_model(model: Any, weights_path: str, backend: InferenceBackend,
+                 cache_dir: str = DEFAULT_CACHE_DIR, imgsz: int = 640) -> str:
+    """
+    Exporta el modelo al formato del backend, reutilizando la exportación cacheada.
+
+    La exportación usa dimensiones dinámicas para que el modelo exportado
+    acepte lotes de cualquier tamaño.
+
+    Args:
+        model: Modelo ultralytics cargado desde los pesos PyTorch
+        weights_path: Ruta de los pesos PyTorch
+        backend: Backend de destino
+        cache_dir: Directorio de la caché de modelos exportados
+        imgsz: Tamaño de entrada del modelo exportado
+
+    Returns:
+        Ruta del modelo exportado
+    """
+    target = backend.artifact_path(weights_path, cache_dir, imgsz)
+    if os.path.exists(target):
+        logger.info(f"📦 Modelo {backend.name} en caché: {target}")
+        return target
+
+    logger.info(f"🔄 Exportando modelo a {backend.name} (solo la primera vez)...")
+    exported = str(model.export(format=backend.export_format, dynamic=True, imgsz=imgsz))
+
+    os.makedirs(cache_dir, exist_ok=True)
+    if os.path.abspath(exported) != os.path.abspath(target):
+        shutil.move(exported, target)
+    logger.info(f"✅ Modelo {backend.name} exportado en: {target}")
+    return target
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Módulo para caché de detecciones YOLO.
+Responsabilidad única: Guardar las salidas del modelo por imagen y refiltrarlas con otros umbrales.
+"""
+
+import hashlib
+import threading
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Any, Optional, Iterator
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Desplazamiento por clase para hacer NMS por clase en una sola pasada (como ultralytics)
+CLASS_OFFSET = 7680.0
+
+
+def non_max_suppression(xyxy: np.ndarray, scores: np.ndarray, classes: np.ndarray,
+                        iou_threshold: float, max_det: int = 300) -> np.ndarray:
+    """
+    NMS voraz por clase.
+
+    Args:
+        xyxy: Cajas (N×4) en píxeles
+        scores: Confianzas (N)
+        classes: IDs de clase (N)
+        iou_threshold: Se suprimen las cajas con IoU mayor que este umbral
+        max_det: Máximo de cajas a conservar
+
+    Returns:
+        Índices de las cajas conservadas, de mayor a menor confianza
+    """
+    if len(xyxy) == 0:
+        return np.zeros(0, dtype=np.int64)
+
+    boxes = xyxy.astype(np.float64) + classes.astype(np.float64)[:, None] * CLASS_OFFSET
+    areas = (boxes[:, 2] - boxes[:, 0]) * (boxes[:, 3] - boxes[:, 1])
+    order = np.argsort(-scores, kind="stable")
+
+    keep = []
+    while order.size and len(keep) < max_det:
+        best, rest = order[0], order[1:]
+        keep.append(best)
+        x0 = np.maximum(boxes[best, 0], boxes[rest, 0])
+        y0 = np.maximum(boxes[best, 1], boxes[rest, 1])
+        x1 = np.minimum(boxes[best, 2], boxes[rest, 2])
+        y1 = np.minimum(boxes[best, 3], boxes[rest, 3])
+        intersection = np.clip(x1 - x0, 0, None) * np.clip(y1 - y0, 0, None)
+        iou = intersection / np.maximum(areas[best] + areas[rest] - intersection, 1e-9)
+        order = rest[iou <= iou_threshold]
+    return np.array(keep, dtype=np.int64)
+
+
+@dataclass
+class RawDetections:
+    """
+    Cajas de una imagen como arrays (N×4, N, N) y la forma de la imagen.
+
+    Se recorre como ``Boxes`` de ultralytics: cada elemento es una
+    detección con ``xyxy[0]``, ``conf[0]`` y ``cls[0]``. La forma
+    guardada permite formatear las cajas en caché sin decodificar la
+    imagen de nuevo.
+    """
+    xyxy: np.ndarray
+    conf: np.ndarray
+    cls: np.ndarray
+    image_shape: tuple = ()
+    min_confidence: float = 0.0
+
+    @classmethod
+    def from_results(cls, results, image_shape: tuple,
+                     min_confidence: float = 0.0) -> "RawDetections":
+        """
+        Extrae las cajas de un resultado de ultralytics.
+
+        Args:
+            results: Resultado YOLO de una imagen
+            image_shape: Forma de la imagen
+            min_confidence: Confianza mínima de las cajas incluidas
+
+        Returns:
+            Cajas como arrays
+        """
+        if results.boxes is None:
+            return cls(np.zeros((0, 4), np.float32), np.zeros(0, np.float32),
+                       np.zeros(0, np.float32), image_shape, min_confidence)
+        boxes = results.boxes.cpu().numpy()
+        return cls(np.asarray(boxes.xyxy, np.float32).reshape(-1, 4),
+                   np.asarray(boxes.conf, np.float32).reshape(-1),
+                   np.asarray(boxes.cls, np.float32).reshape(-1),
+                   image_shape, min_confidence)
+
+    def __len__(self) -> int:
+        return len(self.conf)
+
+    def __iter__(self) -> Iterator["RawDetections"]:
+        for i in range(len(self)):
+            yield self.select(slice(i, i + 1))
+
+    def select(self, index) -> "RawDetections":
+        """Subconjunto de cajas por índice o máscara."""
+        return RawDetections(self.xyxy[index], self.conf[index], self.cls[index],
+                             self.image_shape, self.min_confidence)
+
+    def covers(self, confidence_threshold: float) -> bool:
+        """Indica si las cajas guardadas bastan para responder a un umbral de confianza."""
+        return confidence_threshold >= self.min_confidence
+
+    def filter(self, confidence_threshold: float, nms_threshold: float,
+               max_det: int = 300) -> "RawDetections":
+        """
+        Aplica umbral de confianza y NMS a las cajas guardadas.
+
+        Args:
+            confidence_threshold: Umbral de confianza
+            nms_threshold: Umbral IoU de NMS
+            max_det: Máximo de detecciones
+
+        Returns:
+            Cajas conservadas, de mayor a menor confianza
+        """
+        candidates = self.select(self.conf >= confidence_threshold)
+        keep = non_max_suppression(candidates.xyxy, candidates.conf, candidates.cls,
+                                   nms_threshold, max_det)
+        return candidates.select(keep)
+
+
+class YoloDetectionCache:
+    """
+    LRU de salidas del modelo indexado por el hash de los bytes de la imagen.
+
+    Cada entrada guarda todas las cajas por encima de una confianza mínima
+    antes de NMS; una petición con otros umbrales sobre la misma imagen se
+    responde refiltrando esas cajas, sin volver a ejecutar el modelo.
+    """
+
+    def __init__(self, max_entries: int = 64):
+        """
+        Inicializa la caché.
+
+        Args:
+            max_entries: Máximo de imágenes en caché (0 = sin caché)
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[bytes, RawDetections]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key_for(image_data: bytes) -> bytes:
+        """Obtiene la clave de caché de una imagen."""
+        return hashlib.blake2b(image_data, digest_size=16).digest()
+
+    def get(self, key: bytes, confidence_threshold: float) -> Optional[RawDetections]:
+        """
+        Obtiene las cajas de una imagen si bastan para el umbral pedido.
+
+        Args:
+            key: Clave de la imagen
+            confidence_threshold: Umbral de confianza de la petición
+
+        Returns:
+            Cajas guardadas o None si no están en caché
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or not entry.covers(confidence_threshold):
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: bytes, detections: RawDetections) -> None:
+        """
+        Guarda las cajas de una imagen.
+
+        Args:
+            key: Clave de la imagen
+            detections: Cajas antes de NMS
+        """
+        if not self.max_entries:
+            return
+        with self._lock:
+            self._entries[key] = detections
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Vacía la caché."""
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Obtiene las estadísticas de la caché.
+
+        Returns:
+            Diccionario con entradas, aciertos y fallos
+        """
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 3) if total else 0.0
+            }
@@ -7,8 +7,11 @@ Responsabilidad única: Carga, inicialización y manejo del modelo YOLO.
 
 import os
 import logging
+import threading
 from typing import Dict, Optional, List
 
+from src.utils.yolo_backends import DEFAULT_CACHE_DIR, get_inference_backend, export_model
+
 logger = logging.getLogger(__name__)
 
 
@@ -27,11 +30,25 @@ class YoloModelManager:
     
     DEFAULT_MODEL_NAME = 'yolo11n.pt'
     
-    def __init__(self):
-        """Inicializa el gestor de modelos."""
+    def __init__(self, backend: str = "pytorch", cache_dir: str = DEFAULT_CACHE_DIR,
+                 imgsz: int = 640):
+        """
+        Inicializa el gestor de modelos.
+        
+        Args:
+            backend: Motor de inferencia (pytorch, onnx u openvino)
+            cache_dir: Directorio donde se cachean los modelos exportados
+            imgsz: Tamaño de entrada de los modelos exportados
+        """
         self.model = None
         self.class_names = {}
         self.is_initialized = False
+        self.backend = get_inference_backend(backend)
+        self.active_backend = None
+        self.cache_dir = cache_dir
+        self.imgsz = imgsz
+        # El modelo se comparte entre servicios y threads de video
+        self._predict_lock = threading.Lock()
         
     def initialize_model(self) -> bool:
         """
@@ -53,8 +70,8 @@ class YoloModelManager:
                 logger.error("❌ No se encontró el modelo YOLO 11n")
                 return False
             
-            # Cargar modelo
-            self.model = YOLO(model_path)
+            # Cargar modelo con el backend configurado
+            self.model = self._load_backend_model(YOLO, model_path)
             self.class_names = self.model.names
             self.is_initialized = True
             
@@ -88,6 +105,41 @@ class YoloModelManager:
         logger.info("🌐 Usando descarga automática")
         return self.DEFAULT_MODEL_NAME
     
+    def _load_backend_model(self, yolo_class, weights_path: str):
+        """
+        Carga el modelo con el backend configurado, exportándolo si hace falta.
+        
+        Si el motor de inferencia no está instalado o la exportación falla
+        se usa el modelo PyTorch.
+        
+        Args:
+            yolo_class: Clase ``YOLO`` de ultralytics
+            weights_path: Ruta de los pesos PyTorch
+            
+        Returns:
+            Modelo ultralytics listo para predecir
+        """
+        model = yolo_class(weights_path)
+        self.active_backend = "pytorch"
+        if self.backend.export_format is None:
+            return model
+        
+        if not self.backend.is_available():
+            logger.warning(f"⚠️ {self.backend.runtime_module} no disponible, se usa PyTorch")
+            return model
+        
+        try:
+            artifact = export_model(model, weights_path, self.backend,
+                                    self.cache_dir, self.imgsz)
+            exported_model = yolo_class(artifact, task="detect")
+        except Exception as e:
+            logger.warning(f"⚠️ No se pudo usar el backend {self.backend.name}, se usa PyTorch: {e}")
+            return model
+        
+        self.active_backend = self.backend.name
+        logger.info(f"⚙️ Backend de inferencia: {self.backend.name}")
+        return exported_model
+    
     def _try_auto_download(self) -> bool:
         """
         Intenta descargar automáticamente el modelo.
@@ -101,7 +153,7 @@ class YoloModelManager:
             logger.info("🌐 Descargando modelo YOLO 11n...")
             
             # Descargar modelo
-            self.model = YOLO(self.DEFAULT_MODEL_NAME)
+            self.model = self._load_backend_model(YOLO, self.DEFAULT_MODEL_NAME)
             self.class_names = self.model.names
             self.is_initialized = True
             
@@ -114,14 +166,15 @@ class YoloModelManager:
             return False
     
     def predict(self, image, confidence_threshold: float = 0.5, 
-                nms_threshold: float = 0.4):
+                nms_threshold: float = 0.4, max_det: int = 300):
         """
         Ejecuta predicción con el modelo.
         
         Args:
-            image: Imagen para procesar
+            image: Imagen o lista de imágenes para procesar en un lote
             confidence_threshold: Umbral de confianza
             nms_threshold: Umbral NMS
+            max_det: Máximo de detecciones por imagen
             
         Returns:
             Resultados de la predicción
@@ -129,7 +182,9 @@ class YoloModelManager:
         if not self.is_initialized:
             raise RuntimeError("Modelo no inicializado")
         
-        return self.model(image, conf=confidence_threshold, iou=nms_threshold)
+        with self._predict_lock:
+            return self.model(image, conf=confidence_threshold, iou=nms_threshold,
+                              max_det=max_det)
     
     def get_class_names(self) -> Dict[int, str]:
         """
@@ -168,6 +223,7 @@ class YoloModelManager:
         return {
             'model_name': 'YOLO 11n',
             'is_initialized': self.is_initialized,
+            'backend': self.active_backend or self.backend.name,
             'total_classes': len(self.class_names) if self.is_initialized else 0,
             'has_model': self.model is not None
         } 
\ No newline at end of file
@@ -6,10 +6,15 @@ Responsabilidad única: Formateo y estructuración de resultados de detección.
 """
 
 import logging
-from typing import Dict, List, Any, Tuple
+from typing import Dict, List, Any, Tuple, Union, Optional
+
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
+BBOX_FIELDS = ('x1', 'y1', 'x2', 'y2', 'width', 'height', 'center_x', 'center_y')
+NORMALIZED_BBOX_FIELDS = ('x1', 'y1', 'x2', 'y2', 'center_x', 'center_y')
+
 
 class YoloResultFormatter:
     """
@@ -32,108 +37,94 @@ class YoloResultFormatter:
         Returns:
             Diccionario con detección formateada
         """
-        # Extraer coordenadas y datos
-        x1, y1, x2, y2 = box_data.xyxy[0]
-        class_id = int(box_data.cls[0])
-        confidence = float(box_data.conf[0])
-        class_name = class_names.get(class_id, f"class_{class_id}")
-        
-        # Calcular dimensiones
-        width = x2 - x1
-        height = y2 - y1
-        center_x = (x1 + x2) / 2
-        center_y = (y1 + y2) / 2
-        
-        # Obtener dimensiones de imagen
-        img_height, img_width = image_shape[:2]
-        
-        return {
-            'id': detection_id,
-            'class_name': class_name,
-            'class_id': class_id,
-            'confidence': round(confidence, 3),
-            'bbox': YoloResultFormatter._format_bbox(
-                x1, y1, x2, y2, width, height, center_x, center_y
-            ),
-            'normalized_bbox': YoloResultFormatter._format_normalized_bbox(
-                x1, y1, x2, y2, center_x, center_y, img_width, img_height
-            ),
-            'area': int(width * height),
-            'area_percentage': YoloResultFormatter._calculate_area_percentage(
-                width, height, img_width, img_height
-            )
-        }
+        detection = YoloResultFormatter.format_detections(
+            np.asarray(box_data.xyxy).reshape(-1, 4)[:1], np.asarray(box_data.conf).reshape(-1)[:1],
+            np.asarray(box_data.cls).reshape(-1)[:1], class_names, image_shape
+        )[0]
+        detection['id'] = detection_id
+        return detection
     
     @staticmethod
-    def _format_bbox(x1: float, y1: float, x2: float, y2: float,
-                    width: float, height: float, center_x: float, 
-                    center_y: float) -> Dict[str, int]:
+    def format_detections(xyxy: np.ndarray, conf: np.ndarray, cls: np.ndarray,
+                          class_names: Dict[int, str], image_shape: Tuple[int, int, int],
+                          columnar: bool = False) -> Union[List[Dict[str, Any]], Dict[str, Any]]:
         """
-        Formatea bounding box absoluto.
+        Formatea todas las detecciones de una imagen en una sola pasada de NumPy.
         
         Args:
-            x1, y1, x2, y2: Coordenadas del bounding box
-            width, height: Dimensiones del bounding box
-            center_x, center_y: Centro del bounding box
+            xyxy: Cajas (N×4) en píxeles
+            conf: Confianzas (N)
+            cls: IDs de clase (N)
+            class_names: Diccionario de nombres de clases
+            image_shape: Dimensiones de la imagen (height, width, channels)
+            columnar: Devolver un diccionario de columnas en lugar de una lista de detecciones
             
         Returns:
-            Diccionario con coordenadas absolutas
+            Lista de detecciones formateadas o, con ``columnar``, diccionario
+            con una lista por campo (los de ``bbox`` y ``normalized_bbox`` anidados)
         """
-        return {
-            'x1': int(x1),
-            'y1': int(y1),
-            'x2': int(x2),
-            'y2': int(y2),
-            'width': int(width),
-            'height': int(height),
-            'center_x': int(center_x),
-            'center_y': int(center_y)
-        }
-    
-    @staticmethod
-    def _format_normalized_bbox(x1: float, y1: float, x2: float, y2: float,
-                               center_x: float, center_y: float,
-                               img_width: int, img_height: int) -> Dict[str, float]:
-        """
-        Formatea bounding box normalizado.
+        # Se opera en el tipo de las cajas (float32 en YOLO) para redondear igual que por caja
+        x1, y1, x2, y2 = np.asarray(xyxy).reshape(-1, 4).T
+        confidence = np.round(np.asarray(conf, dtype=np.float64).reshape(-1), 3).tolist()
+        class_ids = np.asarray(cls).reshape(-1).astype(np.int64).tolist()
+        img_height, img_width = image_shape[:2]
         
-        Args:
-            x1, y1, x2, y2: Coordenadas del bounding box
-            center_x, center_y: Centro del bounding box
-            img_width, img_height: Dimensiones de la imagen
-            
-        Returns:
-            Diccionario con coordenadas normalizadas
-        """
-        return {
-            'x1': round(x1 / img_width, 4),
-            'y1': round(y1 / img_height, 4),
-            'x2': round(x2 / img_width, 4),
-            'y2': round(y2 / img_height, 4),
-            'center_x': round(center_x / img_width, 4),
-            'center_y': round(center_y / img_height, 4)
-        }
+        # Calcular dimensiones
+        width = x2 - x1
+        height = y2 - y1
+        center_x = (x1 + x2) / 2
+        center_y = (y1 + y2) / 2
+        
+        # astype trunca hacia cero, como int()
+        bbox = np.stack([x1, y1, x2, y2, width, height, center_x, center_y],
+                        axis=1).astype(np.int64)
+        normalized = YoloResultFormatter._round(np.stack([
+            x1 / img_width, y1 / img_height, x2 / img_width, y2 / img_height,
+            center_x / img_width, center_y / img_height
+        ], axis=1), 4)
+        area = (width * height).astype(np.int64).tolist()
+        area_percentage = YoloResultFormatter._round(
+            (width * height) / (img_width * img_height) * 100, 2
+        ).tolist()
+        names = [class_names.get(class_id, f"class_{class_id}") for class_id in class_ids]
+        
+        if columnar:
+            return {
+                'id': list(range(len(names))),
+                'class_name': names,
+                'class_id': class_ids,
+                'confidence': confidence,
+                'bbox': dict(zip(BBOX_FIELDS, bbox.T.tolist())),
+                'normalized_bbox': dict(zip(NORMALIZED_BBOX_FIELDS, normalized.T.tolist())),
+                'area': area,
+                'area_percentage': area_percentage
+            }
+        
+        return [
+            {
+                'id': i,
+                'class_name': name,
+                'class_id': class_id,
+                'confidence': score,
+                'bbox': dict(zip(BBOX_FIELDS, box)),
+                'normalized_bbox': dict(zip(NORMALIZED_BBOX_FIELDS, normalized_box)),
+                'area': box_area,
+                'area_percentage': percentage
+            }
+            for i, (name, class_id, score, box, normalized_box, box_area, percentage) in enumerate(
+                zip(names, class_ids, confidence, bbox.tolist(), normalized.tolist(),
+                    area, area_percentage)
+            )
+        ]
     
     @staticmethod
-    def _calculate_area_percentage(width: float, height: float,
-                                  img_width: int, img_height: int) -> float:
-        """
-        Calcula el porcentaje de área que ocupa la detección.
-        
-        Args:
-            width, height: Dimensiones del bounding box
-            img_width, img_height: Dimensiones de la imagen
-            
-        Returns:
-            Porcentaje de área ocupada
-        """
-        detection_area = width * height
-        total_area = img_width * img_height
-        return round((detection_area / total_area) * 100, 2)
+    def _round(values: np.ndarray, decimals: int) -> np.ndarray:
+        """Redondea en el tipo original y devuelve float64 sin restos de float32."""
+        return np.round(np.round(values, decimals).astype(np.float64), decimals)
     
     @staticmethod
-    def format_response(success: bool, detections: List[Dict[str, Any]],
-                       annotated_image: str, conf_threshold: float,
+    def format_response(success: bool, detections: Union[List[Dict[str, Any]], Dict[str, Any]],
+                       annotated_image: Optional[str], conf_threshold: float,
                        nms_threshold: float, model_version: str = "YOLO 11n",
                        error_message: str = None) -> Dict[str, Any]:
         """
@@ -141,8 +132,8 @@ class YoloResultFormatter:
         
         Args:
             success: Indica si la detección fue exitosa
-            detections: Lista de detecciones
-            annotated_image: Imagen anotada en base64
+            detections: Lista de detecciones o diccionario de columnas
+            annotated_image: Imagen anotada en base64 (None si no se pidió)
             conf_threshold: Umbral de confianza usado
             nms_threshold: Umbral NMS usado
             model_version: Versión del modelo
@@ -151,13 +142,16 @@ class YoloResultFormatter:
         Returns:
             Diccionario con respuesta formateada
         """
+        columnar = isinstance(detections, dict)
         response = {
             'success': success,
             'detections': detections,
-            'total_objects': len(detections),
+            'total_objects': len(detections['id']) if columnar else len(detections),
             'annotated_image': annotated_image,
             'model_version': model_version
         }
+        if columnar:
+            response['detections_format'] = 'columnar'
         
         if success:
             response.update({
@@ -190,7 +184,7 @@ class YoloResultFormatter:
             'error': error_message,
             'detections': [],
             'total_objects': 0,
-            'annotated_image': '',
+            'annotated_image': None,
             'model_version': 'YOLO 11n',
             'confidence_threshold': None,
             'nms_threshold': None,
@@ -290,6 +290,51 @@ class TestDroneController:
         assert json_data['success'] is False
         assert 'ID de ruta no especificado' in json_data['error']
     
+    def test_video_feed_streams_multipart(self, client, mock_service):
+        """Prueba el endpoint /api/drone/video/feed con un stream activo"""
+        init_drone_controller(mock_service)
+        part = b'--frame\r\nContent-Type: image/jpeg\r\n\r\njpeg\r\n'
+        mock_service.get_video_feed.return_value = {
+            'success': True,
+            'frames': iter([part, part]),
+            'mimetype': 'multipart/x-mixed-replace; boundary=frame'
+        }
+        
+        response = client.get('/api/drone/video/feed?stream_id=drone_1')
+        
+        assert response.status_code == 200
+        assert response.mimetype == 'multipart/x-mixed-replace'
+        assert response.data == part * 2
+        mock_service.get_video_feed.assert_called_once_with('drone_1')
+    
+    def test_video_history_parses_range(self, client, mock_service):
+        """Prueba el endpoint /api/drone/video/history con rango de tiempo"""
+        init_drone_controller(mock_service)
+        mock_service.get_video_history.return_value = {
+            'success': True, 'analyses': [], 'total_analyses': 0
+        }
+        
+        response = client.get('/api/drone/video/history?start=10.5&end=20&limit=5&thumbnails=true')
+        
+        assert response.status_code == 200
+        assert response.get_json()['success'] is True
+        mock_service.get_video_history.assert_called_once_with(
+            stream_id=None, start=10.5, end=20.0, limit=5, include_thumbnails=True
+        )
+    
+    def test_video_feed_inactive_stream(self, client, mock_service):
+        """Prueba el endpoint /api/drone/video/feed sin stream activo"""
+        init_drone_controller(mock_service)
+        mock_service.get_video_feed.return_value = {
+            'success': False, 'error': 'El stream de video no está activo'
+        }
+        
+        response = client.get('/api/drone/video/feed')
+        
+        json_data = response.get_json()
+        assert json_data['success'] is False
+        mock_service.get_video_feed.assert_called_once_with(None)
+    
     # Tests para casos de error comunes en todos los endpoints
     def test_all_endpoints_service_not_initialized(self, client):
         """Prueba que todos los endpoints manejan correctamente el servicio no inicializado"""
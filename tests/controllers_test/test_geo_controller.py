@@ -51,6 +51,18 @@ class TestGeoController:
             'change_areas': [{'x': 100, 'y': 150, 'width': 50, 'height': 30}],
             'confidence': 0.92
         }
+        service.start_change_detection.return_value = {
+            'success': True,
+            'job_id': 'changes_0001',
+            'status': 'pending'
+        }
+        service.get_change_detection_job.return_value = {
+            'success': True,
+            'job_id': 'changes_0001',
+            'status': 'completed',
+            'result': {'success': True, 'has_changes': True, 'detection_id': 'change_abc'}
+        }
+        service.get_change_visualization.return_value = b'\xff\xd8jpeg'
         service.create_target.return_value = {
             'success': True,
             'target_id': 'target_001',
@@ -106,6 +118,57 @@ class TestGeoController:
         # Verificar que se llamó al servicio
         mock_service.add_reference_image.assert_called_once()
     
+    def test_detect_changes_starts_job(self, client, mock_service):
+        """Prueba que /api/geo/changes/detect lanza un trabajo sin bloquear"""
+        init_geo_controller(mock_service)
+        
+        response = client.post('/api/geo/changes/detect',
+                               json={'latitude': 40.4, 'longitude': -3.7})
+        
+        assert response.status_code == 202
+        assert response.get_json()['job_id'] == 'changes_0001'
+        mock_service.start_change_detection.assert_called_once_with(
+            {'latitude': 40.4, 'longitude': -3.7}
+        )
+        mock_service.detect_changes.assert_not_called()
+    
+    def test_detect_changes_busy(self, client, mock_service):
+        """Prueba que /api/geo/changes/detect responde 429 con demasiados trabajos pendientes"""
+        init_geo_controller(mock_service)
+        mock_service.start_change_detection.return_value = {
+            'success': False, 'busy': True, 'error': 'Demasiadas detecciones pendientes'
+        }
+        
+        response = client.post('/api/geo/changes/detect', json={})
+        
+        assert response.status_code == 429
+        assert response.get_json()['busy'] is True
+    
+    def test_change_detection_job_polling(self, client, mock_service):
+        """Prueba la consulta del estado de un trabajo de detección"""
+        init_geo_controller(mock_service)
+        
+        response = client.get('/api/geo/changes/jobs/changes_0001')
+        
+        assert response.status_code == 200
+        json_data = response.get_json()
+        assert json_data['status'] == 'completed'
+        assert json_data['result']['has_changes'] is True
+        mock_service.get_change_detection_job.assert_called_once_with('changes_0001')
+    
+    def test_change_image(self, client, mock_service):
+        """Prueba la imagen de cambios renderizada bajo demanda"""
+        init_geo_controller(mock_service)
+        
+        response = client.get('/api/geo/changes/change_abc/image')
+        assert response.status_code == 200
+        assert response.mimetype == 'image/jpeg'
+        assert response.data == b'\xff\xd8jpeg'
+        
+        mock_service.get_change_visualization.return_value = None
+        response = client.get('/api/geo/changes/missing/image')
+        assert response.status_code == 404
+    
     def test_calculate_position_success(self, client, mock_service):
         """Prueba el endpoint /api/geo/position/calculate con éxito"""
         init_geo_controller(mock_service)
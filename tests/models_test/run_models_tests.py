@@ -10,6 +10,7 @@ Uso:
     python run_models_tests.py mission_parser       # Solo tests de MissionParser
     python run_models_tests.py mission_validator    # Solo tests de MissionValidator
     python run_models_tests.py geo_manager          # Solo tests de GeolocationManager
+    python run_models_tests.py yolo_detector        # Solo tests de YoloObjectDetector
 """
 
 import sys
@@ -26,6 +27,7 @@ from test_mission_utils import TestMissionUtils
 from test_mission_parser import TestMissionParser
 from test_mission_validator import TestMissionValidator
 from test_geo_manager import TestGeolocationManager
+from test_yolo_detector import TestYoloObjectDetector
 
 
 class ModelsTestRunner:
@@ -38,7 +40,8 @@ class ModelsTestRunner:
             'mission_utils': TestMissionUtils,
             'mission_parser': TestMissionParser,
             'mission_validator': TestMissionValidator,
-            'geo_manager': TestGeolocationManager
+            'geo_manager': TestGeolocationManager,
+            'yolo_detector': TestYoloObjectDetector
         }
         self.results = {}
     
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests básicos para YoloObjectDetector del proyecto Drone Geo Analysis.
+
+Estos tests verifican la detección por lotes sin depender de ultralytics:
+- detect_objects_batch: Lotes del tamaño configurado y resultados en orden
+- Imágenes que no se pueden decodificar
+- Errores del modelo en un lote
+- Modelo no disponible
+- Caché de detecciones de detect_objects
+- Imagen anotada solo bajo demanda
+"""
+
+import sys
+import os
+import unittest
+from unittest.mock import MagicMock
+
+import cv2
+import numpy as np
+
+# Configurar path para imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.models.yolo_detector import YoloObjectDetector
+
+
+class FakeBoxes:
+    """``Boxes`` de ultralytics mínimo: arrays por columna y una caja por elemento."""
+
+    def __init__(self, xyxy, conf, cls):
+        self.xyxy = np.asarray(xyxy, dtype=np.float32).reshape(-1, 4)
+        self.conf = np.asarray(conf, dtype=np.float32)
+        self.cls = np.asarray(cls, dtype=np.float32)
+
+    def cpu(self):
+        return self
+
+    def numpy(self):
+        return self
+
+    def __iter__(self):
+        for i in range(len(self.conf)):
+            yield FakeBoxes(self.xyxy[i:i + 1], self.conf[i:i + 1], self.cls[i:i + 1])
+
+
+class FakeResult:
+    """Resultado YOLO mínimo: una caja con la anchura de la imagen en la confianza."""
+
+    def __init__(self, image):
+        self.boxes = FakeBoxes([[0.0, 0.0, 10.0, 10.0]], [min(image.shape[1] / 1000.0, 0.99)], [0])
+
+
+class TestYoloObjectDetector(unittest.TestCase):
+    """Tests para la detección por lotes de YoloObjectDetector."""
+
+    def setUp(self):
+        """Configurar detector con un modelo simulado."""
+        self.detector = YoloObjectDetector(batch_size=2, decode_workers=2)
+        self.batches = []
+
+        def predict(images, conf, iou):
+            self.batches.append(len(images))
+            return [FakeResult(image) for image in images]
+
+        manager = MagicMock()
+        manager.is_model_ready.return_value = True
+        manager.is_initialized = True
+        manager.predict.side_effect = predict
+        manager.get_class_names.return_value = {0: 'person'}
+        self.detector.model_manager = manager
+
+        self.images = [self._encode(width) for width in (100, 200, 300, 400, 500)]
+
+    @staticmethod
+    def _encode(width: int) -> bytes:
+        """Codifica una imagen de prueba en JPEG."""
+        image = np.full((50, width, 3), 128, dtype=np.uint8)
+        return cv2.imencode('.jpg', image)[1].tobytes()
+
+    def test_batch_sizes_and_order(self):
+        """Test que el modelo recibe lotes del tamaño configurado y el orden se conserva."""
+        results = self.detector.detect_objects_batch(self.images)
+
+        self.assertEqual(self.batches, [2, 2, 1])
+        self.assertEqual(len(results), 5)
+        self.assertTrue(all(r['success'] for r in results))
+        confidences = [r['detections'][0]['confidence'] for r in results]
+        self.assertEqual(confidences, sorted(confidences))
+        self.assertIsNone(results[0]['annotated_image'])
+        print("✓ test_batch_sizes_and_order: EXITOSO")
+
+    def test_batch_size_override(self):
+        """Test que batch_size por llamada sustituye al del detector."""
+        self.detector.detect_objects_batch(self.images, batch_size=4)
+
+        self.assertEqual(self.batches, [4, 1])
+        print("✓ test_batch_size_override: EXITOSO")
+
+    def test_undecodable_image(self):
+        """Test que una imagen corrupta da error sin afectar al resto del lote."""
+        images = [self.images[0], b'no es una imagen', self.images[2]]
+        results = self.detector.detect_objects_batch(images)
+
+        self.assertTrue(results[0]['success'])
+        self.assertFalse(results[1]['success'])
+        self.assertTrue(results[2]['success'])
+        self.assertEqual(self.batches, [1, 1])
+        print("✓ test_undecodable_image: EXITOSO")
+
+    def test_model_error_in_batch(self):
+        """Test que un fallo del modelo solo afecta a las imágenes de su lote."""
+        calls = []
+
+        def predict(images, conf, iou):
+            calls.append(len(images))
+            if len(calls) == 2:
+                raise RuntimeError("fallo de inferencia")
+            return [FakeResult(image) for image in images]
+
+        self.detector.model_manager.predict.side_effect = predict
+        results = self.detector.detect_objects_batch(self.images)
+
+        self.assertEqual([r['success'] for r in results], [True, True, False, False, True])
+        self.assertIn('fallo de inferencia', results[2]['error'])
+        print("✓ test_model_error_in_batch: EXITOSO")
+
+    def test_model_not_ready(self):
+        """Test que sin modelo se devuelve un error por imagen."""
+        self.detector.model_manager.is_model_ready.return_value = False
+        results = self.detector.detect_objects_batch(self.images[:3])
+
+        self.assertEqual(len(results), 3)
+        self.assertFalse(any(r['success'] for r in results))
+        self.assertEqual(self.batches, [])
+        print("✓ test_model_not_ready: EXITOSO")
+
+    def _predict_raw(self, images, conf, iou, max_det=300):
+        """Salida del modelo sin NMS: dos cajas solapadas y una aislada."""
+        self.batches.append(1)
+        boxes = FakeBoxes([[0, 0, 20, 20], [2, 0, 22, 20], [40, 10, 60, 30]],
+                          [0.9, 0.6, 0.4], [0, 0, 0])
+        keep = boxes.conf >= conf
+        return [type('Result', (), {'boxes': FakeBoxes(boxes.xyxy[keep], boxes.conf[keep],
+                                                        boxes.cls[keep])})()]
+
+    def test_detect_objects_refilters_cache(self):
+        """Test que la misma imagen con otros umbrales no vuelve a ejecutar el modelo."""
+        self.detector.model_manager.predict.side_effect = self._predict_raw
+
+        first = self.detector.detect_objects(self.images[0], 0.3, 0.5, annotate=True)
+        stricter = self.detector.detect_objects(self.images[0], 0.5, 0.5)
+        looser_nms = self.detector.detect_objects(self.images[0], 0.3, 0.95)
+
+        self.assertEqual(self.batches, [1])
+        self.assertEqual(self.detector.model_manager.predict.call_args[0][2], 1.0)
+        self.assertEqual([d['confidence'] for d in first['detections']], [0.9, 0.4])
+        self.assertEqual([d['confidence'] for d in stricter['detections']], [0.9])
+        self.assertEqual([d['confidence'] for d in looser_nms['detections']], [0.9, 0.6, 0.4])
+        self.assertIsNotNone(first['annotated_image'])
+        self.assertEqual(self.detector.get_model_info()['detection_cache']['hits'], 2)
+        print("✓ test_detect_objects_refilters_cache: EXITOSO")
+
+    def test_detect_objects_annotation_on_request(self):
+        """Test que la imagen anotada solo se genera si se pide y que un acierto no decodifica."""
+        self.detector.model_manager.predict.side_effect = self._predict_raw
+        decode = MagicMock(wraps=self.detector._process_input_image)
+        self.detector._process_input_image = decode
+
+        plain = self.detector.detect_objects(self.images[0], 0.3, 0.5)
+        cached = self.detector.detect_objects(self.images[0], 0.3, 0.5)
+        annotated = self.detector.detect_objects(self.images[0], 0.3, 0.5, annotate=True)
+
+        self.assertIsNone(plain['annotated_image'])
+        self.assertEqual(cached['detections'], plain['detections'])
+        self.assertTrue(annotated['annotated_image'])
+        self.assertEqual(decode.call_count, 2)
+        print("✓ test_detect_objects_annotation_on_request: EXITOSO")
+
+    def test_detect_objects_below_cache_floor(self):
+        """Test que un umbral por debajo de la caché vuelve a ejecutar el modelo."""
+        self.detector.model_manager.predict.side_effect = self._predict_raw
+        self.detector.cache_floor_confidence = 0.5
+
+        self.detector.detect_objects(self.images[0], 0.5, 0.5)
+        result = self.detector.detect_objects(self.images[0], 0.3, 0.5)
+
+        self.assertEqual(self.batches, [1, 1])
+        self.assertEqual(result['total_objects'], 2)
+        print("✓ test_detect_objects_below_cache_floor: EXITOSO")
+
+    def test_empty_batch(self):
+        """Test que una lista vacía devuelve una lista vacía."""
+        self.assertEqual(self.detector.detect_objects_batch([]), [])
+        print("✓ test_empty_batch: EXITOSO")
+
+
+if __name__ == '__main__':
+    print("🧪 EJECUTANDO TESTS DE YOLO DETECTOR")
+    print("=" * 60)
+    
+    # Crear suite de tests
+    loader = unittest.TestLoader()
+    suite = loader.loadTestsFromTestCase(TestYoloObjectDetector)
+    
+    # Ejecutar tests
+    runner = unittest.TextTestRunner(verbosity=0, stream=open(os.devnull, 'w'))
+    result = runner.run(suite)
+    
+    # Mostrar resumen
+    total_tests = result.testsRun
+    failures = len(result.failures)
+    errors = len(result.errors)
+    passed = total_tests - failures - errors
+    
+    print(f"\n📈 ESTADÍSTICAS DE YOLO DETECTOR:")
+    print(f"   Tests ejecutados: {total_tests}")
+    print(f"   Exitosos: {passed}")
+    print(f"   Fallidos: {failures}")
+    print(f"   Errores: {errors}")
+    print(f"   Tasa de éxito: {(passed/total_tests)*100:.1f}%")
+    
+    if failures > 0 or errors > 0:
+        print(f"\n❌ FALLOS DETECTADOS:")
+        for failure in result.failures:
+            print(f"   • {failure[0]}")
+        for error in result.errors:
+            print(f"   • {error[0]}")
+    else:
+        print(f"\n🎉 ¡TODOS LOS TESTS DE YOLO DETECTOR PASAN! 🎉") 
\ No newline at end of file
@@ -7,9 +7,25 @@ Este script permite ejecutar todos los tests o tests específicos del módulo pr
 proporcionando estadísticas detalladas y identificación exacta de errores.
 
 Uso:
-    python run_processors_tests.py                    # Ejecuta todos los tests
-    python run_processors_tests.py change_detector    # Solo tests de ChangeDetector
-    python run_processors_tests.py video_processor    # Solo tests de VideoProcessor
+    python run_processors_tests.py                        # Ejecuta todos los tests
+    python run_processors_tests.py change_detector        # Solo tests de ChangeDetector
+    python run_processors_tests.py video_processor        # Solo tests de VideoProcessor
+    python run_processors_tests.py frame_buffer           # Solo tests de FrameRingBuffer
+    python run_processors_tests.py stream_manager         # Solo tests de VideoStreamManager
+    python run_processors_tests.py scene_change_gate      # Solo tests de SceneChangeGate
+    python run_processors_tests.py rate_controller        # Solo tests de AdaptiveRateController
+    python run_processors_tests.py capture_backends       # Solo tests de backends de captura
+    python run_processors_tests.py batch_video_analyzer   # Solo tests de BatchVideoAnalyzer
+    python run_processors_tests.py mjpeg_streamer         # Solo tests de MjpegStreamer
+    python run_processors_tests.py frame_detection_stage  # Solo tests de FrameDetectionStage
+    python run_processors_tests.py analysis_history       # Solo tests de AnalysisHistory
+    python run_processors_tests.py tiled_differencer      # Solo tests de TiledDifferencer
+    python run_processors_tests.py reference_store        # Solo tests de ReferenceImageStore
+    python run_processors_tests.py reference_index        # Solo tests de ReferenceSpatialIndex
+    python run_processors_tests.py image_aligner          # Solo tests de ImageAligner
+    python run_processors_tests.py change_visualization   # Solo tests de Visualización diferida de cambios
+    python run_processors_tests.py background_model       # Solo tests de Modelo de fondo incremental
+    python run_processors_tests.py preprocessing_cache    # Solo tests de Caché de imágenes preprocesadas
 """
 
 import sys
@@ -24,6 +40,22 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(
 # Importar los módulos de test
 from test_change_detector import TestChangeDetector
 from test_video_processor import TestVideoProcessor
+from test_frame_buffer import TestFrameRingBuffer
+from test_stream_manager import TestVideoStreamManager
+from test_scene_change_gate import TestSceneChangeGate
+from test_rate_controller import TestAdaptiveRateController
+from test_capture_backends import TestCaptureBackends
+from test_batch_video_analyzer import TestBatchVideoAnalyzer
+from test_mjpeg_streamer import TestMjpegStreamer
+from test_frame_detection_stage import TestFrameDetectionStage
+from test_analysis_history import TestAnalysisHistory
+from test_tiled_differencer import TestTiledDifferencer
+from test_reference_store import TestReferenceImageStore
+from test_reference_index import TestReferenceSpatialIndex
+from test_image_aligner import TestImageAligner
+from test_change_visualization import TestChangeVisualization
+from test_background_model import TestBackgroundModel
+from test_preprocessing_cache import TestPreprocessingCache
 
 
 class ProcessorTestRunner:
@@ -33,7 +65,23 @@ class ProcessorTestRunner:
         """Inicializar el ejecutor de tests."""
         self.test_modules = {
             'change_detector': TestChangeDetector,
-            'video_processor': TestVideoProcessor
+            'video_processor': TestVideoProcessor,
+            'frame_buffer': TestFrameRingBuffer,
+            'stream_manager': TestVideoStreamManager,
+            'scene_change_gate': TestSceneChangeGate,
+            'rate_controller': TestAdaptiveRateController,
+            'capture_backends': TestCaptureBackends,
+            'batch_video_analyzer': TestBatchVideoAnalyzer,
+            'mjpeg_streamer': TestMjpegStreamer,
+            'frame_detection_stage': TestFrameDetectionStage,
+            'analysis_history': TestAnalysisHistory,
+            'tiled_differencer': TestTiledDifferencer,
+            'reference_store': TestReferenceImageStore,
+            'reference_index': TestReferenceSpatialIndex,
+            'image_aligner': TestImageAligner,
+            'change_visualization': TestChangeVisualization,
+            'background_model': TestBackgroundModel,
+            'preprocessing_cache': TestPreprocessingCache
         }
         
         self.results = {}
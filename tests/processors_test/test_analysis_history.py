@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests básicos para AnalysisHistory del proyecto Drone Geo Analysis.
+
+Estos tests verifican el historial acotado de análisis:
+- Consultas por rango de tiempo y por instante más cercano
+- Miniaturas compactas en lugar del JPEG completo
+- Expulsión por número de entradas y por presupuesto de memoria
+"""
+
+import sys
+import os
+import unittest
+import numpy as np
+import cv2
+
+# Configurar path para imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.processors.analysis_history import AnalysisHistory
+
+
+class TestAnalysisHistory(unittest.TestCase):
+    """Tests para la clase AnalysisHistory."""
+
+    def setUp(self):
+        """Configurar un historial pequeño."""
+        self.history = AnalysisHistory(max_entries=10, thumbnail_width=64)
+        self.frame = np.random.RandomState(0).randint(0, 255, (480, 640, 3), dtype=np.uint8)
+
+    def test_invalid_limits(self):
+        """Test: Límites no positivos se rechazan."""
+        with self.assertRaises(ValueError):
+            AnalysisHistory(max_entries=0)
+        with self.assertRaises(ValueError):
+            AnalysisHistory(memory_budget=0)
+        print("✓ test_invalid_limits: EXITOSO")
+
+    def test_range_lookup(self):
+        """Test: El rango devuelve los análisis entre ambos instantes, en orden."""
+        for t in (5.0, 1.0, 3.0, 4.0, 2.0):
+            self.history.add(t, {"t": t})
+
+        records = self.history.get_range(2.0, 4.0)
+
+        self.assertEqual([r.timestamp for r in records], [2.0, 3.0, 4.0])
+        self.assertEqual([r.timestamp for r in self.history.get_range(limit=2)], [4.0, 5.0])
+        self.assertEqual(self.history.get_range(limit=0), [])
+        print("✓ test_range_lookup: EXITOSO")
+
+    def test_nearest_lookup(self):
+        """Test: Se obtiene el análisis más cercano a un instante."""
+        self.assertIsNone(self.history.get_nearest(1.0))
+        for t in (1.0, 2.0, 4.0):
+            self.history.add(t, {"t": t})
+
+        self.assertEqual(self.history.get_nearest(3.4).timestamp, 4.0)
+        self.assertEqual(self.history.get_nearest(-1.0).timestamp, 1.0)
+        self.assertEqual(self.history.latest().timestamp, 4.0)
+        print("✓ test_nearest_lookup: EXITOSO")
+
+    def test_thumbnail_is_compact(self):
+        """Test: Se guarda una miniatura reducida, no el frame completo."""
+        record = self.history.add(1.0, {}, frame=self.frame, frame_sequence=7)
+
+        thumb = cv2.imdecode(np.frombuffer(record.thumbnail, np.uint8), cv2.IMREAD_COLOR)
+        self.assertEqual(thumb.shape[:2], (48, 64))
+        full_jpeg = cv2.imencode(".jpg", self.frame)[1].tobytes()
+        self.assertLess(len(record.thumbnail), len(full_jpeg) / 10)
+        self.assertIn("thumbnail", record.to_dict(include_thumbnail=True))
+        self.assertNotIn("thumbnail", record.to_dict())
+        print("✓ test_thumbnail_is_compact: EXITOSO")
+
+    def test_evicts_by_entries(self):
+        """Test: Se expulsan los más antiguos al superar el máximo de entradas."""
+        for t in range(15):
+            self.history.add(float(t), {"t": t})
+
+        stats = self.history.get_stats()
+        self.assertEqual(stats["entries"], 10)
+        self.assertEqual(stats["records_evicted"], 5)
+        self.assertEqual(stats["oldest_timestamp"], 5.0)
+        print("✓ test_evicts_by_entries: EXITOSO")
+
+    def test_evicts_by_memory_budget(self):
+        """Test: El historial nunca supera el presupuesto de memoria."""
+        history = AnalysisHistory(max_entries=100, memory_budget=2000, thumbnail_width=0)
+        for t in range(20):
+            history.add(float(t), {"description": "x" * 300})
+
+        stats = history.get_stats()
+        self.assertLessEqual(stats["memory_used"], 2000)
+        self.assertGreater(stats["records_evicted"], 0)
+        self.assertEqual(history.latest().timestamp, 19.0)
+        print("✓ test_evicts_by_memory_budget: EXITOSO")
+
+    def test_clear(self):
+        """Test: Vaciar el historial libera la memoria contabilizada."""
+        self.history.add(1.0, {}, frame=self.frame)
+        self.history.clear()
+
+        self.assertEqual(len(self.history), 0)
+        self.assertEqual(self.history.get_stats()["memory_used"], 0)
+        print("✓ test_clear: EXITOSO")
+
+
+if __name__ == '__main__':
+    print("🧪 EJECUTANDO TESTS DE ANALYSIS HISTORY")
+    print("=" * 60)
+    
+    # Crear suite de tests
+    loader = unittest.TestLoader()
+    suite = loader.loadTestsFromTestCase(TestAnalysisHistory)
+    
+    # Ejecutar tests
+    runner = unittest.TextTestRunner(verbosity=0, stream=open(os.devnull, 'w'))
+    result = runner.run(suite)
+    
+    # Mostrar resumen
+    total_tests = result.testsRun
+    failures = len(result.failures)
+    errors = len(result.errors)
+    passed = total_tests - failures - errors
+    
+    print(f"\n📈 ESTADÍSTICAS DE ANALYSIS HISTORY:")
+    print(f"   Tests ejecutados: {total_tests}")
+    print(f"   Exitosos: {passed}")
+    print(f"   Fallidos: {failures}")
+    print(f"   Errores: {errors}")
+    print(f"   Tasa de éxito: {(passed/total_tests)*100:.1f}%")
+    
+    if failures > 0 or errors > 0:
+        print(f"\n❌ FALLOS DETECTADOS:")
+        for failure in result.failures:
+            print(f"   • {failure[0]}")
+        for error in result.errors:
+            print(f"   • {error[0]}")
+    else:
+        print(f"\n🎉 ¡TODOS LOS TESTS DE ANALYSIS HISTORY PASAN! 🎉") 
\ No newline at end of file
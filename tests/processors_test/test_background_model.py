@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests básicos para BackgroundModel del proyecto Drone Geo Analysis.
+
+Estos tests verifican el modelo de fondo incremental:
+- Inicialización del fondo con la referencia
+- Actualización por media móvil exponencial
+- Persistencia de regiones emparejadas por IoU
+- Expulsión de las ubicaciones menos usadas
+"""
+
+import sys
+import os
+import unittest
+import numpy as np
+
+# Configurar path para imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.processors.background_model import BackgroundModel
+
+
+class TestBackgroundModel(unittest.TestCase):
+    """Tests para la clase BackgroundModel."""
+    
+    def setUp(self):
+        """Configurar tests con una referencia plana."""
+        self.model = BackgroundModel(alpha=0.5, min_persistence=2)
+        self.reference = np.full((40, 40), 100, dtype=np.uint8)
+    
+    def test_background_starts_from_reference(self):
+        """Test: El fondo inicial es la referencia."""
+        background = self.model.get_background("loc", self.reference)
+        
+        np.testing.assert_array_equal(background, self.reference)
+        self.assertEqual(self.model.get_captures("loc"), 0)
+        print("✓ test_background_starts_from_reference: EXITOSO")
+    
+    def test_update_moves_average(self):
+        """Test: Cada captura acerca el fondo con peso alpha."""
+        self.model.get_background("loc", self.reference)
+        self.model.update("loc", np.full((40, 40), 200, dtype=np.uint8), np.zeros((0, 4)))
+        
+        background = self.model.get_background("loc", self.reference)
+        self.assertEqual(int(background[0, 0]), 150)
+        self.assertEqual(self.model.get_captures("loc"), 1)
+        print("✓ test_update_moves_average: EXITOSO")
+    
+    def test_update_respects_valid_mask(self):
+        """Test: Los píxeles fuera de la captura no modifican el fondo."""
+        self.model.get_background("loc", self.reference)
+        mask = np.zeros((40, 40), dtype=np.uint8)
+        mask[:, :20] = 255
+        self.model.update("loc", np.full((40, 40), 200, dtype=np.uint8), np.zeros((0, 4)), mask)
+        
+        background = self.model.get_background("loc", self.reference)
+        self.assertEqual(int(background[0, 0]), 150)
+        self.assertEqual(int(background[0, 39]), 100)
+        print("✓ test_update_respects_valid_mask: EXITOSO")
+    
+    def test_region_persistence(self):
+        """Test: Una región que reaparece acumula persistencia y una nueva empieza en 1."""
+        self.model.get_background("loc", self.reference)
+        frame = self.reference.copy()
+        
+        first = self.model.update("loc", frame, np.array([[10, 10, 10, 10]]))
+        second = self.model.update("loc", frame, np.array([[11, 10, 10, 10], [30, 30, 5, 5]]))
+        
+        self.assertEqual(first[0]["persistence"], 1)
+        self.assertFalse(first[0]["persistent"])
+        self.assertEqual(second[0]["track_id"], first[0]["track_id"])
+        self.assertEqual(second[0]["persistence"], 2)
+        self.assertTrue(second[0]["persistent"])
+        self.assertEqual(second[1]["persistence"], 1)
+        self.assertNotEqual(second[1]["track_id"], first[0]["track_id"])
+        print("✓ test_region_persistence: EXITOSO")
+    
+    def test_evicts_least_recent_location(self):
+        """Test: Solo se mantiene el fondo de las ubicaciones más recientes."""
+        model = BackgroundModel(max_locations=1)
+        model.get_background("a", self.reference)
+        model.get_background("b", self.reference)
+        
+        self.assertEqual(model.get_stats()["locations"], 1)
+        self.assertEqual(model.update("a", self.reference, np.zeros((0, 4))), [])
+        print("✓ test_evicts_least_recent_location: EXITOSO")
+
+
+if __name__ == '__main__':
+    print("🧪 EJECUTANDO TESTS DE BACKGROUND MODEL")
+    print("=" * 60)
+    
+    # Crear suite de tests
+    loader = unittest.TestLoader()
+    suite = loader.loadTestsFromTestCase(TestBackgroundModel)
+    
+    # Ejecutar tests
+    runner = unittest.TextTestRunner(verbosity=0, stream=open(os.devnull, 'w'))
+    result = runner.run(suite)
+    
+    # Mostrar resumen
+    total_tests = result.testsRun
+    failures = len(result.failures)
+    errors = len(result.errors)
+    passed = total_tests - failures - errors
+    
+    print(f"\n📈 ESTADÍSTICAS DE BACKGROUND MODEL:")
+    print(f"   Tests ejecutados: {total_tests}")
+    print(f"   Exitosos: {passed}")
+    print(f"   Fallidos: {failures}")
+    print(f"   Errores: {errors}")
+    print(f"   Tasa de éxito: {(passed/total_tests)*100:.1f}%")
+    
+    if failures > 0 or errors > 0:
+        print(f"\n❌ FALLOS DETECTADOS:")
+        for failure in result.failures:
+            print(f"   • {failure[0]}")
+        for error in result.errors:
+            print(f"   • {error[0]}")
+    else:
+        print(f"\n🎉 ¡TODOS LOS TESTS DE BACKGROUND MODEL PASAN! 🎉") 
\ No newline at end of file
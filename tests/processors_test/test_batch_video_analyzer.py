@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests básicos para BatchVideoAnalyzer del proyecto Drone Geo Analysis.
+
+Estos tests verifican el análisis offline de vídeos grabados:
+- División del vídeo en tramos
+- Muestreo por marca de tiempo del vídeo
+- Reparto en procesos y escritura ordenada en JSONL
+"""
+
+import sys
+import os
+import json
+import unittest
+import tempfile
+from unittest.mock import patch
+import numpy as np
+import cv2
+
+# Configurar path para imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.processors.batch_video_analyzer import BatchVideoAnalyzer, main
+
+
+def create_mean_analyzer():
+    """Analizador de frames de prueba: brillo medio del frame."""
+    return lambda frame: {"mean": float(frame.mean())}
+
+
+class TestBatchVideoAnalyzer(unittest.TestCase):
+    """Tests para la clase BatchVideoAnalyzer."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Generar un clip de 2 segundos a 25 fps."""
+        cls.temp_dir = tempfile.TemporaryDirectory()
+        cls.clip_path = os.path.join(cls.temp_dir.name, "flight.avi")
+        writer = cv2.VideoWriter(cls.clip_path, cv2.VideoWriter_fourcc(*"MJPG"), 25, (64, 48))
+        for index in range(50):
+            writer.write(np.full((48, 64, 3), index * 5, dtype=np.uint8))
+        writer.release()
+
+    @classmethod
+    def tearDownClass(cls):
+        """Eliminar el clip de prueba."""
+        cls.temp_dir.cleanup()
+
+    def _analyze(self, segment_duration, sample_interval=0.2):
+        """Analiza el clip de prueba y devuelve resumen y registros."""
+        analyzer = BatchVideoAnalyzer(sample_interval=sample_interval, max_workers=2,
+                                      segment_duration=segment_duration,
+                                      analyzer_factory=create_mean_analyzer)
+        output_path = os.path.join(self.temp_dir.name, f"out_{segment_duration}.jsonl")
+        summary = analyzer.analyze_file(self.clip_path, output_path)
+        with open(output_path, encoding="utf-8") as output:
+            records = [json.loads(line) for line in output]
+        return summary, records
+
+    def test_invalid_parameters(self):
+        """Test: Intervalo de muestreo y duración de tramo deben ser positivos."""
+        with self.assertRaises(ValueError):
+            BatchVideoAnalyzer(sample_interval=0)
+        with self.assertRaises(ValueError):
+            BatchVideoAnalyzer(segment_duration=-1)
+        print("✓ test_invalid_parameters: EXITOSO")
+
+    def test_build_segments(self):
+        """Test: El vídeo se divide en tramos de duración fija."""
+        analyzer = BatchVideoAnalyzer(segment_duration=4.0)
+
+        segments = analyzer._build_segments("video.mp4", 25.0, 250)
+
+        self.assertEqual([(s.start_frame, s.end_frame) for s in segments],
+                         [(0, 100), (100, 200), (200, 250)])
+        print("✓ test_build_segments: EXITOSO")
+
+    def test_build_segments_unknown_length(self):
+        """Test: Sin número de frames se usa un único tramo hasta el final."""
+        segments = BatchVideoAnalyzer()._build_segments("stream.ts", 25.0, 0)
+
+        self.assertEqual(len(segments), 1)
+        self.assertIsNone(segments[0].end_frame)
+        print("✓ test_build_segments_unknown_length: EXITOSO")
+
+    def test_analyze_file_writes_jsonl(self):
+        """Test: Se analizan los frames muestreados y se escriben en orden."""
+        summary, records = self._analyze(segment_duration=0.4)
+
+        self.assertEqual(summary["frames_analyzed"], 10)
+        self.assertEqual(summary["segments"], 5)
+        self.assertEqual(summary["segment_errors"], 0)
+        self.assertEqual([r["frame_index"] for r in records], list(range(0, 50, 5)))
+        self.assertAlmostEqual(records[1]["video_timestamp"], 0.2)
+        self.assertIn("mean", records[0]["results"])
+        print("✓ test_analyze_file_writes_jsonl: EXITOSO")
+
+    def test_sampling_independent_of_segments(self):
+        """Test: La rejilla de muestreo no depende del reparto en tramos."""
+        _, split = self._analyze(segment_duration=0.3, sample_interval=0.25)
+        _, single = self._analyze(segment_duration=10.0, sample_interval=0.25)
+
+        self.assertEqual([r["frame_index"] for r in split],
+                         [r["frame_index"] for r in single])
+        print("✓ test_sampling_independent_of_segments: EXITOSO")
+
+    def test_missing_file(self):
+        """Test: Un fichero inexistente produce IOError."""
+        with self.assertRaises(IOError):
+            BatchVideoAnalyzer().analyze_file("/no/existe.mp4")
+        print("✓ test_missing_file: EXITOSO")
+
+    def test_main_runs_recorded_video(self):
+        """Test: La línea de comandos analiza un vídeo grabado y escribe el JSONL."""
+        output_path = os.path.join(self.temp_dir.name, "cli.jsonl")
+        with patch("src.processors.batch_video_analyzer.setup_logging"):
+            exit_code = main([self.clip_path, "--interval", "0.5", "--workers", "2",
+                              "--output", output_path], analyzer_factory=create_mean_analyzer)
+
+        self.assertEqual(exit_code, 0)
+        with open(output_path, encoding="utf-8") as output:
+            self.assertEqual(len(output.readlines()), 4)
+        print("✓ test_main_runs_recorded_video: EXITOSO")
+
+    def test_main_missing_file(self):
+        """Test: La línea de comandos devuelve error con un fichero inexistente."""
+        with patch("src.processors.batch_video_analyzer.setup_logging"):
+            self.assertEqual(main(["/no/existe.mp4"]), 1)
+        print("✓ test_main_missing_file: EXITOSO")
+
+
+if __name__ == '__main__':
+    print("🧪 EJECUTANDO TESTS DE BATCH VIDEO ANALYZER")
+    print("=" * 60)
+    
+    # Crear suite de tests
+    loader = unittest.TestLoader()
+    suite = loader.loadTestsFromTestCase(TestBatchVideoAnalyzer)
+    
+    # Ejecutar tests
+    runner = unittest.TextTestRunner(verbosity=0, stream=open(os.devnull, 'w'))
+    result = runner.run(suite)
+    
+    # Mostrar resumen
+    total_tests = result.testsRun
+    failures = len(result.failures)
+    errors = len(result.errors)
+    passed = total_tests - failures - errors
+    
+    print(f"\n📈 ESTADÍSTICAS DE BATCH VIDEO ANALYZER:")
+    print(f"   Tests ejecutados: {total_tests}")
+    print(f"   Exitosos: {passed}")
+    print(f"   Fallidos: {failures}")
+    print(f"   Errores: {errors}")
+    print(f"   Tasa de éxito: {(passed/total_tests)*100:.1f}%")
+    
+    if failures > 0 or errors > 0:
+        print(f"\n❌ FALLOS DETECTADOS:")
+        for failure in result.failures:
+            print(f"   • {failure[0]}")
+        for error in result.errors:
+            print(f"   • {error[0]}")
+    else:
+        print(f"\n🎉 ¡TODOS LOS TESTS DE BATCH VIDEO ANALYZER PASAN! 🎉") 
\ No newline at end of file
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests básicos para los backends de captura del proyecto Drone Geo Analysis.
+
+Estos tests verifican la apertura configurable de fuentes de video:
+- Factoría de backends por nombre
+- Opciones de baja latencia y threads del backend FFmpeg
+- Reproducción de ficheros grabados con bucle
+"""
+
+import sys
+import os
+import unittest
+import tempfile
+from unittest.mock import patch, MagicMock
+import numpy as np
+import cv2
+
+# Configurar path para imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.processors.capture_backends import (
+    create_capture_backend, OpenCVCaptureBackend, FFmpegCaptureBackend, FileReplayBackend
+)
+
+
+class TestCaptureBackends(unittest.TestCase):
+    """Tests para los backends de captura de video."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Generar un clip corto de prueba."""
+        cls.temp_dir = tempfile.TemporaryDirectory()
+        cls.clip_path = os.path.join(cls.temp_dir.name, "clip.avi")
+        writer = cv2.VideoWriter(cls.clip_path, cv2.VideoWriter_fourcc(*"MJPG"), 25, (64, 48))
+        for index in range(5):
+            writer.write(np.full((48, 64, 3), index * 40, dtype=np.uint8))
+        writer.release()
+
+    @classmethod
+    def tearDownClass(cls):
+        """Eliminar el clip de prueba."""
+        cls.temp_dir.cleanup()
+
+    def test_create_capture_backend(self):
+        """Test: La factoría crea cada backend por nombre."""
+        self.assertIsInstance(create_capture_backend(), OpenCVCaptureBackend)
+        backend = create_capture_backend("FFMPEG", decoder_threads=2)
+        self.assertIsInstance(backend, FFmpegCaptureBackend)
+        self.assertEqual(backend.decoder_threads, 2)
+        self.assertIsInstance(create_capture_backend("file"), FileReplayBackend)
+        print("✓ test_create_capture_backend: EXITOSO")
+
+    def test_create_unknown_backend(self):
+        """Test: Un backend desconocido produce ValueError."""
+        with self.assertRaises(ValueError):
+            create_capture_backend("gstreamer-nvdec")
+        print("✓ test_create_unknown_backend: EXITOSO")
+
+    def test_ffmpeg_options(self):
+        """Test: Opciones de baja latencia y transporte RTSP."""
+        backend = FFmpegCaptureBackend(decoder_threads=4)
+
+        options = backend.build_ffmpeg_options("rtsp://drone/live")
+
+        self.assertIn("fflags;nobuffer", options)
+        self.assertIn("rtsp_transport;tcp", options)
+        self.assertEqual(backend.build_open_params(), [cv2.CAP_PROP_N_THREADS, 4])
+        self.assertEqual(FFmpegCaptureBackend(low_latency=False).build_ffmpeg_options("a.mp4"), "")
+        print("✓ test_ffmpeg_options: EXITOSO")
+
+    @patch('cv2.VideoCapture')
+    def test_ffmpeg_open_restores_environment(self, mock_video_capture):
+        """Test: La apertura FFmpeg usa CAP_FFMPEG, no toca el buffer y restaura el entorno."""
+        mock_cap = MagicMock()
+        mock_cap.isOpened.return_value = True
+        mock_video_capture.return_value = mock_cap
+        os.environ.pop("OPENCV_FFMPEG_CAPTURE_OPTIONS", None)
+
+        FFmpegCaptureBackend().open("rtmp://drone/live")
+
+        self.assertEqual(mock_video_capture.call_args[0][1], cv2.CAP_FFMPEG)
+        mock_cap.set.assert_not_called()
+        self.assertNotIn("OPENCV_FFMPEG_CAPTURE_OPTIONS", os.environ)
+        print("✓ test_ffmpeg_open_restores_environment: EXITOSO")
+
+    def test_file_replay_reads_clip(self):
+        """Test: El backend de ficheros reproduce todos los frames del clip."""
+        cap = FileReplayBackend(realtime=False).open(self.clip_path)
+        frames = 0
+        while cap.read()[0]:
+            frames += 1
+        cap.release()
+
+        self.assertEqual(frames, 5)
+        print("✓ test_file_replay_reads_clip: EXITOSO")
+
+    def test_file_replay_loop(self):
+        """Test: Con bucle, la reproducción vuelve al inicio al terminar."""
+        cap = FileReplayBackend(realtime=False, loop=True).open(self.clip_path)
+        results = [cap.read()[0] for _ in range(8)]
+        cap.release()
+
+        self.assertTrue(all(results))
+        print("✓ test_file_replay_loop: EXITOSO")
+
+
+if __name__ == '__main__':
+    print("🧪 EJECUTANDO TESTS DE CAPTURE BACKENDS")
+    print("=" * 60)
+    
+    # Crear suite de tests
+    loader = unittest.TestLoader()
+    suite = loader.loadTestsFromTestCase(TestCaptureBackends)
+    
+    # Ejecutar tests
+    runner = unittest.TextTestRunner(verbosity=0, stream=open(os.devnull, 'w'))
+    result = runner.run(suite)
+    
+    # Mostrar resumen
+    total_tests = result.testsRun
+    failures = len(result.failures)
+    errors = len(result.errors)
+    passed = total_tests - failures - errors
+    
+    print(f"\n📈 ESTADÍSTICAS DE CAPTURE BACKENDS:")
+    print(f"   Tests ejecutados: {total_tests}")
+    print(f"   Exitosos: {passed}")
+    print(f"   Fallidos: {failures}")
+    print(f"   Errores: {errors}")
+    print(f"   Tasa de éxito: {(passed/total_tests)*100:.1f}%")
+    
+    if failures > 0 or errors > 0:
+        print(f"\n❌ FALLOS DETECTADOS:")
+        for failure in result.failures:
+            print(f"   • {failure[0]}")
+        for error in result.errors:
+            print(f"   • {error[0]}")
+    else:
+        print(f"\n🎉 ¡TODOS LOS TESTS DE CAPTURE BACKENDS PASAN! 🎉") 
\ No newline at end of file
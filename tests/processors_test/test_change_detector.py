@@ -12,9 +12,15 @@ Estos tests verifican la funcionalidad del detector de cambios entre imágenes:
 
 import sys
 import os
+import json
+import base64
 import unittest
 from unittest.mock import patch, MagicMock
+import shutil
+import tempfile
+from collections.abc import MutableMapping
 import numpy as np
+import cv2
 
 # Configurar path para imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
@@ -48,7 +54,7 @@ class TestChangeDetector(unittest.TestCase):
         detector = ChangeDetector()
         
         self.assertEqual(detector.sensitivity, 0.2)
-        self.assertIsInstance(detector.reference_images, dict)
+        self.assertIsInstance(detector.reference_images, MutableMapping)
         self.assertEqual(len(detector.reference_images), 0)
         print("✓ test_change_detector_init_default: EXITOSO")
     
@@ -57,7 +63,7 @@ class TestChangeDetector(unittest.TestCase):
         detector = ChangeDetector(sensitivity=0.5)
         
         self.assertEqual(detector.sensitivity, 0.5)
-        self.assertIsInstance(detector.reference_images, dict)
+        self.assertIsInstance(detector.reference_images, MutableMapping)
         print("✓ test_change_detector_init_custom_sensitivity: EXITOSO")
     
     def test_generate_location_id(self):
@@ -200,9 +206,9 @@ class TestChangeDetector(unittest.TestCase):
         threshold_image[10:20, 10:20] = 255  # 100 píxeles cambiados de 10000 total = 1%
         
         difference_data = {"threshold": threshold_image}
-        contour_data = {"significant_contours": []}  # Sin contornos significativos
+        region_data = {"areas": np.array([])}  # Sin regiones significativas
         
-        metrics = self.detector._calculate_change_metrics(difference_data, contour_data)
+        metrics = self.detector._calculate_change_metrics(difference_data, region_data)
         
         self.assertIn("change_percentage", metrics)
         self.assertIn("has_significant_changes", metrics)
@@ -219,15 +225,50 @@ class TestChangeDetector(unittest.TestCase):
         threshold_image[0:40, :] = 255  # 4000 píxeles de 10000 = 40%
         
         difference_data = {"threshold": threshold_image}
-        contour_data = {"significant_contours": [1, 2, 3]}  # 3 contornos
+        region_data = {"areas": np.array([500, 600, 700])}  # 3 regiones
         
-        metrics = self.detector._calculate_change_metrics(difference_data, contour_data)
+        metrics = self.detector._calculate_change_metrics(difference_data, region_data)
         
         self.assertAlmostEqual(metrics["change_percentage"], 40.0, places=1)
         self.assertTrue(metrics["has_significant_changes"])  # 40% > 30%
         self.assertEqual(metrics["significant_areas"], 3)
         print("✓ test_calculate_change_metrics_significant_changes: EXITOSO")
     
+    def test_analyze_regions_filters_small_blobs(self):
+        """Test: Las regiones pequeñas se descartan y las grandes traen sus estadísticas."""
+        dilated = np.zeros((200, 200), dtype=np.uint8)
+        delta = np.zeros((200, 200), dtype=np.uint8)
+        dilated[::10, ::10] = 255  # 400 blobs de un píxel
+        dilated[52:89, 102:159] = 255
+        delta[52:89, 102:159] = 80
+        
+        region_data = self.detector._analyze_regions(
+            {"dilated": dilated, "delta": delta}, np.zeros((200, 200, 3), dtype=np.uint8)
+        )
+        
+        self.assertGreater(region_data["total_regions"], 300)
+        self.assertEqual(len(region_data["areas"]), 1)
+        self.assertEqual(list(region_data["boxes"][0]), [102, 52, 57, 37])
+        self.assertAlmostEqual(region_data["centroids"][0][0], 130.0, places=1)
+        self.assertAlmostEqual(region_data["intensity"][0], 80.0, places=0)
+        print("✓ test_analyze_regions_filters_small_blobs: EXITOSO")
+    
+    def test_region_coordinates(self):
+        """Test: Los centroides se proyectan al norte y al este de la referencia."""
+        reference = {"coordinates": self.sample_coordinates,
+                     "metadata": {"gsd_m": 0.1}}
+        points = np.array([[50.0, 50.0], [100.0, 0.0]])
+        
+        coordinates = self.detector._georeference_points(points, (100, 100), reference)
+        
+        self.assertAlmostEqual(coordinates[0]["latitude"], 40.7128, places=6)
+        self.assertAlmostEqual(coordinates[0]["longitude"], -74.0060, places=6)
+        self.assertGreater(coordinates[1]["latitude"], 40.7128)
+        self.assertGreater(coordinates[1]["longitude"], -74.0060)
+        self.assertIsNone(self.detector._georeference_points(points, (100, 100),
+                                                             {"coordinates": None, "metadata": {}}))
+        print("✓ test_region_coordinates: EXITOSO")
+    
     def test_build_detection_result(self):
         """Test: Construcción del resultado de detección."""
         location_id = "test_location_001"
@@ -244,10 +285,13 @@ class TestChangeDetector(unittest.TestCase):
         }
         
         changes_image_bytes = b"fake_changes_image"
-        contour_data = {"significant_contours": []}
+        region_data = {
+            "total_regions": 0, "areas": np.array([]), "boxes": np.zeros((0, 4)),
+            "centroids": np.zeros((0, 2)), "intensity": np.array([]), "shape": (100, 100)
+        }
         
         result = self.detector._build_detection_result(
-            location_id, metrics, changes_image_bytes, contour_data
+            location_id, metrics, changes_image_bytes, region_data
         )
         
         self.assertEqual(result["location_id"], location_id)
@@ -255,9 +299,250 @@ class TestChangeDetector(unittest.TestCase):
         self.assertEqual(result["change_percentage"], 25.5)
         self.assertEqual(result["significant_areas"], 2)
         self.assertEqual(result["changes_image"], changes_image_bytes)
+        self.assertEqual(result["regions"], [])
         self.assertEqual(result["timestamp"], 1234567890)
         print("✓ test_build_detection_result: EXITOSO")
     
+    def test_detect_changes_tiled_matches_full_resolution(self):
+        """Test: El modo por teselas produce el mismo informe que la resolución completa."""
+        rng = np.random.RandomState(5)
+        base = rng.randint(0, 255, (48, 64, 3), dtype=np.uint8)
+        reference = cv2.resize(base, (640, 480), interpolation=cv2.INTER_CUBIC)
+        current = reference.copy()
+        current[200:300, 250:400] = (0, 0, 255)
+        reference_png = cv2.imencode('.png', reference)[1].tobytes()
+        current_png = cv2.imencode('.png', current)[1].tobytes()
+        
+        full = ChangeDetector(tiling_min_pixels=None)
+        tiled = ChangeDetector(tiling_min_pixels=0, tile_size=128)
+        for detector in (full, tiled):
+            detector.add_reference_image(reference_png, self.sample_coordinates, self.sample_metadata)
+        
+        location_id = "40.71280_-74.00600"
+        full_result = full.detect_changes(current_png, location_id)
+        tiled_result = tiled.detect_changes(current_png, location_id)
+        
+        self.assertGreater(tiled_result["change_percentage"], 0)
+        self.assertAlmostEqual(tiled_result["change_percentage"], full_result["change_percentage"])
+        self.assertEqual(tiled_result["significant_areas"], full_result["significant_areas"])
+        self.assertIsNotNone(tiled.reference_images[location_id]["coarse"])
+        print("✓ test_detect_changes_tiled_matches_full_resolution: EXITOSO")
+    
+    def test_persistent_references_survive_restart(self):
+        """Test: Las referencias guardadas en disco se recuperan tras reiniciar."""
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, True)
+        image = np.zeros((64, 64, 3), dtype=np.uint8)
+        image_png = cv2.imencode('.png', image)[1].tobytes()
+        
+        ChangeDetector(reference_directory=directory).add_reference_image(
+            image_png, self.sample_coordinates, self.sample_metadata
+        )
+        restarted = ChangeDetector(reference_directory=directory)
+        result = restarted.detect_changes(image_png, "40.71280_-74.00600")
+        
+        self.assertNotIn("error", result)
+        self.assertFalse(result["has_changes"])
+        self.assertEqual(result["timestamp"], 1234567890)
+        self.assertEqual(len(restarted.find_references(self.sample_coordinates)), 1)
+        print("✓ test_persistent_references_survive_restart: EXITOSO")
+    
+    def test_detect_changes_by_coordinates(self):
+        """Test: La referencia se resuelve a partir de la telemetría sin redondear."""
+        image = np.zeros((64, 64, 3), dtype=np.uint8)
+        image_png = cv2.imencode('.png', image)[1].tobytes()
+        self.detector.add_reference_image(image_png, self.sample_coordinates, self.sample_metadata)
+        
+        nearby = {"latitude": 40.71284, "longitude": -74.00603}
+        result = self.detector.detect_changes(image_png, coordinates=nearby)
+        far_away = self.detector.detect_changes(image_png, coordinates={"latitude": 41.0, "longitude": -74.0})
+        
+        self.assertEqual(result["location_id"], "40.71280_-74.00600")
+        self.assertLess(result["reference_distance_m"], 10.0)
+        self.assertIn("error", far_away)
+        print("✓ test_detect_changes_by_coordinates: EXITOSO")
+    
+    def test_remove_reference_updates_index(self):
+        """Test: Eliminar una referencia la quita del índice espacial."""
+        self.detector._store_reference_image(
+            "40.71280_-74.00600",
+            {"original": np.zeros((8, 8, 3), dtype=np.uint8), "processed": np.zeros((8, 8), dtype=np.uint8)},
+            self.sample_coordinates, self.sample_metadata
+        )
+        self.assertEqual(len(self.detector.find_references(self.sample_coordinates)), 1)
+        
+        self.detector.remove_reference_image("40.71280_-74.00600")
+        
+        self.assertEqual(self.detector.find_references(self.sample_coordinates), [])
+        print("✓ test_remove_reference_updates_index: EXITOSO")
+    
+    def test_alignment_removes_drift_false_positives(self):
+        """Test: La deriva del dron no se reporta como cambio gracias a la alineación."""
+        rng = np.random.RandomState(11)
+        blocks = rng.randint(0, 255, (30, 40, 3), dtype=np.uint8)
+        reference = cv2.resize(blocks, (640, 480), interpolation=cv2.INTER_NEAREST)
+        matrix = cv2.getRotationMatrix2D((320, 240), 2.0, 1.0)
+        matrix[:, 2] += (12, -8)
+        drifted = cv2.warpAffine(reference, matrix, (640, 480), borderMode=cv2.BORDER_REFLECT)
+        reference_png = cv2.imencode('.png', reference)[1].tobytes()
+        drifted_png = cv2.imencode('.png', drifted)[1].tobytes()
+        
+        unaligned = ChangeDetector(alignment=False)
+        aligned = ChangeDetector()
+        for detector in (unaligned, aligned):
+            detector.add_reference_image(reference_png, self.sample_coordinates, self.sample_metadata)
+        
+        location_id = "40.71280_-74.00600"
+        self.assertIn("descriptors", aligned.reference_images[location_id])
+        unaligned_result = unaligned.detect_changes(drifted_png, location_id)
+        aligned_result = aligned.detect_changes(drifted_png, location_id)
+        
+        self.assertTrue(aligned_result["alignment"]["aligned"])
+        self.assertGreater(unaligned_result["change_percentage"], 20.0)
+        self.assertLess(aligned_result["change_percentage"], 2.0)
+        print("✓ test_alignment_removes_drift_false_positives: EXITOSO")
+    
+    def test_detect_changes_batch(self):
+        """Test: Un lote agrupa por referencia y devuelve una tabla compacta en orden."""
+        rng = np.random.RandomState(7)
+        reference = cv2.resize(rng.randint(0, 255, (24, 32, 3), dtype=np.uint8), (320, 240),
+                               interpolation=cv2.INTER_CUBIC)
+        changed = reference.copy()
+        changed[60:180, 80:240] = (255, 255, 255)
+        reference_png = cv2.imencode('.png', reference)[1].tobytes()
+        changed_png = cv2.imencode('.png', changed)[1].tobytes()
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, True)
+        detector = ChangeDetector(sensitivity=0.05, alignment=False, reference_directory=directory)
+        location_id = detector.add_reference_image(reference_png, self.sample_coordinates,
+                                                   self.sample_metadata)
+        
+        batch = detector.detect_changes_batch([
+            (reference_png, location_id),
+            (changed_png, {"latitude": 40.71281, "longitude": -74.00601}),
+            (changed_png, "unknown_location"),
+            (b"not an image", location_id)
+        ], max_workers=2)
+        
+        rows = batch["results"]
+        self.assertEqual([row["index"] for row in rows], [0, 1, 2, 3])
+        self.assertFalse(rows[0]["has_changes"])
+        self.assertTrue(rows[1]["has_changes"])
+        self.assertIsNotNone(rows[2]["error"])
+        self.assertIsNotNone(rows[3]["error"])
+        self.assertNotIn("changes_image", rows[1])
+        store_stats = detector.reference_images.get_stats()
+        self.assertEqual(store_stats["cache_hits"] + store_stats["cache_misses"], 1)
+        self.assertEqual(batch["summary"]["total_captures"], 4)
+        self.assertEqual(batch["summary"]["with_changes"], 1)
+        self.assertEqual(batch["summary"]["errors"], 2)
+        self.assertEqual(batch["summary"]["references_used"], 1)
+        print("✓ test_detect_changes_batch: EXITOSO")
+    
+    def test_detect_changes_batch_with_visualization(self):
+        """Test: La visualización del lote solo se codifica si se pide."""
+        image_png = cv2.imencode('.png', np.zeros((32, 32, 3), dtype=np.uint8))[1].tobytes()
+        location_id = self.detector.add_reference_image(image_png, self.sample_coordinates,
+                                                        self.sample_metadata)
+        
+        batch = self.detector.detect_changes_batch([(image_png, location_id)],
+                                                   include_visualization=True)
+        
+        # La tabla del lote es serializable a JSON: la imagen va en base64
+        self.assertEqual(json.loads(json.dumps(batch)), batch)
+        image = base64.b64decode(batch["results"][0]["changes_image"])
+        self.assertTrue(image.startswith(b"\xff\xd8"))
+        print("✓ test_detect_changes_batch_with_visualization: EXITOSO")
+    
+    def test_detect_changes_visualization_is_lazy(self):
+        """Test: La visualización se codifica solo al pedirla por su ID."""
+        image_png = cv2.imencode('.png', np.zeros((32, 32, 3), dtype=np.uint8))[1].tobytes()
+        detector = ChangeDetector(alignment=False, visualization_cache_size=1)
+        location_id = detector.add_reference_image(image_png, self.sample_coordinates,
+                                                   self.sample_metadata)
+
+        with patch('cv2.imencode') as mock_encode:
+            result = detector.detect_changes(image_png, location_id)
+        mock_encode.assert_not_called()
+        self.assertIsNone(result["changes_image"])
+        self.assertFalse(result["visualization"].rendered)
+
+        rendered = detector.render_visualization(result["detection_id"])
+        self.assertTrue(rendered.startswith(b"\xff\xd8"))
+        self.assertIs(detector.render_visualization(result["detection_id"]), rendered)
+
+        # Solo se conservan las más recientes
+        detector.detect_changes(image_png, location_id)
+        self.assertIsNone(detector.render_visualization(result["detection_id"]))
+        print("✓ test_detect_changes_visualization_is_lazy: EXITOSO")
+
+    def test_visualization_cache_is_bounded_by_bytes(self):
+        """Test: Las capturas pendientes se reducen y el LRU se limita en bytes."""
+        image_png = cv2.imencode('.png', np.zeros((40, 64, 3), dtype=np.uint8))[1].tobytes()
+        detector = ChangeDetector(alignment=False, visualization_max_width=32,
+                                  visualization_cache_bytes=32 * 20 * 3 * 2)
+        location_id = detector.add_reference_image(image_png, self.sample_coordinates,
+                                                   self.sample_metadata)
+
+        results = [detector.detect_changes(image_png, location_id) for _ in range(3)]
+
+        self.assertEqual(results[-1]["visualization"].nbytes, 32 * 20 * 3)
+        self.assertEqual(len(detector._visualizations), 2)
+        self.assertIsNone(detector.render_visualization(results[0]["detection_id"]))
+        self.assertIsNotNone(detector.render_visualization(results[-1]["detection_id"]))
+        print("✓ test_visualization_cache_is_bounded_by_bytes: EXITOSO")
+
+    def test_detect_changes_include_visualization(self):
+        """Test: Se puede pedir la visualización codificada en el resultado."""
+        image_png = cv2.imencode('.png', np.zeros((32, 32, 3), dtype=np.uint8))[1].tobytes()
+        location_id = self.detector.add_reference_image(image_png, self.sample_coordinates,
+                                                        self.sample_metadata)
+
+        result = self.detector.detect_changes(image_png, location_id, include_visualization=True)
+
+        self.assertTrue(result["changes_image"].startswith(b"\xff\xd8"))
+        print("✓ test_detect_changes_include_visualization: EXITOSO")
+
+    def test_track_changes_reports_persistence(self):
+        """Test: Un cambio que se mantiene entre capturas acumula persistencia."""
+        reference = np.full((200, 200, 3), 60, dtype=np.uint8)
+        changed = reference.copy()
+        changed[60:140, 60:140] = (255, 255, 255)
+        reference_png = cv2.imencode('.png', reference)[1].tobytes()
+        changed_png = cv2.imencode('.png', changed)[1].tobytes()
+        detector = ChangeDetector(sensitivity=0.05, alignment=False, background_alpha=0.05)
+        location_id = detector.add_reference_image(reference_png, self.sample_coordinates,
+                                                   self.sample_metadata)
+
+        results = [detector.track_changes(changed_png, location_id) for _ in range(3)]
+
+        self.assertEqual([r["captures"] for r in results], [1, 2, 3])
+        self.assertTrue(all(r["has_changes"] for r in results))
+        self.assertEqual(results[2]["regions"][0]["persistence"], 3)
+        self.assertEqual(results[2]["regions"][0]["track_id"], results[0]["regions"][0]["track_id"])
+        self.assertEqual(results[2]["persistent_regions"], 1)
+
+        # Eliminar la referencia descarta su fondo acumulado
+        detector.remove_reference_image(location_id)
+        self.assertEqual(detector.background_model.get_captures(location_id), 0)
+        print("✓ test_track_changes_reports_persistence: EXITOSO")
+
+    def test_repeated_capture_skips_decode_and_blur(self):
+        """Test: Una captura comparada de nuevo reutiliza su decodificación y su blur."""
+        image_png = cv2.imencode('.png', np.full((48, 64, 3), 90, dtype=np.uint8))[1].tobytes()
+        detector = ChangeDetector(alignment=False)
+        location_id = detector.add_reference_image(image_png, self.sample_coordinates,
+                                                   self.sample_metadata)
+
+        with patch('cv2.imdecode') as mock_decode, patch('cv2.GaussianBlur') as mock_blur:
+            result = detector.detect_changes(image_png, location_id)
+
+        mock_decode.assert_not_called()
+        mock_blur.assert_not_called()
+        self.assertFalse(result["has_changes"])
+        self.assertEqual(detector.get_stats()["preprocessing_cache"]["hits"], 1)
+        print("✓ test_repeated_capture_skips_decode_and_blur: EXITOSO")
+
     def test_get_reference_image_not_exists(self):
         """Test: Obtener imagen de referencia que no existe."""
         result = self.detector.get_reference_image("nonexistent_location")
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests básicos para ChangeVisualization del proyecto Drone Geo Analysis.
+
+Estos tests verifican la visualización diferida de cambios:
+- Sin copia ni codificación hasta que se pide la imagen
+- Rectángulos dibujados sin modificar la captura original
+- Codificación única con bytes en caché
+"""
+
+import sys
+import os
+import unittest
+from unittest.mock import patch
+import numpy as np
+import cv2
+
+# Configurar path para imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.processors.change_visualization import ChangeVisualization
+
+
+class TestChangeVisualization(unittest.TestCase):
+    """Tests para la clase ChangeVisualization."""
+    
+    def setUp(self):
+        """Configurar tests con una captura sintética."""
+        self.image = np.zeros((60, 80, 3), dtype=np.uint8)
+        self.visualization = ChangeVisualization(self.image, [(10, 10, 20, 15)])
+    
+    def test_not_rendered_until_requested(self):
+        """Test: Crear el manejador no codifica ni copia la captura."""
+        with patch('cv2.imencode') as mock_encode:
+            visualization = ChangeVisualization(self.image, [(0, 0, 5, 5)])
+        
+        mock_encode.assert_not_called()
+        self.assertFalse(visualization.rendered)
+        print("✓ test_not_rendered_until_requested: EXITOSO")
+    
+    def test_render_draws_boxes_on_copy(self):
+        """Test: El render dibuja los rectángulos sobre una copia."""
+        rendered = self.visualization.render()
+        
+        self.assertEqual(tuple(rendered[10, 15]), (0, 255, 0))
+        self.assertEqual(int(self.image.sum()), 0)
+        print("✓ test_render_draws_boxes_on_copy: EXITOSO")
+    
+    def test_encode_is_cached(self):
+        """Test: La imagen se codifica una sola vez."""
+        first = self.visualization.encode()
+        with patch('cv2.imencode') as mock_encode:
+            second = self.visualization.encode()
+        
+        mock_encode.assert_not_called()
+        self.assertIs(first, second)
+        self.assertTrue(first.startswith(b"\xff\xd8"))
+        self.assertTrue(self.visualization.rendered)
+        print("✓ test_encode_is_cached: EXITOSO")
+    
+    def test_downscale_before_render(self):
+        """Test: La captura pendiente se reduce junto con sus rectángulos."""
+        self.visualization.downscale(40)
+        
+        self.assertEqual(self.visualization.nbytes, 30 * 40 * 3)
+        self.assertEqual(self.visualization.boxes, [(5, 5, 10, 8)])
+        self.assertEqual(self.visualization.render().shape, (30, 40, 3))
+        print("✓ test_downscale_before_render: EXITOSO")
+    
+    def test_downscale_after_encode_keeps_bytes(self):
+        """Test: Una vez codificada, reducir no cambia la imagen guardada."""
+        encoded = self.visualization.encode()
+        self.visualization.downscale(40)
+        
+        self.assertIs(self.visualization.encode(), encoded)
+        self.assertEqual(self.visualization.nbytes, len(encoded))
+        print("✓ test_downscale_after_encode_keeps_bytes: EXITOSO")
+    
+    def test_render_after_encode(self):
+        """Test: Tras codificar se puede seguir renderizando desde los bytes."""
+        self.visualization.encode()
+        rendered = self.visualization.render()
+        
+        self.assertEqual(rendered.shape, self.image.shape)
+        print("✓ test_render_after_encode: EXITOSO")
+
+
+if __name__ == '__main__':
+    print("🧪 EJECUTANDO TESTS DE CHANGE VISUALIZATION")
+    print("=" * 60)
+    
+    # Crear suite de tests
+    loader = unittest.TestLoader()
+    suite = loader.loadTestsFromTestCase(TestChangeVisualization)
+    
+    # Ejecutar tests
+    runner = unittest.TextTestRunner(verbosity=0, stream=open(os.devnull, 'w'))
+    result = runner.run(suite)
+    
+    # Mostrar resumen
+    total_tests = result.testsRun
+    failures = len(result.failures)
+    errors = len(result.errors)
+    passed = total_tests - failures - errors
+    
+    print(f"\n📈 ESTADÍSTICAS DE CHANGE VISUALIZATION:")
+    print(f"   Tests ejecutados: {total_tests}")
+    print(f"   Exitosos: {passed}")
+    print(f"   Fallidos: {failures}")
+    print(f"   Errores: {errors}")
+    print(f"   Tasa de éxito: {(passed/total_tests)*100:.1f}%")
+    
+    if failures > 0 or errors > 0:
+        print(f"\n❌ FALLOS DETECTADOS:")
+        for failure in result.failures:
+            print(f"   • {failure[0]}")
+        for error in result.errors:
+            print(f"   • {error[0]}")
+    else:
+        print(f"\n🎉 ¡TODOS LOS TESTS DE CHANGE VISUALIZATION PASAN! 🎉") 
\ No newline at end of file
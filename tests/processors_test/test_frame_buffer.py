@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests básicos para FrameRingBuffer del proyecto Drone Geo Analysis.
+
+Estos tests verifican el buffer circular de frames crudos:
+- Asignación de secuencias y sobrescritura de slots
+- Codificación JPEG/base64 bajo demanda y cacheada
+- Manejo de frames ya sobrescritos
+"""
+
+import sys
+import os
+import unittest
+import base64
+from unittest.mock import patch
+import numpy as np
+import cv2
+
+# Configurar path para imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.processors.frame_buffer import FrameRingBuffer
+
+
+class TestFrameRingBuffer(unittest.TestCase):
+    """Tests para la clase FrameRingBuffer."""
+
+    def setUp(self):
+        """Configurar tests con datos de prueba."""
+        self.buffer = FrameRingBuffer(capacity=3)
+        self.frame = np.full((48, 64, 3), 127, dtype=np.uint8)
+
+    def test_init_invalid_capacity(self):
+        """Test: La capacidad debe ser positiva."""
+        with self.assertRaises(ValueError):
+            FrameRingBuffer(capacity=0)
+        print("✓ test_init_invalid_capacity: EXITOSO")
+
+    def test_empty_buffer(self):
+        """Test: Buffer vacío sin secuencias."""
+        self.assertIsNone(self.buffer.latest_sequence())
+        self.assertIsNone(self.buffer.get_jpeg(0))
+        self.assertEqual(len(self.buffer), 0)
+        print("✓ test_empty_buffer: EXITOSO")
+
+    def test_push_assigns_sequences(self):
+        """Test: Cada frame recibe una secuencia creciente."""
+        first = self.buffer.push(self.frame)
+        second = self.buffer.push(self.frame)
+
+        self.assertEqual((first, second), (0, 1))
+        self.assertEqual(self.buffer.latest_sequence(), 1)
+        self.assertEqual(self.buffer.get_shape(), (48, 64, 3))
+        print("✓ test_push_assigns_sequences: EXITOSO")
+
+    def test_push_copies_frame(self):
+        """Test: El buffer no comparte memoria con el frame de entrada."""
+        sequence = self.buffer.push(self.frame)
+        self.frame[:] = 0
+
+        stored = self.buffer.get_frame(sequence)
+        self.assertEqual(int(stored[0, 0, 0]), 127)
+        print("✓ test_push_copies_frame: EXITOSO")
+
+    def test_overwrite_oldest_slot(self):
+        """Test: Los frames más antiguos se sobrescriben al llenar el buffer."""
+        for _ in range(4):
+            self.buffer.push(self.frame)
+
+        self.assertFalse(self.buffer.contains(0))
+        self.assertIsNone(self.buffer.get_frame(0))
+        self.assertTrue(self.buffer.contains(3))
+        self.assertEqual(len(self.buffer), 3)
+        print("✓ test_overwrite_oldest_slot: EXITOSO")
+
+    def test_get_jpeg_encodes_once(self):
+        """Test: La codificación JPEG se cachea por secuencia."""
+        sequence = self.buffer.push(self.frame)
+
+        with patch('cv2.imencode', wraps=cv2.imencode) as mock_encode:
+            first = self.buffer.get_jpeg(sequence)
+            second = self.buffer.get_jpeg(sequence)
+
+        self.assertTrue(first.startswith(b'\xff\xd8'))
+        self.assertIs(first, second)
+        mock_encode.assert_called_once()
+        print("✓ test_get_jpeg_encodes_once: EXITOSO")
+
+    def test_get_base64(self):
+        """Test: Codificación base64 del JPEG bajo demanda."""
+        sequence = self.buffer.push(self.frame)
+
+        encoded = self.buffer.get_base64(sequence)
+
+        self.assertEqual(base64.b64decode(encoded), self.buffer.get_jpeg(sequence))
+        print("✓ test_get_base64: EXITOSO")
+
+    def test_cache_invalidated_on_overwrite(self):
+        """Test: La caché de codificación se descarta al reutilizar el slot."""
+        sequence = self.buffer.push(self.frame)
+        self.buffer.get_jpeg(sequence)
+
+        for _ in range(3):
+            self.buffer.push(self.frame)
+
+        self.assertIsNone(self.buffer.get_jpeg(sequence))
+        print("✓ test_cache_invalidated_on_overwrite: EXITOSO")
+
+    def test_resolution_change_reallocates(self):
+        """Test: Un cambio de resolución reasigna los slots."""
+        self.buffer.push(self.frame)
+        sequence = self.buffer.push(np.zeros((24, 32, 3), dtype=np.uint8))
+
+        self.assertEqual(self.buffer.get_shape(), (24, 32, 3))
+        self.assertTrue(self.buffer.contains(sequence))
+        self.assertFalse(self.buffer.contains(0))
+        print("✓ test_resolution_change_reallocates: EXITOSO")
+
+
+if __name__ == '__main__':
+    print("🧪 EJECUTANDO TESTS DE FRAME BUFFER")
+    print("=" * 60)
+    
+    # Crear suite de tests
+    loader = unittest.TestLoader()
+    suite = loader.loadTestsFromTestCase(TestFrameRingBuffer)
+    
+    # Ejecutar tests
+    runner = unittest.TextTestRunner(verbosity=0, stream=open(os.devnull, 'w'))
+    result = runner.run(suite)
+    
+    # Mostrar resumen
+    total_tests = result.testsRun
+    failures = len(result.failures)
+    errors = len(result.errors)
+    passed = total_tests - failures - errors
+    
+    print(f"\n📈 ESTADÍSTICAS DE FRAME BUFFER:")
+    print(f"   Tests ejecutados: {total_tests}")
+    print(f"   Exitosos: {passed}")
+    print(f"   Fallidos: {failures}")
+    print(f"   Errores: {errors}")
+    print(f"   Tasa de éxito: {(passed/total_tests)*100:.1f}%")
+    
+    if failures > 0 or errors > 0:
+        print(f"\n❌ FALLOS DETECTADOS:")
+        for failure in result.failures:
+            print(f"   • {failure[0]}")
+        for error in result.errors:
+            print(f"   • {error[0]}")
+    else:
+        print(f"\n🎉 ¡TODOS LOS TESTS DE FRAME BUFFER PASAN! 🎉") 
\ No newline at end of file
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests básicos para FrameDetectionStage del proyecto Drone Geo Analysis.
+
+Estos tests verifican la etapa YOLO continua del procesador de video:
+- Lotes con los frames más recientes del buffer
+- Conteo de frames saltados cuando el modelo no da abasto
+- Publicación de las detecciones por frame
+- Ausencia de llamadas al modelo sin frames nuevos
+"""
+
+import sys
+import os
+import unittest
+from unittest.mock import MagicMock
+import numpy as np
+
+# Configurar path para imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.processors.video_processor import VideoProcessor
+from src.processors.frame_detection_stage import FrameDetectionStage
+
+
+class TestFrameDetectionStage(unittest.TestCase):
+    """Tests para la clase FrameDetectionStage."""
+
+    def setUp(self):
+        """Configurar un procesador con detector simulado."""
+        self.detector = MagicMock()
+        self.detector.detect_frames.side_effect = lambda frames: [
+            {"detections": [{"class": "car"}], "total_objects": 1} for _ in frames
+        ]
+        self.processor = VideoProcessor(MagicMock(), frame_buffer_size=16,
+                                        object_detector=self.detector,
+                                        detection_batch_size=2)
+        self.stage = self.processor.detection_stage
+
+    def _push_frames(self, count):
+        """Añade frames distintos al buffer del procesador."""
+        for value in range(count):
+            frame = np.full((24, 32, 3), value, dtype=np.uint8)
+            self.processor._process_captured_frame(frame)
+
+    def test_invalid_batch_size(self):
+        """Test: Un tamaño de lote menor que 1 se rechaza."""
+        with self.assertRaises(ValueError):
+            FrameDetectionStage(self.processor, self.detector, batch_size=0)
+        print("✓ test_invalid_batch_size: EXITOSO")
+
+    def test_no_frames_no_model_call(self):
+        """Test: Sin frames nuevos no se llama al modelo."""
+        self.assertFalse(self.stage.run_batch())
+
+        self._push_frames(1)
+        self.assertTrue(self.stage.run_batch())
+        self.assertFalse(self.stage.run_batch())
+
+        self.assertEqual(self.detector.detect_frames.call_count, 1)
+        print("✓ test_no_frames_no_model_call: EXITOSO")
+
+    def test_batch_takes_newest_frames(self):
+        """Test: El lote contiene los frames más recientes en una sola llamada."""
+        self._push_frames(5)
+
+        self.stage.run_batch()
+
+        frames = self.detector.detect_frames.call_args[0][0]
+        self.assertEqual([int(frame[0, 0, 0]) for frame in frames], [3, 4])
+        stats = self.stage.get_stats()
+        self.assertEqual(stats["frames_skipped"], 3)
+        self.assertEqual(stats["frames_detected"], 2)
+        self.assertEqual(stats["batches_run"], 1)
+        print("✓ test_batch_takes_newest_frames: EXITOSO")
+
+    def test_publishes_detections_per_frame(self):
+        """Test: Las detecciones se publican con la secuencia y el instante del frame."""
+        self._push_frames(2)
+
+        self.stage.run_batch()
+        detections = self.processor.get_last_detections()
+
+        self.assertEqual([f["frame_sequence"] for f in detections["frames"]], [0, 1])
+        self.assertEqual(detections["frames"][0]["total_objects"], 1)
+        self.assertIsNotNone(detections["frames"][0]["frame_timestamp"])
+        self.assertIsNotNone(self.processor.get_stream_stats()["detection"]["last_batch_latency"])
+        print("✓ test_publishes_detections_per_frame: EXITOSO")
+
+    def test_stop_without_start(self):
+        """Test: Detener la etapa sin arrancarla no falla."""
+        self.stage.stop(timeout=0.1)
+        self.assertIsNone(self.stage._thread)
+        print("✓ test_stop_without_start: EXITOSO")
+
+
+if __name__ == '__main__':
+    print("🧪 EJECUTANDO TESTS DE FRAME DETECTION STAGE")
+    print("=" * 60)
+    
+    # Crear suite de tests
+    loader = unittest.TestLoader()
+    suite = loader.loadTestsFromTestCase(TestFrameDetectionStage)
+    
+    # Ejecutar tests
+    runner = unittest.TextTestRunner(verbosity=0, stream=open(os.devnull, 'w'))
+    result = runner.run(suite)
+    
+    # Mostrar resumen
+    total_tests = result.testsRun
+    failures = len(result.failures)
+    errors = len(result.errors)
+    passed = total_tests - failures - errors
+    
+    print(f"\n📈 ESTADÍSTICAS DE FRAME DETECTION STAGE:")
+    print(f"   Tests ejecutados: {total_tests}")
+    print(f"   Exitosos: {passed}")
+    print(f"   Fallidos: {failures}")
+    print(f"   Errores: {errors}")
+    print(f"   Tasa de éxito: {(passed/total_tests)*100:.1f}%")
+    
+    if failures > 0 or errors > 0:
+        print(f"\n❌ FALLOS DETECTADOS:")
+        for failure in result.failures:
+            print(f"   • {failure[0]}")
+        for error in result.errors:
+            print(f"   • {error[0]}")
+    else:
+        print(f"\n🎉 ¡TODOS LOS TESTS DE FRAME DETECTION STAGE PASAN! 🎉") 
\ No newline at end of file
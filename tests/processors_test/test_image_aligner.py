@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests básicos para ImageAligner del proyecto Drone Geo Analysis.
+
+Estos tests verifican la alineación de capturas con su referencia:
+- Extracción de características en coordenadas de resolución completa
+- Estimación de la homografía de una captura desplazada y rotada
+- Sin deformación cuando la captura ya está alineada
+- Imágenes sin textura
+"""
+
+import sys
+import os
+import unittest
+import numpy as np
+import cv2
+
+# Configurar path para imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.processors.image_aligner import ImageAligner
+
+
+def make_scene(seed=11, size=(480, 640)):
+    """Genera una escena texturizada con esquinas detectables por ORB."""
+    rng = np.random.RandomState(seed)
+    blocks = rng.randint(0, 255, (size[0] // 16, size[1] // 16), dtype=np.uint8)
+    return cv2.resize(blocks, (size[1], size[0]), interpolation=cv2.INTER_NEAREST)
+
+
+def drift(image, dx=12.0, dy=-8.0, angle=2.0):
+    """Simula la deriva del dron con un desplazamiento y un giro."""
+    height, width = image.shape[:2]
+    matrix = cv2.getRotationMatrix2D((width / 2, height / 2), angle, 1.0)
+    matrix[:, 2] += (dx, dy)
+    return cv2.warpAffine(image, matrix, (width, height), borderMode=cv2.BORDER_REFLECT)
+
+
+class TestImageAligner(unittest.TestCase):
+    """Tests para la clase ImageAligner."""
+
+    def setUp(self):
+        """Configurar el alineador y una escena de referencia."""
+        self.aligner = ImageAligner(working_width=640)
+        self.reference = make_scene()
+        self.reference_features = self.aligner.extract_features(self.reference)
+
+    def test_extract_features_full_resolution(self):
+        """Test: Los puntos se devuelven en coordenadas de resolución completa."""
+        aligner = ImageAligner(working_width=320)
+
+        features = aligner.extract_features(self.reference)
+
+        self.assertEqual(features["descriptors"].shape[1], 32)
+        self.assertGreater(features["keypoints"][:, 0].max(), 320)
+        print("✓ test_extract_features_full_resolution: EXITOSO")
+
+    def test_textureless_image(self):
+        """Test: Una imagen sin textura no tiene características."""
+        self.assertIsNone(self.aligner.extract_features(np.zeros((100, 100), dtype=np.uint8)))
+        print("✓ test_textureless_image: EXITOSO")
+
+    def test_align_drifted_capture(self):
+        """Test: Una captura desplazada y girada vuelve al encuadre de la referencia."""
+        current = drift(self.reference)
+        current_bgr = cv2.cvtColor(current, cv2.COLOR_GRAY2BGR)
+
+        result = self.aligner.align(self.reference_features, self.reference.shape,
+                                    current_bgr, current)
+
+        self.assertTrue(result["aligned"])
+        self.assertIsNotNone(result["valid_mask"])
+        inner = (slice(40, -40), slice(40, -40))
+        before = np.mean(cv2.absdiff(self.reference, current)[inner])
+        after = np.mean(cv2.absdiff(self.reference, result["gray"])[inner])
+        self.assertLess(after, before / 4)
+        print("✓ test_align_drifted_capture: EXITOSO")
+
+    def test_aligned_capture_not_warped(self):
+        """Test: Una captura ya alineada no se deforma."""
+        current_bgr = cv2.cvtColor(self.reference, cv2.COLOR_GRAY2BGR)
+
+        result = self.aligner.align(self.reference_features, self.reference.shape,
+                                    current_bgr, self.reference)
+
+        self.assertTrue(result["aligned"])
+        self.assertIsNone(result["valid_mask"])
+        self.assertIs(result["gray"], self.reference)
+        print("✓ test_aligned_capture_not_warped: EXITOSO")
+
+    def test_unrelated_scene_not_aligned(self):
+        """Test: Una escena distinta no produce homografía."""
+        other = make_scene(seed=99)
+
+        result = self.aligner.align(self.reference_features, self.reference.shape,
+                                    cv2.cvtColor(other, cv2.COLOR_GRAY2BGR), other)
+
+        self.assertFalse(result["aligned"])
+        self.assertIs(result["gray"], other)
+        print("✓ test_unrelated_scene_not_aligned: EXITOSO")
+
+
+if __name__ == '__main__':
+    print("🧪 EJECUTANDO TESTS DE IMAGE ALIGNER")
+    print("=" * 60)
+    
+    # Crear suite de tests
+    loader = unittest.TestLoader()
+    suite = loader.loadTestsFromTestCase(TestImageAligner)
+    
+    # Ejecutar tests
+    runner = unittest.TextTestRunner(verbosity=0, stream=open(os.devnull, 'w'))
+    result = runner.run(suite)
+    
+    # Mostrar resumen
+    total_tests = result.testsRun
+    failures = len(result.failures)
+    errors = len(result.errors)
+    passed = total_tests - failures - errors
+    
+    print(f"\n📈 ESTADÍSTICAS DE IMAGE ALIGNER:")
+    print(f"   Tests ejecutados: {total_tests}")
+    print(f"   Exitosos: {passed}")
+    print(f"   Fallidos: {failures}")
+    print(f"   Errores: {errors}")
+    print(f"   Tasa de éxito: {(passed/total_tests)*100:.1f}%")
+    
+    if failures > 0 or errors > 0:
+        print(f"\n❌ FALLOS DETECTADOS:")
+        for failure in result.failures:
+            print(f"   • {failure[0]}")
+        for error in result.errors:
+            print(f"   • {error[0]}")
+    else:
+        print(f"\n🎉 ¡TODOS LOS TESTS DE IMAGE ALIGNER PASAN! 🎉") 
\ No newline at end of file
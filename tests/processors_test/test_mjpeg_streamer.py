@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests básicos para MjpegStreamer del proyecto Drone Geo Analysis.
+
+Estos tests verifican la vista previa MJPEG en vivo:
+- Formato de las partes multipart
+- Codificación única compartida entre espectadores
+- Salto al frame más reciente para clientes lentos
+- Fin del stream al detener el procesador
+"""
+
+import sys
+import os
+import unittest
+from unittest.mock import patch, MagicMock
+import numpy as np
+import cv2
+
+# Configurar path para imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.processors.video_processor import VideoProcessor
+from src.processors.mjpeg_streamer import MjpegStreamer
+
+
+class TestMjpegStreamer(unittest.TestCase):
+    """Tests para la clase MjpegStreamer."""
+
+    def setUp(self):
+        """Configurar un procesador activo sin threads de captura."""
+        self.processor = VideoProcessor(MagicMock())
+        self.processor.processing = True
+        self.streamer = MjpegStreamer(self.processor, max_fps=0, idle_timeout=0.05)
+        self.frame = np.full((48, 64, 3), 90, dtype=np.uint8)
+
+    def test_format_part(self):
+        """Test: Cada parte lleva delimitador, tipo y longitud."""
+        part = MjpegStreamer.format_part(b"abc")
+
+        self.assertTrue(part.startswith(b"--frame\r\nContent-Type: image/jpeg\r\n"))
+        self.assertIn(b"Content-Length: 3\r\n\r\nabc\r\n", part)
+        print("✓ test_format_part: EXITOSO")
+
+    def test_stream_yields_latest_frame(self):
+        """Test: El espectador recibe el frame más reciente en JPEG."""
+        self.processor._process_captured_frame(self.frame)
+        stream = self.streamer.stream()
+
+        part = next(stream)
+        stream.close()
+
+        self.assertIn(b"\xff\xd8", part)
+        self.assertEqual(self.streamer.get_stats()["frames_sent"], 1)
+        print("✓ test_stream_yields_latest_frame: EXITOSO")
+
+    def test_viewers_share_single_encode(self):
+        """Test: Varios espectadores comparten la misma codificación."""
+        self.processor._process_captured_frame(self.frame)
+        viewers = [self.streamer.stream() for _ in range(3)]
+
+        with patch('cv2.imencode', wraps=cv2.imencode) as mock_encode:
+            parts = [next(viewer) for viewer in viewers]
+
+        self.assertEqual(len(set(parts)), 1)
+        mock_encode.assert_called_once()
+        self.assertEqual(self.streamer.get_stats()["viewers"], 3)
+        for viewer in viewers:
+            viewer.close()
+        self.assertEqual(self.streamer.get_stats()["viewers"], 0)
+        print("✓ test_viewers_share_single_encode: EXITOSO")
+
+    def test_slow_client_skips_to_latest(self):
+        """Test: Un cliente lento salta frames en lugar de acumular cola."""
+        self.processor._process_captured_frame(self.frame)
+        stream = self.streamer.stream()
+        next(stream)
+        for _ in range(4):
+            self.processor._process_captured_frame(self.frame)
+
+        next(stream)
+        stream.close()
+
+        self.assertEqual(self.streamer.get_stats()["frames_skipped"], 3)
+        print("✓ test_slow_client_skips_to_latest: EXITOSO")
+
+    def test_stream_ends_without_frames(self):
+        """Test: El stream termina si no llegan frames o el procesador se detiene."""
+        self.assertEqual(list(self.streamer.stream()), [])
+
+        self.processor.processing = False
+        self.processor._process_captured_frame(self.frame)
+        self.assertEqual(list(self.streamer.stream()), [])
+        print("✓ test_stream_ends_without_frames: EXITOSO")
+
+
+if __name__ == '__main__':
+    print("🧪 EJECUTANDO TESTS DE MJPEG STREAMER")
+    print("=" * 60)
+    
+    # Crear suite de tests
+    loader = unittest.TestLoader()
+    suite = loader.loadTestsFromTestCase(TestMjpegStreamer)
+    
+    # Ejecutar tests
+    runner = unittest.TextTestRunner(verbosity=0, stream=open(os.devnull, 'w'))
+    result = runner.run(suite)
+    
+    # Mostrar resumen
+    total_tests = result.testsRun
+    failures = len(result.failures)
+    errors = len(result.errors)
+    passed = total_tests - failures - errors
+    
+    print(f"\n📈 ESTADÍSTICAS DE MJPEG STREAMER:")
+    print(f"   Tests ejecutados: {total_tests}")
+    print(f"   Exitosos: {passed}")
+    print(f"   Fallidos: {failures}")
+    print(f"   Errores: {errors}")
+    print(f"   Tasa de éxito: {(passed/total_tests)*100:.1f}%")
+    
+    if failures > 0 or errors > 0:
+        print(f"\n❌ FALLOS DETECTADOS:")
+        for failure in result.failures:
+            print(f"   • {failure[0]}")
+        for error in result.errors:
+            print(f"   • {error[0]}")
+    else:
+        print(f"\n🎉 ¡TODOS LOS TESTS DE MJPEG STREAMER PASAN! 🎉") 
\ No newline at end of file
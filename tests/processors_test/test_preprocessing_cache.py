@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests básicos para PreprocessingCache del proyecto Drone Geo Analysis.
+
+Estos tests verifican la caché de imágenes preprocesadas:
+- Aciertos por contenido sin volver a decodificar
+- Derivados (blur) calculados una sola vez
+- Expulsión por tamaño en bytes
+- Imágenes inválidas
+"""
+
+import sys
+import os
+import unittest
+from unittest.mock import patch
+import numpy as np
+import cv2
+
+# Configurar path para imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.processors.preprocessing_cache import PreprocessingCache
+
+
+def encode_png(value, size=(40, 60)):
+    """Codifica una imagen BGR uniforme en PNG."""
+    image = np.full((size[0], size[1], 3), value, dtype=np.uint8)
+    return cv2.imencode('.png', image)[1].tobytes()
+
+
+class TestPreprocessingCache(unittest.TestCase):
+    """Tests para la clase PreprocessingCache."""
+    
+    def setUp(self):
+        """Configurar tests con una caché amplia."""
+        self.cache = PreprocessingCache(max_bytes=10 * 1024 * 1024)
+        self.image_data = encode_png(120)
+    
+    def test_hit_skips_decode(self):
+        """Test: La misma imagen se decodifica una sola vez."""
+        first = self.cache.get(self.image_data)
+        with patch('cv2.imdecode') as mock_decode:
+            second = self.cache.get(bytes(self.image_data))
+        
+        mock_decode.assert_not_called()
+        self.assertIs(first, second)
+        self.assertEqual(first.gray.shape, (40, 60))
+        stats = self.cache.get_stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 1))
+        print("✓ test_hit_skips_decode: EXITOSO")
+    
+    def test_blur_is_computed_once(self):
+        """Test: El blur se calcula la primera vez y se reutiliza."""
+        entry = self.cache.get(self.image_data)
+        size_before = self.cache.get_stats()["bytes_used"]
+        blur = entry.blur()
+        with patch('cv2.GaussianBlur') as mock_blur:
+            self.assertIs(entry.blur(), blur)
+        
+        mock_blur.assert_not_called()
+        self.assertEqual(self.cache.get_stats()["bytes_used"], size_before + blur.nbytes)
+        print("✓ test_blur_is_computed_once: EXITOSO")
+    
+    def test_evicts_by_size(self):
+        """Test: Se expulsan las imágenes menos recientes al superar el tamaño."""
+        entry_size = 40 * 60 * 4  # BGR + grises
+        cache = PreprocessingCache(max_bytes=entry_size * 2)
+        for value in (10, 20, 30):
+            cache.get(encode_png(value))
+        
+        stats = cache.get_stats()
+        self.assertEqual(stats["entries"], 2)
+        self.assertEqual(stats["evictions"], 1)
+        self.assertLessEqual(stats["bytes_used"], entry_size * 2)
+        print("✓ test_evicts_by_size: EXITOSO")
+    
+    def test_disabled_cache(self):
+        """Test: Con tamaño 0 se preprocesa sin guardar nada."""
+        cache = PreprocessingCache(max_bytes=0)
+        entry = cache.get(self.image_data)
+        entry.blur()
+        
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.get_stats()["bytes_used"], 0)
+        print("✓ test_disabled_cache: EXITOSO")
+    
+    def test_invalid_image(self):
+        """Test: Los bytes que no son imagen devuelven None."""
+        self.assertIsNone(self.cache.get(b"not an image"))
+        self.assertEqual(len(self.cache), 0)
+        print("✓ test_invalid_image: EXITOSO")
+
+
+if __name__ == '__main__':
+    print("🧪 EJECUTANDO TESTS DE PREPROCESSING CACHE")
+    print("=" * 60)
+    
+    # Crear suite de tests
+    loader = unittest.TestLoader()
+    suite = loader.loadTestsFromTestCase(TestPreprocessingCache)
+    
+    # Ejecutar tests
+    runner = unittest.TextTestRunner(verbosity=0, stream=open(os.devnull, 'w'))
+    result = runner.run(suite)
+    
+    # Mostrar resumen
+    total_tests = result.testsRun
+    failures = len(result.failures)
+    errors = len(result.errors)
+    passed = total_tests - failures - errors
+    
+    print(f"\n📈 ESTADÍSTICAS DE PREPROCESSING CACHE:")
+    print(f"   Tests ejecutados: {total_tests}")
+    print(f"   Exitosos: {passed}")
+    print(f"   Fallidos: {failures}")
+    print(f"   Errores: {errors}")
+    print(f"   Tasa de éxito: {(passed/total_tests)*100:.1f}%")
+    
+    if failures > 0 or errors > 0:
+        print(f"\n❌ FALLOS DETECTADOS:")
+        for failure in result.failures:
+            print(f"   • {failure[0]}")
+        for error in result.errors:
+            print(f"   • {error[0]}")
+    else:
+        print(f"\n🎉 ¡TODOS LOS TESTS DE PREPROCESSING CACHE PASAN! 🎉") 
\ No newline at end of file
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests básicos para AdaptiveRateController del proyecto Drone Geo Analysis.
+
+Estos tests verifican el control adaptativo de tasa del video:
+- Medias móviles de coste de frame, codificación y latencia
+- Reducción de tasa ante latencia, ocupación o coste por frame altos
+- Recuperación de tasa con margen y límites de las escalas
+- Historial de decisiones y estadísticas
+"""
+
+import sys
+import os
+import unittest
+
+# Configurar path para imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.processors.rate_controller import AdaptiveRateController
+
+
+class TestAdaptiveRateController(unittest.TestCase):
+    """Tests para la clase AdaptiveRateController."""
+
+    def setUp(self):
+        """Configurar tests con un controlador de objetivo conocido."""
+        self.controller = AdaptiveRateController(target_latency=4.0, smoothing=1.0)
+        self.frame_interval = 0.2
+        self.analysis_interval = 5.0
+
+    def _adjust(self):
+        """Ejecuta un ajuste con los intervalos base de prueba."""
+        return self.controller.adjust(self.frame_interval, self.analysis_interval)
+
+    def test_initial_state(self):
+        """Test: Sin métricas el controlador no cambia la tasa."""
+        self.assertIsNone(self._adjust())
+        self.assertEqual(self.controller.frame_scale, 1.0)
+        self.assertEqual(self.controller.analysis_scale, 1.0)
+        print("✓ test_initial_state: EXITOSO")
+
+    def test_high_latency_decreases_rate(self):
+        """Test: Latencia por encima del objetivo alarga los intervalos."""
+        self.controller.record_analysis(latency=9.0, duration=2.0)
+
+        decision = self._adjust()
+
+        self.assertEqual(decision["action"], "decrease_rate")
+        self.assertIn("latency", decision["reasons"])
+        self.assertGreater(self.controller.analysis_scale, 1.0)
+        self.assertGreater(self.controller.frame_scale, 1.0)
+        print("✓ test_high_latency_decreases_rate: EXITOSO")
+
+    def test_saturated_analysis_decreases_rate(self):
+        """Test: Un worker de análisis casi siempre ocupado reduce la tasa."""
+        self.controller.record_analysis(latency=3.5, duration=4.5)
+
+        decision = self._adjust()
+
+        self.assertIn("analysis_occupancy", decision["reasons"])
+        print("✓ test_saturated_analysis_decreases_rate: EXITOSO")
+
+    def test_frame_cost_decreases_rate(self):
+        """Test: Un coste por frame alto espacia el muestreo."""
+        self.controller.record_frame_cost(0.08)
+        self.controller.record_encode(0.05)
+
+        decision = self._adjust()
+
+        self.assertEqual(decision["reasons"], ["frame_cost"])
+        print("✓ test_frame_cost_decreases_rate: EXITOSO")
+
+    def test_headroom_increases_rate(self):
+        """Test: Con margen se recupera la tasa sin bajar del intervalo de análisis base."""
+        self.controller.record_analysis(latency=9.0, duration=2.0)
+        self._adjust()
+        self.controller.record_analysis(latency=1.0, duration=0.5)
+
+        for _ in range(20):
+            self._adjust()
+
+        self.assertEqual(self.controller.analysis_scale, 1.0)
+        self.assertEqual(self.controller.frame_scale, self.controller.min_frame_scale)
+        self.assertEqual(self.controller.get_decisions()[-1]["action"], "increase_rate")
+        print("✓ test_headroom_increases_rate: EXITOSO")
+
+    def test_scales_are_bounded(self):
+        """Test: La reducción de tasa respeta las escalas máximas."""
+        self.controller.record_analysis(latency=60.0, duration=2.0)
+
+        for _ in range(20):
+            self._adjust()
+
+        self.assertEqual(self.controller.frame_scale, self.controller.max_frame_scale)
+        self.assertEqual(self.controller.analysis_scale, self.controller.max_analysis_scale)
+        self.assertIsNone(self._adjust())
+        print("✓ test_scales_are_bounded: EXITOSO")
+
+    def test_disabled_only_measures(self):
+        """Test: Desactivado, el controlador mide pero no ajusta."""
+        controller = AdaptiveRateController(enabled=False)
+        controller.record_analysis(latency=60.0, duration=2.0)
+
+        self.assertIsNone(controller.adjust(0.2, 5.0))
+        self.assertEqual(controller.get_stats()["analysis_latency"], 60.0)
+        print("✓ test_disabled_only_measures: EXITOSO")
+
+    def test_source_fps_and_stats(self):
+        """Test: Cálculo de fps de la fuente y estadísticas expuestas."""
+        for index in range(11):
+            self.controller.record_frame_read(100.0 + index * 0.04)
+
+        stats = self.controller.get_stats()
+
+        self.assertAlmostEqual(stats["source_fps"], 25.0, places=1)
+        for key in ("frame_scale", "analysis_scale", "encode_time", "last_decision"):
+            self.assertIn(key, stats)
+        print("✓ test_source_fps_and_stats: EXITOSO")
+
+
+if __name__ == '__main__':
+    print("🧪 EJECUTANDO TESTS DE RATE CONTROLLER")
+    print("=" * 60)
+    
+    # Crear suite de tests
+    loader = unittest.TestLoader()
+    suite = loader.loadTestsFromTestCase(TestAdaptiveRateController)
+    
+    # Ejecutar tests
+    runner = unittest.TextTestRunner(verbosity=0, stream=open(os.devnull, 'w'))
+    result = runner.run(suite)
+    
+    # Mostrar resumen
+    total_tests = result.testsRun
+    failures = len(result.failures)
+    errors = len(result.errors)
+    passed = total_tests - failures - errors
+    
+    print(f"\n📈 ESTADÍSTICAS DE RATE CONTROLLER:")
+    print(f"   Tests ejecutados: {total_tests}")
+    print(f"   Exitosos: {passed}")
+    print(f"   Fallidos: {failures}")
+    print(f"   Errores: {errors}")
+    print(f"   Tasa de éxito: {(passed/total_tests)*100:.1f}%")
+    
+    if failures > 0 or errors > 0:
+        print(f"\n❌ FALLOS DETECTADOS:")
+        for failure in result.failures:
+            print(f"   • {failure[0]}")
+        for error in result.errors:
+            print(f"   • {error[0]}")
+    else:
+        print(f"\n🎉 ¡TODOS LOS TESTS DE RATE CONTROLLER PASAN! 🎉") 
\ No newline at end of file
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests básicos para ReferenceSpatialIndex del proyecto Drone Geo Analysis.
+
+Estos tests verifican el índice espacial de referencias:
+- Búsqueda de la referencia más cercana dentro de un radio
+- Resultados ordenados y limitados
+- Movimiento y eliminación de referencias
+"""
+
+import sys
+import os
+import unittest
+
+# Configurar path para imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.processors.reference_index import ReferenceSpatialIndex
+
+
+class TestReferenceSpatialIndex(unittest.TestCase):
+    """Tests para la clase ReferenceSpatialIndex."""
+
+    def setUp(self):
+        """Configurar un índice con referencias a lo largo de una ruta."""
+        self.index = ReferenceSpatialIndex(cell_size_m=100.0)
+        # Una referencia cada ~11 m hacia el norte
+        for step in range(1000):
+            self.index.insert(f"ref_{step}", 40.0 + step * 0.0001, -3.0)
+
+    def test_invalid_cell_size(self):
+        """Test: Un tamaño de celda no positivo se rechaza."""
+        with self.assertRaises(ValueError):
+            ReferenceSpatialIndex(cell_size_m=0)
+        print("✓ test_invalid_cell_size: EXITOSO")
+
+    def test_nearest_within_radius(self):
+        """Test: Se encuentra la referencia más cercana a una posición sin redondear."""
+        matches = self.index.nearest(40.050004, -3.00001, radius_m=20.0)
+
+        self.assertEqual(len(matches), 1)
+        self.assertEqual(matches[0][0], "ref_500")
+        self.assertLess(matches[0][1], 2.0)
+        print("✓ test_nearest_within_radius: EXITOSO")
+
+    def test_results_sorted_and_limited(self):
+        """Test: Varios resultados se devuelven ordenados por distancia."""
+        matches = self.index.nearest(40.05, -3.0, radius_m=30.0, max_results=None)
+
+        distances = [distance for _, distance in matches]
+        self.assertEqual(distances, sorted(distances))
+        self.assertTrue(all(distance <= 30.0 for distance in distances))
+        self.assertEqual(len(matches), 5)
+        self.assertEqual(len(self.index.nearest(40.05, -3.0, 30.0, max_results=2)), 2)
+        print("✓ test_results_sorted_and_limited: EXITOSO")
+
+    def test_no_match_outside_radius(self):
+        """Test: Sin referencias dentro del radio el resultado está vacío."""
+        self.assertEqual(self.index.nearest(41.0, -3.0, radius_m=500.0), [])
+        print("✓ test_no_match_outside_radius: EXITOSO")
+
+    def test_large_radius(self):
+        """Test: Un radio enorme recorre solo las celdas ocupadas."""
+        matches = self.index.nearest(40.0, -3.0, radius_m=5_000_000.0, max_results=None)
+        self.assertEqual(len(matches), 1000)
+        print("✓ test_large_radius: EXITOSO")
+
+    def test_move_and_remove(self):
+        """Test: Reinsertar mueve la referencia y eliminarla la quita del índice."""
+        self.index.insert("ref_0", 41.0, -3.0)
+        self.assertEqual(self.index.nearest(41.0, -3.0, 10.0)[0][0], "ref_0")
+
+        self.assertTrue(self.index.remove("ref_0"))
+        self.assertFalse(self.index.remove("ref_0"))
+        self.assertEqual(self.index.nearest(41.0, -3.0, 10.0), [])
+        self.assertEqual(len(self.index), 999)
+        print("✓ test_move_and_remove: EXITOSO")
+
+
+if __name__ == '__main__':
+    print("🧪 EJECUTANDO TESTS DE REFERENCE SPATIAL INDEX")
+    print("=" * 60)
+    
+    # Crear suite de tests
+    loader = unittest.TestLoader()
+    suite = loader.loadTestsFromTestCase(TestReferenceSpatialIndex)
+    
+    # Ejecutar tests
+    runner = unittest.TextTestRunner(verbosity=0, stream=open(os.devnull, 'w'))
+    result = runner.run(suite)
+    
+    # Mostrar resumen
+    total_tests = result.testsRun
+    failures = len(result.failures)
+    errors = len(result.errors)
+    passed = total_tests - failures - errors
+    
+    print(f"\n📈 ESTADÍSTICAS DE REFERENCE SPATIAL INDEX:")
+    print(f"   Tests ejecutados: {total_tests}")
+    print(f"   Exitosos: {passed}")
+    print(f"   Fallidos: {failures}")
+    print(f"   Errores: {errors}")
+    print(f"   Tasa de éxito: {(passed/total_tests)*100:.1f}%")
+    
+    if failures > 0 or errors > 0:
+        print(f"\n❌ FALLOS DETECTADOS:")
+        for failure in result.failures:
+            print(f"   • {failure[0]}")
+        for error in result.errors:
+            print(f"   • {error[0]}")
+    else:
+        print(f"\n🎉 ¡TODOS LOS TESTS DE REFERENCE SPATIAL INDEX PASAN! 🎉") 
\ No newline at end of file
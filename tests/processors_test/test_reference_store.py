@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests básicos para ReferenceImageStore del proyecto Drone Geo Analysis.
+
+Estos tests verifican el almacén persistente de referencias:
+- Comportamiento de diccionario en memoria y en disco
+- Arrays mapeados en memoria y recarga tras reiniciar
+- LRU de referencias abiertas
+- Eliminación de ficheros
+"""
+
+import sys
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+
+# Configurar path para imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.processors.reference_store import ReferenceImageStore
+
+
+class TestReferenceImageStore(unittest.TestCase):
+    """Tests para la clase ReferenceImageStore."""
+
+    def setUp(self):
+        """Configurar un directorio temporal y una referencia de prueba."""
+        self.directory = tempfile.mkdtemp()
+        self.store = ReferenceImageStore(self.directory, cache_size=2)
+        self.reference = {
+            "image": np.full((40, 60), 7, dtype=np.uint8),
+            "original": np.zeros((40, 60, 3), dtype=np.uint8),
+            "metadata": {"timestamp": 123},
+            "coordinates": {"latitude": 40.0, "longitude": -3.0}
+        }
+
+    def tearDown(self):
+        """Eliminar el directorio temporal."""
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def test_memory_only_store(self):
+        """Test: Sin directorio funciona como un diccionario en memoria."""
+        store = ReferenceImageStore()
+        store["a"] = {"test": "data"}
+
+        self.assertIn("a", store)
+        self.assertEqual(store["a"], {"test": "data"})
+        del store["a"]
+        self.assertEqual(len(store), 0)
+        print("✓ test_memory_only_store: EXITOSO")
+
+    def test_arrays_are_memory_mapped(self):
+        """Test: Los arrays se guardan en .npy y se abren mapeados."""
+        self.store["loc_1"] = self.reference
+
+        entry = self.store["loc_1"]
+
+        self.assertIsInstance(entry["image"], np.memmap)
+        self.assertEqual(int(entry["image"][0, 0]), 7)
+        self.assertEqual(entry["metadata"], {"timestamp": 123})
+        self.assertTrue(any(name.endswith(".npy") for name in os.listdir(self.directory)))
+        print("✓ test_arrays_are_memory_mapped: EXITOSO")
+
+    def test_survives_restart(self):
+        """Test: Un almacén nuevo sobre el mismo directorio recupera las referencias."""
+        self.store["loc_1"] = self.reference
+        self.store.set_array("loc_1", "coarse", np.ones((10, 15), dtype=np.uint8))
+
+        reopened = ReferenceImageStore(self.directory)
+
+        self.assertEqual(list(reopened), ["loc_1"])
+        self.assertEqual(reopened["loc_1"]["coordinates"]["latitude"], 40.0)
+        self.assertEqual(reopened["loc_1"]["coarse"].shape, (10, 15))
+        print("✓ test_survives_restart: EXITOSO")
+
+    def test_lru_bounds_open_references(self):
+        """Test: Solo se mantienen abiertas las referencias más recientes."""
+        for location_id in ("a", "b", "c"):
+            self.store[location_id] = self.reference
+            self.store[location_id]
+
+        self.store["c"]
+        stats = self.store.get_stats()
+        self.assertEqual(stats["cached"], 2)
+        self.assertEqual(stats["cache_hits"], 1)
+        self.assertEqual(stats["cache_misses"], 3)
+        print("✓ test_lru_bounds_open_references: EXITOSO")
+
+    def test_get_fields_without_arrays(self):
+        """Test: Los datos ligeros se leen sin abrir los arrays."""
+        self.store["loc_1"] = self.reference
+
+        fields = self.store.get_fields("loc_1")
+
+        self.assertNotIn("image", fields)
+        self.assertEqual(fields["metadata"]["timestamp"], 123)
+        self.assertEqual(self.store.get_stats()["cache_misses"], 0)
+        self.assertIsNone(self.store.get_fields("missing"))
+        print("✓ test_get_fields_without_arrays: EXITOSO")
+
+    def test_delete_removes_files(self):
+        """Test: Eliminar una referencia borra sus ficheros."""
+        self.store["loc_1"] = self.reference
+        del self.store["loc_1"]
+
+        self.assertNotIn("loc_1", self.store)
+        self.assertFalse(any(name.endswith(".npy") for name in os.listdir(self.directory)))
+        with self.assertRaises(KeyError):
+            del self.store["loc_1"]
+        print("✓ test_delete_removes_files: EXITOSO")
+
+
+if __name__ == '__main__':
+    print("🧪 EJECUTANDO TESTS DE REFERENCE IMAGE STORE")
+    print("=" * 60)
+    
+    # Crear suite de tests
+    loader = unittest.TestLoader()
+    suite = loader.loadTestsFromTestCase(TestReferenceImageStore)
+    
+    # Ejecutar tests
+    runner = unittest.TextTestRunner(verbosity=0, stream=open(os.devnull, 'w'))
+    result = runner.run(suite)
+    
+    # Mostrar resumen
+    total_tests = result.testsRun
+    failures = len(result.failures)
+    errors = len(result.errors)
+    passed = total_tests - failures - errors
+    
+    print(f"\n📈 ESTADÍSTICAS DE REFERENCE IMAGE STORE:")
+    print(f"   Tests ejecutados: {total_tests}")
+    print(f"   Exitosos: {passed}")
+    print(f"   Fallidos: {failures}")
+    print(f"   Errores: {errors}")
+    print(f"   Tasa de éxito: {(passed/total_tests)*100:.1f}%")
+    
+    if failures > 0 or errors > 0:
+        print(f"\n❌ FALLOS DETECTADOS:")
+        for failure in result.failures:
+            print(f"   • {failure[0]}")
+        for error in result.errors:
+            print(f"   • {error[0]}")
+    else:
+        print(f"\n🎉 ¡TODOS LOS TESTS DE REFERENCE IMAGE STORE PASAN! 🎉") 
\ No newline at end of file
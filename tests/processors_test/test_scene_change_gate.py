@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests básicos para SceneChangeGate del proyecto Drone Geo Analysis.
+
+Estos tests verifican el filtro previo de cambio de escena:
+- Firma perceptual (dHash) y miniatura de un frame
+- Detección de escena igual y de escena distinta
+- Caducidad de la reutilización y reinicio de la referencia
+"""
+
+import sys
+import os
+import unittest
+import numpy as np
+
+# Configurar path para imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.processors.scene_change_gate import SceneChangeGate
+
+
+class TestSceneChangeGate(unittest.TestCase):
+    """Tests para la clase SceneChangeGate."""
+
+    def setUp(self):
+        """Configurar tests con frames de prueba."""
+        self.gate = SceneChangeGate(max_reuse_age=10.0)
+        gradient = np.tile(np.linspace(0, 255, 128, dtype=np.uint8), (96, 1))
+        self.frame = np.dstack([gradient] * 3)
+        self.other_frame = np.ascontiguousarray(self.frame[:, ::-1])
+
+    def test_compute_signature(self):
+        """Test: La firma tiene 64 bits de hash y una miniatura en grises."""
+        signature = self.gate.compute_signature(self.frame)
+
+        self.assertEqual(signature.hash_bits.shape, (64,))
+        self.assertEqual(signature.thumbnail.shape, (32, 32))
+        print("✓ test_compute_signature: EXITOSO")
+
+    def test_first_frame_requires_analysis(self):
+        """Test: Sin referencia, el frame siempre se analiza."""
+        changed, _ = self.gate.evaluate(self.frame, 100.0)
+
+        self.assertTrue(changed)
+        print("✓ test_first_frame_requires_analysis: EXITOSO")
+
+    def test_same_scene_is_reused(self):
+        """Test: Un frame casi idéntico no requiere análisis."""
+        _, signature = self.gate.evaluate(self.frame, 100.0)
+        self.gate.record_analysis(signature, 100.0)
+        noisy = np.clip(self.frame.astype(np.int16) + 2, 0, 255).astype(np.uint8)
+
+        changed, _ = self.gate.evaluate(noisy, 101.0)
+
+        self.assertFalse(changed)
+        self.assertEqual(self.gate.get_stats()["unchanged_frames"], 1)
+        print("✓ test_same_scene_is_reused: EXITOSO")
+
+    def test_different_scene_requires_analysis(self):
+        """Test: Un cambio de escena fuerza un análisis nuevo."""
+        _, signature = self.gate.evaluate(self.frame, 100.0)
+        self.gate.record_analysis(signature, 100.0)
+
+        changed, _ = self.gate.evaluate(self.other_frame, 101.0)
+
+        self.assertTrue(changed)
+        self.assertGreater(self.gate.get_stats()["last_hash_distance"], 6)
+        print("✓ test_different_scene_requires_analysis: EXITOSO")
+
+    def test_reuse_expires(self):
+        """Test: La misma escena se reanaliza al superar la edad máxima."""
+        _, signature = self.gate.evaluate(self.frame, 100.0)
+        self.gate.record_analysis(signature, 100.0)
+
+        changed, _ = self.gate.evaluate(self.frame, 111.0)
+
+        self.assertTrue(changed)
+        print("✓ test_reuse_expires: EXITOSO")
+
+    def test_reset_forgets_reference(self):
+        """Test: Tras reiniciar, el siguiente frame se analiza."""
+        _, signature = self.gate.evaluate(self.frame, 100.0)
+        self.gate.record_analysis(signature, 100.0)
+        self.gate.reset()
+
+        changed, _ = self.gate.evaluate(self.frame, 101.0)
+
+        self.assertTrue(changed)
+        print("✓ test_reset_forgets_reference: EXITOSO")
+
+
+if __name__ == '__main__':
+    print("🧪 EJECUTANDO TESTS DE SCENE CHANGE GATE")
+    print("=" * 60)
+    
+    # Crear suite de tests
+    loader = unittest.TestLoader()
+    suite = loader.loadTestsFromTestCase(TestSceneChangeGate)
+    
+    # Ejecutar tests
+    runner = unittest.TextTestRunner(verbosity=0, stream=open(os.devnull, 'w'))
+    result = runner.run(suite)
+    
+    # Mostrar resumen
+    total_tests = result.testsRun
+    failures = len(result.failures)
+    errors = len(result.errors)
+    passed = total_tests - failures - errors
+    
+    print(f"\n📈 ESTADÍSTICAS DE SCENE CHANGE GATE:")
+    print(f"   Tests ejecutados: {total_tests}")
+    print(f"   Exitosos: {passed}")
+    print(f"   Fallidos: {failures}")
+    print(f"   Errores: {errors}")
+    print(f"   Tasa de éxito: {(passed/total_tests)*100:.1f}%")
+    
+    if failures > 0 or errors > 0:
+        print(f"\n❌ FALLOS DETECTADOS:")
+        for failure in result.failures:
+            print(f"   • {failure[0]}")
+        for error in result.errors:
+            print(f"   • {error[0]}")
+    else:
+        print(f"\n🎉 ¡TODOS LOS TESTS DE SCENE CHANGE GATE PASAN! 🎉") 
\ No newline at end of file
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests básicos para VideoStreamManager del proyecto Drone Geo Analysis.
+
+Estos tests verifican el gestor de streams de la flota:
+- Alta, baja y listado de streams
+- Límite de streams simultáneos
+- Planificación round-robin sobre un pool acotado de workers
+- Análisis que terminan antes de registrar su callback
+- Estadísticas por stream
+"""
+
+import sys
+import os
+import unittest
+from unittest.mock import patch, MagicMock
+import time
+import threading
+from concurrent.futures import Future
+import numpy as np
+
+# Configurar path para imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.processors.stream_manager import VideoStreamManager
+from src.processors.video_processor import VideoProcessor
+
+
+class TestVideoStreamManager(unittest.TestCase):
+    """Tests para la clase VideoStreamManager."""
+
+    def setUp(self):
+        """Configurar tests con un analizador simulado y captura desactivada."""
+        self.mock_analyzer = MagicMock()
+        self.mock_analyzer.analyze_image.return_value = {"status": "success"}
+        self.manager = VideoStreamManager(
+            self.mock_analyzer, max_workers=1, analysis_interval=0.05, max_streams=2
+        )
+        self.frame = np.zeros((48, 64, 3), dtype=np.uint8)
+
+        # Evitar abrir streams reales: solo se marca el procesador como activo
+        patcher = patch.object(VideoProcessor, 'start_capture', self._fake_start_capture)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        """Detener gestor y streams."""
+        self.manager.shutdown()
+
+    @staticmethod
+    def _fake_start_capture(processor, stream_url):
+        """Simula el arranque de captura sin thread real."""
+        processor.stream_url = stream_url
+        processor.processing = True
+        return True
+
+    def _feed_frame(self, stream_id):
+        """Inyecta un frame en el procesador de un stream."""
+        self.manager._streams[stream_id].processor._process_captured_frame(self.frame)
+
+    def test_start_and_list_streams(self):
+        """Test: Alta y listado de streams con estadísticas."""
+        self.assertTrue(self.manager.start_stream("drone_1", "rtmp://a/live"))
+        self.assertTrue(self.manager.start_stream("drone_2", "rtmp://b/live"))
+
+        streams = self.manager.list_streams()
+
+        self.assertEqual({s["stream_id"] for s in streams}, {"drone_1", "drone_2"})
+        for stats in streams:
+            self.assertIn("capture_fps", stats)
+            self.assertIn("queue_depth", stats)
+            self.assertIn("frames_dropped", stats)
+        print("✓ test_start_and_list_streams: EXITOSO")
+
+    def test_start_duplicate_stream(self):
+        """Test: No se puede iniciar dos veces el mismo stream."""
+        self.manager.start_stream("drone_1", "rtmp://a/live")
+
+        self.assertFalse(self.manager.start_stream("drone_1", "rtmp://a/live"))
+        print("✓ test_start_duplicate_stream: EXITOSO")
+
+    def test_max_streams_limit(self):
+        """Test: Se respeta el número máximo de streams."""
+        self.manager.start_stream("drone_1", "rtmp://a/live")
+        self.manager.start_stream("drone_2", "rtmp://b/live")
+
+        self.assertFalse(self.manager.start_stream("drone_3", "rtmp://c/live"))
+        print("✓ test_max_streams_limit: EXITOSO")
+
+    def test_concurrent_starts_reserve_slots(self):
+        """Test: Arranques simultáneos no duplican streams ni superan el límite."""
+        gate = threading.Barrier(4)
+        started_captures = []
+
+        def slow_start_capture(processor, stream_url):
+            started_captures.append(stream_url)
+            time.sleep(0.05)
+            return self._fake_start_capture(processor, stream_url)
+
+        results = {}
+
+        def start(name, stream_id):
+            gate.wait()
+            results[name] = self.manager.start_stream(stream_id, f"rtmp://{name}/live")
+
+        with patch.object(VideoProcessor, 'start_capture', slow_start_capture):
+            threads = [threading.Thread(target=start, args=(name, stream_id))
+                       for name, stream_id in (("a", "drone_1"), ("b", "drone_1"),
+                                               ("c", "drone_2"), ("d", "drone_3"))]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join(timeout=2.0)
+
+        self.assertEqual(sum(results.values()), 2)
+        self.assertEqual(len(started_captures), 2)
+        self.assertEqual(len(self.manager._streams), 2)
+        self.assertEqual(self.manager._starting, set())
+        print("✓ test_concurrent_starts_reserve_slots: EXITOSO")
+
+    def test_failed_start_releases_reservation(self):
+        """Test: Si la captura no arranca, el hueco reservado se libera."""
+        with patch.object(VideoProcessor, 'start_capture', return_value=False):
+            self.assertFalse(self.manager.start_stream("drone_1", "rtmp://a/live"))
+
+        self.assertEqual(self.manager._starting, set())
+        self.assertTrue(self.manager.start_stream("drone_1", "rtmp://a/live"))
+        print("✓ test_failed_start_releases_reservation: EXITOSO")
+
+    def test_stop_stream(self):
+        """Test: Baja de un stream activo e inexistente."""
+        self.manager.start_stream("drone_1", "rtmp://a/live")
+
+        self.assertTrue(self.manager.stop_stream("drone_1"))
+        self.assertFalse(self.manager.stop_stream("drone_1"))
+        self.assertEqual(self.manager.list_streams(), [])
+        print("✓ test_stop_stream: EXITOSO")
+
+    def test_frames_are_analyzed_by_pool(self):
+        """Test: Los frames de todos los streams se analizan en el pool compartido."""
+        self.manager.start_stream("drone_1", "rtmp://a/live")
+        self.manager.start_stream("drone_2", "rtmp://b/live")
+
+        self._feed_frame("drone_1")
+        self._feed_frame("drone_2")
+        deadline = time.time() + 2.0
+        while self.mock_analyzer.analyze_image.call_count < 2 and time.time() < deadline:
+            time.sleep(0.01)
+
+        self.assertEqual(self.mock_analyzer.analyze_image.call_count, 2)
+        self.assertIsNotNone(self.manager.get_last_analysis("drone_1"))
+        self.assertIsNotNone(self.manager.get_last_analysis("drone_2"))
+        print("✓ test_frames_are_analyzed_by_pool: EXITOSO")
+
+    def test_round_robin_when_pool_is_saturated(self):
+        """Test: Con el pool lleno, el stream menos atendido recibe el hueco."""
+        self.manager._running = True
+        self.manager._executor = MagicMock()
+        for stream_id in ("drone_1", "drone_2"):
+            self.manager.start_stream(stream_id, "rtmp://x/live")
+            self._feed_frame(stream_id)
+
+        self.manager._schedule_ready_streams(time.time())
+
+        # Solo hay un worker: drone_1 se planifica y drone_2 queda retrasado
+        self.assertEqual(list(self.manager._in_flight.keys()), ["drone_1"])
+        self.assertEqual(list(self.manager._schedule_order), ["drone_2", "drone_1"])
+        self.assertEqual(self.manager.get_stream_stats("drone_2")["analyses_deferred"], 1)
+        print("✓ test_round_robin_when_pool_is_saturated: EXITOSO")
+
+    def test_instant_analysis_does_not_deadlock(self):
+        """Test: Un análisis ya terminado al planificarse no bloquea el gestor."""
+        class InstantExecutor:
+            """Pool que ejecuta el análisis antes de devolver el future."""
+
+            def submit(self, fn):
+                future = Future()
+                future.set_result(fn())
+                return future
+
+            def shutdown(self, wait=True, cancel_futures=False):
+                pass
+
+        self.manager._running = True
+        self.manager._executor = InstantExecutor()
+        self.manager.start_stream("drone_1", "rtmp://x/live")
+        self._feed_frame("drone_1")
+
+        worker = threading.Thread(
+            target=self.manager._schedule_ready_streams, args=(time.time(),), daemon=True
+        )
+        worker.start()
+        worker.join(timeout=2.0)
+        self.assertFalse(worker.is_alive())
+        self.assertEqual(self.manager._in_flight, {})
+
+        closer = threading.Thread(target=self.manager.shutdown, daemon=True)
+        closer.start()
+        closer.join(timeout=2.0)
+        self.assertFalse(closer.is_alive())
+        print("✓ test_instant_analysis_does_not_deadlock: EXITOSO")
+
+    def test_get_stream_stats_unknown(self):
+        """Test: Estadísticas de un stream inexistente."""
+        self.assertIsNone(self.manager.get_stream_stats("unknown"))
+        print("✓ test_get_stream_stats_unknown: EXITOSO")
+
+
+if __name__ == '__main__':
+    print("🧪 EJECUTANDO TESTS DE STREAM MANAGER")
+    print("=" * 60)
+    
+    # Crear suite de tests
+    loader = unittest.TestLoader()
+    suite = loader.loadTestsFromTestCase(TestVideoStreamManager)
+    
+    # Ejecutar tests
+    runner = unittest.TextTestRunner(verbosity=0, stream=open(os.devnull, 'w'))
+    result = runner.run(suite)
+    
+    # Mostrar resumen
+    total_tests = result.testsRun
+    failures = len(result.failures)
+    errors = len(result.errors)
+    passed = total_tests - failures - errors
+    
+    print(f"\n📈 ESTADÍSTICAS DE STREAM MANAGER:")
+    print(f"   Tests ejecutados: {total_tests}")
+    print(f"   Exitosos: {passed}")
+    print(f"   Fallidos: {failures}")
+    print(f"   Errores: {errors}")
+    print(f"   Tasa de éxito: {(passed/total_tests)*100:.1f}%")
+    
+    if failures > 0 or errors > 0:
+        print(f"\n❌ FALLOS DETECTADOS:")
+        for failure in result.failures:
+            print(f"   • {failure[0]}")
+        for error in result.errors:
+            print(f"   • {error[0]}")
+    else:
+        print(f"\n🎉 ¡TODOS LOS TESTS DE STREAM MANAGER PASAN! 🎉") 
\ No newline at end of file
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests básicos para TiledDifferencer del proyecto Drone Geo Analysis.
+
+Estos tests verifican el diferenciado por teselas de grueso a fino:
+- Solo se refinan las teselas con cambios en el nivel grueso
+- El resultado coincide con el diferenciado a resolución completa
+- Validación de tamaños
+"""
+
+import sys
+import os
+import unittest
+import numpy as np
+import cv2
+
+# Configurar path para imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.processors.tiled_differencer import TiledDifferencer
+
+
+class TestTiledDifferencer(unittest.TestCase):
+    """Tests para la clase TiledDifferencer."""
+
+    def setUp(self):
+        """Configurar una escena texturizada y una captura con un cambio local."""
+        rng = np.random.RandomState(3)
+        base = rng.randint(0, 255, (60, 80), dtype=np.uint8)
+        self.reference_gray = cv2.resize(base, (800, 600), interpolation=cv2.INTER_CUBIC)
+        self.current_gray = self.reference_gray.copy()
+        self.current_gray[300:380, 420:520] = 255
+        self.reference_blur = cv2.GaussianBlur(self.reference_gray, (21, 21), 0)
+        self.differencer = TiledDifferencer(tile_size=128, max_workers=4)
+        self.reference_coarse = self.differencer.build_coarse(self.reference_gray)
+
+    def _full_resolution(self):
+        """Diferenciado de referencia sobre la imagen completa."""
+        current_blur = cv2.GaussianBlur(self.current_gray, (21, 21), 0)
+        delta = cv2.absdiff(self.reference_blur, current_blur)
+        thresh = cv2.threshold(delta, 25, 255, cv2.THRESH_BINARY)[1]
+        return thresh, cv2.dilate(thresh, None, iterations=2)
+
+    def test_invalid_tile_size(self):
+        """Test: Teselas demasiado pequeñas se rechazan."""
+        with self.assertRaises(ValueError):
+            TiledDifferencer(tile_size=8)
+        print("✓ test_invalid_tile_size: EXITOSO")
+
+    def test_shape_mismatch(self):
+        """Test: Referencia y captura de distinto tamaño se rechazan."""
+        with self.assertRaises(ValueError):
+            self.differencer.compute(self.reference_blur, self.current_gray[:100], self.reference_coarse)
+        print("✓ test_shape_mismatch: EXITOSO")
+
+    def test_only_changed_tiles_refined(self):
+        """Test: Solo las teselas alrededor del cambio se procesan a resolución completa."""
+        result = self.differencer.compute(self.reference_blur, self.current_gray, self.reference_coarse)
+
+        self.assertEqual(result["tiles_total"], 35)
+        self.assertGreater(result["tiles_refined"], 0)
+        self.assertLessEqual(result["tiles_refined"], 6)
+        print("✓ test_only_changed_tiles_refined: EXITOSO")
+
+    def test_matches_full_resolution(self):
+        """Test: El mapa por teselas coincide con el de la imagen completa."""
+        expected_thresh, expected_dilated = self._full_resolution()
+
+        result = self.differencer.compute(self.reference_blur, self.current_gray, self.reference_coarse)
+
+        np.testing.assert_array_equal(result["threshold"], expected_thresh)
+        np.testing.assert_array_equal(result["dilated"], expected_dilated)
+        print("✓ test_matches_full_resolution: EXITOSO")
+
+    def test_unchanged_scene(self):
+        """Test: Sin cambios no se refina ninguna tesela."""
+        unchanged = self.reference_gray.copy()
+
+        result = self.differencer.compute(self.reference_blur, unchanged, self.reference_coarse)
+
+        self.assertEqual(result["tiles_refined"], 0)
+        self.assertFalse(result["threshold"].any())
+        print("✓ test_unchanged_scene: EXITOSO")
+
+
+if __name__ == '__main__':
+    print("🧪 EJECUTANDO TESTS DE TILED DIFFERENCER")
+    print("=" * 60)
+    
+    # Crear suite de tests
+    loader = unittest.TestLoader()
+    suite = loader.loadTestsFromTestCase(TestTiledDifferencer)
+    
+    # Ejecutar tests
+    runner = unittest.TextTestRunner(verbosity=0, stream=open(os.devnull, 'w'))
+    result = runner.run(suite)
+    
+    # Mostrar resumen
+    total_tests = result.testsRun
+    failures = len(result.failures)
+    errors = len(result.errors)
+    passed = total_tests - failures - errors
+    
+    print(f"\n📈 ESTADÍSTICAS DE TILED DIFFERENCER:")
+    print(f"   Tests ejecutados: {total_tests}")
+    print(f"   Exitosos: {passed}")
+    print(f"   Fallidos: {failures}")
+    print(f"   Errores: {errors}")
+    print(f"   Tasa de éxito: {(passed/total_tests)*100:.1f}%")
+    
+    if failures > 0 or errors > 0:
+        print(f"\n❌ FALLOS DETECTADOS:")
+        for failure in result.failures:
+            print(f"   • {failure[0]}")
+        for error in result.errors:
+            print(f"   • {error[0]}")
+    else:
+        print(f"\n🎉 ¡TODOS LOS TESTS DE TILED DIFFERENCER PASAN! 🎉") 
\ No newline at end of file
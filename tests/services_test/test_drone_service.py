@@ -21,6 +21,7 @@ import time
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
 from src.services.drone_service import DroneService
+from src.processors.video_processor import STOP_TIMEOUT
 
 
 class TestDroneService(unittest.TestCase):
@@ -237,6 +238,95 @@ class TestDroneService(unittest.TestCase):
         self.assertIn('Stream error', result['error'])
         print("✓ test_start_video_stream_exception: EXITOSO")
     
+    def test_start_fleet_stream_success(self):
+        """Test: Inicio de stream de flota mediante el gestor."""
+        mock_manager = MagicMock()
+        mock_manager.start_stream.return_value = True
+        service = DroneService(self.mock_drone_controller, self.mock_video_processor, mock_manager)
+        
+        result = service.start_fleet_stream('drone_1', 'rtmp://test/live')
+        
+        self.assertTrue(result['success'])
+        self.assertEqual(result['stream_id'], 'drone_1')
+        mock_manager.start_stream.assert_called_once_with('drone_1', 'rtmp://test/live')
+        print("✓ test_start_fleet_stream_success: EXITOSO")
+    
+    def test_fleet_stream_without_manager(self):
+        """Test: Operaciones de flota sin gestor de streams."""
+        result = self.service.list_fleet_streams()
+        
+        self.assertFalse(result['success'])
+        self.assertIn('error', result)
+        print("✓ test_fleet_stream_without_manager: EXITOSO")
+    
+    def test_list_fleet_streams(self):
+        """Test: Listado de streams de flota con estadísticas."""
+        mock_manager = MagicMock()
+        mock_manager.list_streams.return_value = [{'stream_id': 'drone_1', 'capture_fps': 5.0}]
+        service = DroneService(self.mock_drone_controller, self.mock_video_processor, mock_manager)
+        
+        result = service.list_fleet_streams()
+        
+        self.assertTrue(result['success'])
+        self.assertEqual(result['total_streams'], 1)
+        print("✓ test_list_fleet_streams: EXITOSO")
+    
+    def test_get_video_feed_not_processing(self):
+        """Test: Vista previa sin stream principal activo."""
+        self.mock_video_processor.processing = False
+        
+        result = self.service.get_video_feed()
+        
+        self.assertFalse(result['success'])
+        self.assertIn('error', result)
+        print("✓ test_get_video_feed_not_processing: EXITOSO")
+    
+    def test_get_video_feed_active_stream(self):
+        """Test: Vista previa del stream principal activo."""
+        self.mock_video_processor.processing = True
+        
+        result = self.service.get_video_feed()
+        
+        self.assertTrue(result['success'])
+        self.assertTrue(result['mimetype'].startswith('multipart/x-mixed-replace'))
+        self.assertTrue(hasattr(result['frames'], '__next__'))
+        print("✓ test_get_video_feed_active_stream: EXITOSO")
+    
+    def test_get_video_feed_unknown_fleet_stream(self):
+        """Test: Vista previa de un stream de flota inexistente."""
+        mock_manager = MagicMock()
+        mock_manager.get_preview.return_value = None
+        service = DroneService(self.mock_drone_controller, self.mock_video_processor, mock_manager)
+        
+        result = service.get_video_feed('drone_9')
+        
+        self.assertFalse(result['success'])
+        self.assertIn('drone_9', result['error'])
+        print("✓ test_get_video_feed_unknown_fleet_stream: EXITOSO")
+    
+    def test_get_video_history_main_stream(self):
+        """Test: Historial de análisis del stream principal."""
+        self.mock_video_processor.get_analysis_history.return_value = [{'timestamp': 1.0}]
+        
+        result = self.service.get_video_history(start=0.0, end=2.0)
+        
+        self.assertTrue(result['success'])
+        self.assertEqual(result['total_analyses'], 1)
+        self.mock_video_processor.get_analysis_history.assert_called_once_with(0.0, 2.0, None, False)
+        print("✓ test_get_video_history_main_stream: EXITOSO")
+    
+    def test_get_video_history_unknown_fleet_stream(self):
+        """Test: Historial de un stream de flota inexistente."""
+        mock_manager = MagicMock()
+        mock_manager.get_analysis_history.return_value = None
+        service = DroneService(self.mock_drone_controller, self.mock_video_processor, mock_manager)
+        
+        result = service.get_video_history('drone_9')
+        
+        self.assertFalse(result['success'])
+        self.assertIn('drone_9', result['error'])
+        print("✓ test_get_video_history_unknown_fleet_stream: EXITOSO")
+    
     def test_stop_video_stream_success(self):
         """Test: Parada exitosa de streaming de video."""
         self.mock_drone_controller.stop_video_stream.return_value = True
@@ -244,7 +334,8 @@ class TestDroneService(unittest.TestCase):
         result = self.service.stop_video_stream()
         
         self.assertTrue(result['success'])
-        self.mock_video_processor.stop_processing.assert_called_once()
+        # La espera por los threads está acotada: se ejecuta en la petición HTTP
+        self.mock_video_processor.stop_processing.assert_called_once_with(timeout=STOP_TIMEOUT)
         self.mock_drone_controller.stop_video_stream.assert_called_once()
         print("✓ test_stop_video_stream_success: EXITOSO")
     
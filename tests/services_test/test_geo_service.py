@@ -5,7 +5,7 @@ Tests completos para GeoService del proyecto Drone Geo Analysis.
 
 Estos tests verifican la funcionalidad del servicio de geolocalización:
 - Gestión de imágenes de referencia
-- Detección de cambios con correlación real y mock
+- Detección de cambios con ChangeDetector y mock, en segundo plano
 - Triangulación real y simulada  
 - Manejo de observaciones
 - Estados de objetivos
@@ -13,6 +13,8 @@ Estos tests verifican la funcionalidad del servicio de geolocalización:
 
 import sys
 import os
+import time
+import threading
 import unittest
 from unittest.mock import patch, MagicMock, Mock
 from datetime import datetime
@@ -118,9 +120,8 @@ class TestGeoService(unittest.TestCase):
     
     @patch.object(GeoService, '_detect_changes_real')
     def test_detect_changes_with_real_correlator(self, mock_detect_real):
-        """Test: Detección de cambios con correlador real."""
-        self.mock_geo_manager.current_reference_image = 'ref_001'
-        self.service.is_mock_correlator = False  # Simular correlador real
+        """Test: Detección de cambios con el detector real."""
+        self._attach_change_pipeline()
         mock_detect_real.return_value = {
             'success': True,
             'has_changes': True,
@@ -132,7 +133,7 @@ class TestGeoService(unittest.TestCase):
         self.assertTrue(result['success'])
         self.assertTrue(result['has_changes'])
         self.assertEqual(result['change_percentage'], 25.5)
-        mock_detect_real.assert_called_once()
+        mock_detect_real.assert_called_once_with(b"jpeg_frame", {'latitude': 40.0, 'longitude': -3.0})
         print("✓ test_detect_changes_with_real_correlator: EXITOSO")
     
     @patch.object(GeoService, '_detect_changes_mock')
@@ -393,46 +394,184 @@ class TestGeoService(unittest.TestCase):
         self.assertIn('Status error', result['error'])
         print("✓ test_get_targets_status_exception: EXITOSO")
     
-    @patch.object(GeoService, '_get_mock_telemetry')
-    def test_detect_changes_real_success(self, mock_telemetry):
-        """Test: Detección de cambios real exitosa."""
-        mock_telemetry.return_value = {
-            'gps': {'latitude': 40.0, 'longitude': -3.0},
+    def _attach_change_pipeline(self, frame=b"jpeg_frame", gps=None):
+        """Conecta un detector de cambios, un procesador de video y un dron simulados."""
+        self.service.change_detector = MagicMock()
+        self.service.video_processor = MagicMock()
+        self.service.video_processor.get_last_frame.return_value = frame
+        self.service.drone_controller = MagicMock()
+        self.service.drone_controller.get_telemetry.return_value = {
+            'gps': gps or {'latitude': 40.0, 'longitude': -3.0},
             'timestamp': 1234567890
         }
-        
-        self.mock_geo_correlator.correlate_drone_image.return_value = {
-            'confidence': 0.75,
-            'correlation_data': 'test_data'
+        return self.service.change_detector
+    
+    def test_detect_changes_real_success(self):
+        """Test: Detección de cambios real con el último frame y la referencia más cercana."""
+        detector = self._attach_change_pipeline()
+        detector.detect_changes.return_value = {
+            'location_id': '40.00000_-3.00000',
+            'has_changes': True,
+            'change_percentage': 25.04,
+            'significant_areas': 1,
+            'regions': [],
+            'changes_image': None,
+            'visualization': object(),
+            'detection_id': 'change_abc',
+            'timestamp': 1234567000,
+            'reference_distance_m': 3.2
         }
         
-        result = self.service._detect_changes_real()
+        result = self.service.detect_changes()
         
+        detector.detect_changes.assert_called_once_with(
+            b"jpeg_frame", coordinates={'latitude': 40.0, 'longitude': -3.0}
+        )
         self.assertTrue(result['success'])
-        self.assertTrue(result['has_changes'])  # confidence < 0.8
-        self.assertEqual(result['change_percentage'], 25.0)  # (1 - 0.75) * 100
-        self.assertEqual(result['correlation_confidence'], 0.75)
+        self.assertTrue(result['has_changes'])
+        self.assertEqual(result['change_percentage'], 25.04)
+        self.assertEqual(result['detection_id'], 'change_abc')
+        self.assertEqual(result['reference_distance_m'], 3.2)
+        self.assertNotIn('visualization', result)
         print("✓ test_detect_changes_real_success: EXITOSO")
     
-    @patch.object(GeoService, '_get_mock_telemetry')
-    def test_detect_changes_real_error(self, mock_telemetry):
-        """Test: Error en detección de cambios real."""
-        mock_telemetry.return_value = {
-            'gps': {'latitude': 40.0, 'longitude': -3.0},
-            'timestamp': 1234567890
-        }
-        
-        self.mock_geo_correlator.correlate_drone_image.return_value = {
-            'error': 'Correlation failed'
+    def test_detect_changes_real_error(self):
+        """Test: Error del detector en detección de cambios real."""
+        detector = self._attach_change_pipeline()
+        detector.detect_changes.return_value = {
+            'error': 'No hay referencias dentro del radio de búsqueda'
         }
         
-        result = self.service._detect_changes_real()
+        result = self.service.detect_changes({'latitude': 40.0, 'longitude': -3.0})
         
         self.assertFalse(result['success'])
-        self.assertIn('error', result)
-        self.assertEqual(result['error'], 'Correlation failed')
+        self.assertIn('referencias', result['error'])
         print("✓ test_detect_changes_real_error: EXITOSO")
     
+    def test_detect_changes_real_without_frame(self):
+        """Test: Sin frames de video no se puede detectar cambios."""
+        detector = self._attach_change_pipeline(frame=None)
+        
+        result = self.service.detect_changes()
+        
+        self.assertFalse(result['success'])
+        detector.detect_changes.assert_not_called()
+        print("✓ test_detect_changes_real_without_frame: EXITOSO")
+    
+    def test_detect_changes_without_telemetry(self):
+        """Test: Sin telemetría real no se usa una posición simulada con frames reales."""
+        detector = self._attach_change_pipeline()
+        self.service.drone_controller.get_telemetry.return_value = {'gps': {}}
+        
+        result = self.service.detect_changes()
+        started = self.service.start_change_detection()
+        reference = self.service.add_reference_image()
+        
+        for response in (result, started, reference):
+            self.assertFalse(response['success'])
+            self.assertIn('telemetría', response['error'])
+        detector.detect_changes.assert_not_called()
+        detector.add_reference_image.assert_not_called()
+        self.assertEqual(self.service._jobs, {})
+        print("✓ test_detect_changes_without_telemetry: EXITOSO")
+    
+    def test_change_detection_job_uses_submitted_frame(self):
+        """Test: El trabajo compara el frame y la posición del momento de la petición."""
+        self._attach_change_pipeline()
+        with patch.object(self.service, '_get_detection_executor') as mock_executor:
+            started = self.service.start_change_detection()
+        job_id, capture = mock_executor.return_value.submit.call_args[0][1:]
+        
+        # El dron sigue volando antes de que el worker llegue al trabajo
+        self.service.video_processor.get_last_frame.return_value = b"later_frame"
+        self.service.drone_controller.get_telemetry.return_value = {
+            'gps': {'latitude': 41.0, 'longitude': -4.0}
+        }
+        with patch.object(self.service, '_detect_changes_real',
+                          return_value={'success': True}) as mock_detect:
+            self.service._run_change_detection_job(job_id, capture)
+        
+        self.assertEqual(job_id, started['job_id'])
+        mock_detect.assert_called_once_with(b"jpeg_frame", {'latitude': 40.0, 'longitude': -3.0})
+        self.assertEqual(self.service.get_change_detection_job(job_id)['status'], 'completed')
+        print("✓ test_change_detection_job_uses_submitted_frame: EXITOSO")
+    
+    def test_change_detection_job(self):
+        """Test: La detección se ejecuta en segundo plano y se consulta por ID."""
+        self._attach_change_pipeline()
+        with patch.object(self.service, '_detect_changes_real',
+                          return_value={'success': True, 'has_changes': False}) as mock_detect:
+            started = self.service.start_change_detection({'latitude': 1.0, 'longitude': 2.0})
+            self.assertTrue(started['success'])
+            
+            job = self.service.get_change_detection_job(started['job_id'])
+            for _ in range(100):
+                if job['status'] == 'completed':
+                    break
+                time.sleep(0.01)
+                job = self.service.get_change_detection_job(started['job_id'])
+        
+        self.assertEqual(job['status'], 'completed')
+        self.assertFalse(job['result']['has_changes'])
+        mock_detect.assert_called_once_with(b"jpeg_frame", {'latitude': 1.0, 'longitude': 2.0})
+        self.assertFalse(self.service.get_change_detection_job('missing')['success'])
+        print("✓ test_change_detection_job: EXITOSO")
+    
+    def test_change_detection_rejects_when_busy(self):
+        """Test: Con demasiados trabajos pendientes se rechazan los nuevos."""
+        self.service.max_pending_jobs = 2
+        release = threading.Event()
+        with patch.object(self.service, 'detect_changes',
+                          side_effect=lambda: release.wait(2.0) and {'success': True}):
+            first = self.service.start_change_detection()
+            second = self.service.start_change_detection()
+            third = self.service.start_change_detection()
+            release.set()
+            
+            self.assertTrue(first['success'] and second['success'])
+            self.assertFalse(third['success'])
+            self.assertTrue(third['busy'])
+            self.assertEqual(len(self.service._jobs), 2)
+            
+            for _ in range(200):
+                if all(job['status'] == 'completed' for job in self.service._jobs.values()):
+                    break
+                time.sleep(0.01)
+            self.assertTrue(self.service.start_change_detection()['success'])
+        print("✓ test_change_detection_rejects_when_busy: EXITOSO")
+    
+    def test_change_detection_max_jobs_is_hard_cap(self):
+        """Test: Los trabajos terminados se olvidan y nunca se superan max_jobs."""
+        self.service.max_jobs = 3
+        self.service.max_pending_jobs = 3
+        for index in range(5):
+            job_id = f"changes_done_{index}"
+            self.service._jobs[job_id] = {'job_id': job_id, 'status': 'completed', 'result': None}
+        self.service._jobs['changes_pending'] = {'job_id': 'changes_pending',
+                                                 'status': 'pending', 'result': None}
+        
+        with patch.object(self.service, '_get_detection_executor'):
+            started = self.service.start_change_detection()
+        
+        self.assertTrue(started['success'])
+        self.assertEqual(len(self.service._jobs), 3)
+        self.assertIn('changes_pending', self.service._jobs)
+        print("✓ test_change_detection_max_jobs_is_hard_cap: EXITOSO")
+    
+    def test_add_reference_image_registers_frame(self):
+        """Test: La referencia nueva también se registra en el detector de cambios."""
+        detector = self._attach_change_pipeline()
+        detector.add_reference_image.return_value = '40.41678_-3.70379'
+        self.mock_geo_manager.add_reference_image.return_value = 'ref_001'
+        
+        result = self.service.add_reference_image()
+        
+        self.assertEqual(result['location_id'], '40.41678_-3.70379')
+        frame, coordinates, _ = detector.add_reference_image.call_args[0]
+        self.assertEqual(frame, b"jpeg_frame")
+        self.assertEqual(coordinates['latitude'], 40.0)
+        print("✓ test_add_reference_image_registers_frame: EXITOSO")
+    
     def test_detect_changes_mock(self):
         """Test: Detección de cambios mock."""
         result = self.service._detect_changes_mock()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Pruebas para el módulo image_annotator.py
+"""
+
+import base64
+
+import cv2
+import numpy as np
+import pytest
+
+from src.utils.image_annotator import ImageAnnotator
+from src.utils.image_processor import ImageProcessor
+from src.utils.yolo_result_formatter import YoloResultFormatter
+
+
+def _decode(encoded: str) -> np.ndarray:
+    """Decodifica una imagen base64 a BGR."""
+    return cv2.imdecode(np.frombuffer(base64.b64decode(encoded), np.uint8), cv2.IMREAD_COLOR)
+
+
+@pytest.fixture
+def image():
+    """Imagen RGB roja de 200×400 (el canal rojo es el primero)."""
+    rgb = np.zeros((200, 400, 3), dtype=np.uint8)
+    rgb[:, :, 0] = 200
+    return rgb
+
+
+@pytest.fixture
+def detections():
+    """Una detección formateada en la esquina inferior derecha."""
+    return YoloResultFormatter.format_detections(
+        np.array([[300, 150, 380, 190]], dtype=np.float32), np.array([0.9]), np.array([0]),
+        {0: 'car'}, (200, 400, 3)
+    )
+
+
+def test_annotate_detections_draws_on_bgr(image, detections):
+    """La imagen se codifica en BGR con la caja dibujada y sin tocar la original."""
+    original = image.copy()
+    annotated = _decode(ImageAnnotator(ImageProcessor()).annotate_detections(image, detections))
+
+    assert annotated.shape == (200, 400, 3)
+    assert annotated[20, 20, 2] > 150 and annotated[20, 20, 0] < 50
+    assert annotated[170, 300, 1] > 200
+    assert np.array_equal(image, original)
+
+
+def test_annotate_detections_columnar(image, detections):
+    """Las detecciones en columnas producen la misma imagen que las filas."""
+    annotator = ImageAnnotator(ImageProcessor())
+    columns = YoloResultFormatter.format_detections(
+        np.array([[300, 150, 380, 190]], dtype=np.float32), np.array([0.9]), np.array([0]),
+        {0: 'car'}, (200, 400, 3), columnar=True
+    )
+    assert annotator.annotate_detections(image, columns) == \
+        annotator.annotate_detections(image, detections)
+
+
+def test_annotate_detections_max_width(image, detections):
+    """Con max_width la imagen se reduce y las cajas se escalan."""
+    annotated = _decode(ImageAnnotator(ImageProcessor(), max_width=200)
+                        .annotate_detections(image, detections))
+
+    assert annotated.shape == (100, 200, 3)
+    assert annotated[85, 150, 1] > 200
+    assert annotated[85, 150, 2] < 100
+
+
+def test_annotate_detections_quality(image, detections):
+    """Menor calidad JPEG produce una imagen más pequeña."""
+    noisy = np.random.default_rng(0).integers(0, 255, image.shape, dtype=np.uint8)
+    high = ImageAnnotator(ImageProcessor(), jpeg_quality=95).annotate_detections(noisy, detections)
+    low = ImageAnnotator(ImageProcessor(), jpeg_quality=30).annotate_detections(noisy, detections)
+    assert len(low) < len(high)
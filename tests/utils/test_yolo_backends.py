@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Pruebas para los backends de inferencia YOLO (yolo_backends.py y YoloModelManager)
+"""
+
+import os
+import pytest
+from unittest.mock import patch
+
+from src.utils.yolo_backends import (
+    INFERENCE_BACKENDS,
+    InferenceBackend,
+    get_inference_backend,
+    export_model,
+    weights_fingerprint
+)
+from src.utils.yolo_model_manager import YoloModelManager
+
+
+class FakeYOLO:
+    """Sustituto de ``ultralytics.YOLO`` que registra cargas y exportaciones."""
+
+    loaded = []
+    exports = []
+
+    def __init__(self, path, task=None):
+        self.path = path
+        self.names = {0: 'person'}
+        FakeYOLO.loaded.append(path)
+
+    def export(self, format, dynamic, imgsz):
+        FakeYOLO.exports.append(format)
+        exported = os.path.splitext(self.path)[0] + '.onnx'
+        with open(exported, 'w') as f:
+            f.write('onnx')
+        return exported
+
+
+@pytest.fixture
+def weights(tmp_path):
+    """Pesos PyTorch falsos en un directorio temporal."""
+    FakeYOLO.loaded = []
+    FakeYOLO.exports = []
+    path = tmp_path / 'yolo11n.pt'
+    path.write_text('pt')
+    return str(path)
+
+
+def test_get_inference_backend():
+    """Los backends se obtienen por nombre sin distinguir mayúsculas."""
+    assert get_inference_backend('ONNX') is INFERENCE_BACKENDS['onnx']
+    assert get_inference_backend().export_format is None
+
+
+def test_get_inference_backend_unknown():
+    """Un backend desconocido produce ValueError."""
+    with pytest.raises(ValueError):
+        get_inference_backend('tensorrt')
+
+
+def test_artifact_path(weights):
+    """La ruta exportada se deriva del nombre, el tamaño de entrada y la huella de los pesos."""
+    fingerprint = weights_fingerprint(weights)
+
+    assert INFERENCE_BACKENDS['onnx'].artifact_path(weights, 'cache') == \
+        os.path.join('cache', f'yolo11n_640_{fingerprint}.onnx')
+    assert INFERENCE_BACKENDS['openvino'].artifact_path(weights, 'cache', imgsz=320) == \
+        os.path.join('cache', f'yolo11n_320_{fingerprint}_openvino_model')
+
+
+def test_artifact_path_changes_with_weights(weights):
+    """Unos pesos nuevos con el mismo nombre no reutilizan la exportación anterior."""
+    backend = INFERENCE_BACKENDS['onnx']
+    before = backend.artifact_path(weights, 'cache')
+
+    with open(weights, 'w') as f:
+        f.write('pt reentrenado')
+
+    assert backend.artifact_path(weights, 'cache') != before
+
+
+def test_export_model_is_cached(weights, tmp_path):
+    """La exportación se hace una vez y se reutiliza desde la caché."""
+    cache_dir = str(tmp_path / 'models')
+    backend = INFERENCE_BACKENDS['onnx']
+
+    first = export_model(FakeYOLO(weights), weights, backend, cache_dir)
+    second = export_model(FakeYOLO(weights), weights, backend, cache_dir)
+
+    assert first == second == backend.artifact_path(weights, cache_dir)
+    assert os.path.exists(first)
+    assert FakeYOLO.exports == ['onnx']
+
+
+def test_export_model_per_imgsz(weights, tmp_path):
+    """Cada tamaño de entrada tiene su propia exportación."""
+    cache_dir = str(tmp_path / 'models')
+    backend = INFERENCE_BACKENDS['onnx']
+
+    small = export_model(FakeYOLO(weights), weights, backend, cache_dir, imgsz=320)
+    large = export_model(FakeYOLO(weights), weights, backend, cache_dir, imgsz=640)
+
+    assert small != large
+    assert FakeYOLO.exports == ['onnx', 'onnx']
+
+
+def test_manager_loads_exported_model(weights, tmp_path):
+    """El gestor sirve el modelo exportado cuando el motor está instalado."""
+    manager = YoloModelManager(backend='onnx', cache_dir=str(tmp_path / 'models'))
+
+    with patch.object(InferenceBackend, 'is_available', return_value=True):
+        model = manager._load_backend_model(FakeYOLO, weights)
+
+    assert model.path.endswith('.onnx')
+    assert manager.active_backend == 'onnx'
+
+
+def test_manager_falls_back_to_pytorch(weights, tmp_path):
+    """Sin el motor de inferencia instalado se usa el modelo PyTorch."""
+    manager = YoloModelManager(backend='openvino', cache_dir=str(tmp_path / 'models'))
+
+    with patch.object(InferenceBackend, 'is_available', return_value=False):
+        model = manager._load_backend_model(FakeYOLO, weights)
+
+    assert model.path == weights
+    assert manager.active_backend == 'pytorch'
+    assert FakeYOLO.exports == []
+    assert manager.get_model_info()['backend'] == 'pytorch'
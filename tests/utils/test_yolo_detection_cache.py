@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Pruebas para el módulo yolo_detection_cache.py
+"""
+
+import numpy as np
+
+from src.utils.yolo_detection_cache import (
+    non_max_suppression,
+    RawDetections,
+    YoloDetectionCache
+)
+
+
+def _raw(min_confidence=0.25):
+    """Cajas de prueba: dos solapadas de la clase 0, una de la clase 1 encima y una aislada."""
+    return RawDetections(
+        xyxy=np.array([[0, 0, 10, 10], [1, 0, 11, 10], [0, 0, 10, 10], [50, 50, 60, 60]],
+                      dtype=np.float32),
+        conf=np.array([0.9, 0.8, 0.7, 0.3], dtype=np.float32),
+        cls=np.array([0, 0, 1, 0], dtype=np.float32),
+        image_shape=(100, 100, 3),
+        min_confidence=min_confidence
+    )
+
+
+def test_nms_is_per_class():
+    """Solo se suprimen cajas solapadas de la misma clase."""
+    raw = _raw()
+    keep = non_max_suppression(raw.xyxy, raw.conf, raw.cls, 0.5)
+    assert keep.tolist() == [0, 2, 3]
+
+
+def test_nms_threshold_is_exclusive():
+    """Una caja con IoU igual al umbral se conserva."""
+    raw = _raw()
+    iou = 9 * 10 / (2 * 100 - 9 * 10)
+    assert non_max_suppression(raw.xyxy, raw.conf, raw.cls, iou).tolist() == [0, 1, 2, 3]
+
+
+def test_nms_max_det_and_empty():
+    """max_det limita las cajas y una entrada vacía devuelve un array vacío."""
+    raw = _raw()
+    assert non_max_suppression(raw.xyxy, raw.conf, raw.cls, 0.99, max_det=2).tolist() == [0, 1]
+    assert len(non_max_suppression(np.zeros((0, 4)), np.zeros(0), np.zeros(0), 0.5)) == 0
+
+
+def test_filter_applies_confidence_then_nms():
+    """filter descarta por confianza y aplica NMS a las restantes."""
+    filtered = _raw().filter(0.75, 0.5)
+    assert len(filtered) == 1
+    assert filtered.xyxy[0].tolist() == [0, 0, 10, 10]
+
+    assert len(_raw().filter(0.5, 0.95)) == 3
+
+
+def test_raw_detections_iterate_like_boxes():
+    """Cada elemento expone xyxy[0], conf[0] y cls[0]."""
+    boxes = list(_raw())
+    assert len(boxes) == 4
+    assert boxes[2].xyxy[0].tolist() == [0, 0, 10, 10]
+    assert int(boxes[2].cls[0]) == 1
+
+
+def test_cache_hit_and_floor():
+    """La caché responde a umbrales desde su confianza mínima."""
+    cache = YoloDetectionCache(max_entries=4)
+    key = cache.key_for(b'imagen')
+    cache.put(key, _raw(min_confidence=0.25))
+
+    assert cache.get(key, 0.5) is not None
+    assert cache.get(key, 0.1) is None
+    assert cache.get(cache.key_for(b'otra'), 0.5) is None
+    stats = cache.get_stats()
+    assert (stats['hits'], stats['misses'], stats['entries']) == (1, 2, 1)
+
+
+def test_cache_evicts_least_recent():
+    """Se expulsa la imagen usada hace más tiempo."""
+    cache = YoloDetectionCache(max_entries=2)
+    keys = [cache.key_for(bytes([i])) for i in range(3)]
+    cache.put(keys[0], _raw())
+    cache.put(keys[1], _raw())
+    cache.get(keys[0], 0.5)
+    cache.put(keys[2], _raw())
+
+    assert cache.get(keys[1], 0.5) is None
+    assert cache.get(keys[0], 0.5) is not None
+
+
+def test_cache_disabled():
+    """Con max_entries=0 no se guarda nada."""
+    cache = YoloDetectionCache(max_entries=0)
+    key = cache.key_for(b'imagen')
+    cache.put(key, _raw())
+    assert cache.get(key, 0.5) is None
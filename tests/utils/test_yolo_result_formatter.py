@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Pruebas para el módulo yolo_result_formatter.py
+"""
+
+import json
+
+import numpy as np
+import pytest
+
+from src.utils.yolo_result_formatter import YoloResultFormatter
+
+CLASS_NAMES = {0: 'person', 2: 'car'}
+IMAGE_SHAPE = (100, 200, 3)
+
+
+@pytest.fixture
+def boxes():
+    """Dos cajas YOLO en float32, como las devuelve el modelo."""
+    return {
+        'xyxy': np.array([[10.7, 20.2, 50.9, 60.5], [100, 0, 200, 100]], dtype=np.float32),
+        'conf': np.array([0.91234, 0.5], dtype=np.float32),
+        'cls': np.array([0, 7], dtype=np.float32)
+    }
+
+
+def test_format_detections_rows(boxes):
+    """Cada detección tiene bbox, bbox normalizado, área y porcentaje."""
+    detections = YoloResultFormatter.format_detections(
+        boxes['xyxy'], boxes['conf'], boxes['cls'], CLASS_NAMES, IMAGE_SHAPE
+    )
+
+    assert len(detections) == 2
+    first = detections[0]
+    assert first['id'] == 0
+    assert first['class_name'] == 'person'
+    assert first['confidence'] == 0.912
+    assert first['bbox'] == {'x1': 10, 'y1': 20, 'x2': 50, 'y2': 60,
+                             'width': 40, 'height': 40, 'center_x': 30, 'center_y': 40}
+    assert first['normalized_bbox']['x2'] == 0.2545
+    assert first['area'] == 1620
+    assert first['area_percentage'] == 8.1
+    assert detections[1]['class_name'] == 'class_7'
+    assert detections[1]['area_percentage'] == 50.0
+
+
+def test_format_detections_is_json_serializable(boxes):
+    """Los valores son tipos de Python, no escalares de NumPy."""
+    detections = YoloResultFormatter.format_detections(
+        boxes['xyxy'], boxes['conf'], boxes['cls'], CLASS_NAMES, IMAGE_SHAPE
+    )
+    assert json.loads(json.dumps(detections)) == detections
+
+
+def test_format_detections_columnar_matches_rows(boxes):
+    """El formato de columnas contiene los mismos valores que las filas."""
+    rows = YoloResultFormatter.format_detections(
+        boxes['xyxy'], boxes['conf'], boxes['cls'], CLASS_NAMES, IMAGE_SHAPE
+    )
+    columns = YoloResultFormatter.format_detections(
+        boxes['xyxy'], boxes['conf'], boxes['cls'], CLASS_NAMES, IMAGE_SHAPE, columnar=True
+    )
+
+    for i, row in enumerate(rows):
+        for field in ('id', 'class_name', 'class_id', 'confidence', 'area', 'area_percentage'):
+            assert columns[field][i] == row[field]
+        for field in ('bbox', 'normalized_bbox'):
+            assert {k: v[i] for k, v in columns[field].items()} == row[field]
+
+
+def test_format_detections_empty():
+    """Sin cajas se devuelve una lista (o columnas) vacía."""
+    empty = np.zeros((0, 4), dtype=np.float32)
+    assert YoloResultFormatter.format_detections(empty, [], [], CLASS_NAMES, IMAGE_SHAPE) == []
+    columns = YoloResultFormatter.format_detections(empty, [], [], CLASS_NAMES, IMAGE_SHAPE,
+                                                    columnar=True)
+    assert columns['id'] == [] and columns['bbox']['x1'] == []
+
+
+def test_format_detection_single_box(boxes):
+    """format_detection formatea una caja con el ID indicado."""
+    class Box:
+        xyxy = boxes['xyxy'][:1]
+        conf = boxes['conf'][:1]
+        cls = boxes['cls'][:1]
+
+    detection = YoloResultFormatter.format_detection(Box, CLASS_NAMES, 5, IMAGE_SHAPE)
+    assert detection['id'] == 5
+    assert detection['bbox']['width'] == 40
+
+
+def test_format_response_columnar(boxes):
+    """La respuesta cuenta los objetos e indica el formato de columnas."""
+    columns = YoloResultFormatter.format_detections(
+        boxes['xyxy'], boxes['conf'], boxes['cls'], CLASS_NAMES, IMAGE_SHAPE, columnar=True
+    )
+    response = YoloResultFormatter.format_response(True, columns, None, 0.5, 0.4)
+
+    assert response['total_objects'] == 2
+    assert response['detections_format'] == 'columnar'
+    assert 'detections_format' not in YoloResultFormatter.format_response(True, [], None, 0.5, 0.4)
+
+
+def test_no_annotated_image_is_none():
+    """Sin imagen anotada, tanto la respuesta como el error usan None."""
+    response = YoloResultFormatter.format_response(True, [], None, 0.5, 0.4)
+    error = YoloResultFormatter.format_error_response('sin modelo')
+
+    assert response['annotated_image'] is None
+    assert error['annotated_image'] is None